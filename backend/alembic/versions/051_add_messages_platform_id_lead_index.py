@@ -0,0 +1,53 @@
+"""Add (platform_message_id, lead_id) index on messages for reconciliation diffing.
+
+Revision ID: 051
+Revises: 050
+Create Date: 2026-10-16
+
+Background:
+  get_db_message_ids loaded every Lead of a creator, then pulled every
+  platform_message_id for those leads into a Python set on each reconciliation
+  cycle — cost grew with the creator's lifetime lead count.
+
+  It now probes only the candidate IDs fetched from Instagram:
+    SELECT m.platform_message_id FROM messages m
+    JOIN leads l ON l.id = m.lead_id JOIN creators c ON c.id = l.creator_id
+    WHERE c.name = :creator AND m.platform_message_id IN (:candidates)
+
+Index added:
+  messages (platform_message_id, lead_id) WHERE platform_message_id IS NOT NULL
+    — index-only probe for the candidate IDs, lead_id included for the join
+    — partial index skips bot/manual messages that have no platform ID
+
+Index dropped:
+  ix_messages_platform_message_id (platform_message_id)
+    — same leading column, so every equality / IN lookup on
+      platform_message_id (webhook dedup checks) is served by the new index;
+      no query filters on platform_message_id IS NULL
+"""
+
+from alembic import op
+
+revision = "051"
+down_revision = "050"
+branch_labels = None
+depends_on = None
+
+transaction = False
+
+
+def upgrade():
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_messages_platform_msg_lead
+        ON messages (platform_message_id, lead_id)
+        WHERE platform_message_id IS NOT NULL
+    """)
+    op.execute("DROP INDEX IF EXISTS ix_messages_platform_message_id")
+
+
+def downgrade():
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_messages_platform_message_id
+        ON messages (platform_message_id)
+    """)
+    op.execute("DROP INDEX IF EXISTS idx_messages_platform_msg_lead")
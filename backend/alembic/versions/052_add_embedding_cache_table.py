@@ -0,0 +1,55 @@
+"""Add embedding_cache table: durable tier of the embedding cache.
+
+Vectors keyed by (model, task_type, dimensions, sha256(normalised text)) so
+re-embedding the same query / memory fact / contextual prefix after a deploy
+is a DB lookup instead of a Gemini call. See core/embedding_cache.py.
+
+Revision ID: 052
+Revises: 051
+Create Date: 2026-10-16
+"""
+
+revision = "052"
+down_revision = "051"
+branch_labels = None
+depends_on = None
+
+from alembic import op
+from sqlalchemy import inspect, text
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = inspect(conn)
+
+    if "embedding_cache" in inspector.get_table_names():
+        return  # idempotent
+
+    op.execute(text("""
+        CREATE TABLE embedding_cache (
+            cache_key    TEXT         PRIMARY KEY,
+            model        VARCHAR(100) NOT NULL,
+            task_type    VARCHAR(50)  NOT NULL,
+            dimensions   INT          NOT NULL,
+            embedding    BYTEA        NOT NULL,
+            created_at   TIMESTAMP    NOT NULL DEFAULT NOW(),
+            last_used_at TIMESTAMP    NOT NULL DEFAULT NOW()
+        )
+    """))
+
+    # LRU eviction scans by recency
+    op.execute(text("""
+        CREATE INDEX idx_embedding_cache_last_used
+            ON embedding_cache(last_used_at DESC)
+    """))
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    inspector = inspect(conn)
+
+    if "embedding_cache" not in inspector.get_table_names():
+        return
+
+    op.execute(text("DROP INDEX IF EXISTS idx_embedding_cache_last_used"))
+    op.drop_table("embedding_cache")
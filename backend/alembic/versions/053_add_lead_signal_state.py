@@ -0,0 +1,63 @@
+"""Add lead_signal_state table: incrementally maintained lead-scoring signals.
+
+One row per lead with the counters extract_signals() used to rebuild from the
+lead's first 100 messages on every rescore. Updated in O(1) by an ORM
+after_flush hook each time a Message is saved; rebuilt from messages when
+missing, marked stale, or built by an older keyword dictionary (version).
+See services/lead_scoring.py.
+
+Revision ID: 053
+Revises: 052
+Create Date: 2026-10-16
+"""
+
+revision = "053"
+down_revision = "052"
+branch_labels = None
+depends_on = None
+
+from alembic import op
+from sqlalchemy import inspect, text
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = inspect(conn)
+
+    if "lead_signal_state" in inspector.get_table_names():
+        return  # idempotent
+
+    op.execute(text("""
+        CREATE TABLE lead_signal_state (
+            lead_id                  UUID        PRIMARY KEY REFERENCES leads(id) ON DELETE CASCADE,
+            version                  INT         NOT NULL,
+            stale                    BOOLEAN     NOT NULL DEFAULT FALSE,
+            message_count            INT         NOT NULL DEFAULT 0,
+            last_message_at          TIMESTAMPTZ,
+            follower_messages        INT         NOT NULL DEFAULT 0,
+            creator_messages         INT         NOT NULL DEFAULT 0,
+            follower_purchase_hits   INT         NOT NULL DEFAULT 0,
+            follower_interest_hits   INT         NOT NULL DEFAULT 0,
+            follower_scheduling_hits INT         NOT NULL DEFAULT 0,
+            follower_negative_hits   INT         NOT NULL DEFAULT 0,
+            follower_social_hits     INT         NOT NULL DEFAULT 0,
+            creator_social_hits      INT         NOT NULL DEFAULT 0,
+            collaboration_hits       INT         NOT NULL DEFAULT 0,
+            follower_length_sum      INT         NOT NULL DEFAULT 0,
+            short_reactions          INT         NOT NULL DEFAULT 0,
+            story_replies            INT         NOT NULL DEFAULT 0,
+            strong_intents           INT         NOT NULL DEFAULT 0,
+            soft_intents             INT         NOT NULL DEFAULT 0,
+            updated_at               TIMESTAMPTZ NOT NULL DEFAULT NOW()
+        )
+    """))
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    inspector = inspect(conn)
+
+    if "lead_signal_state" not in inspector.get_table_names():
+        return
+
+    op.drop_table("lead_signal_state")
@@ -0,0 +1,67 @@
+"""Add audience rollup tables: precomputed "Tu Audiencia" tab aggregates.
+
+audience_follower_facts holds one row per follower_memories row with that
+follower's contribution to every tab. audience_rollups holds one row per
+creator with the merged tabs served by the audiencia endpoints. An ORM
+after_flush hook drops the facts of changed followers and bumps the
+creator's generation; reads rebuild the rollup when it falls behind.
+See core/audience_rollups.py.
+
+Revision ID: 054
+Revises: 053
+Create Date: 2026-10-16
+"""
+
+revision = "054"
+down_revision = "053"
+branch_labels = None
+depends_on = None
+
+from alembic import op
+from sqlalchemy import inspect, text
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    tables = inspector.get_table_names()
+
+    if "audience_follower_facts" not in tables:
+        op.execute(text("""
+            CREATE TABLE audience_follower_facts (
+                follower_memory_id UUID         PRIMARY KEY REFERENCES follower_memories(id) ON DELETE CASCADE,
+                creator_id         VARCHAR(100) NOT NULL,
+                version            INT          NOT NULL,
+                last_contact       VARCHAR(50),
+                facts              JSONB        NOT NULL,
+                updated_at         TIMESTAMPTZ  NOT NULL DEFAULT NOW()
+            )
+        """))
+        op.execute(text(
+            "CREATE INDEX idx_audience_follower_facts_creator "
+            "ON audience_follower_facts (creator_id, version, last_contact DESC)"
+        ))
+
+    if "audience_rollups" not in tables:
+        op.execute(text("""
+            CREATE TABLE audience_rollups (
+                creator_id       VARCHAR(100) PRIMARY KEY,
+                version          INT          NOT NULL DEFAULT 0,
+                generation       BIGINT       NOT NULL DEFAULT 0,
+                built_generation BIGINT       NOT NULL DEFAULT -1,
+                followers        INT          NOT NULL DEFAULT 0,
+                payload          JSONB,
+                computed_at      TIMESTAMPTZ
+            )
+        """))
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    tables = inspector.get_table_names()
+
+    if "audience_rollups" in tables:
+        op.drop_table("audience_rollups")
+    if "audience_follower_facts" in tables:
+        op.drop_table("audience_follower_facts")
@@ -0,0 +1,47 @@
+"""Add scheduler_leases: one row per cluster-scoped TaskScheduler job.
+
+A node runs a job only after taking its lease: the lease must be expired
+and last_started_at at least one interval old. The holder renews
+lease_until while the job runs and records the duration and error on
+release. See core/job_leases.py.
+
+Revision ID: 055
+Revises: 054
+Create Date: 2026-10-16
+"""
+
+revision = "055"
+down_revision = "054"
+branch_labels = None
+depends_on = None
+
+from alembic import op
+from sqlalchemy import inspect, text
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    tables = inspector.get_table_names()
+
+    if "scheduler_leases" not in tables:
+        op.execute(text("""
+            CREATE TABLE scheduler_leases (
+                job_name          VARCHAR(100) PRIMARY KEY,
+                owner             VARCHAR(255) NOT NULL,
+                lease_until       TIMESTAMPTZ  NOT NULL,
+                last_started_at   TIMESTAMPTZ,
+                last_finished_at  TIMESTAMPTZ,
+                last_duration_ms  DOUBLE PRECISION,
+                last_error        TEXT
+            )
+        """))
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    tables = inspector.get_table_names()
+
+    if "scheduler_leases" in tables:
+        op.drop_table("scheduler_leases")
@@ -0,0 +1,66 @@
+"""Add webhook_events: durable queue for inbound Instagram/Evolution webhooks.
+
+Routes store the validated payload here and return 200; consumers claim
+the oldest unfinished event of each conversation_key with
+FOR UPDATE SKIP LOCKED, so a conversation's events run one at a time in
+arrival order. (source, idempotency_key) is unique, which absorbs
+redelivered webhooks. See core/webhook_queue.py.
+
+Revision ID: 056
+Revises: 055
+Create Date: 2026-10-16
+"""
+
+revision = "056"
+down_revision = "055"
+branch_labels = None
+depends_on = None
+
+from alembic import op
+from sqlalchemy import inspect, text
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    tables = inspector.get_table_names()
+
+    if "webhook_events" not in tables:
+        op.execute(text("""
+            CREATE TABLE webhook_events (
+                id                BIGSERIAL    PRIMARY KEY,
+                source            VARCHAR(32)  NOT NULL,
+                idempotency_key   VARCHAR(255) NOT NULL,
+                conversation_key  VARCHAR(255) NOT NULL,
+                payload           JSONB        NOT NULL,
+                meta              JSONB,
+                status            VARCHAR(16)  NOT NULL DEFAULT 'pending',
+                attempts          INTEGER      NOT NULL DEFAULT 0,
+                received_at       TIMESTAMPTZ  NOT NULL DEFAULT NOW(),
+                available_at      TIMESTAMPTZ  NOT NULL DEFAULT NOW(),
+                locked_by         VARCHAR(255),
+                locked_until      TIMESTAMPTZ,
+                finished_at       TIMESTAMPTZ,
+                last_error        TEXT,
+                CONSTRAINT uq_webhook_events_idempotency UNIQUE (source, idempotency_key)
+            )
+        """))
+        op.execute(text("""
+            CREATE INDEX ix_webhook_events_open
+                ON webhook_events (conversation_key, id)
+             WHERE status IN ('pending', 'processing')
+        """))
+        op.execute(text("""
+            CREATE INDEX ix_webhook_events_finished
+                ON webhook_events (finished_at)
+             WHERE status = 'done'
+        """))
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    tables = inspector.get_table_names()
+
+    if "webhook_events" in tables:
+        op.drop_table("webhook_events")
@@ -14,7 +14,7 @@ Usage:
     # Set cached value (10 second TTL)
     api_cache.set("conversations:creator:50", result, ttl_seconds=10)
 
-    # Invalidate on updates
+    # Invalidate on updates (broadcast to all workers via the invalidation bus)
     api_cache.invalidate("conversations:creator")
 """
 
@@ -29,7 +29,8 @@ logger = logging.getLogger(__name__)
 class SimpleCache:
     """Thread-safe in-memory cache with TTL support and max size cap."""
 
-    def __init__(self, maxsize: int = 1000):
+    def __init__(self, maxsize: int = 1000, invalidation_topic=None):
+        self._invalidation_topic = invalidation_topic
         self._cache: Dict[str, Tuple[Any, datetime]] = {}
         self._lock = threading.Lock()
         self._hits = 0
@@ -74,7 +75,19 @@ class SimpleCache:
                     self._evictions += 1
 
     def invalidate(self, key_prefix: str):
-        """Invalidate all keys starting with prefix."""
+        """Invalidate all keys starting with prefix (in every worker when the cache has a topic)."""
+        if self._invalidation_topic is not None:
+            from core.invalidation_bus import publish_invalidation
+
+            publish_invalidation(self._invalidation_topic, key_prefix)
+        else:
+            self._invalidate_local(key_prefix)
+
+    def _invalidate_local(self, key_prefix: Optional[str]):
+        """Drop keys with prefix from this process (None clears everything)."""
+        if key_prefix is None:
+            self.clear()
+            return
         with self._lock:
             keys_to_delete = [k for k in self._cache if k.startswith(key_prefix)]
             for key in keys_to_delete:
@@ -103,5 +116,8 @@ class SimpleCache:
             }
 
 
-# Global cache instance
-api_cache = SimpleCache()
+# Global cache instance — invalidations reach every worker (core/invalidation_bus.py)
+from core.invalidation_bus import InvalidationTopic, get_invalidation_bus  # noqa: E402
+
+api_cache = SimpleCache(invalidation_topic=InvalidationTopic.API_CACHE)
+get_invalidation_bus().subscribe(InvalidationTopic.API_CACHE, api_cache._invalidate_local)
@@ -1,5 +1,6 @@
 import logging
 import os
+import time
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from sqlalchemy.pool import QueuePool
@@ -20,6 +21,26 @@ if DATABASE_URL and "sslmode" not in DATABASE_URL:
 
 logger.info("DATABASE_URL configured: %s", bool(DATABASE_URL))
 
+
+def _emit_pool_metric(name: str, value, **labels) -> None:
+    try:
+        from core.observability.metrics import emit_metric
+        emit_metric(name, value, **labels)
+    except Exception:
+        pass
+
+
+class _TimedQueuePool(QueuePool):
+    """QueuePool that reports how long each checkout waited (db_pool_wait_ms{engine="sync"})."""
+
+    def _do_get(self):
+        start = time.monotonic()
+        try:
+            return super()._do_get()
+        finally:
+            _emit_pool_metric("db_pool_wait_ms", (time.monotonic() - start) * 1000, engine="sync")
+
+
 engine = None
 SessionLocal = None
 
@@ -31,7 +52,7 @@ if DATABASE_URL:
         engine = create_engine(
             DATABASE_URL,
             echo=False,
-            poolclass=QueuePool,
+            poolclass=_TimedQueuePool,
             pool_size=5,  # 5 base connections (was 3 — too low with background scoring)
             max_overflow=7,  # 7 overflow (12 max)
             pool_timeout=10,  # Fail fast
@@ -49,9 +70,101 @@ if DATABASE_URL:
         )
         SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
         logger.info("SQLAlchemy engine created successfully with connection pooling")
+        # Incremental lead-scoring signals, advanced on every Message flush
+        from services.lead_scoring import install_signal_state_hooks
+        install_signal_state_hooks(SessionLocal)
+        # Audience rollups, invalidated on every FollowerMemoryDB flush
+        from core.audience_rollups import install_audience_rollup_hooks
+        install_audience_rollup_hooks(SessionLocal)
+        # Identity map, invalidated when Creator/Lead identities are committed
+        from core.identity_map import install_identity_map_hooks
+        install_identity_map_hooks(SessionLocal)
+        # Media store, moves inline base64 out of Message.msg_metadata on flush
+        from services.media_store import install_media_store_hooks
+        install_media_store_hooks(SessionLocal)
     except Exception as e:
         logger.error("Failed to create SQLAlchemy engine: %s", e, exc_info=True)
 
+# ─────────────────────────────────────────────────────────────────────────────
+# Async engine (asyncpg) — DM hot-path reads without asyncio.to_thread.
+# Lives alongside the sync engine; see services/dm_context_repository.py.
+# ─────────────────────────────────────────────────────────────────────────────
+ENABLE_ASYNC_DB = os.getenv("ENABLE_ASYNC_DB", "false").lower() == "true"
+
+async_engine = None
+AsyncSessionLocal = None
+
+
+def _async_database_url(url: str) -> tuple:
+    """postgresql://...?sslmode=require → (postgresql+asyncpg://..., connect_args).
+
+    asyncpg does not understand libpq's sslmode query parameter; SSL goes in
+    connect_args instead.
+    """
+    from sqlalchemy.engine import make_url
+
+    parsed = make_url(url).set(drivername="postgresql+asyncpg")
+    query = dict(parsed.query)
+    sslmode = query.pop("sslmode", None)
+    connect_args = {}
+    if sslmode and sslmode != "disable":
+        connect_args["ssl"] = "require"
+    return parsed.set(query=query), connect_args
+
+
+if DATABASE_URL and ENABLE_ASYNC_DB:
+    try:
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+        _async_url, _async_connect_args = _async_database_url(DATABASE_URL)
+        # Same budget as the sync pool: Neon scale-to-zero, fail fast on exhaustion
+        async_engine = create_async_engine(
+            _async_url,
+            echo=False,
+            pool_size=int(os.getenv("ASYNC_DB_POOL_SIZE", "5")),
+            max_overflow=int(os.getenv("ASYNC_DB_MAX_OVERFLOW", "5")),
+            pool_timeout=10,
+            pool_recycle=300,
+            pool_pre_ping=True,
+            connect_args=_async_connect_args,
+        )
+        AsyncSessionLocal = async_sessionmaker(
+            async_engine, expire_on_commit=False, autoflush=False
+        )
+        logger.info("Async SQLAlchemy engine (asyncpg) created")
+    except Exception as e:
+        logger.error("Failed to create async SQLAlchemy engine: %s", e, exc_info=True)
+        async_engine = None
+        AsyncSessionLocal = None
+
+
+def _instrument_pool(sync_engine, label: str) -> None:
+    """Publish checked-out connection count for a pool on every checkout/checkin."""
+    from sqlalchemy import event
+
+    pool = sync_engine.pool
+
+    def _report(*_args):
+        try:
+            _emit_pool_metric("db_pool_checked_out", pool.checkedout(), engine=label)
+        except Exception:
+            pass
+
+    event.listen(pool, "checkout", _report)
+    event.listen(pool, "checkin", _report)
+
+
+if engine is not None:
+    try:
+        _instrument_pool(engine, "sync")
+    except Exception as e:
+        logger.debug("Pool instrumentation failed (sync): %s", e)
+if async_engine is not None:
+    try:
+        _instrument_pool(async_engine.sync_engine, "async")
+    except Exception as e:
+        logger.debug("Pool instrumentation failed (async): %s", e)
+
 Base = declarative_base()
 
 def get_db():
@@ -64,7 +177,7 @@ def get_db():
         db.close()
 
 
-from contextlib import contextmanager
+from contextlib import asynccontextmanager, contextmanager
 
 @contextmanager
 def get_db_session():
@@ -76,3 +189,22 @@ def get_db_session():
         yield db
     finally:
         db.close()
+
+
+@asynccontextmanager
+async def get_async_db_session():
+    """Async counterpart of get_db_session (asyncpg engine).
+
+    Acquires the pooled connection up front so pool wait time is measured
+    (db_pool_wait_ms{engine="async"}).
+    """
+    if AsyncSessionLocal is None:
+        raise Exception("Async database not configured")
+    session = AsyncSessionLocal()
+    try:
+        start = time.monotonic()
+        await session.connection()
+        _emit_pool_metric("db_pool_wait_ms", (time.monotonic() - start) * 1000, engine="async")
+        yield session
+    finally:
+        await session.close()
@@ -230,6 +230,7 @@ from api.routers import (
     knowledge,
     leads,
     maintenance,
+    media,
     memory,
     messaging_webhooks,
     metrics,
@@ -274,6 +275,7 @@ app.include_router(ingestion_v2.router)
 app.include_router(autolearning_api.router)
 app.include_router(instagram.router)
 app.include_router(preview.router)
+app.include_router(media.router)
 app.include_router(dm.router)
 app.include_router(webhooks.router)
 app.include_router(gdpr.router)
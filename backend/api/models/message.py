@@ -12,6 +12,7 @@ from sqlalchemy import (
     Integer,
     String,
     Text,
+    text,
 )
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import relationship
@@ -25,6 +26,13 @@ except ImportError:
 
 class Message(Base):
     __tablename__ = "messages"
+    __table_args__ = (
+        # Migration 051: dedup lookups and reconciliation probes by platform ID
+        Index(
+            "idx_messages_platform_msg_lead", "platform_message_id", "lead_id",
+            postgresql_where=text("platform_message_id IS NOT NULL"),
+        ),
+    )
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     lead_id = Column(
         UUID(as_uuid=True), ForeignKey("leads.id"), index=True
@@ -37,7 +45,7 @@ class Message(Base):
     suggested_response = Column(Text)  # Original bot suggestion (before edit)
     approved_at = Column(DateTime(timezone=True))
     approved_by = Column(String(50))  # "creator" or "auto"
-    platform_message_id = Column(String(255), index=True)  # ID del mensaje en Instagram/Telegram (indexed for dedup checks)
+    platform_message_id = Column(String(255))  # ID del mensaje en Instagram/Telegram (indexed below for dedup checks)
     msg_metadata = Column(
         JSON, default=dict
     )  # {type: "story_mention", url: "...", emoji_type: "camera"}
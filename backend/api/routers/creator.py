@@ -76,7 +76,7 @@ async def reset_creator_data(
     Reset all test/follower data for a creator.
 
     Deletes:
-    - All followers (data/followers/{creator_id}/)
+    - All followers (follower store records + legacy data/followers/{creator_id}/ files)
     - All analytics (data/analytics/{creator_id}/)
 
     Keeps:
@@ -93,16 +93,27 @@ async def reset_creator_data(
     deleted = {"followers": 0, "analytics": 0}
     errors = []
 
-    # Delete followers directory
+    # Delete follower records from the memory store (imports and removes the
+    # legacy JSON files of its storage path, so they are counted once)
+    try:
+        deleted["followers"] += memory_store.delete_creator_followers(creator_id)
+        logger.info(f"Deleted {deleted['followers']} follower records for {creator_id}")
+    except Exception as e:
+        errors.append(f"Error deleting follower records: {e}")
+        logger.error(f"Error deleting follower records for {creator_id}: {e}")
+
+    # Delete any follower files left in the data directory
     followers_path = os.path.join(data_path, "followers", creator_id)
     if os.path.exists(followers_path):
         try:
+            removed = 0
             for file in os.listdir(followers_path):
                 file_path = os.path.join(followers_path, file)
                 if os.path.isfile(file_path):
                     os.remove(file_path)
-                    deleted["followers"] += 1
-            logger.info(f"Deleted {deleted['followers']} follower files for {creator_id}")
+                    removed += 1
+            deleted["followers"] += removed
+            logger.info(f"Deleted {removed} follower files for {creator_id}")
         except Exception as e:
             errors.append(f"Error deleting followers: {e}")
             logger.error(f"Error deleting followers for {creator_id}: {e}")
@@ -121,12 +132,6 @@ async def reset_creator_data(
             errors.append(f"Error deleting analytics: {e}")
             logger.error(f"Error deleting analytics for {creator_id}: {e}")
 
-    # Clear memory store cache if exists
-    try:
-        memory_store.clear_creator_cache(creator_id)
-    except Exception as e:
-        logger.debug(f"Memory store cache clear skipped: {e}")
-
     return {
         "status": "ok" if not errors else "partial",
         "creator_id": creator_id,
@@ -473,9 +473,9 @@ async def test_telegram_flow():
 
     # Step 2: Try to generate a response
     try:
-        from core.dm_agent_v2 import get_dm_agent
+        from core.dm_agent_v2 import aget_dm_agent
 
-        agent = get_dm_agent(creator_id)
+        agent = await aget_dm_agent(creator_id)
         steps.append(
             {
                 "step": "3. Initialize DM Agent",
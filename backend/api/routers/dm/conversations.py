@@ -3,7 +3,7 @@ DM Conversations - Conversation management endpoints
 (get_conversations, mark_conversation_read, archive, spam, reset, delete, sync, etc.)
 """
 
-import json
+import asyncio
 import logging
 import os
 from datetime import datetime, timezone
@@ -155,9 +155,15 @@ async def get_conversations(creator_id: str, platform: str = None):
 
                     # Step 4: Get last message per lead using DISTINCT ON — far faster than
                     # the old MAX(created_at) subquery + JOIN for large lead sets.
+                    # Only 'type' and 'emoji' are read for the preview, so project those
+                    # instead of shipping the whole msg_metadata JSONB per lead.
                     last_msg_sql = _text("""
                         SELECT DISTINCT ON (lead_id)
-                            lead_id, role, content, created_at, msg_metadata
+                            lead_id, role, content, created_at,
+                            jsonb_strip_nulls(jsonb_build_object(
+                                'type', msg_metadata -> 'type',
+                                'emoji', msg_metadata -> 'emoji'
+                            )) AS msg_metadata
                         FROM messages
                         WHERE lead_id = ANY(CAST(:lead_ids AS uuid[]))
                           AND status IN ('sent', 'edited')
@@ -362,17 +368,12 @@ async def archive_conversation_endpoint(creator_id: str, conversation_id: str):
                 return {"status": "ok", "archived": True}
         except Exception as e:
             logger.warning(f"PostgreSQL archive failed: {e}")
-    # Fallback to JSON files
+    # Fallback to the follower store
     try:
-        file_path = f"data/followers/{creator_id}/{conversation_id}.json"
-        if not os.path.exists(file_path):
+        if not await asyncio.to_thread(
+            _update_follower_record, creator_id, conversation_id, archived=True, is_lead=False
+        ):
             return {"status": "error", "message": "Conversation not found"}
-        with open(file_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        data["archived"] = True
-        data["is_lead"] = False
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
         return {"status": "ok", "archived": True}
     except Exception as e:
         return {"status": "error", "message": str(e)}
@@ -394,24 +395,12 @@ async def mark_conversation_spam_endpoint(creator_id: str, conversation_id: str)
                 return {"status": "ok", "spam": True}
         except Exception as e:
             logger.warning(f"PostgreSQL spam failed: {e}")
-    # Fallback to JSON files
+    # Fallback to the follower store
     try:
-        from .processing import get_dm_agent
-
-        file_path = f"data/followers/{creator_id}/{conversation_id}.json"
-        if not os.path.exists(file_path):
+        if not await asyncio.to_thread(
+            _update_follower_record, creator_id, conversation_id, spam=True, is_lead=False
+        ):
             return {"status": "error", "message": "Conversation not found"}
-        with open(file_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        data["spam"] = True
-        data["is_lead"] = False
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        # Invalidate cache
-        agent = get_dm_agent(creator_id)
-        cache_key = f"{creator_id}:{conversation_id}"
-        if cache_key in agent.memory_store._cache:
-            del agent.memory_store._cache[cache_key]
         return {"status": "ok", "spam": True}
     except Exception as e:
         return {"status": "error", "message": str(e)}
@@ -457,14 +446,17 @@ async def delete_conversation_endpoint(creator_id: str, conversation_id: str):
         except Exception as e:
             logger.error(f"PostgreSQL delete failed for {conversation_id}: {e}")
             raise HTTPException(status_code=500, detail="Internal server error")
-    # Fallback to JSON files (non-DB setups only)
+    # Fallback to the follower store (non-DB setups only)
     try:
-        file_path = f"data/followers/{creator_id}/{conversation_id}.json"
-        if not os.path.exists(file_path):
+        from core.follower_store import get_follower_store
+
+        store = get_follower_store()
+        if await store.aget(creator_id, conversation_id) is None:
             raise HTTPException(
                 status_code=404, detail="Conversation not found"
             )
-        os.remove(file_path)
+        await asyncio.to_thread(store.delete, creator_id, conversation_id)
+        _drop_cached_follower(creator_id, conversation_id)
         return {"status": "ok", "deleted": conversation_id}
     except HTTPException:
         raise
@@ -475,6 +467,29 @@ async def delete_conversation_endpoint(creator_id: str, conversation_id: str):
 # ============ ARCHIVED/SPAM MANAGEMENT ============
 
 
+def _drop_cached_follower(creator_id: str, follower_id: str) -> None:
+    """Drop a follower's decoded FollowerMemory from the shared MemoryStore caches."""
+    from core.follower_store import get_follower_store
+
+    store = get_follower_store()
+    for namespace in ("services.memory_service", "core.memory"):
+        store.object_cache(namespace).pop(f"{creator_id}:{follower_id}")
+
+
+def _update_follower_record(creator_id: str, follower_id: str, **fields) -> bool:
+    """Set fields on a follower-store record (non-DB fallback). False if not found."""
+    from core.follower_store import get_follower_store
+
+    store = get_follower_store()
+    data = store.get(creator_id, follower_id)
+    if data is None:
+        return False
+    data.update(fields)
+    store.put(data)
+    _drop_cached_follower(creator_id, follower_id)
+    return True
+
+
 @router.get("/conversations/{creator_id}/archived")
 async def get_archived_conversations(creator_id: str):
     """Get all archived and spam conversations"""
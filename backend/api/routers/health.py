@@ -269,6 +269,83 @@ def health_cache():
         return {"status": "error", "error": str(e)}
 
 
+@router.get("/health/http-pools")
+def health_http_pools():
+    """Per-provider LLM HTTP pool metrics (requests, new connections, latency)."""
+    try:
+        from core.providers.http_clients import get_pool_stats
+
+        return {"status": "ok", **get_pool_stats()}
+    except Exception as e:
+        return {"status": "error", "error": str(e)}
+
+
+@router.get("/health/llm-hedging")
+def health_llm_hedging():
+    """Hedged DM generation: hedge/win rates and p50/p95/p99 latency per provider."""
+    try:
+        from core.providers.hedging import get_hedge_stats
+
+        return {"status": "ok", **get_hedge_stats()}
+    except Exception as e:
+        return {"status": "error", "error": str(e)}
+
+
+@router.get("/health/prompt-cache")
+def health_prompt_cache():
+    """Prompt prefix caching: cached-token hit rate per creator/provider and live Gemini caches."""
+    try:
+        from core.providers.prefix_cache import get_prefix_cache_stats
+
+        return {"status": "ok", **get_prefix_cache_stats()}
+    except Exception as e:
+        return {"status": "error", "error": str(e)}
+
+
+@router.get("/health/identity-map")
+def health_identity_map():
+    """Identity map: hit rate, size and DB queries per creator/lead lookup kind."""
+    try:
+        from core.identity_map import get_identity_map_stats
+
+        return {"status": "ok", **get_identity_map_stats()}
+    except Exception as e:
+        return {"status": "error", "error": str(e)}
+
+
+@router.get("/health/dm-coalescing")
+def health_dm_coalescing():
+    """DM burst coalescing: windows per platform, batch sizes and pipeline passes saved."""
+    try:
+        from core.dm_coalescer import get_dm_coalescer_stats
+
+        return {"status": "ok", **get_dm_coalescer_stats()}
+    except Exception as e:
+        return {"status": "error", "error": str(e)}
+
+
+@router.get("/health/media-store")
+def health_media_store():
+    """Content-addressed media store: backend and URL / hot-blob cache counters."""
+    try:
+        from services.media_store import get_media_store_stats
+
+        return {"status": "ok", **get_media_store_stats()}
+    except Exception as e:
+        return {"status": "error", "error": str(e)}
+
+
+@router.get("/health/webhook-queue")
+async def health_webhook_queue():
+    """Durable webhook queue: depth by status, oldest pending age and this consumer's load."""
+    try:
+        from core.webhook_queue import get_webhook_queue_stats
+
+        return {"status": "ok", **(await get_webhook_queue_stats())}
+    except Exception as e:
+        return {"status": "error", "error": str(e)}
+
+
 @router.get("/health/tasks")
 async def task_health():
     from core.task_scheduler import scheduler
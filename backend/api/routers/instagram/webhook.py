@@ -5,6 +5,7 @@ Handles webhook verification, message routing, and story interactions.
 Routes incoming webhooks to the correct creator based on page_id.
 """
 
+import asyncio
 import logging
 import os
 from datetime import datetime, timezone
@@ -13,6 +14,8 @@ from typing import Any, Dict, Optional
 from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import PlainTextResponse
 
+from core.invalidation_bus import InvalidationTopic, get_invalidation_bus, publish_invalidation
+
 logger = logging.getLogger("clonnect-instagram")
 
 router = APIRouter()
@@ -61,26 +64,23 @@ def get_creator_by_page_id(page_id: str) -> Optional[Dict[str, Any]]:
 
     # Cache miss - query DB
     try:
+        import uuid
+
         from api.database import SessionLocal
         from api.models import Creator
+        from core.identity_map import identity_map
+
+        # page_id, then instagram_user_id (new Instagram API without Facebook Page),
+        # then instagram_additional_ids — one query, unknown IDs cached
+        creator_uuid = identity_map.resolve_creator_by_platform_id(page_id)
+        if not creator_uuid:
+            logger.warning(f"No creator found for page_id: {page_id}")
+            _creator_by_page_id_cache[page_id] = (None, current_time)
+            return None
 
         session = SessionLocal()
         try:
-            # Try by instagram_page_id first
-            creator = session.query(Creator).filter_by(instagram_page_id=page_id).first()
-
-            # If not found, also try by instagram_user_id (for new Instagram API without Facebook Page)
-            if not creator:
-                creator = session.query(Creator).filter_by(instagram_user_id=page_id).first()
-
-            # Also search in instagram_additional_ids (JSON array)
-            if not creator:
-                creator = (
-                    session.query(Creator)
-                    .filter(Creator.instagram_additional_ids.contains([page_id]))
-                    .first()
-                )
-
+            creator = session.get(Creator, uuid.UUID(creator_uuid))
             if not creator:
                 logger.warning(f"No creator found for page_id: {page_id}")
                 _creator_by_page_id_cache[page_id] = (None, current_time)
@@ -163,6 +163,59 @@ def get_creator_by_ig_user_id(ig_user_id: str) -> Optional[Dict[str, Any]]:
         return None
 
 
+def _drop_creator_lookups(creator_name: Optional[str]) -> None:
+    """CREATOR_LOOKUP handler: drop a creator's cached routes plus negative entries.
+
+    Negative entries go too — a page_id that matched nobody may belong to the
+    creator that just changed.
+    """
+    if creator_name is None:
+        _creator_by_page_id_cache.clear()
+        return
+    for key, (info, _cached_time) in list(_creator_by_page_id_cache.items()):
+        if info is None or info.get("creator_id") == creator_name:
+            _creator_by_page_id_cache.pop(key, None)
+
+
+def _collect_creator_changes(session, _flush_context) -> None:
+    from api.models import Creator
+
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, Creator) and obj.name:
+            session.info.setdefault("_invalidate_creators", set()).add(obj.name)
+
+
+def _publish_creator_changes(session) -> None:
+    # After commit, so other workers never reload the pre-commit row
+    for name in session.info.pop("_invalidate_creators", None) or ():
+        publish_invalidation(InvalidationTopic.CREATOR_LOOKUP, name)
+
+
+def _discard_creator_changes(session) -> None:
+    session.info.pop("_invalidate_creators", None)
+
+
+def _install_creator_invalidation() -> None:
+    """Invalidate the page_id lookup cache in every worker whenever a Creator row is committed.
+
+    Hooked at the ORM level because bot_active / copilot_mode / tokens / page IDs
+    are written from many routers (oauth, admin, copilot, onboarding).
+    """
+    get_invalidation_bus().subscribe(InvalidationTopic.CREATOR_LOOKUP, _drop_creator_lookups)
+    try:
+        from sqlalchemy import event
+        from sqlalchemy.orm import Session
+
+        event.listen(Session, "after_flush", _collect_creator_changes)
+        event.listen(Session, "after_commit", _publish_creator_changes)
+        event.listen(Session, "after_rollback", _discard_creator_changes)
+    except Exception as e:
+        logger.warning(f"[CREATOR-CACHE] ORM invalidation hooks not installed: {e}")
+
+
+_install_creator_invalidation()
+
+
 def get_handler_for_creator(creator_info: Dict[str, Any]):
     """
     Get or create Instagram handler for a specific creator.
@@ -271,6 +324,14 @@ async def instagram_webhook_receive(request: Request):
             logger.warning(f"Invalid webhook payload: missing 'object' and 'entry' fields")
             raise HTTPException(status_code=400, detail="Invalid webhook payload")
 
+        # Durable queue: same consumer as /webhook/instagram (core.webhook_queue)
+        from core.webhook_queue import WEBHOOK_QUEUE_ENABLED
+
+        if WEBHOOK_QUEUE_ENABLED:
+            from api.routers.messaging_webhooks.instagram_webhook import enqueue_instagram_webhook
+
+            return await enqueue_instagram_webhook(payload, signature, await request.body())
+
         # Log payload structure for debugging
         logger.info(f"Webhook object: {payload.get('object')}")
 
@@ -285,7 +346,7 @@ async def instagram_webhook_receive(request: Request):
         logger.info(f"Routing webhook for page_id: {page_id}")
 
         # Lookup creator by page_id
-        creator_info = get_creator_by_page_id(page_id)
+        creator_info = await asyncio.to_thread(get_creator_by_page_id, page_id)
 
         if not creator_info:
             # Try alternative lookup by recipient in messaging
@@ -293,7 +354,7 @@ async def instagram_webhook_receive(request: Request):
                 for messaging in entry.get("messaging", []):
                     ig_user_id = messaging.get("recipient", {}).get("id")
                     if ig_user_id:
-                        creator_info = get_creator_by_ig_user_id(ig_user_id)
+                        creator_info = await asyncio.to_thread(get_creator_by_ig_user_id, ig_user_id)
                         if creator_info:
                             break
                 if creator_info:
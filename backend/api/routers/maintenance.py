@@ -535,20 +535,21 @@ async def restore_dismissed_lead(creator_name: str, platform_user_id: str):
 
 
 @router.post("/recalculate-scores/{creator_name}")
-async def recalculate_lead_scores(creator_name: str):
+async def recalculate_lead_scores(creator_name: str, rebuild: bool = Query(False)):
     """
     Recalculate lead scores for all leads of a creator using V3 algorithm.
 
-    V3 pipeline: extract_signals -> classify_lead -> calculate_score.
+    V3 pipeline: signal state -> classify_lead -> calculate_score.
     Returns distribution by status (6 categories).
 
     Uses paged batches (50 leads/batch) with short-lived sessions to avoid
     blocking the event loop or monopolizing the DB connection pool.
+    rebuild=true rescans every lead's messages instead of reading lead_signal_state.
     """
     import asyncio
     from services.lead_scoring import batch_recalculate_scores_paged
 
-    result = await asyncio.to_thread(batch_recalculate_scores_paged, creator_name)
+    result = await asyncio.to_thread(batch_recalculate_scores_paged, creator_name, rebuild=rebuild)
 
     if "error" in result:
         raise HTTPException(status_code=404, detail=result["error"])
@@ -556,6 +557,43 @@ async def recalculate_lead_scores(creator_name: str):
     return result
 
 
+@router.get("/signal-state-check/{creator_name}")
+async def check_lead_signal_states(
+    creator_name: str,
+    limit: int = Query(200, ge=1, le=5000),
+    repair: bool = Query(False),
+):
+    """
+    Compare stored lead_signal_state rows against a from-scratch message scan.
+
+    Reports missing and mismatched leads (per-field stored vs fresh values);
+    repair=true overwrites them with the fresh scan.
+    """
+    import asyncio
+    from services.lead_scoring import check_signal_state
+
+    def _check():
+        session = SessionLocal()
+        try:
+            creator = session.query(Creator).filter_by(name=creator_name).first()
+            if not creator:
+                return None
+            lead_ids = [
+                r.id for r in session.query(Lead.id).filter_by(creator_id=creator.id).order_by(Lead.id).limit(limit)
+            ]
+            report = check_signal_state(session, lead_ids, repair=repair)
+            if repair:
+                session.commit()
+            return report
+        finally:
+            session.close()
+
+    report = await asyncio.to_thread(_check)
+    if report is None:
+        raise HTTPException(status_code=404, detail="Creator not found")
+    return report
+
+
 @router.post("/batch-embed-conversations/{creator_name}")
 async def batch_embed_conversations(creator_name: str, batch_size: int = Query(50, ge=1, le=200)):
     """
@@ -0,0 +1,33 @@
+"""Media endpoint - serves blobs from the content-addressed media store (services/media_store.py)"""
+import asyncio
+import logging
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/media", tags=["media"])
+
+# Content-addressed: the bytes behind a hash never change
+_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+@router.get("/{sha256}")
+async def get_media(sha256: str, request: Request):
+    """Serve a stored blob by its sha256 with long-lived cache headers."""
+    from services.media_store import get_media_store, is_media_hash
+
+    sha256 = sha256.lower()
+    if not is_media_hash(sha256):
+        raise HTTPException(status_code=404, detail="Media not found")
+
+    etag = f'"{sha256}"'
+    headers = {"Cache-Control": _CACHE_CONTROL, "ETag": etag}
+    if request.headers.get("if-none-match") in (etag, sha256):
+        return Response(status_code=304, headers=headers)
+
+    blob = await asyncio.to_thread(get_media_store().get, sha256)
+    if blob is None:
+        raise HTTPException(status_code=404, detail="Media not found")
+    content, content_type = blob
+    return Response(content=content, media_type=content_type, headers=headers)
@@ -47,6 +47,10 @@ _EVO_CONTENT_DEDUP_TTL = 60  # seconds
 # Populated on connection.update state=open via Evolution API.
 _INSTANCE_OWN_PHONE: Dict[str, str] = {}  # instance → bare phone digits (e.g. "34692419787")
 
+# Events routed through core.webhook_queue when WEBHOOK_QUEUE_ENABLED
+# (connection/QR updates are cheap and stay inline)
+_EVO_QUEUED_EVENTS = ("messages.upsert", "messages.update", "messages.delete", "messages.edited")
+
 
 def _normalize_wa_phone(number: str) -> str:
     """Normalize a WhatsApp phone/JID to bare digits.
@@ -66,16 +70,25 @@ def _normalize_wa_phone(number: str) -> str:
     return n
 
 
+def _purge_expired(seen: Dict[str, float], now: float, ttl: float) -> None:
+    """Drop expired entries from the front of an insertion-ordered dedup dict.
+
+    Entries are only ever added with the current time, so insertion order is
+    expiry order and the scan stops at the first live entry.
+    """
+    while seen:
+        oldest = next(iter(seen))
+        if now - seen[oldest] <= ttl:
+            break
+        del seen[oldest]
+
+
 def _evo_is_duplicate(message_id: str) -> bool:
     """Return True if this message_id was already processed (dedup)."""
     import time
 
     now = time.time()
-
-    # Purge expired entries every call (dict is small, O(n) is fine)
-    expired = [k for k, t in _evo_processed_messages.items() if now - t > _EVO_DEDUP_TTL]
-    for k in expired:
-        del _evo_processed_messages[k]
+    _purge_expired(_evo_processed_messages, now, _EVO_DEDUP_TTL)
 
     if message_id in _evo_processed_messages:
         return True
@@ -90,17 +103,12 @@ def _evo_is_content_duplicate(sender: str, text: str) -> bool:
     Baileys sometimes delivers 1 WhatsApp message as 2-3 webhook events
     with DIFFERENT message_ids. This catches those by hashing sender+text.
     """
-    import hashlib
     import time
 
     now = time.time()
+    _purge_expired(_evo_content_dedup, now, _EVO_CONTENT_DEDUP_TTL)
 
-    # Purge expired
-    expired = [k for k, t in _evo_content_dedup.items() if now - t > _EVO_CONTENT_DEDUP_TTL]
-    for k in expired:
-        del _evo_content_dedup[k]
-
-    key = hashlib.md5(f"{sender}:{text}".encode()).hexdigest()
+    key = _evo_content_key(sender, text)
     if key in _evo_content_dedup:
         return True
 
@@ -108,6 +116,19 @@ def _evo_is_content_duplicate(sender: str, text: str) -> bool:
     return False
 
 
+def _evo_content_key(sender: str, text: str) -> str:
+    import hashlib
+
+    return hashlib.md5(f"{sender}:{text}".encode()).hexdigest()
+
+
+def _evo_forget_message(message_id: str, sender: str = "", text: str = "") -> None:
+    """Drop a message's dedup marks so a retried queue event is processed again."""
+    _evo_processed_messages.pop(message_id, None)
+    if sender and text:
+        _evo_content_dedup.pop(_evo_content_key(sender, text), None)
+
+
 async def _refresh_own_phone(instance: str, creator_id: str) -> None:
     """Fetch and cache the instance's own WhatsApp phone number.
 
@@ -170,12 +191,99 @@ async def evolution_webhook(request: Request):
     - qrcode.updated: New QR code generated
 
     All other events are acknowledged but ignored.
+
+    With WEBHOOK_QUEUE_ENABLED, message events (upserts and deletes) are
+    only queued here; core.webhook_queue runs process_evolution_event for
+    them, in order per chat.
     """
+    from core.webhook_queue import WEBHOOK_QUEUE_ENABLED
+
     try:
         payload = await request.json()
     except Exception:
         return {"status": "ok", "ignored": "invalid_json"}
 
+    if WEBHOOK_QUEUE_ENABLED and _is_message_event(payload.get("event", "")):
+        return await enqueue_evolution_event(payload)
+
+    return await process_evolution_event(payload)
+
+
+def _is_message_event(event: str) -> bool:
+    return event.lower().replace("_", ".") in _EVO_QUEUED_EVENTS
+
+
+def evolution_queue_keys(payload: dict) -> tuple:
+    """(idempotency_key, conversation_key) for an Evolution message event.
+
+    Upserts are keyed by WhatsApp message id, so the duplicate upsert Baileys
+    sends for every message is dropped at enqueue time. Events are ordered
+    per chat (instance + remoteJid).
+    """
+    import hashlib
+    import json
+
+    event = payload.get("event", "").lower().replace("_", ".")
+    instance = payload.get("instance", "")
+    data = payload.get("data") or {}
+    first = (data[0] if data else {}) if isinstance(data, list) else data
+    key = first.get("key") or {}
+    remote_jid = key.get("remoteJid") or first.get("remoteJid") or "unknown"
+    message_id = key.get("id", "")
+    if event == "messages.upsert" and message_id:
+        idempotency_key = f"{instance}:upsert:{message_id}"
+    else:
+        body = json.dumps(payload, sort_keys=True, default=str).encode()
+        idempotency_key = f"{instance}:{event}:{hashlib.sha256(body).hexdigest()}"
+    return idempotency_key, f"evo:{instance}:{remote_jid}"
+
+
+async def enqueue_evolution_event(payload: dict) -> dict:
+    """Persist an Evolution message event to the durable queue."""
+    from core.webhook_queue import get_webhook_queue
+
+    idempotency_key, conversation_key = evolution_queue_keys(payload)
+    queued = await get_webhook_queue().enqueue("evolution", idempotency_key, conversation_key, payload)
+    return {
+        "status": "ok",
+        "event": payload.get("event", ""),
+        "processing": "queued" if queued else "duplicate",
+    }
+
+
+async def process_queued_evolution_event(event) -> None:
+    """core.webhook_queue handler: process one queued Evolution event in order."""
+    from core.webhook_queue import handling_event
+
+    with handling_event(event):
+        await process_evolution_event(event.payload, background=False, retry=event.attempts > 1)
+
+
+async def process_queued_evolution_events(events) -> None:
+    """core.webhook_queue batch handler: one chat's queued events as one DM turn."""
+    from core.dm_coalescer import QueuedBurst
+
+    await QueuedBurst().run(process_queued_evolution_event(event) for event in events)
+
+
+async def _run_or_spawn(coro, background: bool) -> None:
+    if background:
+        asyncio.create_task(coro)
+    else:
+        await coro
+
+
+async def process_evolution_event(payload: dict, background: bool = True, retry: bool = False) -> dict:
+    """
+    Handle one Evolution API event.
+
+    background=True (the inline route) hands message processing to asyncio
+    tasks so the webhook returns fast; the queue consumer passes False and
+    awaits it, which keeps a chat's messages in order, and gets failures
+    raised so the event is retried. A retry (retry=True) skips the in-memory
+    dedup its earlier attempt, or its burst's, already marked, but not a
+    message that attempt finished (core.webhook_queue per-message marks).
+    """
     event = payload.get("event", "")
     instance = payload.get("instance", "")
 
@@ -261,7 +369,10 @@ async def evolution_webhook(request: Request):
                     f"type={update_type} stub={stub_type} status={update_status} "
                     f"fromMe={key.get('fromMe')}"
                 )
-                asyncio.create_task(_handle_message_deleted(instance, msg_id, key))
+                await _run_or_spawn(
+                    _handle_message_deleted(instance, msg_id, key, reraise=not background),
+                    background,
+                )
                 handled += 1
             else:
                 logger.debug(
@@ -353,8 +464,14 @@ async def evolution_webhook(request: Request):
     message_id = key.get("id", "")
 
     # Dedup: Baileys sends messages.upsert twice per message
-    if not message_id or _evo_is_duplicate(message_id):
+    if not message_id or (_evo_is_duplicate(message_id) and not retry):
         return {"status": "ok", "ignored": "duplicate"}
+    if retry:
+        from core.webhook_queue import queued_message_done
+
+        if queued_message_done(message_id):
+            logger.info(f"[EVO:{instance}] {message_id} already answered by an earlier attempt")
+            return {"status": "ok", "ignored": "already_processed"}
 
     # Resolve creator from instance
     creator_id = EVOLUTION_INSTANCE_MAP.get(instance)
@@ -394,17 +511,23 @@ async def evolution_webhook(request: Request):
                     if duration:
                         outgoing_meta["duration"] = duration
 
-        asyncio.create_task(
-            _save_evolution_outgoing_message(
-                instance=instance,
-                creator_id=creator_id,
-                follower_id=follower_id,
-                text=text,
-                message_id=message_id,
-                push_name=push_name,
-                msg_metadata=outgoing_meta,
+        try:
+            await _run_or_spawn(
+                _save_evolution_outgoing_message(
+                    instance=instance,
+                    creator_id=creator_id,
+                    follower_id=follower_id,
+                    text=text,
+                    message_id=message_id,
+                    push_name=push_name,
+                    msg_metadata=outgoing_meta,
+                    reraise=not background,
+                ),
+                background,
             )
-        )
+        except Exception:
+            _evo_forget_message(message_id)
+            raise
         return {
             "status": "ok",
             "event": event,
@@ -414,7 +537,7 @@ async def evolution_webhook(request: Request):
         }
 
     # Content-based dedup: Baileys sends 1 message as 2-3 events with different IDs
-    if not from_me and _evo_is_content_duplicate(sender_number, text):
+    if not from_me and _evo_is_content_duplicate(sender_number, text) and not retry:
         logger.info(
             f"[EVO:{instance}] Content dedup: same text from {sender_number} within 60s, skipping"
         )
@@ -489,6 +612,12 @@ async def evolution_webhook(request: Request):
                 ).first()
                 if not _el:
                     return False
+                # A retried queue event finds its message already saved
+                if _es.query(_EMsg.id).filter(
+                    _EMsg.lead_id == _el.id,
+                    _EMsg.platform_message_id == message_id,
+                ).first():
+                    return True
                 _um = _EMsg(
                     lead_id=_el.id, role="user", content=text,
                     status="sent", platform_message_id=message_id,
@@ -531,17 +660,24 @@ async def evolution_webhook(request: Request):
     await _do_early_save()
 
     # Process with DM agent in background so webhook returns 200 fast
-    asyncio.create_task(
-        _process_evolution_message_safe(
-            instance=instance,
-            creator_id=creator_id,
-            sender_number=sender_number,
-            push_name=push_name,
-            text=text,
-            message_id=message_id,
-            msg_metadata=msg_metadata,
+    # (awaited when called from the queue consumer, which groups bursts)
+    try:
+        await _run_or_spawn(
+            _process_evolution_message_safe(
+                instance=instance,
+                creator_id=creator_id,
+                sender_number=sender_number,
+                push_name=push_name,
+                text=text,
+                message_id=message_id,
+                msg_metadata=msg_metadata,
+                reraise=not background,
+            ),
+            background,
         )
-    )
+    except Exception:
+        _evo_forget_message(message_id, sender_number, text)
+        raise
 
     return {
         "status": "ok",
@@ -727,7 +863,7 @@ async def _download_evolution_media(instance: str, data: dict, media_type: str)
         return result
 
 
-async def _handle_message_deleted(instance: str, message_id: str, key: dict):
+async def _handle_message_deleted(instance: str, message_id: str, key: dict, reraise: bool = False):
     """Handle WhatsApp 'Delete for everyone' — soft-delete message in DB.
 
     - Marks the message with deleted_at timestamp
@@ -828,6 +964,8 @@ async def _handle_message_deleted(instance: str, message_id: str, key: dict):
     except Exception as e:
         logger.error(f"[EVO:{instance}] Delete handler error: {e}")
         session.rollback()
+        if reraise:
+            raise
     finally:
         session.close()
 
@@ -840,6 +978,7 @@ async def _save_evolution_outgoing_message(
     message_id: str,
     push_name: str,
     msg_metadata: dict = None,
+    reraise: bool = False,
 ):
     """
     Save a creator's outgoing WhatsApp message (fromMe=true) to the DB.
@@ -1005,6 +1144,8 @@ async def _save_evolution_outgoing_message(
         logger.error(f"[EVO:{instance}] Error saving outgoing message: {e}")
         import traceback
         logger.error(traceback.format_exc())
+        if reraise:
+            raise
 
 
 async def _process_evolution_message_safe(
@@ -1015,19 +1156,23 @@ async def _process_evolution_message_safe(
     text: str,
     message_id: str,
     msg_metadata: dict = None,
+    reraise: bool = False,
 ):
     """
     Process an incoming Evolution API message in COPILOT mode.
 
     User message is already saved to DB by the webhook handler (early save).
     This background task generates a suggested response via the DM agent.
+    With reraise (queue consumer) failures propagate so the event is retried.
     """
     import time as _time
     _t0 = _time.monotonic()
 
     try:
         from core.copilot_service import get_copilot_service
-        from core.dm_agent_v2 import get_dm_agent
+        from core.dm_agent_v2 import aget_dm_agent
+        from core.dm_coalescer import coalescing_enabled, get_dm_coalescer
+        from core.webhook_queue import mark_queued_message_done
 
         follower_id = f"wa_{sender_number}"
 
@@ -1044,7 +1189,7 @@ async def _process_evolution_message_safe(
 
         # Generate suggestion via DM agent
         _t1 = _time.monotonic()
-        agent = get_dm_agent(creator_id)
+        agent = await aget_dm_agent(creator_id)
         _t_agent = int((_time.monotonic() - _t1) * 1000)
         dm_metadata = {
             "message_id": message_id,
@@ -1055,12 +1200,34 @@ async def _process_evolution_message_safe(
         # Pass audio intelligence to DM agent for enriched context
         if msg_metadata and msg_metadata.get("audio_intel"):
             dm_metadata["audio_intel"] = msg_metadata["audio_intel"]
+        # Bursts of text messages from one contact get one suggestion for the
+        # whole turn (core.dm_coalescer); earlier messages were early-saved.
+        coalesce = coalescing_enabled("whatsapp") and not msg_metadata
+
+        async def _generate(batch):
+            return await agent.process_dm(
+                message="\n".join(m["text"] for m in batch),
+                sender_id=follower_id,
+                metadata={**dm_metadata, "message_id": batch[-1]["message_id"]},
+            )
+
         _t2 = _time.monotonic()
-        response = await agent.process_dm(
-            message=text,
-            sender_id=follower_id,
-            metadata=dm_metadata,
+        turn = await get_dm_coalescer().submit(
+            "whatsapp",
+            f"{creator_id}:{follower_id}",
+            {"text": text, "message_id": message_id},
+            _generate,
+            window_s=None if coalesce else 0,
         )
+        if turn.absorbed:
+            logger.info(
+                f"[EVO:{instance}] {message_id} answered with a later message "
+                f"({turn.batch_size} coalesced)"
+            )
+            mark_queued_message_done(message_id)
+            return
+        response = turn.result
+        text = "\n".join(m["text"] for m in turn.items)
         _t_dm = int((_time.monotonic() - _t2) * 1000)
 
         # Extract text from response — response.content may be a string or a dict
@@ -1099,6 +1266,7 @@ async def _process_evolution_message_safe(
             full_name=push_name or "",
             msg_metadata=msg_metadata if msg_metadata else None,
         )
+        mark_queued_message_done(message_id)
         _t_copilot = int((_time.monotonic() - _t3) * 1000)
         _t_total = int((_time.monotonic() - _t0) * 1000)
         logger.info(
@@ -1145,3 +1313,5 @@ async def _process_evolution_message_safe(
         )
         import traceback
         logger.error(traceback.format_exc())
+        if reraise:
+            raise
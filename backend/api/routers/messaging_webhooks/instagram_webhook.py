@@ -4,6 +4,7 @@ Extracted from messaging_webhooks.py following TDD methodology.
 """
 
 import asyncio
+import json
 import logging
 
 from fastapi import APIRouter, HTTPException, Request
@@ -47,14 +48,10 @@ async def instagram_webhook_receive(request: Request):
     - Feed: New post/reel detected → background task for real-time ingestion (SPEC-004B)
 
     Multi-creator routing with robust ID matching.
+    With WEBHOOK_QUEUE_ENABLED the event is only validated and queued here;
+    core.webhook_queue runs process_instagram_webhook for it.
     """
-    from api.routers.instagram import get_handler_for_creator
-    from core.webhook_routing import (
-        extract_all_instagram_ids,
-        find_creator_for_webhook,
-        save_unmatched_webhook,
-        update_creator_webhook_stats,
-    )
+    from core.webhook_queue import WEBHOOK_QUEUE_ENABLED
 
     logger.warning("=" * 60)
     logger.warning("========== INSTAGRAM WEBHOOK HIT V9 (MESSAGING + FEED) ==========")
@@ -74,115 +71,222 @@ async def instagram_webhook_receive(request: Request):
                 status_code=400,
             )
 
-        # 1. Extract ALL possible Instagram IDs from payload
-        instagram_ids = extract_all_instagram_ids(payload)
-
-        if not instagram_ids:
-            logger.warning("Could not extract any Instagram IDs from webhook payload")
-            return {"status": "ok", "warning": "no_ids_found", "messages_processed": 0}
+        if WEBHOOK_QUEUE_ENABLED:
+            return await enqueue_instagram_webhook(payload, signature, raw_body)
 
-        logger.info(f"Extracted Instagram IDs: {instagram_ids}")
+        return await process_instagram_webhook(payload, signature, raw_body)
 
-        # 2. Find creator using any of the extracted IDs
-        creator_info, matched_id = find_creator_for_webhook(instagram_ids)
+    except Exception as e:
+        logger.error(f"Error processing Instagram webhook: {e}")
+        import traceback
 
-        # 3. If no creator found, save for debugging and return
-        if not creator_info:
-            logger.warning(f"No creator found for Instagram IDs: {instagram_ids}")
-            unmatched_id = save_unmatched_webhook(instagram_ids, payload)
-            return {
-                "status": "ok",
-                "warning": "unknown_creator",
-                "instagram_ids": instagram_ids,
-                "unmatched_webhook_id": unmatched_id,
-                "messages_processed": 0,
-            }
+        logger.error(traceback.format_exc())
+        # Return 200 to acknowledge receipt (prevents infinite retries from Meta)
+        return {"status": "error", "error": str(e)}
 
-        creator_id = creator_info["creator_id"]
-        logger.info(f"Found creator: {creator_id} (matched by ID: {matched_id})")
 
-        # 4. Update webhook stats for this creator
-        update_creator_webhook_stats(creator_id)
+def instagram_queue_keys(payload: dict, raw_body: bytes) -> tuple:
+    """(idempotency_key, conversation_key) for a Meta webhook.
 
-        # 5. Check for feed events (new posts/reels) — SPEC-004B
-        #    Process in background so webhook returns 200 instantly
-        feed_events_found = 0
-        for entry in payload.get("entry", []):
-            has_feed = any(
-                c.get("field") == "feed"
-                for c in entry.get("changes", [])
-            )
-            if has_feed:
-                feed_events_found += 1
-                asyncio.create_task(
-                    _process_feed_event_safe(creator_info, entry)
-                )
-
-        if feed_events_found > 0:
-            logger.info(
-                f"[FEED-WEBHOOK] Dispatched {feed_events_found} feed event(s) "
-                f"for {creator_id} to background processing"
+    Meta redelivers the exact same body, so the body hash is the idempotency
+    key. Both directions of a DM (user → page, page echo → user) share one
+    conversation key; feed-only payloads are ordered per account.
+    """
+    import hashlib
+
+    body = raw_body or json.dumps(payload, sort_keys=True).encode()
+    idempotency_key = hashlib.sha256(body).hexdigest()
+    for entry in payload.get("entry", []):
+        for messaging in entry.get("messaging", []):
+            ids = sorted(
+                i for i in (
+                    (messaging.get("sender") or {}).get("id"),
+                    (messaging.get("recipient") or {}).get("id"),
+                ) if i
             )
+            if ids:
+                return idempotency_key, "ig:" + ":".join(str(i) for i in ids)
+    entry_id = next((e.get("id") for e in payload.get("entry", []) if e.get("id")), "unknown")
+    return idempotency_key, f"ig:{entry_id}"
+
+
+async def enqueue_instagram_webhook(payload: dict, signature: str, raw_body: bytes) -> dict:
+    """Persist a validated Meta webhook to the durable queue."""
+    from core.webhook_queue import get_webhook_queue
+
+    idempotency_key, conversation_key = instagram_queue_keys(payload, raw_body)
+    queued = await get_webhook_queue().enqueue(
+        "instagram",
+        idempotency_key,
+        conversation_key,
+        payload,
+        {"signature": signature, "raw_body": raw_body.decode("utf-8", "replace") if raw_body else ""},
+    )
+    return {"status": "ok", "processing": "queued" if queued else "duplicate"}
+
+
+async def process_queued_instagram_event(event) -> None:
+    """core.webhook_queue handler: route and process one queued Meta webhook in order."""
+    from core.webhook_queue import handling_event
+
+    meta = event.meta or {}
+    raw_body = meta.get("raw_body", "").encode("utf-8") or None
+    with handling_event(event):
+        await process_instagram_webhook(
+            event.payload, meta.get("signature", ""), raw_body, background=False
+        )
+
+
+async def process_queued_instagram_events(events) -> None:
+    """core.webhook_queue batch handler: one conversation's queued webhooks as one DM turn."""
+    from core.dm_coalescer import QueuedBurst
+
+    await QueuedBurst().run(process_queued_instagram_event(event) for event in events)
+
+
+async def process_instagram_webhook(
+    payload: dict, signature: str, raw_body: bytes, background: bool = True
+) -> dict:
+    """
+    Route a validated Meta webhook to its creator and process it.
+
+    background=True (the inline route) hands DM and feed processing to
+    asyncio tasks so Meta gets its 200 fast; the queue consumer passes
+    False and awaits them, which keeps a conversation's events in order,
+    and gets their failures raised so the event is retried.
+    Creator lookups run in a thread (sync SQLAlchemy).
+    """
+    from api.routers.instagram import get_handler_for_creator
+    from core.webhook_routing import (
+        extract_all_instagram_ids,
+        find_creator_for_webhook,
+        save_unmatched_webhook,
+        update_creator_webhook_stats,
+    )
 
-        # 6. Check if bot is active (for DM processing)
-        has_messaging = any(
-            "messaging" in entry
-            for entry in payload.get("entry", [])
+    # 1. Extract ALL possible Instagram IDs from payload
+    instagram_ids = extract_all_instagram_ids(payload)
+
+    if not instagram_ids:
+        logger.warning("Could not extract any Instagram IDs from webhook payload")
+        return {"status": "ok", "warning": "no_ids_found", "messages_processed": 0}
+
+    logger.info(f"Extracted Instagram IDs: {instagram_ids}")
+
+    # 2. Find creator using any of the extracted IDs
+    creator_info, matched_id = await asyncio.to_thread(find_creator_for_webhook, instagram_ids)
+
+    # 3. If no creator found, save for debugging and return
+    if not creator_info:
+        logger.warning(f"No creator found for Instagram IDs: {instagram_ids}")
+        unmatched_id = await asyncio.to_thread(save_unmatched_webhook, instagram_ids, payload)
+        return {
+            "status": "ok",
+            "warning": "unknown_creator",
+            "instagram_ids": instagram_ids,
+            "unmatched_webhook_id": unmatched_id,
+            "messages_processed": 0,
+        }
+
+    creator_id = creator_info["creator_id"]
+    logger.info(f"Found creator: {creator_id} (matched by ID: {matched_id})")
+
+    # 4. Update webhook stats for this creator
+    await asyncio.to_thread(update_creator_webhook_stats, creator_id)
+
+    # 5. Check for feed events (new posts/reels) — SPEC-004B
+    #    Process in background so webhook returns 200 instantly
+    feed_events_found = 0
+    for entry in payload.get("entry", []):
+        has_feed = any(
+            c.get("field") == "feed"
+            for c in entry.get("changes", [])
         )
+        if has_feed:
+            feed_events_found += 1
+            await _run_or_spawn(
+                _process_feed_event_safe(creator_info, entry, reraise=not background), background
+            )
 
-        if not has_messaging:
-            # Pure feed event — no DM to process
-            return {
-                "status": "ok",
-                "creator_id": creator_id,
-                "matched_id": matched_id,
-                "messages_processed": 0,
-                "feed_events_dispatched": feed_events_found,
-            }
-
-        if not creator_info.get("bot_active", False):
-            logger.info(f"Bot not active for creator {creator_id}, skipping DM processing")
-            return {
-                "status": "ok",
-                "info": "bot_paused",
-                "creator_id": creator_id,
-                "matched_id": matched_id,
-                "messages_processed": 0,
-                "feed_events_dispatched": feed_events_found,
-            }
-
-        # 7. Get handler for this creator and process DMs in background
-        # Return 200 immediately so Meta doesn't timeout (Meta SLA = 20s,
-        # LLM processing can take 25-35s due to Gemini→OpenAI fallback chain).
-        handler = get_handler_for_creator(creator_info)
-        asyncio.create_task(
-            _process_dm_webhook_safe(handler, payload, signature, raw_body, creator_id)
+    if feed_events_found > 0:
+        logger.info(
+            f"[FEED-WEBHOOK] Dispatched {feed_events_found} feed event(s) "
+            f"for {creator_id} to background processing"
         )
 
-        logger.info(f"[DM-ASYNC] Webhook queued for background processing: creator={creator_id}")
+    # 6. Check if bot is active (for DM processing)
+    has_messaging = any(
+        "messaging" in entry
+        for entry in payload.get("entry", [])
+    )
+
+    if not has_messaging:
+        # Pure feed event — no DM to process
         return {
             "status": "ok",
-            "processing": "async",
             "creator_id": creator_id,
             "matched_id": matched_id,
+            "messages_processed": 0,
             "feed_events_dispatched": feed_events_found,
         }
 
-    except Exception as e:
-        logger.error(f"Error processing Instagram webhook: {e}")
-        import traceback
+    if not creator_info.get("bot_active", False):
+        logger.info(f"Bot not active for creator {creator_id}, skipping DM processing")
+        return {
+            "status": "ok",
+            "info": "bot_paused",
+            "creator_id": creator_id,
+            "matched_id": matched_id,
+            "messages_processed": 0,
+            "feed_events_dispatched": feed_events_found,
+        }
+
+    # 7. Get handler for this creator and process DMs in background
+    # Return 200 immediately so Meta doesn't timeout (Meta SLA = 20s,
+    # LLM processing can take 25-35s due to Gemini→OpenAI fallback chain).
+    # The queue consumer awaits it; bursts are grouped by the consumer.
+    handler = get_handler_for_creator(creator_info)
+    await _run_or_spawn(
+        _process_dm_webhook_safe(
+            handler, payload, signature, raw_body, creator_id, reraise=not background
+        ),
+        background,
+    )
+
+    if background:
+        logger.info(f"[DM-ASYNC] Webhook queued for background processing: creator={creator_id}")
+    return {
+        "status": "ok",
+        "processing": "async" if background else "done",
+        "creator_id": creator_id,
+        "matched_id": matched_id,
+        "feed_events_dispatched": feed_events_found,
+    }
 
-        logger.error(traceback.format_exc())
-        # Return 200 to acknowledge receipt (prevents infinite retries from Meta)
-        return {"status": "error", "error": str(e)}
+
+async def _run_or_spawn(coro, background: bool) -> None:
+    if background:
+        asyncio.create_task(coro)
+    else:
+        await coro
 
 
 async def _process_dm_webhook_safe(
-    handler, payload: dict, signature: str, raw_body: bytes, creator_id: str
+    handler, payload: dict, signature: str, raw_body: bytes, creator_id: str,
+    reraise: bool = False,
 ):
-    """Process DM webhook in background so Meta gets HTTP 200 immediately."""
+    """Process DM webhook in background so Meta gets HTTP 200 immediately.
+
+    reraise=True (queue consumer) raises on any failure, including messages
+    the handler reported as failed, so core.webhook_queue retries the event.
+    """
     try:
         result = await handler.handle_webhook(payload, signature, raw_body=raw_body)
+        failed = [r for r in result.get("results", []) if r.get("status") == "failed"]
+        if failed and reraise:
+            raise RuntimeError(
+                f"{len(failed)} message(s) failed: {failed[0].get('error', 'unknown error')}"
+            )
         processed = result.get("messages_processed", 0)
         if processed:
             logger.info(f"[DM-ASYNC] {creator_id}: {processed} message(s) processed")
@@ -190,9 +294,11 @@ async def _process_dm_webhook_safe(
             logger.info(f"[DM-ASYNC] {creator_id}: no messages (feed/echo/dedup)")
     except Exception as e:
         logger.error(f"[DM-ASYNC] Background DM processing failed for {creator_id}: {e}")
+        if reraise:
+            raise
 
 
-async def _process_feed_event_safe(creator_info: dict, entry: dict):
+async def _process_feed_event_safe(creator_info: dict, entry: dict, reraise: bool = False):
     """Wrapper to safely run feed webhook processing in background."""
     try:
         from services.feed_webhook_handler import process_feed_webhook
@@ -203,6 +309,8 @@ async def _process_feed_event_safe(creator_info: dict, entry: dict):
             "[FEED-WEBHOOK] Background processing failed for "
             f"{creator_info.get('creator_id', '?')}: {e}"
         )
+        if reraise:
+            raise
 
 
 
@@ -199,7 +199,7 @@ async def telegram_webhook(request: Request):
         if header_token != secret_token:
             raise HTTPException(status_code=403, detail="Invalid secret token")
 
-    from core.dm_agent_v2 import get_dm_agent
+    from core.dm_agent_v2 import aget_dm_agent
     from core.telegram_registry import get_telegram_registry
 
     try:
@@ -261,7 +261,7 @@ async def telegram_webhook(request: Request):
 
             _t_webhook_start = time.time()
 
-            agent = get_dm_agent(creator_id)
+            agent = await aget_dm_agent(creator_id)
             _t_agent_ready = time.time()
             logger.info(f"Agent ready in {_t_agent_ready - _t_webhook_start:.3f}s")
 
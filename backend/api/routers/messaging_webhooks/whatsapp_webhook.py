@@ -44,7 +44,7 @@ async def whatsapp_webhook_receive(request: Request):
     Processes incoming messages with DMResponderAgent and sends automatic responses.
     Supports copilot mode (suggested responses) and autopilot mode (auto-send).
     """
-    from core.dm_agent_v2 import get_dm_agent
+    from core.dm_agent_v2 import aget_dm_agent
     from core.whatsapp import WhatsAppConnector
 
     logger.warning("========== WHATSAPP WEBHOOK HIT ==========")
@@ -113,7 +113,7 @@ async def whatsapp_webhook_receive(request: Request):
             logger.info(f"[WA:{message.sender_id}] ({display_name}) Input: {message.text[:100]}")
 
             try:
-                agent = get_dm_agent(creator_id)
+                agent = await aget_dm_agent(creator_id)
                 response = await agent.process_dm(
                     message=message.text,
                     sender_id=sender_id,
@@ -320,7 +320,7 @@ async def whatsapp_test_message(request: Request):
 
     Body: { "creator_id": "stefano_bonanno", "phone": "+34612345678", "text": "Hola" }
     """
-    from core.dm_agent_v2 import get_dm_agent
+    from core.dm_agent_v2 import aget_dm_agent
 
     try:
         body = await request.json()
@@ -331,7 +331,7 @@ async def whatsapp_test_message(request: Request):
         # Strip + and spaces for consistent sender_id
         phone_clean = phone.replace("+", "").replace(" ", "")
 
-        agent = get_dm_agent(creator_id)
+        agent = await aget_dm_agent(creator_id)
 
         response = await agent.process_dm(
             message=text,
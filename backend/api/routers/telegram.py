@@ -378,10 +378,10 @@ async def telegram_test_message(request: TestMessageRequest):
     but the response is returned in the API response instead of being
     sent to Telegram.
     """
-    from core.dm_agent_v2 import get_dm_agent
+    from core.dm_agent_v2 import aget_dm_agent
 
     try:
-        agent = get_dm_agent(request.creator_id)
+        agent = await aget_dm_agent(request.creator_id)
 
         response = await agent.process_dm(
             message=request.text,
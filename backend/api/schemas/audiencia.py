@@ -3,8 +3,9 @@ Audiencia API Schemas
 
 SPRINT4-T4.1: Schemas for aggregated audience data endpoints
 """
+from datetime import datetime
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
 
 
 class TopicAggregation(BaseModel):
@@ -75,30 +76,35 @@ class TopicsResponse(BaseModel):
     """Response for topics endpoint"""
     total_conversations: int
     topics: List[TopicAggregation]
+    computed_at: Optional[datetime] = None  # When the underlying rollup was built
 
 
 class ObjectionsResponse(BaseModel):
     """Response for objections endpoint"""
     total_with_objections: int
     objections: List[ObjectionAggregation]
+    computed_at: Optional[datetime] = None  # When the underlying rollup was built
 
 
 class CompetitionResponse(BaseModel):
     """Response for competition endpoint"""
     total_mentions: int
     competitors: List[CompetitionMention]
+    computed_at: Optional[datetime] = None  # When the underlying rollup was built
 
 
 class TrendsResponse(BaseModel):
     """Response for trends endpoint"""
     period: str = "week"
     trends: List[TrendItem]
+    computed_at: Optional[datetime] = None  # When the underlying rollup was built
 
 
 class ContentRequestsResponse(BaseModel):
     """Response for content requests endpoint"""
     total_requests: int
     requests: List[ContentRequest]
+    computed_at: Optional[datetime] = None  # When the underlying rollup was built
 
 
 class ProductRequestsResponse(BaseModel):
@@ -111,3 +117,4 @@ class PerceptionResponse(BaseModel):
     """Response for perception endpoint"""
     total_analyzed: int
     perceptions: List[PerceptionItem]
+    computed_at: Optional[datetime] = None  # When the underlying rollup was built
@@ -36,6 +36,14 @@ def register_startup_handlers(app: "FastAPI"):
         logger.info("Clonnect Creators API starting...")
         logger.info(f"LLM Provider: {os.getenv('LLM_PROVIDER', 'openai')}")
 
+        # Pooled LLM provider HTTP clients (keep-alive / TLS reuse across DMs)
+        from core.providers.http_clients import open_http_clients
+        open_http_clients()
+
+        # Cross-worker cache invalidation (INVALIDATION_BUS_BACKEND=postgres for LISTEN/NOTIFY)
+        from core.invalidation_bus import get_invalidation_bus
+        get_invalidation_bus().start()
+
         # Log database configuration
         db_url = os.getenv("DATABASE_URL")
         json_fallback = os.getenv("ENABLE_JSON_FALLBACK", "false").lower() == "true"
@@ -108,6 +116,8 @@ def register_startup_handlers(app: "FastAPI"):
 
         # =====================================================================
         # Register recurring tasks with centralized TaskScheduler
+        # Jobs are cluster-scoped (one node per run, via core.job_leases)
+        # unless registered with scope="process".
         # =====================================================================
         from core.task_scheduler import scheduler
 
@@ -819,7 +829,7 @@ def register_startup_handlers(app: "FastAPI"):
             _t_end = time.time()
             logger.debug(f"[KEEP-ALIVE] Ping OK in {_t_end - _t_start:.3f}s")
 
-        scheduler.register("keep_alive", _keep_alive_job, interval_seconds=60, initial_delay_seconds=3)
+        scheduler.register("keep_alive", _keep_alive_job, interval_seconds=60, initial_delay_seconds=3, scope="process")
 
         # =====================================================================
         # Job 15: Evolution API health check (WhatsApp 401 monitoring)
@@ -1051,7 +1061,9 @@ def register_startup_handlers(app: "FastAPI"):
                     logger.error("[WATCHDOG] 3 consecutive failures — forcing process exit for Railway restart")
                     os._exit(1)
 
-        scheduler.register("self_health_watchdog", _self_health_watchdog, interval_seconds=60, initial_delay_seconds=120)
+        # Worker processes (SCHEDULER_ROLE=worker) serve no HTTP, so there is nothing to probe
+        if scheduler.role != "worker":
+            scheduler.register("self_health_watchdog", _self_health_watchdog, interval_seconds=60, initial_delay_seconds=120, scope="process")
 
         # =====================================================================
         # MEMORY CLEANUP JOB: force-evict expired TTL caches + run GC
@@ -1148,7 +1160,7 @@ def register_startup_handlers(app: "FastAPI"):
                 freed, collected, rss_mb, len(all_tasks),
             )
 
-        scheduler.register("memory_cleanup", _memory_cleanup_job, interval_seconds=300, initial_delay_seconds=120)
+        scheduler.register("memory_cleanup", _memory_cleanup_job, interval_seconds=300, initial_delay_seconds=120, scope="process")
 
         # JOB N: Nightly extract_deep — populates objection/interest/relationship_state
         # Blocked by A2.6 gating: disabled by default until 7 consecutive days validated.
@@ -1168,6 +1180,46 @@ def register_startup_handlers(app: "FastAPI"):
 
         scheduler.register("nightly_extract_deep", _nightly_extract_deep_job, interval_seconds=86400, initial_delay_seconds=720)
 
+        # Durable inbound webhook queue (WEBHOOK_QUEUE_ENABLED=true, core/webhook_queue.py)
+        from core.webhook_queue import (
+            WEBHOOK_QUEUE_CONSUMER,
+            WEBHOOK_QUEUE_ENABLED,
+            WEBHOOK_QUEUE_RETENTION_H,
+            get_webhook_queue,
+        )
+
+        if WEBHOOK_QUEUE_ENABLED:
+            webhook_queue = get_webhook_queue()
+            if WEBHOOK_QUEUE_CONSUMER:
+                import functools
+
+                from api.routers.messaging_webhooks.evolution_webhook import process_queued_evolution_events
+                from api.routers.messaging_webhooks.instagram_webhook import process_queued_instagram_events
+                from core.dm_coalescer import DM_COALESCE_MAX_BATCH, DM_COALESCE_MAX_WAIT_S, coalesce_window_s
+
+                # A conversation's DM burst is claimed and answered together (core.dm_coalescer)
+                for source, platform, batch_handler in (
+                    ("instagram", "instagram", process_queued_instagram_events),
+                    ("evolution", "whatsapp", process_queued_evolution_events),
+                ):
+                    webhook_queue.register_batch_handler(
+                        source,
+                        batch_handler,
+                        window_s=functools.partial(coalesce_window_s, platform),
+                        max_wait_s=DM_COALESCE_MAX_WAIT_S,
+                        max_size=DM_COALESCE_MAX_BATCH,
+                    )
+                webhook_queue.start()
+
+            async def _webhook_queue_purge_job():
+                purged = await asyncio.to_thread(
+                    webhook_queue.backend.purge, WEBHOOK_QUEUE_RETENTION_H * 3600
+                )
+                if purged:
+                    logger.info(f"[WEBHOOK-QUEUE] purged {purged} finished event(s)")
+
+            scheduler.register("webhook_queue_purge", _webhook_queue_purge_job, interval_seconds=3600, initial_delay_seconds=600)
+
         # Start all registered scheduled tasks
         await scheduler.start_all()
 
@@ -1175,7 +1227,14 @@ def register_startup_handlers(app: "FastAPI"):
 
     @app.on_event("shutdown")
     async def shutdown_event():
+        from core.webhook_queue import WEBHOOK_QUEUE_ENABLED, get_webhook_queue
+        if WEBHOOK_QUEUE_ENABLED:
+            await get_webhook_queue().stop()
         from services.memory_extraction import drain_extraction
         await drain_extraction()
         from core.task_scheduler import scheduler
         await scheduler.shutdown()
+        from core.providers.http_clients import close_http_clients
+        await close_http_clients()
+        from core.invalidation_bus import get_invalidation_bus
+        get_invalidation_bus().stop()
@@ -1,5 +1,6 @@
 """Shared creator resolution logic — replaces 20+ duplicated lookup patterns."""
 import logging
+import uuid
 from typing import Optional
 
 from fastapi import HTTPException
@@ -9,6 +10,26 @@ from sqlalchemy.orm import Session
 logger = logging.getLogger(__name__)
 
 
+def _get_by_identity_map(session: Session, creator_id: str):
+    """Creator by primary key, with the slug translated by core.identity_map.
+
+    session.get() is served from the session's own identity map when the row
+    is already loaded. Returns None when the map can't tell (unknown slug,
+    DB error); callers then run the name / id::text queries.
+    """
+    from api.models import Creator
+
+    try:
+        from core.identity_map import identity_map
+
+        creator_uuid = identity_map.resolve_creator_uuid(creator_id)
+        if creator_uuid:
+            return session.get(Creator, uuid.UUID(creator_uuid))
+    except Exception as e:
+        logger.debug("Identity map lookup failed for creator %s: %s", creator_id, e)
+    return None
+
+
 def resolve_creator(session: Session, creator_id: str):
     """
     Resolve a creator by name (slug) or UUID string.
@@ -25,8 +46,11 @@ def resolve_creator(session: Session, creator_id: str):
     """
     from api.models import Creator
 
+    creator = _get_by_identity_map(session, creator_id)
+
     # Try by name first (most common path)
-    creator = session.query(Creator).filter_by(name=creator_id).first()
+    if not creator:
+        creator = session.query(Creator).filter_by(name=creator_id).first()
 
     # Fallback: try by UUID
     if not creator:
@@ -53,7 +77,9 @@ def resolve_creator_safe(session: Session, creator_id: str):
     """
     from api.models import Creator
 
-    creator = session.query(Creator).filter_by(name=creator_id).first()
+    creator = _get_by_identity_map(session, creator_id)
+    if not creator:
+        creator = session.query(Creator).filter_by(name=creator_id).first()
     if not creator:
         try:
             creator = (
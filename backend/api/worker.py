@@ -0,0 +1,51 @@
+"""
+Scheduler worker: runs the TaskScheduler jobs without serving HTTP traffic.
+
+Runs the app's startup handlers, which register and start the scheduled
+jobs, then idles until SIGTERM/SIGINT and runs the shutdown handlers.
+Use it with a shared lease backend so web processes can drop their
+cluster jobs:
+
+    web:    SCHEDULER_ROLE=web    SCHEDULER_LEASE_BACKEND=postgres uvicorn api.main:app ...
+    worker: SCHEDULER_LEASE_BACKEND=postgres python -m api.worker   (sets SCHEDULER_ROLE=worker)
+
+Several workers can run at once; the leases give each job run to one of them.
+"""
+
+import asyncio
+import logging
+import os
+import signal
+
+logger = logging.getLogger(__name__)
+
+
+async def run_worker() -> None:
+    from api.main import app
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:  # Windows
+            pass
+
+    await app.router.startup()
+    logger.info("[WORKER] scheduler worker running (no HTTP)")
+    try:
+        await stop.wait()
+    finally:
+        logger.info("[WORKER] shutting down")
+        await app.router.shutdown()
+
+
+def main() -> None:
+    # Must be set before core.task_scheduler is imported
+    os.environ["SCHEDULER_ROLE"] = "worker"
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run_worker())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,570 @@
+"""
+Audience rollups — single-pass aggregation behind the "Tu Audiencia" tabs.
+
+Every tab is a sum over a creator's follower memories, so the work is split
+in two levels:
+
+  follower facts  audience_follower_facts, one row per follower_memories row:
+                  that follower's contribution to all eight tabs, computed in
+                  one pass over its interests, objections and last_messages.
+  creator rollup  audience_rollups, one row per creator: all facts merged and
+                  trimmed to the top ROLLUP_MAX_ITEMS entries per tab.
+
+An ORM after_flush hook drops the facts of every follower memory that changes
+and bumps the creator's rollup generation. Reads serve the stored rollup while
+it is current (built from the latest generation, same version, younger than
+AUDIENCE_ROLLUP_TTL_S — trends are relative to computed_at). Otherwise
+refresh_audience_rollup() computes facts only for followers that have none
+and re-merges. Before migration 054 the same single pass runs over
+follower_memories on each request. Neither path is capped at 500 followers.
+
+Config:
+  AUDIENCE_ROLLUP_TTL_S — max age of a served rollup in seconds (default 3600)
+"""
+
+import json
+import logging
+import os
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from core.derived_tables import TableProbe, rules_version
+
+logger = logging.getLogger(__name__)
+
+AUDIENCE_ROLLUP_TTL_S = int(os.getenv("AUDIENCE_ROLLUP_TTL_S", "3600"))
+ROLLUP_MAX_ITEMS = 200
+FACTS_BATCH = 500
+
+# Purchase-related objection keywords
+PURCHASE_OBJECTION_KEYWORDS = [
+    "precio", "caro", "dinero", "pagar", "cuesta", "coste",
+    "ahora no", "después", "más adelante", "pensarlo",
+    "duda", "no sé si", "funciona", "garantía", "gratis",
+]
+
+COMPETITION_POSITIVE_WORDS = ["mejor", "genial", "bueno", "recomiendo"]
+COMPETITION_NEGATIVE_WORDS = ["malo", "peor", "no me gustó", "caro"]
+
+PERCEPTION_POSITIVE_WORDS = ["genial", "increíble", "excelente", "gracias", "ayudó", "útil", "bueno", "mejor"]
+PERCEPTION_NEGATIVE_WORDS = ["malo", "caro", "no responde", "tardó", "decepcionado", "no funciona"]
+PERCEPTION_ASPECTS = ("expertise", "precio", "atencion", "contenido")
+
+_MENTION_PATTERN = re.compile(r'@([a-zA-Z0-9_]+)')
+_QUESTION_PATTERN = re.compile(r'[¿?]')
+
+# Kept per item; the tabs never return more than this
+_LIST_CAPS = {
+    "users": 10, "quotes": 5, "context": 5, "questions": 5,
+    "quotes_positive": 5, "quotes_negative": 5, "trend_quotes": 3,
+}
+
+SECTIONS = (
+    "topics", "passions", "frustrations", "competition",
+    "content_requests", "purchase_objections", "perception",
+)
+
+_FOLLOWER_COLUMNS = (
+    "id", "username", "last_contact", "total_messages", "interests",
+    "products_discussed", "objections_raised", "is_customer", "last_messages",
+)
+
+# Stored rollups and facts built by different rules are recomputed on read
+ROLLUP_VERSION = rules_version(
+    1, ROLLUP_MAX_ITEMS, _LIST_CAPS, PURCHASE_OBJECTION_KEYWORDS,
+    COMPETITION_POSITIVE_WORDS, COMPETITION_NEGATIVE_WORDS,
+    PERCEPTION_POSITIVE_WORDS, PERCEPTION_NEGATIVE_WORDS,
+)
+
+
+def facts_version(creator_names: Iterable[str]) -> int:
+    """Facts depend on the creator's names too (perception tab)."""
+    return rules_version(ROLLUP_VERSION, sorted(set(creator_names)))
+
+
+# =============================================================================
+# Follower facts
+# =============================================================================
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, (str, bytes)):
+        try:
+            return json.loads(value)
+        except ValueError:
+            return None
+    return value
+
+
+def _strings(value: Any) -> List[str]:
+    value = _json_value(value)
+    if not isinstance(value, list):
+        return []
+    return [v for v in value if isinstance(v, str)]
+
+
+def _user_messages(last_messages: Any) -> List[str]:
+    last_messages = _json_value(last_messages)
+    if not isinstance(last_messages, list):
+        return []
+    return [
+        m.get("content") or ""
+        for m in last_messages
+        if isinstance(m, dict) and m.get("role") == "user"
+    ]
+
+
+def _item(section: Dict[str, Any], key: str, **fields) -> Dict[str, Any]:
+    items = section["items"]
+    if key not in items:
+        items[key] = {"count": 0, **fields}
+    return items[key]
+
+
+def _append(item: Dict[str, Any], field: str, value: str) -> None:
+    if len(item[field]) < _LIST_CAPS[field]:
+        item[field].append(value)
+
+
+def _empty_sections() -> Dict[str, Dict[str, Any]]:
+    return {name: {"total": 0, "items": {}} for name in SECTIONS}
+
+
+def follower_facts(row, creator_id: str, creator_names: List[str]) -> Dict[str, Any]:
+    """One follower's contribution to every tab, from a single read of its row.
+
+    Args:
+        row: Mapping with the follower_memories columns in _FOLLOWER_COLUMNS
+        creator_id: Creator the follower belongs to (@mentions of it are not competition)
+        creator_names: Lowercased names that count as talking about the creator
+
+    Returns:
+        {section: {"total", "items"}} for SECTIONS, plus "trends": {"terms", "quotes"}
+    """
+    facts = _empty_sections()
+    username = row["username"]
+    raw_interests = _json_value(row["interests"])
+    interests = _strings(raw_interests)
+    raw_objections = _json_value(row["objections_raised"])
+    objections = [o.lower() for o in _strings(raw_objections)]
+    messages = _json_value(row["last_messages"])
+    messages = messages if isinstance(messages, list) else []
+    user_messages = _user_messages(messages)
+    recent = _user_messages(messages[-3:])
+    is_customer = row["is_customer"]
+
+    # Tab 1: interests (first matching quote among the last 3 messages)
+    if raw_interests is not None:
+        section = facts["topics"]
+        section["total"] = 1
+        for interest in interests:
+            item = _item(section, interest, users=[], quotes=[])
+            item["count"] += 1
+            if username and username not in item["users"]:
+                _append(item, "users", username)
+            quote = next((c for c in recent if interest.lower() in c.lower()), None)
+            if quote is not None:
+                _append(item, "quotes", quote[:150])
+
+    # Tab 2: interests inside long messages of engaged followers
+    if (row["total_messages"] or 0) >= 5:
+        section = facts["passions"]
+        section["total"] = 1
+        for content in user_messages:
+            if len(content) <= 100:
+                continue
+            for interest in interests:
+                if interest.lower() in content.lower():
+                    item = _item(section, interest, users=[], quotes=[])
+                    item["count"] += 1
+                    if username and username not in item["users"]:
+                        _append(item, "users", username)
+                    _append(item, "quotes", content[:200])
+
+    # Tabs 3 and 7: objections (purchase tab only for non-customers)
+    if raw_objections is not None:
+        facts["frustrations"]["total"] = 1 if objections else 0
+        for objection in objections:
+            quote = next((c for c in user_messages if objection in c.lower()), None)
+            item = _item(facts["frustrations"], objection, quotes=[], resolved=0, pending=0)
+            item["count"] += 1
+            item["resolved" if is_customer else "pending"] += 1
+            if quote is not None:
+                _append(item, "quotes", quote[:150])
+
+            if is_customer is False and any(k in objection for k in PURCHASE_OBJECTION_KEYWORDS):
+                facts["purchase_objections"]["total"] += 1
+                item = _item(facts["purchase_objections"], objection, quotes=[])
+                item["count"] += 1
+                if quote is not None:
+                    _append(item, "quotes", quote[:150])
+
+    creator_lower = creator_id.lower()
+    perception = facts["perception"]
+    for aspect in PERCEPTION_ASPECTS:
+        _item(perception, aspect, positive=0, negative=0, quotes_positive=[], quotes_negative=[])
+
+    for content in user_messages:
+        content_lower = content.lower()
+
+        # Tab 4: @mentions other than the creator
+        for mention in _MENTION_PATTERN.findall(content):
+            mention_lower = mention.lower()
+            if mention_lower == creator_lower:
+                continue
+            item = _item(facts["competition"], mention_lower, context=[], score=0)
+            item["count"] += 1
+            _append(item, "context", content[:150])
+            if any(word in content_lower for word in COMPETITION_POSITIVE_WORDS):
+                item["score"] += 1
+            elif any(word in content_lower for word in COMPETITION_NEGATIVE_WORDS):
+                item["score"] -= 1
+
+        # Tab 6: questions, grouped by the first interest they mention
+        if _QUESTION_PATTERN.search(content):
+            topic = next((i for i in interests if i.lower() in content_lower), None)
+            if topic is None and len(content) > 20:
+                topic = "General"
+            if topic is not None:
+                item = _item(facts["content_requests"], topic, questions=[])
+                item["count"] += 1
+                _append(item, "questions", content[:200])
+
+        # Tab 8: sentiment per aspect in messages that name the creator
+        if not any(name in content_lower for name in creator_names):
+            continue
+        perception["total"] += 1
+        is_positive = any(word in content_lower for word in PERCEPTION_POSITIVE_WORDS)
+        is_negative = any(word in content_lower for word in PERCEPTION_NEGATIVE_WORDS)
+        matched = {
+            "expertise": any(w in content_lower for w in ("experto", "sabe", "profesional")),
+            "precio": any(w in content_lower for w in ("precio", "caro", "barato")),
+            "atencion": any(w in content_lower for w in ("responde", "atención", "rápido")),
+            "contenido": any(w in content_lower for w in ("contenido", "video", "curso")),
+        }
+        for aspect, hit in matched.items():
+            if not hit:
+                continue
+            positive, negative = is_positive, is_negative
+            if aspect == "precio":
+                positive = is_positive or "barato" in content_lower
+                negative = is_negative or "caro" in content_lower
+            item = perception["items"][aspect]
+            if positive:
+                item["positive"] += 1
+                _append(item, "quotes_positive", content[:150])
+            elif negative:
+                item["negative"] += 1
+                _append(item, "quotes_negative", content[:150])
+
+    # Tab 5: term counts; bucketed by week only when merged
+    terms: Dict[str, int] = {}
+    for term in _strings(row["products_discussed"]) + interests:
+        terms[term] = terms.get(term, 0) + 1
+    term_quotes: Dict[str, List[str]] = {}
+    for content in recent:
+        for term in terms:
+            if term.lower() in content.lower() and len(term_quotes.get(term, [])) < _LIST_CAPS["trend_quotes"]:
+                term_quotes.setdefault(term, []).append(content[:100])
+    facts["trends"] = {"terms": terms, "quotes": term_quotes}
+    return facts
+
+
+# =============================================================================
+# Merge
+# =============================================================================
+
+class AudienceRollup:
+    """Merges follower facts into the per-tab payload served to the dashboard."""
+
+    def __init__(self, now: Optional[datetime] = None):
+        self.computed_at = now or datetime.now(timezone.utc)
+        self._week_ago = (self.computed_at - timedelta(days=7)).isoformat()
+        self._two_weeks_ago = (self.computed_at - timedelta(days=14)).isoformat()
+        self.followers = 0
+        self.sections = _empty_sections()
+        self.trends: Dict[str, Dict[str, Any]] = {}
+
+    def add(self, facts: Dict[str, Any], last_contact: Optional[str]) -> None:
+        self.followers += 1
+        for name in SECTIONS:
+            source, target = facts[name], self.sections[name]
+            target["total"] += source["total"]
+            for key, item in source["items"].items():
+                merged = target["items"].get(key)
+                if merged is None:
+                    target["items"][key] = {f: (list(v) if isinstance(v, list) else v) for f, v in item.items()}
+                    continue
+                for field, value in item.items():
+                    if not isinstance(value, list):
+                        merged[field] += value
+                    elif field == "users":
+                        for user in value:
+                            if user not in merged[field]:
+                                _append(merged, field, user)
+                    else:
+                        merged[field].extend(value[: max(0, _LIST_CAPS[field] - len(merged[field]))])
+
+        # Same string comparison on ISO timestamps the per-tab queries used
+        last_contact = last_contact or ""
+        if last_contact >= self._week_ago:
+            bucket = "this_week"
+        elif last_contact >= self._two_weeks_ago:
+            bucket = "last_week"
+        else:
+            return
+        trends = facts["trends"]
+        for term, count in trends["terms"].items():
+            entry = self.trends.setdefault(term, {"this_week": 0, "last_week": 0, "quotes": []})
+            entry[bucket] += count
+            if bucket == "this_week":
+                room = _LIST_CAPS["trend_quotes"] - len(entry["quotes"])
+                entry["quotes"].extend(trends["quotes"].get(term, [])[: max(0, room)])
+
+    def payload(self) -> Dict[str, Any]:
+        """JSON-ready rollup, top ROLLUP_MAX_ITEMS items per tab."""
+        payload: Dict[str, Any] = {
+            "computed_at": self.computed_at.isoformat(),
+            "followers": self.followers,
+        }
+        for name, section in self.sections.items():
+            top = sorted(section["items"].items(), key=lambda kv: (-kv[1]["count"], kv[0]))[:ROLLUP_MAX_ITEMS]
+            payload[name] = {"total": section["total"], "items": dict(top)}
+        growing = sorted(
+            ((t, e) for t, e in self.trends.items() if e["this_week"] > 0),
+            key=lambda kv: (-kv[1]["this_week"], kv[0]),
+        )[:ROLLUP_MAX_ITEMS]
+        payload["trends"] = {"items": dict(growing)}
+        return payload
+
+
+# =============================================================================
+# Persistence (audience_follower_facts, audience_rollups)
+# =============================================================================
+
+_FOLLOWER_SELECT = "SELECT " + ", ".join(f"fm.{c}" for c in _FOLLOWER_COLUMNS) + " FROM follower_memories fm"
+
+_UPSERT_FACTS_SQL = (
+    "INSERT INTO audience_follower_facts (follower_memory_id, creator_id, version, last_contact, facts, updated_at) "
+    "VALUES (:id, :creator_id, :version, :last_contact, CAST(:facts AS JSONB), NOW()) "
+    "ON CONFLICT (follower_memory_id) DO UPDATE SET creator_id = EXCLUDED.creator_id, "
+    "version = EXCLUDED.version, last_contact = EXCLUDED.last_contact, facts = EXCLUDED.facts, updated_at = NOW()"
+)
+
+# generation is only ever bumped by the hook; a rollup is current while
+# built_generation (read before its facts) still equals it
+_UPSERT_ROLLUP_SQL = (
+    "INSERT INTO audience_rollups (creator_id, version, generation, built_generation, followers, payload, computed_at) "
+    "VALUES (:creator_id, :version, :generation, :generation, :followers, CAST(:payload AS JSONB), :computed_at) "
+    "ON CONFLICT (creator_id) DO UPDATE SET version = EXCLUDED.version, "
+    "built_generation = EXCLUDED.built_generation, followers = EXCLUDED.followers, "
+    "payload = EXCLUDED.payload, computed_at = EXCLUDED.computed_at"
+)
+
+_TOUCH_ROLLUP_SQL = (
+    "INSERT INTO audience_rollups (creator_id, generation) VALUES (:creator_id, 1) "
+    "ON CONFLICT (creator_id) DO UPDATE SET generation = audience_rollups.generation + 1"
+)
+
+_DROP_FACTS_SQL = "DELETE FROM audience_follower_facts WHERE follower_memory_id = :id"
+
+
+# Whether migration 054 ran
+rollup_tables_present = TableProbe("audience_rollups")
+
+
+def creator_names(db, creator_id: str) -> List[str]:
+    """Lowercased names a follower may use for the creator."""
+    from api.models import Creator
+
+    names = [creator_id.lower()]
+    creator = db.query(Creator).filter(Creator.name == creator_id).first()
+    if creator:
+        names.extend(n.lower() for n in (creator.clone_name, creator.name) if n)
+    return names
+
+
+def _stream(db, sql: str, params: Dict[str, Any]):
+    from sqlalchemy import text
+
+    return db.execute(text(sql).execution_options(yield_per=FACTS_BATCH), params).mappings()
+
+
+def compute_audience_rollup(db, creator_id: str) -> Dict[str, Any]:
+    """Single pass over follower_memories without storing anything."""
+    names = creator_names(db, creator_id)
+    rollup = AudienceRollup()
+    rows = _stream(
+        db,
+        _FOLLOWER_SELECT + " WHERE fm.creator_id = :creator_id ORDER BY fm.last_contact DESC",
+        {"creator_id": creator_id},
+    )
+    for row in rows:
+        rollup.add(follower_facts(row, creator_id, names), row["last_contact"])
+    return rollup.payload()
+
+
+def load_audience_rollup(db, creator_id: str) -> Optional[Dict[str, Any]]:
+    """The stored payload if it is still current, else None."""
+    from sqlalchemy import text
+
+    row = db.execute(
+        text(
+            "SELECT version, generation, built_generation, payload, computed_at "
+            "FROM audience_rollups WHERE creator_id = :creator_id"
+        ),
+        {"creator_id": creator_id},
+    ).mappings().first()
+    if row is None or row["payload"] is None:
+        return None
+    if row["version"] != ROLLUP_VERSION or row["generation"] != row["built_generation"]:
+        return None
+    if row["computed_at"] < datetime.now(timezone.utc) - timedelta(seconds=AUDIENCE_ROLLUP_TTL_S):
+        return None
+    return _json_value(row["payload"])
+
+
+def refresh_audience_rollup(db, creator_id: str) -> Dict[str, Any]:
+    """Fill in missing follower facts, re-merge and store the rollup.
+
+    Only followers without current facts (new, changed since the last
+    refresh, or built under another version) are read from follower_memories.
+    Commits its own writes; the audiencia endpoints hold no other changes.
+    """
+    from sqlalchemy import text
+
+    names = creator_names(db, creator_id)
+    version = facts_version(names)
+    generation = db.execute(
+        text("SELECT generation FROM audience_rollups WHERE creator_id = :creator_id"),
+        {"creator_id": creator_id},
+    ).scalar() or 0
+
+    stale = _stream(
+        db,
+        _FOLLOWER_SELECT
+        + " LEFT JOIN audience_follower_facts f ON f.follower_memory_id = fm.id AND f.version = :version"
+        " WHERE fm.creator_id = :creator_id AND f.follower_memory_id IS NULL",
+        {"creator_id": creator_id, "version": version},
+    )
+    built = 0
+    for batch in stale.partitions(FACTS_BATCH):
+        db.execute(text(_UPSERT_FACTS_SQL), [
+            {
+                "id": row["id"],
+                "creator_id": creator_id,
+                "version": version,
+                "last_contact": row["last_contact"],
+                "facts": json.dumps(follower_facts(row, creator_id, names), ensure_ascii=False),
+            }
+            for row in batch
+        ])
+        built += len(batch)
+
+    rollup = AudienceRollup()
+    facts_rows = _stream(
+        db,
+        "SELECT facts, last_contact FROM audience_follower_facts "
+        "WHERE creator_id = :creator_id AND version = :version ORDER BY last_contact DESC",
+        {"creator_id": creator_id, "version": version},
+    )
+    for row in facts_rows:
+        rollup.add(_json_value(row["facts"]), row["last_contact"])
+    payload = rollup.payload()
+
+    try:
+        db.execute(text(_UPSERT_ROLLUP_SQL), {
+            "creator_id": creator_id,
+            "version": ROLLUP_VERSION,
+            "generation": generation,
+            "followers": rollup.followers,
+            "payload": json.dumps(payload, ensure_ascii=False),
+            "computed_at": rollup.computed_at,
+        })
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"[AUDIENCE] Could not store rollup for {creator_id}: {e}")
+    logger.info(
+        f"[AUDIENCE] Rollup refreshed for {creator_id}: {rollup.followers} followers, {built} facts rebuilt"
+    )
+    return payload
+
+
+def get_audience_rollup(db, creator_id: str) -> Dict[str, Any]:
+    """Current rollup for a creator: stored, refreshed, or (before 054) computed live."""
+    if not rollup_tables_present(db.connection()):
+        return compute_audience_rollup(db, creator_id)
+    payload = load_audience_rollup(db, creator_id)
+    if payload is not None:
+        return payload
+    return refresh_audience_rollup(db, creator_id)
+
+
+# --- ORM hooks: invalidate as follower memories change ------------------------
+
+_FACT_FIELDS = (
+    "creator_id", "username", "last_contact", "total_messages", "interests",
+    "products_discussed", "objections_raised", "is_customer", "last_messages",
+)
+
+
+def _invalidate_audience_rollups(session, _flush_context) -> None:
+    from sqlalchemy import inspect
+    from sqlalchemy import text
+
+    from api.models import FollowerMemoryDB
+
+    stale_ids: set = set()
+    creators: set = set()
+    for obj in session.new:
+        if isinstance(obj, FollowerMemoryDB):
+            creators.add(inspect(obj).dict.get("creator_id"))
+    for obj in session.deleted:
+        # Facts go with the row (ON DELETE CASCADE)
+        if isinstance(obj, FollowerMemoryDB):
+            creators.add(inspect(obj).dict.get("creator_id"))
+    for obj in session.dirty:
+        if not isinstance(obj, FollowerMemoryDB):
+            continue
+        state = inspect(obj)
+        if not any(state.attrs[name].history.has_changes() for name in _FACT_FIELDS):
+            continue
+        stale_ids.add(state.dict.get("id"))
+        creators.add(state.dict.get("creator_id"))
+        creators.update(state.attrs["creator_id"].history.deleted)
+    stale_ids.discard(None)
+    creators.discard(None)
+
+    if not creators:
+        return
+    connection = session.connection()
+    if not rollup_tables_present(connection):
+        return
+    if stale_ids:
+        connection.execute(text(_DROP_FACTS_SQL), [{"id": i} for i in stale_ids])
+    # Sorted so concurrent flushes lock rollup rows in the same order
+    connection.execute(text(_TOUCH_ROLLUP_SQL), [{"creator_id": c} for c in sorted(creators)])
+
+
+_hooks_installed = False
+
+
+def install_audience_rollup_hooks(target=None) -> None:
+    """Invalidate audience rollups on every flush that changes FollowerMemoryDB rows.
+
+    Raw-SQL writes to follower_memories bypass it; those creators catch up
+    when their rollup ages past AUDIENCE_ROLLUP_TTL_S, and their changed
+    followers when facts are rebuilt (DELETE FROM audience_follower_facts).
+    """
+    global _hooks_installed
+    if _hooks_installed:
+        return
+    try:
+        from sqlalchemy import event
+        from sqlalchemy.orm import Session
+
+        event.listen(target if target is not None else Session, "after_flush", _invalidate_audience_rollups)
+        _hooks_installed = True
+    except Exception as e:
+        logger.warning(f"[AUDIENCE] Rollup hooks not installed: {e}")
@@ -8,9 +8,12 @@ Beneficios:
 - Reduce costes de LLM significativamente
 - Ideal para preguntas frecuentes (FAQ)
 """
-from typing import Any, Dict, Optional
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+import asyncio
 import hashlib
 import json
+import threading
 import time
 import logging
 
@@ -190,75 +193,203 @@ def get_search_cache() -> QueryCache:
     return _search_cache
 
 
+class _Flight:
+    """One in-progress load shared by every concurrent caller of get_or_load."""
+
+    __slots__ = ("event", "value", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+def _retrieve_exception(task: "asyncio.Task") -> None:
+    """Mark an async load's error retrieved when every caller was cancelled."""
+    if not task.cancelled():
+        task.exception()
+
+
 class BoundedTTLCache:
     """
-    Simple bounded dict with TTL and LRU eviction.
+    Thread-safe bounded LRU cache with TTL (sliding: reads refresh the entry).
 
     Drop-in replacement for unbounded `_cache: dict = {}` patterns.
-    When max_size is reached, evicts the oldest 20% of entries.
+    Backed by an OrderedDict kept in access order, so get/set/evict are O(1):
+    the least recently used entry is always at the front.
+
+    - ``get_or_load`` / ``aget_or_load``: single-flight loading — concurrent
+      misses on the same key run the loader once and share the result.
+    - ``name``: when set, hits/misses/evictions are exported via emit_metric
+      (cache_hit_total / cache_miss_total / cache_eviction_total, cache_name=name).
+      Counters are always kept per instance and returned by stats().
+
+    None is the miss sentinel, so loaders returning None are not cached.
     """
 
-    def __init__(self, max_size: int = 100, ttl_seconds: float = 300):
+    def __init__(self, max_size: int = 100, ttl_seconds: float = 300, name: Optional[str] = None):
         self.max_size = max_size
         self.ttl_seconds = ttl_seconds
-        self._data: Dict[str, Any] = {}
-        self._timestamps: Dict[str, float] = {}
+        self.name = name
+        self._data: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._flights: Dict[str, _Flight] = {}
+        self._async_flights: Dict[Tuple[int, str], "asyncio.Task"] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
 
-    def get(self, key: str) -> Optional[Any]:
-        if key not in self._data:
+    def _emit(self, metric: str, value: int = 1) -> None:
+        if self.name is None:
+            return
+        try:
+            from core.observability.metrics import emit_metric
+            emit_metric(metric, value, cache_name=self.name)
+        except Exception:
+            pass
+
+    def _lookup(self, key: str) -> Optional[Any]:
+        """Live value for key (refreshing recency), or None. Caller holds the lock."""
+        entry = self._data.get(key)
+        if entry is None:
             return None
-        age = time.time() - self._timestamps.get(key, 0)
-        if age > self.ttl_seconds:
-            self._data.pop(key, None)
-            self._timestamps.pop(key, None)
+        now = time.monotonic()
+        if now - entry[1] > self.ttl_seconds:
+            del self._data[key]
             return None
-        self._timestamps[key] = time.time()  # refresh access time
-        return self._data[key]
+        self._data[key] = (entry[0], now)  # refresh access time
+        self._data.move_to_end(key)
+        return entry[0]
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            value = self._lookup(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        self._emit("cache_miss_total" if value is None else "cache_hit_total")
+        return value
 
     def set(self, key: str, value: Any):
-        if len(self._data) >= self.max_size and key not in self._data:
-            self._evict()
-        self._data[key] = value
-        self._timestamps[key] = time.time()
+        evicted = 0
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+            else:
+                while len(self._data) >= self.max_size and self._data:
+                    self._data.popitem(last=False)
+                    evicted += 1
+            self._data[key] = (value, time.monotonic())
+            self.evictions += evicted
+        if evicted:
+            self._emit("cache_eviction_total", evicted)
 
     def pop(self, key: str, default: Any = None) -> Any:
-        self._timestamps.pop(key, None)
-        return self._data.pop(key, default)
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return default if entry is None else entry[0]
+
+    def pop_prefix(self, prefix: str) -> int:
+        """Drop every key starting with ``prefix``; returns how many were dropped."""
+        with self._lock:
+            keys = [k for k in self._data if k.startswith(prefix)]
+            for key in keys:
+                del self._data[key]
+        return len(keys)
 
     def clear(self):
-        self._data.clear()
-        self._timestamps.clear()
-
-    def _evict(self):
-        """Remove oldest 20% of entries."""
-        if not self._timestamps:
-            return
-        n_evict = max(1, len(self._timestamps) // 5)
-        oldest = sorted(self._timestamps, key=self._timestamps.get)[:n_evict]
-        for k in oldest:
-            self._data.pop(k, None)
-            self._timestamps.pop(k, None)
+        with self._lock:
+            self._data.clear()
+
+    def get_or_load(self, key: str, loader: Callable[[], Any]) -> Optional[Any]:
+        """Return the cached value, or run ``loader()`` once for all concurrent callers."""
+        value = self.get(key)
+        if value is not None:
+            return value
+        with self._lock:
+            value = self._lookup(key)  # filled while we were emitting the miss
+            if value is not None:
+                return value
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+        try:
+            flight.value = loader()
+            if flight.value is not None:
+                self.set(key, flight.value)
+            return flight.value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.event.set()
+
+    async def aget_or_load(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Optional[Any]:
+        """Async single-flight: concurrent awaiters of one key share one ``await loader()``."""
+        value = self.get(key)
+        if value is not None:
+            return value
+        loop = asyncio.get_running_loop()
+        flight_key = (id(loop), key)
+        with self._lock:
+            value = self._lookup(key)
+            if value is not None:
+                return value
+            task = self._async_flights.get(flight_key)
+            if task is None:
+                task = loop.create_task(self._aload(flight_key, key, loader))
+                task.add_done_callback(_retrieve_exception)
+                self._async_flights[flight_key] = task
+        # The load runs in its own task and every caller awaits it shielded:
+        # a cancelled caller, the one that started it included, leaves the
+        # load running for the others.
+        return await asyncio.shield(task)
+
+    async def _aload(self, flight_key: Tuple[int, str], key: str,
+                     loader: Callable[[], Awaitable[Any]]) -> Optional[Any]:
+        try:
+            value = await loader()
+            if value is not None:
+                self.set(key, value)
+            return value
+        finally:
+            with self._lock:
+                self._async_flights.pop(flight_key, None)
 
     def __contains__(self, key: str) -> bool:
-        if key not in self._data:
-            return False
-        age = time.time() - self._timestamps.get(key, 0)
-        if age > self.ttl_seconds:
-            self._data.pop(key, None)
-            self._timestamps.pop(key, None)
-            return False
-        return True
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return False
+            if time.monotonic() - entry[1] > self.ttl_seconds:
+                del self._data[key]
+                return False
+            return True
 
     def __len__(self) -> int:
         return len(self._data)
 
     def __delitem__(self, key: str):
-        self._data.pop(key, None)
-        self._timestamps.pop(key, None)
+        with self._lock:
+            self._data.pop(key, None)
 
     def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
         return {
             "size": len(self._data),
             "max_size": self.max_size,
             "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
         }
@@ -173,9 +173,9 @@ async def approve_response_impl(
         # Update follower memory with the APPROVED response
         # (not saved during process_dm in copilot mode to prevent phantom context)
         try:
-            from core.dm_agent_v2 import get_dm_agent
+            from core.dm_agent_v2 import aget_dm_agent
 
-            agent = get_dm_agent(creator_id)
+            agent = await aget_dm_agent(creator_id)
             follower = await agent.memory_store.get(
                 creator_id, lead.platform_user_id
             )
@@ -318,9 +318,9 @@ async def _debounced_regeneration_impl(service, lead_key: str):
             return
 
         # Call process_dm to generate a new response with full context
-        from core.dm_agent_v2 import get_dm_agent
+        from core.dm_agent_v2 import aget_dm_agent
 
-        agent = get_dm_agent(meta["creator_id"])
+        agent = await aget_dm_agent(meta["creator_id"])
         dm_response = await agent.process_dm(
             message=latest_user_msg.content,
             sender_id=meta["follower_id"],
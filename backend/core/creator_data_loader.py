@@ -514,7 +514,7 @@ def load_creator_data(creator_id: str) -> CreatorData:
 # =============================================================================
 
 from core.cache import BoundedTTLCache
-_creator_data_cache = BoundedTTLCache(max_size=20, ttl_seconds=300)
+_creator_data_cache = BoundedTTLCache(max_size=20, ttl_seconds=300, name="creator_data")
 _CACHE_TTL_SECONDS = 300  # 5 minutes
 
 
@@ -530,10 +530,8 @@ def get_creator_data(creator_id: str, use_cache: bool = True) -> CreatorData:
         CreatorData instance
     """
     if use_cache:
-        cached = _creator_data_cache.get(creator_id)
-        if cached is not None:
-            logger.debug(f"Using cached CreatorData for {creator_id}")
-            return cached
+        # Single-flight: a burst of DMs for one creator triggers one load
+        return _creator_data_cache.get_or_load(creator_id, lambda: load_creator_data(creator_id))
 
     # Load fresh data
     data = load_creator_data(creator_id)
@@ -0,0 +1,58 @@
+"""
+Helpers for tables that store state derived from other rows.
+
+lead_signal_state (services/lead_scoring.py) and audience_rollups
+(core/audience_rollups.py) follow the same pattern: the table is optional
+until its migration runs, and every stored row carries the version of the
+rules that built it, so rows from older rules are recomputed on read.
+
+  TableProbe     cached "does the table exist" check (rechecked every
+                 5 min while absent)
+  rules_version  stable 31-bit version of a rule set
+"""
+
+import logging
+import threading
+import time
+import zlib
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+TABLE_RECHECK_S = 300.0
+
+
+def rules_version(*parts: Any) -> int:
+    """CRC32 of the repr of the ``parts`` tuple, kept positive so it fits an INTEGER column."""
+    return zlib.crc32(repr(parts).encode("utf-8")) & 0x7FFFFFFF
+
+
+class TableProbe:
+    """Callable ``probe(connection) -> bool``: whether ``table`` exists.
+
+    A positive answer is cached for good; a negative one for
+    ``recheck_s`` so the migration is picked up without a restart.
+    """
+
+    def __init__(self, table: str, recheck_s: float = TABLE_RECHECK_S):
+        self.table = table
+        self.recheck_s = recheck_s
+        self._checked_at: Optional[float] = None
+        self._present = False
+        self._lock = threading.Lock()
+
+    def __call__(self, connection) -> bool:
+        if self._present:
+            return True
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < self.recheck_s:
+            return False
+        with self._lock:
+            self._checked_at = now
+            try:
+                from sqlalchemy import inspect
+
+                self._present = inspect(connection).has_table(self.table)
+            except Exception as e:
+                logger.debug(f"[DERIVED-TABLES] {self.table} lookup failed: {e}")
+        return self._present
@@ -623,13 +623,21 @@ DMResponderAgent = DMResponderAgentV2
 # =============================================================================
 
 from core.cache import BoundedTTLCache
+from core.invalidation_bus import InvalidationTopic, get_invalidation_bus, publish_invalidation
 _dm_agent_cache = BoundedTTLCache(
     max_size=20,  # Max 20 agents in memory (~20-50MB each)
     ttl_seconds=AGENT_THRESHOLDS.agent_cache_ttl,
+    name="dm_agent",
 )
 _DM_AGENT_CACHE_TTL = AGENT_THRESHOLDS.agent_cache_ttl
 
 
+def _create_dm_agent(creator_id: str) -> DMResponderAgentV2:
+    agent = DMResponderAgentV2(creator_id=creator_id)
+    logger.info(f"get_dm_agent: created new agent for {creator_id}")
+    return agent
+
+
 def get_dm_agent(creator_id: str) -> DMResponderAgentV2:
     """
     Factory to get DM agent for a creator - SINGLETON PATTERN.
@@ -642,16 +650,21 @@ def get_dm_agent(creator_id: str) -> DMResponderAgentV2:
     Returns:
         DMResponderAgentV2 instance (cached or new)
     """
-    cached = _dm_agent_cache.get(creator_id)
-    if cached is not None:
-        logger.debug(f"get_dm_agent: reusing cached agent for {creator_id}")
-        return cached
+    # Single-flight: concurrent first messages for a creator build one agent
+    return _dm_agent_cache.get_or_load(creator_id, lambda: _create_dm_agent(creator_id))
 
-    # Create new agent and cache it
-    agent = DMResponderAgentV2(creator_id=creator_id)
-    _dm_agent_cache.set(creator_id, agent)
-    logger.info(f"get_dm_agent: created new agent for {creator_id}")
-    return agent
+
+async def aget_dm_agent(creator_id: str) -> DMResponderAgentV2:
+    """
+    get_dm_agent for async callers.
+
+    Agent construction reads creator data from the DB and disk, so a cache
+    miss is built in a worker thread instead of on the event loop. Concurrent
+    misses for the same creator share one build.
+    """
+    return await _dm_agent_cache.aget_or_load(
+        creator_id, lambda: asyncio.to_thread(_create_dm_agent, creator_id)
+    )
 
 
 def invalidate_dm_agent_cache(creator_id: str = None) -> None:
@@ -663,9 +676,17 @@ def invalidate_dm_agent_cache(creator_id: str = None) -> None:
     Args:
         creator_id: Specific creator to invalidate, or None for all
     """
+    # Applied here immediately and broadcast to the other workers
+    publish_invalidation(InvalidationTopic.DM_AGENT, creator_id or None)
+
+
+def _drop_dm_agents(creator_id: Optional[str]) -> None:
     if creator_id:
         _dm_agent_cache.pop(creator_id, None)
         logger.info(f"Invalidated DM agent cache for {creator_id}")
     else:
         _dm_agent_cache.clear()
         logger.info("Invalidated all DM agent caches")
+
+
+get_invalidation_bus().subscribe(InvalidationTopic.DM_AGENT, _drop_dm_agents)
@@ -0,0 +1,136 @@
+"""
+GeminiLocalTokenizer — offline token counting for the gemini provider.
+
+GenerativeModel.count_tokens is a remote call; BudgetOrchestrator.pack counts
+every section on every DM, so the remote path put N network round-trips on the
+hot path. This module counts locally:
+
+1. SentencePiece model (Gemma tokenizer shares the Gemini vocabulary) when
+   `sentencepiece` is installed and GEMINI_SPM_MODEL_PATH (or the default
+   path below) points to a tokenizer.model file.
+2. Otherwise a pre-tokenizing approximation whose coefficients live in
+   gemini_token_calibration.json. Re-fit them with
+   `python -m scripts.benchmark_gemini_tokenizer --fit` (needs GOOGLE_API_KEY).
+
+Contract: same as TokenCounter — estimation for budgeting (<3% aggregate error
+against the remote counter), not a billing source of truth.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+_HERE = Path(__file__).parent
+CALIBRATION_PATH = _HERE / "gemini_token_calibration.json"
+DEFAULT_SPM_MODEL_PATH = _HERE / "data" / "gemini_tokenizer.model"
+
+DEFAULT_CALIBRATION: Dict[str, float] = {
+    "word_single_max_chars": 9,     # words up to this length are one piece
+    "word_chars_per_extra": 4,      # extra piece per N chars beyond that
+    "digit_cost": 1.0,              # SentencePiece splits digits one by one
+    "punct_run_cost": 1.0,          # "..." / "!!" usually merge into one piece
+    "symbol_cost": 1.5,             # emoji / other symbols (1-2 byte-fallback pieces)
+    "newline_cost": 1.0,
+    "space_run_cost": 1.0,          # runs of 2+ spaces (single spaces merge into ▁word)
+    "scale": 1.0,                   # global multiplier fitted against the remote counter
+}
+
+# Pre-tokenizer: letters, single digits, newlines, space runs, punctuation runs, anything else
+_PIECE_RE = re.compile(
+    r"(?P<word>[^\W\d_]+)"
+    r"|(?P<digit>\d)"
+    r"|(?P<newline>\n)"
+    r"|(?P<spaces> {2,})"
+    r"|(?P<space>\s)"
+    r"|(?P<punct>(?P<pc>[!-/:-@\[-`{-~¡¿«»…])(?P=pc){0,2})"
+    r"|(?P<other>.)",
+    re.DOTALL,
+)
+
+
+def load_calibration(path: Optional[Path] = None) -> Dict[str, float]:
+    """Load calibration coefficients, falling back to defaults for missing keys."""
+    path = path or CALIBRATION_PATH
+    params = dict(DEFAULT_CALIBRATION)
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        params.update({k: float(v) for k, v in data.get("params", {}).items() if k in params})
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning("[TokenCounter] calibration load failed (%s), using defaults", e)
+    return params
+
+
+def calibration_samples(path: Optional[Path] = None) -> int:
+    """Number of remote counts the committed coefficients were fitted on (0 = unfitted defaults)."""
+    try:
+        with open(path or CALIBRATION_PATH, encoding="utf-8") as f:
+            return int(json.load(f).get("samples") or 0)
+    except Exception:
+        return 0
+
+
+class GeminiLocalTokenizer:
+    """Offline Gemini token counter (SentencePiece if available, else approximation)."""
+
+    def __init__(self, calibration: Optional[Dict[str, float]] = None) -> None:
+        self.params = calibration or load_calibration()
+        self._spm: Optional[Any] = self._load_sentencepiece()
+        self.backend = "sentencepiece" if self._spm is not None else "approx"
+
+    @property
+    def validated(self) -> bool:
+        """True when counts come from the real vocabulary or from fitted coefficients."""
+        return self._spm is not None or calibration_samples() > 0
+
+    @staticmethod
+    def _load_sentencepiece() -> Optional[Any]:
+        model_path = Path(os.getenv("GEMINI_SPM_MODEL_PATH", str(DEFAULT_SPM_MODEL_PATH)))
+        if not model_path.exists():
+            return None
+        try:
+            import sentencepiece as spm  # type: ignore[import]
+            return spm.SentencePieceProcessor(model_file=str(model_path))
+        except Exception as e:
+            logger.warning("[TokenCounter] sentencepiece load failed (%s), using approximation", e)
+            return None
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        if self._spm is not None:
+            return len(self._spm.encode(text))
+        return self.approximate(text)
+
+    def approximate(self, text: str) -> int:
+        p = self.params
+        single_max = p["word_single_max_chars"]
+        per_extra = max(1.0, p["word_chars_per_extra"])
+        raw = 0.0
+        for m in _PIECE_RE.finditer(text):
+            kind = m.lastgroup
+            if kind == "word":
+                n = len(m.group())
+                raw += 1 if n <= single_max else 1 + math.ceil((n - single_max) / per_extra)
+            elif kind == "digit":
+                raw += p["digit_cost"]
+            elif kind == "newline":
+                raw += p["newline_cost"]
+            elif kind == "spaces":
+                raw += p["space_run_cost"]
+            elif kind == "punct":
+                raw += p["punct_run_cost"]
+            elif kind == "other":
+                raw += p["symbol_cost"]
+            # single whitespace is absorbed into the following piece
+        return max(1, int(round(raw * p["scale"])))
@@ -1,14 +1,35 @@
 """
 TokenCounter — provider-agnostic token counting wrapper.
-Priority: tiktoken (openai/openrouter) → google.generativeai → chars//4 fallback.
+Priority: tiktoken (openai/openrouter) → Gemini local/remote → chars//4 fallback.
 Design: docs/sprint5_planning/ARC1_token_aware_budget.md §2.4
 
+Gemini counts with GenerativeModel.count_tokens unless GeminiLocalTokenizer is
+validated (SentencePiece model present, or calibration fitted with samples > 0);
+TOKEN_COUNTER_GEMINI_MODE=local|remote forces either side.
+Counts are memoized per counter in a content-hash LRU, and counters are shared
+per (provider, model) via get_token_counter(), so static sections (Doc D,
+safety, few-shots) are tokenized once instead of once per DM.
+
 Contract: not a billing source of truth — estimation sufficient for budget (<3% error).
 """
 
 from __future__ import annotations
 
-from typing import Any, Optional
+import hashlib
+import os
+from typing import Any, Dict, Optional, Tuple
+
+from core.cache import BoundedTTLCache
+from core.dm.budget.local_tokenizer import GeminiLocalTokenizer
+
+TOKEN_COUNT_CACHE_SIZE = int(os.getenv("TOKEN_COUNT_CACHE_SIZE", "2048"))
+# Counts are deterministic for a given text; the TTL only bounds staleness of
+# the LRU bookkeeping, not correctness.
+TOKEN_COUNT_CACHE_TTL = 24 * 3600
+
+
+def _gemini_mode() -> str:
+    return os.getenv("TOKEN_COUNTER_GEMINI_MODE", "auto").lower()
 
 
 class TokenCounter:
@@ -16,14 +37,21 @@ class TokenCounter:
 
     Resolution order:
     1. tiktoken with cl100k_base (openai / openrouter)
-    2. google.generativeai GenerativeModel.count_tokens (gemini-*)
+    2. gemini-*: GeminiLocalTokenizer once validated (or in local mode),
+       otherwise google.generativeai GenerativeModel.count_tokens
     3. len(text) // 4 safe fallback
     """
 
+    # Instances built via __new__ (tests) skip memoization
+    _count_cache: Optional[BoundedTTLCache] = None
+
     def __init__(self, provider: str, model: str) -> None:
         self.provider = provider
         self.model = model
         self._impl: Optional[Any] = self._resolve()
+        self._count_cache = BoundedTTLCache(
+            max_size=TOKEN_COUNT_CACHE_SIZE, ttl_seconds=TOKEN_COUNT_CACHE_TTL
+        )
 
     def _resolve(self) -> Optional[Any]:
         if self.provider in ("openai", "openrouter"):
@@ -36,6 +64,12 @@ class TokenCounter:
             except ImportError:
                 return None
         if self.provider == "gemini":
+            mode = _gemini_mode()
+            if mode != "remote":
+                local = GeminiLocalTokenizer()
+                # Unfitted default coefficients have no measured error bound
+                if mode == "local" or local.validated:
+                    return local
             try:
                 import google.generativeai as genai  # type: ignore[import]
                 return genai.GenerativeModel(self.model)
@@ -48,13 +82,31 @@ class TokenCounter:
             return 0
         if self._impl is None:
             return len(text) // 4
+        cache = self._count_cache
+        key = None
+        if cache is not None:
+            key = hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+        n = self._count_uncached(text)
+        if n is None:
+            # Remote counter failed — estimate, but don't memoize the estimate
+            return len(text) // 4
+        if key is not None:
+            cache.set(key, n)
+        return n
+
+    def _count_uncached(self, text: str) -> Optional[int]:
         if self.provider in ("openai", "openrouter"):
             return len(self._impl.encode(text))
         if self.provider == "gemini":
+            if isinstance(self._impl, GeminiLocalTokenizer):
+                return self._impl.count(text)
             try:
                 return self._impl.count_tokens(text).total_tokens
             except Exception:
-                return len(text) // 4
+                return None
         return len(text) // 4
 
     def truncate(self, text: str, max_tokens: int) -> str:
@@ -72,3 +124,16 @@ class TokenCounter:
             ratio = len(text) / actual
             return text[: int(max_tokens * ratio)]
         return text[: max_tokens * 4]
+
+
+_counters: Dict[Tuple[str, str, str], TokenCounter] = {}
+
+
+def get_token_counter(provider: str, model: str) -> TokenCounter:
+    """Shared TokenCounter per (provider, model) so its count cache survives across DMs."""
+    key = (provider, model, _gemini_mode() if provider == "gemini" else "")
+    counter = _counters.get(key)
+    if counter is None:
+        counter = TokenCounter(provider, model)
+        _counters[key] = counter
+    return counter
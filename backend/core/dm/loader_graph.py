@@ -0,0 +1,170 @@
+"""Loader Graph — declarative DAG executor for context-phase I/O.
+
+phase_memory_and_context pulls lead memory, episodic search, hierarchical
+memory, commitments, DNA, conversation state and RAG. Most of these are
+independent, so running them one after another made context latency the
+*sum* of the loaders. This module runs every loader as soon as its
+dependencies resolve, so latency becomes the longest dependency chain.
+
+Each loader gets:
+- ``deps``: names of loaders whose results it needs (passed in ``results``)
+- ``timeout_s``: per-loader deadline (``None`` → no per-loader deadline)
+- ``optional``: on timeout/error an optional loader yields ``default``;
+  a required loader re-raises
+- a span ``{"ms", "status"}`` written to ``spans[name]``
+  (status: ok | timeout | error | deadline | dep_failed)
+
+The graph also has a total deadline. When it expires, optional loaders still
+running are cancelled and yield their default; required loaders are awaited.
+
+Note: cancelling a loader that wraps ``asyncio.to_thread`` stops waiting for
+it, but the worker thread still runs to completion in the background.
+
+Env vars:
+  CONTEXT_LOADER_TIMEOUT_MS   — default per-loader deadline (default: 3000)
+  CONTEXT_PHASE_DEADLINE_MS   — total deadline for the loader graph (default: 4000)
+"""
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+LOADER_TIMEOUT_S = int(os.getenv("CONTEXT_LOADER_TIMEOUT_MS", "3000")) / 1000
+PHASE_DEADLINE_S = int(os.getenv("CONTEXT_PHASE_DEADLINE_MS", "4000")) / 1000
+
+LoaderFn = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+
+@dataclass(frozen=True)
+class Loader:
+    """One node of the loader graph."""
+
+    name: str
+    fn: LoaderFn
+    deps: Tuple[str, ...] = ()
+    timeout_s: Optional[float] = LOADER_TIMEOUT_S
+    optional: bool = True
+    default: Any = None
+
+
+class LoaderGraphError(ValueError):
+    """Raised for an invalid graph (unknown dependency, duplicate name or cycle)."""
+
+
+def _validate(loaders: Dict[str, Loader]) -> None:
+    for loader in loaders.values():
+        for dep in loader.deps:
+            if dep not in loaders:
+                raise LoaderGraphError(f"loader {loader.name!r} depends on unknown {dep!r}")
+
+    # Kahn's algorithm — any node left over is part of a cycle
+    indegree = {name: len(loader.deps) for name, loader in loaders.items()}
+    dependents: Dict[str, list] = {name: [] for name in loaders}
+    for loader in loaders.values():
+        for dep in loader.deps:
+            dependents[dep].append(loader.name)
+    ready = [name for name, n in indegree.items() if n == 0]
+    seen = 0
+    while ready:
+        name = ready.pop()
+        seen += 1
+        for child in dependents[name]:
+            indegree[child] -= 1
+            if indegree[child] == 0:
+                ready.append(child)
+    if seen != len(loaders):
+        cyclic = sorted(name for name, n in indegree.items() if n > 0)
+        raise LoaderGraphError(f"loader graph has a cycle through {cyclic}")
+
+
+async def run_loader_graph(
+    loaders: Iterable[Loader],
+    *,
+    deadline_s: Optional[float] = PHASE_DEADLINE_S,
+    spans: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    """Run loaders concurrently in dependency order.
+
+    Returns a dict ``name → result`` (or the loader's default when an optional
+    loader failed, timed out or missed the graph deadline).
+    """
+    by_name: Dict[str, Loader] = {}
+    for loader in loaders:
+        if loader.name in by_name:
+            raise LoaderGraphError(f"duplicate loader name {loader.name!r}")
+        by_name[loader.name] = loader
+    _validate(by_name)
+
+    spans = spans if spans is not None else {}
+    results: Dict[str, Any] = {}
+    failed: set = set()
+    tasks: Dict[str, asyncio.Task] = {}
+    graph_start = time.monotonic()
+
+    def _span(name: str, start: float, status: str) -> None:
+        spans[name] = {"ms": round((time.monotonic() - start) * 1000, 1), "status": status}
+
+    async def _run(loader: Loader) -> Any:
+        if loader.deps:
+            await asyncio.gather(*(tasks[d] for d in loader.deps), return_exceptions=True)
+        start = time.monotonic()
+        missing = [d for d in loader.deps if d in failed]
+        if missing and not loader.optional:
+            _span(loader.name, start, "dep_failed")
+            failed.add(loader.name)
+            raise LoaderGraphError(f"required loader {loader.name!r} lost deps {missing}")
+        try:
+            dep_results = {d: results[d] for d in loader.deps}
+            if loader.timeout_s is not None:
+                value = await asyncio.wait_for(loader.fn(dep_results), loader.timeout_s)
+            else:
+                value = await loader.fn(dep_results)
+        except asyncio.TimeoutError:
+            _span(loader.name, start, "timeout")
+            logger.warning("[LOADER-GRAPH] %s timed out after %.2fs", loader.name, loader.timeout_s)
+            if not loader.optional:
+                failed.add(loader.name)
+                raise
+            value = loader.default
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            _span(loader.name, start, "error")
+            logger.debug("[LOADER-GRAPH] %s failed: %s", loader.name, e)
+            if not loader.optional:
+                failed.add(loader.name)
+                raise
+            value = loader.default
+        else:
+            _span(loader.name, start, "ok")
+        results[loader.name] = value
+        return value
+
+    for loader in by_name.values():
+        tasks[loader.name] = asyncio.create_task(_run(loader), name=f"loader:{loader.name}")
+
+    _done, pending = await asyncio.wait(tasks.values(), timeout=deadline_s)
+
+    if pending:
+        for name, task in tasks.items():
+            if task in pending and by_name[name].optional:
+                task.cancel()
+                results[name] = by_name[name].default
+                spans[name] = {
+                    "ms": round((time.monotonic() - graph_start) * 1000, 1),
+                    "status": "deadline",
+                }
+                logger.warning("[LOADER-GRAPH] %s dropped at graph deadline", name)
+        # Required loaders are never dropped; wait for them (and let cancelled ones settle)
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    for name, task in tasks.items():
+        if not by_name[name].optional and not task.cancelled() and task.exception():
+            raise task.exception()
+
+    return results
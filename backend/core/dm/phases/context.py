@@ -12,6 +12,7 @@ from core.agent_config import AGENT_THRESHOLDS
 from core.bot_question_analyzer import QuestionType, get_bot_question_analyzer, is_short_affirmation
 from core.citation_service import get_citation_prompt_section
 from core.conversation_state import get_state_manager
+from core.dm.loader_graph import Loader, run_loader_graph
 from core.dm.models import ContextBundle, DetectionResult
 from core.dm.sell_arbitration import (
     SalesIntentResolver,
@@ -153,7 +154,7 @@ _KW_STOPWORDS = {
 # BUG-RAG-04 fix: Use BoundedTTLCache instead of unbounded dict.
 # Each entry holds a set of keywords extracted from content_chunks.
 from core.cache import BoundedTTLCache as _BoundedTTLCache
-_creator_kw_cache: _BoundedTTLCache = _BoundedTTLCache(max_size=50, ttl_seconds=3600)
+_creator_kw_cache: _BoundedTTLCache = _BoundedTTLCache(max_size=50, ttl_seconds=3600, name="rag_keywords")
 
 
 def _get_creator_product_keywords(creator_id: str) -> Set[str]:
@@ -212,6 +213,14 @@ def _get_creator_product_keywords(creator_id: str) -> Set[str]:
         return set()
 
 
+# BUG-EP-02 fix: Raise min_similarity from 0.45 → 0.60 to avoid noise.
+# BUG-EP-06 fix: Fetch k=5 then filter, cap at 3 quality results.
+_EPISODIC_MIN_SIM = 0.60
+_EPISODIC_FETCH_K = 5
+_EPISODIC_MAX_RESULTS = 3
+_EPISODIC_MAX_CONTENT_CHARS = 250  # BUG-EP-08 fix: 150 → 250
+
+
 def _episodic_search(
     creator_slug: str, sender_id: str, message: str,
     recent_history: list = None,
@@ -226,31 +235,21 @@ def _episodic_search(
     """
     from core.semantic_memory_pgvector import SemanticMemoryPgvector
 
-    # BUG-EP-02 fix: Raise min_similarity from 0.45 → 0.60 to avoid noise.
-    # BUG-EP-06 fix: Fetch k=5 then filter, cap at 3 quality results.
-    _MIN_SIM = 0.60
-    _FETCH_K = 5
-    _MAX_RESULTS = 3
-    _MAX_CONTENT_CHARS = 250  # BUG-EP-08 fix: 150 → 250
-
     # BUG-EP-05 fix: Resolve IDs once upfront instead of double search.
     # BUG-EP-07 fix: Use get_db_session() context manager (no session leak).
     creator_uuid = None
     lead_uuid = None
     try:
         from api.database import get_db_session
+        from services.dm_context_repository import CREATOR_ID_SQL, LEAD_ID_SQL
         from sqlalchemy import text as _sql_text
 
         with get_db_session() as session:
-            row = session.execute(
-                _sql_text("SELECT id FROM creators WHERE name = :name LIMIT 1"),
-                {"name": creator_slug},
-            ).fetchone()
+            row = session.execute(_sql_text(CREATOR_ID_SQL), {"name": creator_slug}).fetchone()
             if row:
                 creator_uuid = str(row[0])
                 lead_row = session.execute(
-                    _sql_text("SELECT id FROM leads WHERE platform_user_id = :pid AND creator_id = :cid LIMIT 1"),
-                    {"pid": sender_id, "cid": creator_uuid},
+                    _sql_text(LEAD_ID_SQL), {"pid": sender_id, "cid": creator_uuid},
                 ).fetchone()
                 if lead_row:
                     lead_uuid = str(lead_row[0])
@@ -263,10 +262,15 @@ def _episodic_search(
         if not cid or not fid:
             continue
         sm = SemanticMemoryPgvector(cid, fid)
-        results = sm.search(message, k=_FETCH_K, min_similarity=_MIN_SIM)
+        results = sm.search(message, k=_EPISODIC_FETCH_K, min_similarity=_EPISODIC_MIN_SIM)
         if results:
             break
 
+    return _format_episodic_results(results, recent_history)
+
+
+def _format_episodic_results(results: list, recent_history: list = None) -> str:
+    """Dedupe episodic hits against the prompt history and format the Recalling block."""
     if not results:
         return ""
 
@@ -279,8 +283,8 @@ def _episodic_search(
         }
         results = [r for r in results if r["content"][:100] not in recent_contents]
 
-    # BUG-EP-06 fix: Cap at _MAX_RESULTS quality results
-    results = results[:_MAX_RESULTS]
+    # BUG-EP-06 fix: Cap at _EPISODIC_MAX_RESULTS quality results
+    results = results[:_EPISODIC_MAX_RESULTS]
 
     if not results:
         return ""
@@ -289,8 +293,8 @@ def _episodic_search(
     lines = []
     for r in results:
         role = "lead" if r["role"] == "user" else "tú"
-        content = r["content"][:_MAX_CONTENT_CHARS]
-        if len(r["content"]) > _MAX_CONTENT_CHARS:
+        content = r["content"][:_EPISODIC_MAX_CONTENT_CHARS]
+        if len(r["content"]) > _EPISODIC_MAX_CONTENT_CHARS:
             content += "..."
         lines.append(f"- {role}: \"{content}\"")
 
@@ -420,6 +424,11 @@ def _read_arc2_memories_sync(
     Returns empty string on any lookup failure (fail-silent).
     """
     from api.database import SessionLocal
+    from services.dm_context_repository import (
+        CREATOR_ID_SQL,
+        LEAD_ID_ANY_PREFIX_SQL,
+        lead_id_any_prefix_params,
+    )
     from sqlalchemy import text as _text
 
     try:
@@ -428,34 +437,14 @@ def _read_arc2_memories_sync(
         logger.debug("[ARC2-MEMORY] _read_arc2_memories_sync failed: %s", exc)
         return ""
     try:
-        creator_row = db.execute(
-            _text("SELECT id FROM creators WHERE name = :slug LIMIT 1"),
-            {"slug": creator_slug},
-        ).fetchone()
+        creator_row = db.execute(_text(CREATOR_ID_SQL), {"name": creator_slug}).fetchone()
         if not creator_row:
             return ""
         creator_uuid = str(creator_row[0])
 
-        raw = platform_user_id
-        for prefix in ("ig_", "wa_", "tg_"):
-            if raw.startswith(prefix):
-                raw = raw[len(prefix):]
-                break
         lead_row = db.execute(
-            _text(
-                "SELECT id FROM leads "
-                "WHERE creator_id = CAST(:cid AS uuid) "
-                "AND platform_user_id = ANY(ARRAY[:pid, :raw, :ig, :wa, :tg]) "
-                "LIMIT 1"
-            ),
-            {
-                "cid": creator_uuid,
-                "pid": platform_user_id,
-                "raw": raw,
-                "ig": f"ig_{raw}",
-                "wa": f"wa_{raw}",
-                "tg": f"tg_{raw}",
-            },
+            _text(LEAD_ID_ANY_PREFIX_SQL),
+            lead_id_any_prefix_params(creator_uuid, platform_user_id),
         ).fetchone()
         if not lead_row:
             return ""
@@ -627,7 +616,7 @@ def _assemble_context_new(inp: _ContextAssemblyInputs) -> Tuple[str, str]:
     from core.dm.budget.section import (
         SECTION_CAPS, Priority, Section, compute_value_score,
     )
-    from core.dm.budget.tokenizer import TokenCounter
+    from core.dm.budget.tokenizer import get_token_counter
 
     cog = inp.cognitive_metadata
 
@@ -659,7 +648,7 @@ def _assemble_context_new(inp: _ContextAssemblyInputs) -> Tuple[str, str]:
     ]
     sections = [s for s in raw_sections if s is not None]
 
-    tokenizer = TokenCounter(inp.provider, inp.model)
+    tokenizer = get_token_counter(inp.provider, inp.model)
     orchestrator = BudgetOrchestrator(
         tokenizer=tokenizer,
         budget_tokens=int(os.getenv("BUDGET_ORCHESTRATOR_TOKENS", "4000")),
@@ -910,6 +899,7 @@ async def phase_memory_and_context(
     # Previously sequential (~3.8s) → now parallel (~1.2s).
 
     from services.dm_agent_context_integration import build_context_prompt as _build_ctx
+    from services import dm_context_repository as _dm_repo
     from services.relationship_dna_repository import get_relationship_dna as _get_raw_dna
 
     async def _load_conv_state():
@@ -926,44 +916,60 @@ async def phase_memory_and_context(
             logger.debug(f"Conversation state failed: {e}")
             return "", {}
 
-    # Parallel phase 1: memory + raw_dna + conv_state (all independent)
-    # raw_dna is loaded ONCE here and passed to build_context_prompt to avoid double DB query.
-    follower, raw_dna, (state_context, state_meta) = await asyncio.gather(
-        agent.memory_store.get_or_create(
+    async def _load_follower(_deps):
+        return await agent.memory_store.get_or_create(
             creator_id=agent.creator_id,
             follower_id=sender_id,
             username=metadata.get("username", sender_id),
-        ),
-        asyncio.to_thread(_get_raw_dna, agent.creator_id, sender_id),
-        _load_conv_state(),
-    )
-    # Phase 2: build_context_prompt uses pre-loaded DNA (saves 1 DB query)
-    dna_context = await _build_ctx(agent.creator_id, sender_id, preloaded_dna=raw_dna)
-    cognitive_metadata.update(state_meta)
+        )
+
+    # With ENABLE_ASYNC_DB the DNA / memory / episodic reads run on the asyncpg
+    # pool (services/dm_context_repository.py) instead of one thread + one
+    # sync-pool connection each.
+    _turn_db = None
+
+    async def _load_raw_dna(_deps):
+        if _turn_db is not None:
+            return await _dm_repo.get_relationship_dna(_turn_db, agent.creator_id, sender_id)
+        return await asyncio.to_thread(_get_raw_dna, agent.creator_id, sender_id)
+
+    async def _load_state(_deps):
+        return await _load_conv_state()
+
+    # build_context_prompt uses the pre-loaded DNA (saves 1 DB query)
+    async def _load_dna_context(deps):
+        return await _build_ctx(agent.creator_id, sender_id, preloaded_dna=deps["raw_dna"])
 
     # Memory recall (per-lead context from past conversations)
-    memory_context = ""
-    if ENABLE_LEAD_MEMORIES_READ:
-        try:
-            memory_context = await asyncio.to_thread(
-                _read_arc2_memories_sync, agent.creator_id, sender_id, message
-            )
+    async def _load_memory(_deps):
+        if ENABLE_LEAD_MEMORIES_READ:
+            if _turn_db is not None:
+                try:
+                    memories = await _dm_repo.read_arc2_memories(
+                        _turn_db, agent.creator_id, sender_id, message
+                    )
+                    memory_context = _format_arc2_memories(memories)
+                except Exception as exc:
+                    logger.debug("[ARC2-MEMORY] async read failed: %s", exc)
+                    memory_context = ""
+            else:
+                memory_context = await asyncio.to_thread(
+                    _read_arc2_memories_sync, agent.creator_id, sender_id, message
+                )
             if memory_context:
                 cognitive_metadata["memory_recalled"] = True
                 cognitive_metadata["memory_chars"] = len(memory_context)
                 cognitive_metadata["memory_source"] = "arc2_lead_memories"
-        except Exception as e:
-            logger.debug(f"[ARC2-MEMORY] recall failed: {e}")
-    elif os.getenv("ENABLE_MEMORY_ENGINE", "false").lower() == "true":
-        try:
+            return memory_context
+        if os.getenv("ENABLE_MEMORY_ENGINE", "false").lower() == "true":
             from services.memory_engine import get_memory_engine
             mem_engine = get_memory_engine()
             memory_context = await mem_engine.recall(agent.creator_id, sender_id, message)
             if memory_context:
                 cognitive_metadata["memory_recalled"] = True
                 cognitive_metadata["memory_chars"] = len(memory_context)
-        except Exception as e:
-            logger.debug(f"[MEMORY] recall failed: {e}")
+            return memory_context
+        return ""
 
     # Episodic memory: search conversation_embeddings for past messages relevant
     # to the current message. Complements Memory Engine facts with raw conversation
@@ -971,7 +977,6 @@ async def phase_memory_and_context(
     # O4 (Multi-Layered, 2026): Adaptive retrieval gating — only search when
     # the message has enough semantic complexity (length + unique words).
     # Short/casual messages ("hola", "ok", "sí") skip the embedding call entirely.
-    episodic_context = ""
     _msg_stripped = message.strip()
     _msg_words = set(_msg_stripped.lower().split())
     _episodic_gate = (
@@ -979,62 +984,197 @@ async def phase_memory_and_context(
         and len(_msg_stripped) >= 15
         and len(_msg_words) >= 3  # O4: at least 3 unique words
     )
-    if _episodic_gate:
-        try:
-            _hist = metadata.get("history", [])
+
+    async def _load_episodic(_deps):
+        if not _episodic_gate:
+            return ""
+        _hist = metadata.get("history", [])
+        if _turn_db is not None:
+            results = await _dm_repo.search_episodic(
+                _turn_db, agent.creator_id, sender_id, message,
+                k=_EPISODIC_FETCH_K, min_similarity=_EPISODIC_MIN_SIM,
+            )
+            episodic_context = _format_episodic_results(results, _hist)
+        else:
             episodic_context = await asyncio.to_thread(
                 _episodic_search, agent.creator_id, sender_id, message,
                 recent_history=_hist,
             )
-            if episodic_context:
-                cognitive_metadata["episodic_recalled"] = True
-                cognitive_metadata["episodic_chars"] = len(episodic_context)
-        except Exception as e:
-            logger.debug(f"[EPISODIC] search failed: {e}")
+        if episodic_context:
+            cognitive_metadata["episodic_recalled"] = True
+            cognitive_metadata["episodic_chars"] = len(episodic_context)
+        return episodic_context
 
     # Hierarchical memory (IMPersona-style 3-level: episodic + semantic + abstract)
     # BUG-EP-08 fix: Cache HierarchicalMemoryManager per creator (avoid disk I/O per message)
-    hier_memory_context = ""
-    if ENABLE_HIERARCHICAL_MEMORY:
-        try:
-            from core.hierarchical_memory.hierarchical_memory import get_hierarchical_memory
+    async def _load_hier_memory(deps):
+        if not ENABLE_HIERARCHICAL_MEMORY:
+            return ""
+        from core.hierarchical_memory.hierarchical_memory import get_hierarchical_memory
 
-            hmm = get_hierarchical_memory(agent.creator_id)
-            lead_name = metadata.get("username", "") or (
-                follower.username if hasattr(follower, "username") else ""
-            )
-            hier_memory_context = hmm.get_context_for_message(
-                message=message,
-                lead_name=lead_name,
-                lead_id=sender_id,
-                max_tokens=300,
+        follower = deps["follower"]
+        hmm = get_hierarchical_memory(agent.creator_id)
+        lead_name = metadata.get("username", "") or (
+            follower.username if hasattr(follower, "username") else ""
+        )
+        hier_memory_context = await asyncio.to_thread(
+            hmm.get_context_for_message,
+            message=message,
+            lead_name=lead_name,
+            lead_id=sender_id,
+            max_tokens=300,
+        )
+        if hier_memory_context:
+            _hmm_stats = hmm.stats()
+            logger.info(
+                "[HIER-MEM] Injected %d chars (L1=%d L2=%d L3=%d) for %s",
+                len(hier_memory_context),
+                _hmm_stats["level1_count"],
+                _hmm_stats["level2_count"],
+                _hmm_stats["level3_count"],
+                sender_id[:20],
             )
-            if hier_memory_context:
-                _hmm_stats = hmm.stats()
-                logger.info(
-                    "[HIER-MEM] Injected %d chars (L1=%d L2=%d L3=%d) for %s",
-                    len(hier_memory_context),
-                    _hmm_stats["level1_count"],
-                    _hmm_stats["level2_count"],
-                    _hmm_stats["level3_count"],
-                    sender_id[:20],
-                )
-        except Exception as e:
-            logger.debug(f"[HIER-MEM] Failed: {e}")
+        return hier_memory_context
 
     # ECHO Engine: Load pending commitments for this lead (Sprint 4)
-    commitment_text = ""
-    if flags.commitment_tracking:
-        try:
-            from services.commitment_tracker import get_commitment_tracker
-            tracker = get_commitment_tracker()
-            commitment_text = await asyncio.to_thread(
-                tracker.get_pending_text, sender_id
+    async def _load_commitments(_deps):
+        if not flags.commitment_tracking:
+            return ""
+        from services.commitment_tracker import get_commitment_tracker
+        tracker = get_commitment_tracker()
+        commitment_text = await asyncio.to_thread(
+            tracker.get_pending_text, sender_id
+        )
+        if commitment_text:
+            cognitive_metadata["commitments_pending"] = True
+        return commitment_text
+
+    async def _load_rag(_deps):
+        # RAG retrieval — Conversational Adaptive RAG:
+        # Product signals activate retrieval; casual messages get ZERO retrieval.
+        # Content reference markers also trigger retrieval for "tu post/reel" queries.
+        # Dynamic product keywords: universal + creator-specific from DB
+        # Keyword extraction hits the DB on a cold cache — keep it off the event loop
+        _dynamic_kw = await asyncio.to_thread(_get_creator_product_keywords, agent.creator_id)
+        _all_product_kw = _UNIVERSAL_PRODUCT_KEYWORDS | _dynamic_kw
+        _CONTENT_REF_MARKERS = {
+            "tu post", "tu reel", "tu video", "tu vídeo", "lo que dijiste",
+            "el teu post", "el teu reel", "el teu vídeo", "el que vas dir",
+            "your post", "your reel", "your video", "what you said",
+            "tu story", "tu storie", "tu historia", "tu publicación",
+        }
+        _PRODUCT_INTENTS = {
+            "question_product", "question_price", "interest_strong",
+            "purchase_intent", "objection_price",
+        }
+        msg_lower = message.lower()
+
+        # Determine retrieval signal and preferred source routing
+        _rag_signal = None
+        _preferred_types = None
+        if not ENABLE_RAG:
+            pass
+        elif intent_value in _PRODUCT_INTENTS or any(kw in msg_lower for kw in _all_product_kw):
+            _rag_signal = "product"
+            _preferred_types = {
+                "product_catalog", "faq", "knowledge_base",
+                "expertise", "objection_handling", "policies",
+            }
+        elif any(marker in msg_lower for marker in _CONTENT_REF_MARKERS):
+            _rag_signal = "content_ref"
+            _preferred_types = {"instagram_post", "video", "carousel", "website"}
+
+        _needs_retrieval = _rag_signal is not None
+
+        rag_query = message
+        rag_results = []
+        if not ENABLE_RAG:
+            pass
+        elif not _needs_retrieval:
+            pass
+        else:
+            if ENABLE_QUERY_EXPANSION:
+                _qx_outcome = "single"
+                try:
+                    expanded = get_query_expander().expand(message, max_expansions=2)
+                    if len(expanded) > 1:
+                        rag_query = " ".join(expanded)
+                        cognitive_metadata["query_expanded"] = True
+                        _qx_outcome = "expanded"
+                except Exception as e:
+                    logger.debug(f"Query expansion failed: {e}")
+                    _qx_outcome = "error"
+                emit_metric("query_expansion_applied_total",
+                            creator_id=agent.creator_id, outcome=_qx_outcome)
+            else:
+                emit_metric("query_expansion_applied_total",
+                            creator_id=agent.creator_id, outcome="disabled")
+            # BUG-RAG-03 fix: RAG search includes blocking OpenAI API call +
+            # pgvector DB query + CPU-bound reranking. Wrap in to_thread.
+            rag_results = await asyncio.to_thread(
+                agent.semantic_rag.search,
+                rag_query, top_k=agent.config.rag_top_k, creator_id=agent.creator_id,
             )
-            if commitment_text:
-                cognitive_metadata["commitments_pending"] = True
-        except Exception as e:
-            logger.debug(f"[COMMITMENT] load failed: {e}")
+            # Source-type routing: prefer results matching the signal type
+            if rag_results and _preferred_types:
+                preferred = [
+                    r for r in rag_results
+                    if r.get("metadata", {}).get("type", "") in _preferred_types
+                ]
+                if preferred:
+                    rag_results = preferred
+                elif _rag_signal == "product":
+                    # For product queries with no product chunks, drop IG noise
+                    logger.debug("[RAG] No product/faq results — dropping IG captions")
+                    rag_results = []
+
+            # Adaptive threshold: filter by top score quality
+            if rag_results:
+                top_score = max(r.get("score", 0) for r in rag_results)
+                if top_score >= 0.5:
+                    # High confidence — inject top 3
+                    rag_results = rag_results[:3]
+                elif top_score >= 0.40:
+                    # Medium confidence — inject top 1 (only the best match)
+                    rag_results = rag_results[:1]
+                else:
+                    # Low confidence — LLM knows enough, skip injection
+                    logger.debug("[RAG] Low confidence (top=%.3f) — skipping injection", top_score)
+                    rag_results = []
+
+        return rag_query, rag_results, _rag_signal
+
+    # Every independent loader runs concurrently; latency is the longest
+    # dependency chain instead of the sum. Optional loaders that fail, time out
+    # or miss the phase deadline fall back to empty context (see loader_graph).
+    _loader_spans: Dict[str, Dict[str, Any]] = {}
+    async with _dm_repo.open_turn_session() as _turn_db:
+        _loaded = await run_loader_graph(
+            [
+                Loader("follower", _load_follower, optional=False, timeout_s=None),
+                Loader("raw_dna", _load_raw_dna),
+                Loader("conv_state", _load_state, default=("", {})),
+                Loader("dna_context", _load_dna_context, deps=("raw_dna",), default=""),
+                Loader("memory", _load_memory, default=""),
+                Loader("episodic", _load_episodic, default=""),
+                Loader("hier_memory", _load_hier_memory, deps=("follower",), default=""),
+                Loader("commitments", _load_commitments, default=""),
+                Loader("rag", _load_rag, default=(message, [], None)),
+            ],
+            spans=_loader_spans,
+        )
+    cognitive_metadata["context_loader_spans"] = _loader_spans
+
+    follower = _loaded["follower"]
+    raw_dna = _loaded["raw_dna"]
+    state_context, state_meta = _loaded["conv_state"]
+    dna_context = _loaded["dna_context"] or ""
+    memory_context = _loaded["memory"] or ""
+    episodic_context = _loaded["episodic"] or ""
+    hier_memory_context = _loaded["hier_memory"] or ""
+    commitment_text = _loaded["commitments"] or ""
+    rag_query, rag_results, _rag_signal = _loaded["rag"]
+    cognitive_metadata.update(state_meta)
 
     if dna_context:
         logger.debug(f"DNA context loaded for {sender_id}")
@@ -1154,98 +1294,6 @@ async def phase_memory_and_context(
     _t1b = time.monotonic()
     logger.info(f"[TIMING] Phase 2 sub: intent={int((_t1a - _t1) * 1000)}ms parallel_io={int((_t1b - _t1a) * 1000)}ms")
 
-    # Fast in-memory operations (no parallelization needed)
-    # RAG retrieval — Conversational Adaptive RAG:
-    # Product signals activate retrieval; casual messages get ZERO retrieval.
-    # Content reference markers also trigger retrieval for "tu post/reel" queries.
-    # Dynamic product keywords: universal + creator-specific from DB
-    _dynamic_kw = _get_creator_product_keywords(agent.creator_id)
-    _all_product_kw = _UNIVERSAL_PRODUCT_KEYWORDS | _dynamic_kw
-    _CONTENT_REF_MARKERS = {
-        "tu post", "tu reel", "tu video", "tu vídeo", "lo que dijiste",
-        "el teu post", "el teu reel", "el teu vídeo", "el que vas dir",
-        "your post", "your reel", "your video", "what you said",
-        "tu story", "tu storie", "tu historia", "tu publicación",
-    }
-    _PRODUCT_INTENTS = {
-        "question_product", "question_price", "interest_strong",
-        "purchase_intent", "objection_price",
-    }
-    msg_lower = message.lower()
-
-    # Determine retrieval signal and preferred source routing
-    _rag_signal = None
-    _preferred_types = None
-    if not ENABLE_RAG:
-        pass
-    elif intent_value in _PRODUCT_INTENTS or any(kw in msg_lower for kw in _all_product_kw):
-        _rag_signal = "product"
-        _preferred_types = {
-            "product_catalog", "faq", "knowledge_base",
-            "expertise", "objection_handling", "policies",
-        }
-    elif any(marker in msg_lower for marker in _CONTENT_REF_MARKERS):
-        _rag_signal = "content_ref"
-        _preferred_types = {"instagram_post", "video", "carousel", "website"}
-
-    _needs_retrieval = _rag_signal is not None
-
-    rag_query = message
-    rag_results = []
-    if not ENABLE_RAG:
-        pass
-    elif not _needs_retrieval:
-        pass
-    else:
-        if ENABLE_QUERY_EXPANSION:
-            _qx_outcome = "single"
-            try:
-                expanded = get_query_expander().expand(message, max_expansions=2)
-                if len(expanded) > 1:
-                    rag_query = " ".join(expanded)
-                    cognitive_metadata["query_expanded"] = True
-                    _qx_outcome = "expanded"
-            except Exception as e:
-                logger.debug(f"Query expansion failed: {e}")
-                _qx_outcome = "error"
-            emit_metric("query_expansion_applied_total",
-                        creator_id=agent.creator_id, outcome=_qx_outcome)
-        else:
-            emit_metric("query_expansion_applied_total",
-                        creator_id=agent.creator_id, outcome="disabled")
-        # BUG-RAG-03 fix: RAG search includes blocking OpenAI API call +
-        # pgvector DB query + CPU-bound reranking. Wrap in to_thread.
-        rag_results = await asyncio.to_thread(
-            agent.semantic_rag.search,
-            rag_query, top_k=agent.config.rag_top_k, creator_id=agent.creator_id,
-        )
-        # Source-type routing: prefer results matching the signal type
-        if rag_results and _preferred_types:
-            preferred = [
-                r for r in rag_results
-                if r.get("metadata", {}).get("type", "") in _preferred_types
-            ]
-            if preferred:
-                rag_results = preferred
-            elif _rag_signal == "product":
-                # For product queries with no product chunks, drop IG noise
-                logger.debug("[RAG] No product/faq results — dropping IG captions")
-                rag_results = []
-
-        # Adaptive threshold: filter by top score quality
-        if rag_results:
-            top_score = max(r.get("score", 0) for r in rag_results)
-            if top_score >= 0.5:
-                # High confidence — inject top 3
-                rag_results = rag_results[:3]
-            elif top_score >= 0.40:
-                # Medium confidence — inject top 1 (only the best match)
-                rag_results = rag_results[:1]
-            else:
-                # Low confidence — LLM knows enough, skip injection
-                logger.debug("[RAG] Low confidence (top=%.3f) — skipping injection", top_score)
-                rag_results = []
-
     if rag_results:
         _rag_scores = [r.get("score", 0) for r in rag_results]
         _rag_types = [r.get("metadata", {}).get("type", "?") for r in rag_results]
@@ -1562,20 +1610,15 @@ async def phase_memory_and_context(
                 style_profile_from_analyzer,
             )
             from core.style_analyzer import load_profile_from_db
-            from api.database import SessionLocal
-            from api.models import Creator
+            from core.identity_map import identity_map
 
             # Load StyleProfile for modulation
             def _load_style_profile():
-                session = SessionLocal()
-                try:
-                    creator = session.query(Creator).filter_by(name=agent.creator_id).first()
-                    if not creator:
-                        return None
-                    raw = load_profile_from_db(str(creator.id))
-                    return style_profile_from_analyzer(raw)
-                finally:
-                    session.close()
+                creator_uuid = identity_map.resolve_creator_uuid(agent.creator_id)
+                if not creator_uuid:
+                    return None
+                raw = load_profile_from_db(creator_uuid)
+                return style_profile_from_analyzer(raw)
 
             _sp = await asyncio.to_thread(_load_style_profile)
 
@@ -1722,34 +1765,31 @@ async def phase_memory_and_context(
     _crm_full_name = ""
     try:
         def _load_lead_crm(creator_slug: str, platform_uid: str):
-            from api.models.creator import Creator
+            import uuid
             from api.models.lead import Lead
             from api.services.db_service import get_session as db_get_session
+            from core.identity_map import identity_map
+            try:
+                # With and without ig_ prefix (the identity map matches both)
+                creator_uuid = identity_map.resolve_creator_uuid(creator_slug)
+                lead_uuid = creator_uuid and identity_map.resolve_lead_uuid(creator_uuid, platform_uid)
+            except Exception:
+                return None
+            if not lead_uuid:
+                return None
             s = db_get_session()
             if not s:
                 return None
             try:
-                creator = s.query(Creator).filter_by(name=creator_slug).first()
-                if not creator:
-                    return None
-                # Try both with and without ig_ prefix
-                pids = [platform_uid]
-                if platform_uid.startswith("ig_"):
-                    pids.append(platform_uid[3:])
-                else:
-                    pids.append(f"ig_{platform_uid}")
-                for pid in pids:
-                    lead = s.query(Lead).filter_by(
-                        creator_id=creator.id, platform_user_id=pid
-                    ).first()
-                    if lead:
-                        return {
-                            "tags": lead.tags or [],
-                            "deal_value": lead.deal_value or 0.0,
-                            "notes": (lead.notes or "")[:200],
-                            "status": lead.status or "",
-                            "full_name": lead.full_name or "",
-                        }
+                lead = s.get(Lead, uuid.UUID(lead_uuid))
+                if lead:
+                    return {
+                        "tags": lead.tags or [],
+                        "deal_value": lead.deal_value or 0.0,
+                        "notes": (lead.notes or "")[:200],
+                        "status": lead.status or "",
+                        "full_name": lead.full_name or "",
+                    }
                 return None
             except Exception:
                 return None
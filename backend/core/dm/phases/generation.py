@@ -22,32 +22,6 @@ from services import LLMResponse
 
 logger = logging.getLogger(__name__)
 
-
-def _truncate_if_looping(text: str) -> tuple[bool, str]:
-    """Detect and truncate character-level repetition loops.
-
-    Returns (was_degenerate, cleaned_text).
-    """
-    if len(text) < 20:
-        return False, text
-
-    MIN_SUB = 10
-    lower = text.lower()
-    n = len(lower)
-
-    # Cap scan start at 30 to avoid false positives on mid-sentence repetitions
-    scan_limit = min(30, n - MIN_SUB)
-    for start in range(scan_limit):
-        sub = lower[start:start + MIN_SUB]
-        pos = lower.find(sub, start + MIN_SUB)
-        if pos != -1:
-            trunc = text[:pos].rstrip(" ,!?¡¿")
-            if len(trunc) >= 3:
-                return True, trunc
-
-    return False, text
-
-
 # Feature flags for generation phase.
 # ENABLE_QUESTION_HINTS kept as proxy to ``flags.question_hints`` so tests that
 # patch this module-level name keep working. See core/feature_flags.py.
@@ -280,16 +254,12 @@ async def phase_llm_generation(
             )
 
             def _load_profile():
-                from api.database import SessionLocal
-                from api.models import Creator
-                _s = SessionLocal()
-                try:
-                    _c = _s.query(Creator.id).filter_by(name=agent.creator_id).first()
-                    if not _c:
-                        return None
-                    return compute_preference_profile(_c[0])
-                finally:
-                    _s.close()
+                import uuid
+                from core.identity_map import identity_map
+                _cid = identity_map.resolve_creator_uuid(agent.creator_id)
+                if not _cid:
+                    return None
+                return compute_preference_profile(uuid.UUID(_cid))
 
             _profile = await asyncio.to_thread(_load_profile)
             if _profile:
@@ -311,21 +281,17 @@ async def phase_llm_generation(
             _conv_language = detect_language(message) if message else None
 
             def _load_examples():
-                from api.database import SessionLocal
-                from api.models import Creator
-                _s = SessionLocal()
-                try:
-                    _c = _s.query(Creator.id).filter_by(name=agent.creator_id).first()
-                    if not _c:
-                        return []
-                    return get_matching_examples(
-                        _c[0], intent=intent_value,
-                        relationship_type=_rel_type,
-                        lead_stage=current_stage,
-                        language=_conv_language,
-                    )
-                finally:
-                    _s.close()
+                import uuid
+                from core.identity_map import identity_map
+                _cid = identity_map.resolve_creator_uuid(agent.creator_id)
+                if not _cid:
+                    return []
+                return get_matching_examples(
+                    uuid.UUID(_cid), intent=intent_value,
+                    relationship_type=_rel_type,
+                    lead_stage=current_stage,
+                    language=_conv_language,
+                )
 
             _gold_examples = await asyncio.to_thread(_load_examples)
             if _gold_examples:
@@ -437,6 +403,7 @@ async def phase_llm_generation(
     # LLM generation: Flash-Lite → GPT-4o-mini (2 providers, nothing else)
     # Path: webhook → process_dm() → generate_dm_response() → gemini/openai
     from core.providers.gemini_provider import generate_dm_response
+    from core.providers.prefix_cache import bound_prompt_prefix
 
     # Build multi-turn messages: system + history turns + current user message.
     # History is passed as separate user/assistant messages so the LLM sees full
@@ -618,12 +585,34 @@ async def phase_llm_generation(
         # TODO: re-enable after bisect confirms it's not the culprit.
         cognitive_metadata["temperature_used"] = _llm_temperature
 
+        # Streaming: runaway replies are aborted mid-stream. None → blocking cascade below.
+        llm_result = None
+        from core.dm import streaming as _dm_streaming
+        if _dm_streaming.ENABLE_DM_STREAMING:
+            try:
+                with bound_prompt_prefix(agent.creator_id, system_prompt, cognitive_metadata):
+                    llm_result = await _dm_streaming.stream_dm_response(
+                        llm_messages,
+                        max_tokens=_llm_max_tokens,
+                        temperature=_llm_temperature,
+                    )
+            except Exception as _stream_err:
+                logger.warning("[DM-STREAM] failed, using blocking generation: %s", _stream_err)
+            # A hedged Flash-Lite reply wins without streaming
+            if llm_result and llm_result.get("streamed"):
+                cognitive_metadata["stream_first_token_ms"] = llm_result.get("first_token_ms")
+                if llm_result.get("stream_abort"):
+                    cognitive_metadata["stream_abort"] = llm_result["stream_abort"]
+
         try:
-            llm_result = await generate_dm_response(
-                llm_messages,
-                max_tokens=_llm_max_tokens,
-                temperature=_llm_temperature,
-            )
+            # Providers reuse the creator's cached static prefix (cache_prefix_* from the context phase)
+            if llm_result is None:
+                with bound_prompt_prefix(agent.creator_id, system_prompt, cognitive_metadata):
+                    llm_result = await generate_dm_response(
+                        llm_messages,
+                        max_tokens=_llm_max_tokens,
+                        temperature=_llm_temperature,
+                    )
         except Exception as _gen_exc:
             if _breaker and _cb_failure_type_cls:
                 try:
@@ -631,6 +620,8 @@ async def phase_llm_generation(
                 except Exception:
                     pass
             raise
+        if llm_result and llm_result.get("cached_tokens") is not None:
+            cognitive_metadata["cached_prompt_tokens"] = llm_result["cached_tokens"]
 
         # G6: Truncation recovery — retry only when API signals max_tokens was hit.
         # Detection: finish_reason == "length" (OpenAI standard, propagated by all providers).
@@ -653,11 +644,12 @@ async def phase_llm_generation(
                     _retry_n + 1, MAX_TRUNCATION_RETRIES, _retry_cap,
                 )
                 try:
-                    _retry_result = await generate_dm_response(
-                        llm_messages,
-                        max_tokens=_retry_cap,
-                        temperature=_llm_temperature,
-                    )
+                    with bound_prompt_prefix(agent.creator_id, system_prompt, cognitive_metadata):
+                        _retry_result = await generate_dm_response(
+                            llm_messages,
+                            max_tokens=_retry_cap,
+                            temperature=_llm_temperature,
+                        )
                     if _retry_result:
                         # Keep the longest result; stop if API no longer signals truncation
                         if len(_retry_result.get("content", "")) > len(_best_result.get("content", "")):
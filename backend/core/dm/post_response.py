@@ -435,27 +435,14 @@ def trigger_identity_resolution(agent, sender_id: str, platform: str) -> None:
     if not flags.identity_resolver:
         return
     try:
-        from api.services.db_service import get_session
-        from api.models import Lead
+        from core.identity_map import identity_map
 
-        session = get_session()
-        if not session:
+        creator_uuid = identity_map.resolve_creator_uuid(agent.creator_id)
+        if not creator_uuid:
+            return
+        lead_id = identity_map.resolve_lead_uuid(creator_uuid, sender_id)
+        if not lead_id:
             return
-        try:
-            from api.models import Creator
-            creator = session.query(Creator).filter_by(name=agent.creator_id).first()
-            if not creator:
-                return
-            lead = (
-                session.query(Lead)
-                .filter(Lead.creator_id == creator.id, Lead.platform_user_id == sender_id)
-                .first()
-            )
-            if not lead:
-                return
-            lead_id = str(lead.id)
-        finally:
-            session.close()
 
         from core.identity_resolver import resolve_identity
         asyncio.create_task(resolve_identity(agent.creator_id, lead_id, platform))
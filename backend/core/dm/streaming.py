@@ -0,0 +1,178 @@
+"""Streaming DM generation with early aborts.
+
+With ENABLE_DM_STREAMING, the generation phase streams the reply from the
+primary provider (SSE) instead of waiting for the whole completion:
+
+- DMStreamMonitor sees every text delta and aborts a runaway reply: a
+  repetition loop found by _truncate_if_looping, or the guardrails'
+  2000-char length limit. Closing the stream drops the provider
+  connection, so a looping generation stops burning tokens. The reply is
+  still split and sent after post-processing (guardrails may rewrite the
+  text): streaming saves wasted generation, not time to first bubble.
+- stream_dm_response() returns the same result dict as
+  generate_dm_response(), or None when the primary provider cannot stream
+  or fails before producing text; the caller then runs the blocking cascade.
+  Usage is logged to llm_usage_log like the blocking calls, and a
+  non-Gemini primary is hedged against Flash-Lite on its first token
+  (core/providers/hedging.py).
+
+Only the legacy LLM_PRIMARY_PROVIDER path streams (gemini, deepinfra); with
+LLM_MODEL_NAME set, generation stays blocking.
+
+Env vars:
+  ENABLE_DM_STREAMING      — "true" to stream DM replies (default: false)
+  DM_STREAM_LOOP_MIN_CHARS — reply length before loop aborts apply (default: 160)
+  DM_STREAM_MAX_CHARS      — hard cap on a streamed reply (default: 2000, the guardrail limit)
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Callable, Optional, Tuple
+
+from core.dm.text_utils import _truncate_if_looping
+from core.observability.metrics import emit_metric
+
+logger = logging.getLogger(__name__)
+
+ENABLE_DM_STREAMING = os.getenv("ENABLE_DM_STREAMING", "false").lower() == "true"
+# The blocking-path loop detector is disabled because it cut natural short
+# repetition ("Buaaaaa tiaaaa"); while streaming it only fires on replies
+# already longer than a DM should be (median creator message is ~22 chars).
+DM_STREAM_LOOP_MIN_CHARS = int(os.getenv("DM_STREAM_LOOP_MIN_CHARS", "160"))
+DM_STREAM_MAX_CHARS = int(os.getenv("DM_STREAM_MAX_CHARS", "2000"))
+
+
+class DMStreamMonitor:
+    """Watches a DM reply as it streams and aborts it once it runs away."""
+
+    def __init__(
+        self,
+        loop_min_chars: int = DM_STREAM_LOOP_MIN_CHARS,
+        max_chars: int = DM_STREAM_MAX_CHARS,
+    ):
+        self.loop_min_chars = loop_min_chars
+        self.max_chars = max_chars
+        self.text = ""
+        self.abort_reason: Optional[str] = None
+
+    def feed(self, delta: str) -> Optional[str]:
+        """Add a text delta. Returns the abort reason once the stream should stop."""
+        if self.abort_reason:
+            return self.abort_reason
+        self.text += delta
+
+        if len(self.text) >= self.loop_min_chars:
+            looping, cleaned = _truncate_if_looping(self.text)
+            if looping:
+                logger.warning("[DM-STREAM] repetition loop after %d chars, aborting: %r", len(self.text), cleaned[:80])
+                self.text = cleaned
+                self.abort_reason = "loop"
+                return self.abort_reason
+        if len(self.text) > self.max_chars:
+            logger.warning("[DM-STREAM] reply past %d chars, aborting", self.max_chars)
+            self.text = self.text[:self.max_chars]
+            self.abort_reason = "too_long"
+            return self.abort_reason
+        return None
+
+    def finish(self) -> str:
+        """Return the reply text."""
+        return self.text.strip()
+
+
+def _primary_streamer() -> Optional[Tuple[str, Callable]]:
+    """(provider, streaming function) for the primary provider, or None if it cannot stream."""
+    from core.config.llm_models import LLM_PRIMARY_PROVIDER, get_active_model_config
+
+    if get_active_model_config():
+        return None
+    if LLM_PRIMARY_PROVIDER == "gemini":
+        from core.providers.gemini_provider import stream_gemini
+        return "gemini", stream_gemini
+    if LLM_PRIMARY_PROVIDER == "deepinfra":
+        from core.providers.deepinfra_provider import stream_deepinfra
+        return "deepinfra", stream_deepinfra
+    return None
+
+
+async def stream_dm_response(
+    messages: list[dict],
+    max_tokens: int = 60,
+    temperature: float = 0.7,
+) -> Optional[dict]:
+    """Stream a DM reply from the primary provider.
+
+    Returns the provider result dict plus streamed=True, first_token_ms and
+    stream_abort (None, "loop", "too_long", or "stream_error" when the
+    connection broke mid-reply). An aborted reply carries finish_reason
+    "aborted" so truncation recovery does not retry it.
+    A non-Gemini primary is hedged like the blocking cascade, on time to
+    first token: if Flash-Lite answers first, its (non-streamed) result is
+    returned and the stream is dropped.
+    Returns None when streaming is unavailable or fails before any text.
+    """
+    primary = _primary_streamer()
+    if primary is None:
+        return None
+    provider, streamer = primary
+
+    from core.providers.gemini_provider import _async_log_usage, _gemini_hedge_backup
+    from core.providers.hedging import hedged_first_token
+
+    monitor = DMStreamMonitor()
+    meta: dict = {"provider": provider}
+    start = time.monotonic()
+    first_token_ms = None
+    backup = _gemini_hedge_backup(messages, max_tokens, temperature) if provider != "gemini" else None
+    stream = streamer(messages, max_tokens, temperature, meta)
+    try:
+        delta, backup_result = await hedged_first_token(provider, lambda: anext(stream, None), backup)
+        if backup_result is not None:
+            emit_metric("dm_stream_total", provider=provider, outcome="hedged")
+            return backup_result
+        while delta is not None:
+            if first_token_ms is None:
+                first_token_ms = int((time.monotonic() - start) * 1000)
+            if monitor.feed(delta):
+                break
+            delta = await anext(stream, None)
+    except Exception as e:
+        if not monitor.text:
+            logger.warning("[DM-STREAM] %s stream failed before first token: %s", provider, e)
+            emit_metric("dm_stream_total", provider=provider, outcome="failed")
+            return None
+        logger.warning("[DM-STREAM] %s stream broke after %d chars: %s", provider, len(monitor.text), e)
+        monitor.abort_reason = "stream_error"
+    finally:
+        await stream.aclose()
+
+    content = monitor.finish()
+    if not content:
+        emit_metric("dm_stream_total", provider=provider, outcome="empty")
+        return None
+
+    outcome = f"aborted_{monitor.abort_reason}" if monitor.abort_reason else "completed"
+    emit_metric("dm_stream_total", provider=meta["provider"], outcome=outcome)
+    latency_ms = int((time.monotonic() - start) * 1000)
+    logger.info(
+        "[DM-STREAM] %s %s: first_token=%sms total=%dms len=%d",
+        meta["provider"], outcome, first_token_ms, latency_ms, len(content),
+    )
+    result = {
+        "content": content,
+        "model": meta.get("model", "unknown"),
+        "provider": meta["provider"],
+        "latency_ms": latency_ms,
+        "tokens_in": meta.get("tokens_in", 0),
+        "tokens_out": meta.get("tokens_out", 0),
+        "cached_tokens": meta.get("cached_tokens", 0),
+        "finish_reason": "aborted" if monitor.abort_reason else meta.get("finish_reason", "stop"),
+        "streamed": True,
+        "first_token_ms": first_token_ms,
+        "stream_abort": monitor.abort_reason,
+    }
+    # Aborted replies still billed the tokens they streamed
+    asyncio.create_task(_async_log_usage(result, "dm_response"))
+    return result
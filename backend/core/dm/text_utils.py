@@ -5,6 +5,7 @@ Text utility functions for DM Agent V2.
 - Product name matching (fuzzy, accent-insensitive)
 - Sentence-aware text truncation
 - Smart context truncation preserving recent conversation
+- Character-level repetition loop detection
 - Argentine voseo conversion
 - Adaptive max_tokens based on message category
 """
@@ -264,6 +265,31 @@ _PRODUCT_STOPWORDS = frozenset({
 })
 
 
+def _truncate_if_looping(text: str) -> tuple[bool, str]:
+    """Detect and truncate character-level repetition loops.
+
+    Returns (was_degenerate, cleaned_text).
+    """
+    if len(text) < 20:
+        return False, text
+
+    MIN_SUB = 10
+    lower = text.lower()
+    n = len(lower)
+
+    # Cap scan start at 30 to avoid false positives on mid-sentence repetitions
+    scan_limit = min(30, n - MIN_SUB)
+    for start in range(scan_limit):
+        sub = lower[start:start + MIN_SUB]
+        pos = lower.find(sub, start + MIN_SUB)
+        if pos != -1:
+            trunc = text[:pos].rstrip(" ,!?¡¿")
+            if len(trunc) >= 3:
+                return True, trunc
+
+    return False, text
+
+
 def _strip_accents(text: str) -> str:
     """Remove accents/diacritics for fuzzy matching."""
     nfkd = unicodedata.normalize("NFKD", text)
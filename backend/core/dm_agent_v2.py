@@ -67,6 +67,7 @@ from core.dm.follower_api import (  # noqa: F401
 from core.dm.agent import (  # noqa: F401
     DMResponderAgentV2,
     DMResponderAgent,
+    aget_dm_agent,
     get_dm_agent,
     invalidate_dm_agent_cache,
 )
@@ -0,0 +1,308 @@
+"""
+Per-conversation burst coalescing before DM generation.
+
+Followers often send a thought as three or four short DMs in a row. Each one
+used to run a full DMResponderAgentV2.process_dm (intent, memory, RAG, LLM)
+and produce its own reply. The DMCoalescer buffers the text messages of one
+(creator, lead) for a quiet window and runs a single pipeline pass over the
+whole burst:
+
+- every new message restarts the window, up to DM_COALESCE_MAX_WAIT_MS after
+  the first one (or at once when DM_COALESCE_MAX_BATCH messages are buffered);
+- a message that arrives while the burst is being generated cancels that
+  generation; the burst, now including the new message, waits for a fresh
+  window and is generated again. A generation that already finished is
+  never cancelled, so a reply is never half-sent;
+- the caller that submitted the burst's last message gets the result
+  (CoalescedTurn.result). Earlier callers get absorbed=True and must not
+  reply.
+
+Only generation is coalesced: callers keep persisting each inbound message
+themselves. With a window of 0 (the default) submit() runs generate() right
+away for the one message, which is the pre-coalescing behaviour.
+
+With the durable webhook queue (core.webhook_queue) the window is waited out
+in the queue instead: the consumer claims a conversation's events together
+and runs them through a QueuedBurst, so the events stay claimed until their
+one reply has been produced. Only the events whose pipeline failed are
+retried (webhook_queue.BatchFailed).
+
+Env vars:
+  DM_COALESCE_WINDOW_MS            — quiet window for every platform (default: 0 = off)
+  DM_COALESCE_WINDOW_MS_<PLATFORM> — per-platform override, e.g. DM_COALESCE_WINDOW_MS_WHATSAPP=3000
+  DM_COALESCE_MAX_WAIT_MS          — longest a burst's first message waits (default: 8000)
+  DM_COALESCE_MAX_BATCH            — generate at once with this many messages buffered (default: 8)
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from core.observability.metrics import emit_metric
+from core.webhook_queue import BatchFailed
+
+logger = logging.getLogger(__name__)
+
+DM_COALESCE_WINDOW_MS = int(os.getenv("DM_COALESCE_WINDOW_MS", "0"))
+DM_COALESCE_MAX_WAIT_S = int(os.getenv("DM_COALESCE_MAX_WAIT_MS", "8000")) / 1000
+DM_COALESCE_MAX_BATCH = int(os.getenv("DM_COALESCE_MAX_BATCH", "8"))
+
+
+def coalesce_window_s(platform: str) -> float:
+    """Quiet window for a platform in seconds (0 = coalescing off)."""
+    raw = os.getenv(f"DM_COALESCE_WINDOW_MS_{platform.upper()}")
+    try:
+        window_ms = int(raw) if raw is not None else DM_COALESCE_WINDOW_MS
+    except ValueError:
+        window_ms = DM_COALESCE_WINDOW_MS
+    return max(window_ms, 0) / 1000
+
+
+def coalescing_enabled(platform: str) -> bool:
+    return coalesce_window_s(platform) > 0
+
+
+@dataclass
+class CoalescedTurn:
+    """One conversational turn: the burst's messages in arrival order and the generation result."""
+
+    items: List[Any]
+    result: Any = None
+    absorbed: bool = False  # this caller's message was answered by a later caller's turn
+
+    @property
+    def batch_size(self) -> int:
+        return len(self.items)
+
+
+@dataclass
+class _Burst:
+    platform: str
+    generate: Callable[[List[Any]], Awaitable[Any]]
+    first_at: float
+    deadline: float
+    items: List[Any] = field(default_factory=list)
+    futures: List[asyncio.Future] = field(default_factory=list)
+    wake: asyncio.Event = field(default_factory=asyncio.Event)
+    worker: Optional[asyncio.Task] = None
+    generation: Optional[asyncio.Task] = None
+
+
+class DMCoalescer:
+    """Buffers inbound messages per conversation and generates one reply per burst."""
+
+    def __init__(
+        self,
+        max_wait_s: float = DM_COALESCE_MAX_WAIT_S,
+        max_batch: int = DM_COALESCE_MAX_BATCH,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_wait_s = max_wait_s
+        self.max_batch = max(1, max_batch)
+        self.clock = clock
+        self._bursts: Dict[str, _Burst] = {}
+        self.counters: Counter = Counter()
+
+    async def submit(
+        self,
+        platform: str,
+        key: str,
+        item: Any,
+        generate: Callable[[List[Any]], Awaitable[Any]],
+        window_s: Optional[float] = None,
+    ) -> CoalescedTurn:
+        """Add a message to its conversation's burst and wait for the burst's turn.
+
+        generate receives every buffered message in arrival order; the most
+        recently submitted callable is used.
+        """
+        window = coalesce_window_s(platform) if window_s is None else window_s
+        if window <= 0:
+            return CoalescedTurn(items=[item], result=await generate([item]))
+        queued = _queued_burst.get()
+        if queued is not None:
+            return await queued.park(platform, key, item, generate)
+
+        now = self.clock()
+        burst = self._bursts.get(key)
+        if burst is None:
+            burst = _Burst(platform=platform, generate=generate, first_at=now, deadline=now)
+            self._bursts[key] = burst
+        burst.generate = generate
+        burst.items.append(item)
+        future = asyncio.get_running_loop().create_future()
+        burst.futures.append(future)
+        burst.deadline = min(now + window, burst.first_at + self.max_wait_s)
+        if len(burst.items) >= self.max_batch:
+            burst.deadline = now
+
+        if burst.generation is not None and not burst.generation.done():
+            burst.generation.cancel()
+            self.counters["superseded"] += 1
+            emit_metric("dm_coalesce_superseded_total", platform=platform)
+            logger.info(f"[COALESCE] {key}: new message mid-generation, superseding in-flight run")
+
+        if burst.worker is None or burst.worker.done():
+            burst.worker = asyncio.create_task(self._run(key, burst), name=f"dm-coalesce:{key}")
+        else:
+            burst.wake.set()
+        return await future
+
+    async def _run(self, key: str, burst: _Burst) -> None:
+        while True:
+            delay = burst.deadline - self.clock()
+            if delay > 0:
+                burst.wake.clear()
+                try:
+                    await asyncio.wait_for(burst.wake.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            batch = list(burst.items)
+            burst.generation = asyncio.create_task(burst.generate(batch))
+            await asyncio.wait([burst.generation])
+            if burst.generation.cancelled():
+                continue  # superseded: the burst grew and its deadline moved
+
+            futures = burst.futures[:len(batch)]
+            del burst.items[:len(batch)]
+            del burst.futures[:len(batch)]
+            self._finish_turn(key, burst, batch, futures, burst.generation)
+
+            if not burst.items:
+                self._bursts.pop(key, None)
+                return
+            # Messages that raced the end of generation start the next turn
+            burst.first_at = self.clock()
+
+    def _finish_turn(self, key, burst, batch, futures, generation) -> None:
+        error = generation.exception()
+        for future in futures[:-1]:
+            if not future.done():
+                future.set_result(CoalescedTurn(items=batch, absorbed=True))
+        last = futures[-1]
+        if not last.done():
+            if error is not None:
+                last.set_exception(error)
+            else:
+                last.set_result(CoalescedTurn(items=batch, result=generation.result()))
+
+        saved = len(batch) - 1
+        self.counters["turns"] += 1
+        self.counters["messages"] += len(batch)
+        self.counters["passes_saved"] += saved
+        emit_metric("dm_coalesce_batch_size", len(batch), platform=burst.platform)
+        if saved:
+            emit_metric("dm_coalesce_passes_saved_total", saved, platform=burst.platform)
+            logger.info(f"[COALESCE] {key}: {len(batch)} messages answered in one pass")
+
+    def stats(self) -> Dict[str, Any]:
+        turns = self.counters["turns"]
+        return {
+            "open_bursts": len(self._bursts),
+            "turns": turns,
+            "messages": self.counters["messages"],
+            "passes_saved": self.counters["passes_saved"],
+            "superseded": self.counters["superseded"],
+            "avg_batch_size": round(self.counters["messages"] / turns, 2) if turns else None,
+        }
+
+
+_queued_burst: ContextVar[Optional["QueuedBurst"]] = ContextVar("dm_queued_burst", default=None)
+
+
+class QueuedBurst:
+    """Runs one conversation's claimed queue events as a single turn.
+
+    The queue consumer has already waited out the coalescing window. run()
+    starts each event's pipeline in arrival order, the next one once the
+    previous has finished or parked its message in DMCoalescer.submit().
+    Parked messages are then generated in one pass per conversation: the
+    last one gets the result, earlier ones are absorbed, exactly as with the
+    in-process window.
+    """
+
+    def __init__(self, coalescer: Optional[DMCoalescer] = None):
+        self.coalescer = coalescer or get_dm_coalescer()
+        self._parked: Dict[str, _Burst] = {}
+        self._progress = asyncio.Event()
+
+    def park(self, platform: str, key: str, item: Any,
+             generate: Callable[[List[Any]], Awaitable[Any]]) -> "asyncio.Future[CoalescedTurn]":
+        burst = self._parked.get(key)
+        if burst is None:
+            burst = _Burst(platform=platform, generate=generate, first_at=0.0, deadline=0.0)
+            self._parked[key] = burst
+        burst.generate = generate
+        burst.items.append(item)
+        future = asyncio.get_running_loop().create_future()
+        burst.futures.append(future)
+        self._progress.set()
+        return future
+
+    async def run(self, coros: Iterable[Awaitable[Any]]) -> None:
+        """Run the events' pipelines; once all have ended, raises BatchFailed if any failed."""
+        token = _queued_burst.set(self)
+        tasks: List[asyncio.Task] = []
+        try:
+            for coro in coros:
+                self._progress.clear()
+                tasks.append(asyncio.ensure_future(coro))
+                await self._wait_progress(tasks[-1:])
+            while True:
+                self._progress.clear()
+                if self._parked:
+                    await self._generate_parked()
+                    continue
+                pending = [t for t in tasks if not t.done()]
+                if not pending:
+                    break
+                await self._wait_progress(pending)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+        finally:
+            _queued_burst.reset(token)
+        errors = [task.exception() for task in tasks]
+        if any(e is not None for e in errors):
+            raise BatchFailed(errors)
+
+    async def _wait_progress(self, tasks: List[asyncio.Task]) -> None:
+        waiter = asyncio.ensure_future(self._progress.wait())
+        try:
+            await asyncio.wait([*tasks, waiter], return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            waiter.cancel()
+
+    async def _generate_parked(self) -> None:
+        parked, self._parked = self._parked, {}
+        for key, burst in parked.items():
+            batch = list(burst.items)
+            generation = asyncio.ensure_future(burst.generate(batch))
+            await asyncio.wait([generation])
+            self.coalescer._finish_turn(key, burst, batch, burst.futures, generation)
+
+
+_coalescer: Optional[DMCoalescer] = None
+
+
+def get_dm_coalescer() -> DMCoalescer:
+    global _coalescer
+    if _coalescer is None:
+        _coalescer = DMCoalescer()
+    return _coalescer
+
+
+def get_dm_coalescer_stats() -> Dict[str, Any]:
+    stats = get_dm_coalescer().stats()
+    stats["windows_ms"] = {
+        p: int(coalesce_window_s(p) * 1000) for p in ("instagram", "whatsapp", "telegram")
+    }
+    return stats
@@ -0,0 +1,244 @@
+"""
+Two-tier embedding cache: in-process BoundedTTLCache + durable Postgres store.
+
+The in-process tier (core.embeddings._embedding_cache) only lives 10 minutes
+and dies with the worker, so every redeploy re-embedded the same queries,
+memory facts and contextual-prefix texts through the paid Gemini API.
+The durable tier keeps vectors in the ``embedding_cache`` table (migration 052)
+keyed by (model, task_type, dimensions, sha256(text)).
+
+Everything that embeds through core.embeddings shares it: generate_embedding,
+generate_embeddings_batch / agenerate_embeddings_batch, SemanticMemoryPgvector,
+MemoryEngine and the contextual-prefix path.
+
+Fail-open: if the DB is missing or errors, the durable tier is skipped for
+EMBEDDING_STORE_RETRY_SECONDS and callers just see a miss.
+
+Env vars:
+  ENABLE_PERSISTENT_EMBEDDING_CACHE — enable the durable tier (default: true)
+  EMBEDDING_CACHE_MAX_ROWS          — rows kept before LRU eviction (default: 200000)
+  EMBEDDING_CACHE_EVICT_EVERY       — run eviction every N stored rows (default: 1000)
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from array import array
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+ENABLE_PERSISTENT_EMBEDDING_CACHE = (
+    os.getenv("ENABLE_PERSISTENT_EMBEDDING_CACHE", "true").lower() == "true"
+)
+EMBEDDING_CACHE_MAX_ROWS = int(os.getenv("EMBEDDING_CACHE_MAX_ROWS", "200000"))
+EMBEDDING_CACHE_EVICT_EVERY = int(os.getenv("EMBEDDING_CACHE_EVICT_EVERY", "1000"))
+EMBEDDING_STORE_RETRY_SECONDS = 60
+
+
+# Bumped when the text normalisation changes, so rows keyed the old way are
+# never read again (v1 lowercased the text; the model is case-sensitive)
+# and age out through LRU eviction.
+_KEY_VERSION = "v2"
+
+
+def embedding_cache_key(text: str, task_type: str, model: str, dimensions: int) -> str:
+    """Cache key shared by both tiers: v2:model:task_type:dims:sha256(stripped text)."""
+    digest = hashlib.sha256(text.strip().encode("utf-8")).hexdigest()
+    return f"{_KEY_VERSION}:{model}:{task_type}:{dimensions}:{digest}"
+
+
+def _encode(vector: List[float]) -> bytes:
+    return array("f", vector).tobytes()
+
+
+def _decode(blob: bytes) -> List[float]:
+    arr = array("f")
+    arr.frombytes(bytes(blob))
+    return arr.tolist()
+
+
+class DurableEmbeddingStore:
+    """Postgres-backed embedding store with bulk get/put and LRU eviction."""
+
+    def __init__(
+        self,
+        max_rows: int = EMBEDDING_CACHE_MAX_ROWS,
+        evict_every: int = EMBEDDING_CACHE_EVICT_EVERY,
+        enabled: bool = ENABLE_PERSISTENT_EMBEDDING_CACHE,
+    ):
+        self.max_rows = max_rows
+        self.evict_every = evict_every
+        self.enabled = enabled
+        self._disabled_until = 0.0
+        self._puts_since_evict = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.errors = 0
+
+    def _session(self):
+        if not self.enabled or time.monotonic() < self._disabled_until:
+            return None
+        try:
+            from api.database import SessionLocal
+        except Exception:
+            return None
+        if SessionLocal is None:
+            return None
+        return SessionLocal()
+
+    def _fail(self, op: str, exc: Exception) -> None:
+        self.errors += 1
+        self._disabled_until = time.monotonic() + EMBEDDING_STORE_RETRY_SECONDS
+        logger.warning(
+            "[EMBEDDING-CACHE] durable %s failed (%s) — skipping store for %ds",
+            op, exc, EMBEDDING_STORE_RETRY_SECONDS,
+        )
+
+    def bulk_get(self, keys: Iterable[str]) -> Dict[str, List[float]]:
+        """Return {key: vector} for the keys present in the store."""
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+        db = self._session()
+        if db is None:
+            return {}
+        try:
+            from sqlalchemy import bindparam, text
+
+            rows = db.execute(
+                text(
+                    "SELECT cache_key, embedding FROM embedding_cache "
+                    "WHERE cache_key IN :keys"
+                ).bindparams(bindparam("keys", expanding=True)),
+                {"keys": keys},
+            ).fetchall()
+            found = {row.cache_key: _decode(row.embedding) for row in rows}
+            if found:
+                # Touch at most once a day so hot rows survive eviction
+                # without turning every read into a write.
+                db.execute(
+                    text(
+                        "UPDATE embedding_cache SET last_used_at = NOW() "
+                        "WHERE cache_key IN :keys "
+                        "AND last_used_at < NOW() - INTERVAL '1 day'"
+                    ).bindparams(bindparam("keys", expanding=True)),
+                    {"keys": list(found)},
+                )
+                db.commit()
+        except Exception as e:
+            db.rollback()
+            self._fail("get", e)
+            return {}
+        finally:
+            db.close()
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def bulk_put(self, items: Dict[str, List[float]], task_type: str, model: str, dimensions: int) -> int:
+        """Upsert vectors. Returns rows written (0 when the store is unavailable)."""
+        if not items:
+            return 0
+        db = self._session()
+        if db is None:
+            return 0
+        try:
+            from sqlalchemy import text
+
+            db.execute(
+                text(
+                    """
+                INSERT INTO embedding_cache (cache_key, model, task_type, dimensions, embedding)
+                VALUES (:cache_key, :model, :task_type, :dimensions, :embedding)
+                ON CONFLICT (cache_key) DO UPDATE SET last_used_at = NOW()
+            """
+                ),
+                [
+                    {
+                        "cache_key": key,
+                        "model": model,
+                        "task_type": task_type,
+                        "dimensions": dimensions,
+                        "embedding": _encode(vector),
+                    }
+                    for key, vector in items.items()
+                ],
+            )
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            self._fail("put", e)
+            return 0
+        finally:
+            db.close()
+
+        self.writes += len(items)
+        with self._lock:
+            self._puts_since_evict += len(items)
+            should_evict = self._puts_since_evict >= self.evict_every
+            if should_evict:
+                self._puts_since_evict = 0
+        if should_evict:
+            self.evict()
+        return len(items)
+
+    def evict(self) -> int:
+        """Delete least-recently-used rows beyond max_rows. Returns rows deleted."""
+        db = self._session()
+        if db is None:
+            return 0
+        try:
+            from sqlalchemy import text
+
+            result = db.execute(
+                text(
+                    """
+                DELETE FROM embedding_cache WHERE cache_key IN (
+                    SELECT cache_key FROM embedding_cache
+                    ORDER BY last_used_at DESC
+                    OFFSET :max_rows
+                )
+            """
+                ),
+                {"max_rows": self.max_rows},
+            )
+            db.commit()
+            deleted = result.rowcount or 0
+        except Exception as e:
+            db.rollback()
+            self._fail("evict", e)
+            return 0
+        finally:
+            db.close()
+        if deleted:
+            logger.info("[EMBEDDING-CACHE] evicted %d rows (max_rows=%d)", deleted, self.max_rows)
+        return deleted
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "available": self.enabled and time.monotonic() >= self._disabled_until,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            "writes": self.writes,
+            "errors": self.errors,
+            "max_rows": self.max_rows,
+        }
+
+
+_store: Optional[DurableEmbeddingStore] = None
+
+
+def get_embedding_store() -> DurableEmbeddingStore:
+    """Get the process-wide durable embedding store."""
+    global _store
+    if _store is None:
+        _store = DurableEmbeddingStore()
+    return _store
@@ -6,9 +6,11 @@ Migrated from OpenAI text-embedding-3-small in Sprint 2bis (OpenAI removal).
 Embeddings persist in PostgreSQL - no regeneration on deploy.
 """
 
+import asyncio
 import logging
 import os
-from typing import List, Optional
+import time
+from typing import Dict, List, Optional, Tuple
 
 import httpx
 
@@ -24,11 +26,25 @@ _GEMINI_EMBED_URL = (
     "https://generativelanguage.googleapis.com/v1beta/"
     "models/gemini-embedding-001:embedContent"
 )
+_GEMINI_BATCH_EMBED_URL = (
+    "https://generativelanguage.googleapis.com/v1beta/"
+    "models/gemini-embedding-001:batchEmbedContents"
+)
+
+# batchEmbedContents accepts at most 100 requests per call
+EMBEDDING_BATCH_SIZE = min(100, int(os.getenv("EMBEDDING_BATCH_SIZE", "100")))
+# Concurrent batch calls in flight for agenerate_embeddings_batch
+EMBEDDING_BATCH_CONCURRENCY = int(os.getenv("EMBEDDING_BATCH_CONCURRENCY", "4"))
+# Retries for items whose batch call failed or came back without a vector
+EMBEDDING_BATCH_MAX_RETRIES = int(os.getenv("EMBEDDING_BATCH_MAX_RETRIES", "2"))
+EMBEDDING_MAX_CHARS = 30000
 
 # Embedding cache: avoid repeated Gemini API calls for same query
-# Bounded to prevent memory leaks (each embedding = 1536 floats ≈ 12KB)
+# Tier 1: in-process, bounded to prevent memory leaks (each embedding = 1536 floats ≈ 12KB)
+# Tier 2: durable Postgres store shared across workers and deploys (core/embedding_cache.py)
 from core.cache import BoundedTTLCache
-_embedding_cache = BoundedTTLCache(max_size=200, ttl_seconds=600)
+from core.embedding_cache import embedding_cache_key, get_embedding_store
+_embedding_cache = BoundedTTLCache(max_size=200, ttl_seconds=600, name="embedding_memory")
 EMBEDDING_CACHE_TTL = 600  # 10 minutes
 
 # Similarity threshold for semantic search
@@ -49,7 +65,8 @@ def generate_embedding(
 ) -> Optional[List[float]]:
     """
     Generate embedding for a single text using Gemini gemini-embedding-001.
-    Results are cached in-memory with TTL to avoid repeated API calls.
+    Results are cached in-memory with TTL and in the durable embedding store
+    (core/embedding_cache.py) to avoid repeated API calls across deploys.
 
     Args:
         text: Text to embed
@@ -63,21 +80,26 @@ def generate_embedding(
         return None
 
     # Include task_type in cache key to avoid cross-task pollution
-    cache_key = f"{task_type}:{text.strip().lower()}"
+    cache_key = _embedding_cache_key(text, task_type)
     cached = _embedding_cache.get(cache_key)
     if cached is not None:
         logger.info(f"[EMBEDDING] Cache hit: '{text[:50]}'")
         return cached
 
+    stored = _durable_get([cache_key]).get(cache_key)
+    if stored is not None:
+        _embedding_cache.set(cache_key, stored)
+        logger.info(f"[EMBEDDING] Durable cache hit: '{text[:50]}'")
+        return stored
+
     api_key = _get_gemini_api_key()
     if not api_key:
         logger.warning("GOOGLE_API_KEY/GEMINI_API_KEY not set, embeddings disabled")
         return None
 
     try:
-        max_chars = 30000
-        if len(text) > max_chars:
-            text = text[:max_chars]
+        if len(text) > EMBEDDING_MAX_CHARS:
+            text = text[:EMBEDDING_MAX_CHARS]
 
         payload = {
             "content": {"parts": [{"text": text}]},
@@ -95,6 +117,7 @@ def generate_embedding(
 
         embedding: List[float] = resp.json()["embedding"]["values"]
         _embedding_cache.set(cache_key, embedding)
+        _durable_put({cache_key: embedding}, task_type)
         logger.info(f"[EMBEDDING] Generated (Gemini): '{text[:50]}'")
         return embedding
 
@@ -103,21 +126,287 @@ def generate_embedding(
         return None
 
 
+def _embedding_cache_key(text: str, task_type: str) -> str:
+    return embedding_cache_key(text, task_type, EMBEDDING_MODEL, EMBEDDING_DIMENSIONS)
+
+
+def _emit_cache(cache_name: str, hits: int = 0, misses: int = 0) -> None:
+    try:
+        from core.observability.metrics import emit_metric
+        if hits:
+            emit_metric("cache_hit_total", hits, cache_name=cache_name)
+        if misses:
+            emit_metric("cache_miss_total", misses, cache_name=cache_name)
+    except Exception:
+        pass
+
+
+def _durable_get(keys: List[str]) -> Dict[str, List[float]]:
+    """Look keys up in the durable tier. Fail-open: errors are a miss."""
+    try:
+        found = get_embedding_store().bulk_get(keys)
+    except Exception as e:
+        logger.debug(f"[EMBEDDING] durable lookup failed: {e}")
+        return {}
+    _emit_cache("embedding_durable", hits=len(found), misses=len(keys) - len(found))
+    return found
+
+
+def _durable_put(embedded: Dict[str, List[float]], task_type: str) -> None:
+    try:
+        get_embedding_store().bulk_put(embedded, task_type, EMBEDDING_MODEL, EMBEDDING_DIMENSIONS)
+    except Exception as e:
+        logger.debug(f"[EMBEDDING] durable store failed: {e}")
+
+
+def _resolve_durable(
+    results: List[Optional[List[float]]],
+    pending: Dict[str, List[int]],
+    to_embed: Dict[str, str],
+) -> None:
+    """Fill memory-tier misses from the durable tier (one bulk query), promoting hits."""
+    if not to_embed:
+        return
+    found = _durable_get(list(to_embed))
+    for key, vector in found.items():
+        _embedding_cache.set(key, vector)
+        for i in pending.pop(key):
+            results[i] = vector
+        del to_embed[key]
+
+
+def get_embedding_cache_stats() -> dict:
+    """Hit/miss counters for both embedding cache tiers."""
+    return {
+        "memory": _embedding_cache.stats(),
+        "durable": get_embedding_store().stats(),
+    }
+
+
+def _batch_payload(texts: List[str], task_type: str) -> dict:
+    return {
+        "requests": [
+            {
+                "model": EMBEDDING_MODEL,
+                "content": {"parts": [{"text": t[:EMBEDDING_MAX_CHARS]}]},
+                "outputDimensionality": EMBEDDING_DIMENSIONS,
+                "taskType": task_type,
+            }
+            for t in texts
+        ]
+    }
+
+
+def _parse_batch_response(data: dict, expected: int) -> List[Optional[List[float]]]:
+    """Map a batchEmbedContents response to one vector (or None) per request."""
+    embeddings = data.get("embeddings") or []
+    out: List[Optional[List[float]]] = []
+    for i in range(expected):
+        values = embeddings[i].get("values") if i < len(embeddings) else None
+        out.append(values or None)
+    return out
+
+
+def _is_retryable(exc: Exception) -> bool:
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(exc, httpx.TransportError)
+
+
+def _plan_batch(
+    texts: List[str], task_type: str,
+) -> Tuple[List[Optional[List[float]]], Dict[str, List[int]], Dict[str, str]]:
+    """Resolve in-process cache hits and dedupe the rest.
+
+    Returns (results, key -> indices still pending, key -> text to embed).
+    """
+    results: List[Optional[List[float]]] = [None] * len(texts)
+    pending: Dict[str, List[int]] = {}
+    to_embed: Dict[str, str] = {}
+    for i, text in enumerate(texts):
+        if not text or not text.strip():
+            continue
+        key = _embedding_cache_key(text, task_type)
+        if key in pending:
+            pending[key].append(i)
+            continue
+        cached = _embedding_cache.get(key)
+        if cached is not None:
+            results[i] = cached
+            continue
+        pending[key] = [i]
+        to_embed[key] = text
+    return results, pending, to_embed
+
+
+def _fill_results(
+    results: List[Optional[List[float]]],
+    pending: Dict[str, List[int]],
+    embedded: Dict[str, List[float]],
+) -> None:
+    for key, vector in embedded.items():
+        _embedding_cache.set(key, vector)
+        for i in pending[key]:
+            results[i] = vector
+
+
+def _embed_chunk_sync(api_key: str, texts: List[str], task_type: str) -> List[Optional[List[float]]]:
+    resp = httpx.post(
+        _GEMINI_BATCH_EMBED_URL,
+        params={"key": api_key},
+        json=_batch_payload(texts, task_type),
+        timeout=60.0,
+    )
+    resp.raise_for_status()
+    return _parse_batch_response(resp.json(), len(texts))
+
+
 def generate_embeddings_batch(
     texts: List[str],
     task_type: str = "RETRIEVAL_DOCUMENT",
 ) -> List[Optional[List[float]]]:
     """
-    Generate embeddings for multiple texts (sequential calls with caching).
+    Generate embeddings for multiple texts via Gemini batchEmbedContents.
+
+    Cache hits (in-process, then the durable store) and duplicate texts are
+    resolved before any API call; the rest
+    is sent in chunks of EMBEDDING_BATCH_SIZE. Items that fail (rate limit,
+    5xx, missing vector) are retried on their own up to
+    EMBEDDING_BATCH_MAX_RETRIES times with exponential backoff.
 
     Args:
         texts: List of texts to embed
         task_type: Gemini task type (same for all items in the batch)
 
     Returns:
-        List of embeddings (or None for failed items)
+        List of embeddings aligned with `texts` (None for failed items)
+    """
+    results, pending, to_embed = _plan_batch(texts, task_type)
+    _resolve_durable(results, pending, to_embed)
+    if not to_embed:
+        return results
+
+    api_key = _get_gemini_api_key()
+    if not api_key:
+        logger.warning("GOOGLE_API_KEY/GEMINI_API_KEY not set, embeddings disabled")
+        return results
+
+    embedded: Dict[str, List[float]] = {}
+    remaining = list(to_embed)
+    for attempt in range(EMBEDDING_BATCH_MAX_RETRIES + 1):
+        failed: List[str] = []
+        for start in range(0, len(remaining), EMBEDDING_BATCH_SIZE):
+            keys = remaining[start:start + EMBEDDING_BATCH_SIZE]
+            try:
+                vectors = _embed_chunk_sync(api_key, [to_embed[k] for k in keys], task_type)
+            except Exception as e:
+                if not _is_retryable(e):
+                    logger.error(f"Error generating batch embeddings (Gemini): {e}")
+                    _fill_results(results, pending, embedded)
+                    _durable_put(embedded, task_type)
+                    return results
+                logger.warning(f"[EMBEDDING] Batch of {len(keys)} failed (attempt {attempt + 1}): {e}")
+                failed.extend(keys)
+                continue
+            for key, vector in zip(keys, vectors):
+                if vector is None:
+                    failed.append(key)
+                else:
+                    embedded[key] = vector
+        remaining = failed
+        if not remaining or attempt == EMBEDDING_BATCH_MAX_RETRIES:
+            break
+        time.sleep(0.5 * 2 ** attempt)
+
+    if remaining:
+        logger.error(f"[EMBEDDING] {len(remaining)} texts failed after retries")
+    _fill_results(results, pending, embedded)
+    _durable_put(embedded, task_type)
+    logger.info(
+        f"[EMBEDDING] Batch: {len(texts)} texts, {len(to_embed)} embedded via API, "
+        f"{len(embedded)} ok"
+    )
+    return results
+
+
+async def agenerate_embeddings_batch(
+    texts: List[str],
+    task_type: str = "RETRIEVAL_DOCUMENT",
+    concurrency: int = EMBEDDING_BATCH_CONCURRENCY,
+) -> List[Optional[List[float]]]:
     """
-    return [generate_embedding(text, task_type=task_type) for text in texts]
+    Async variant of generate_embeddings_batch.
+
+    Chunks are sent concurrently (at most `concurrency` calls in flight) over
+    the pooled Gemini HTTP client; failed items are retried like the sync path.
+    """
+    results, pending, to_embed = _plan_batch(texts, task_type)
+    if to_embed:
+        await asyncio.to_thread(_resolve_durable, results, pending, to_embed)
+    if not to_embed:
+        return results
+
+    api_key = _get_gemini_api_key()
+    if not api_key:
+        logger.warning("GOOGLE_API_KEY/GEMINI_API_KEY not set, embeddings disabled")
+        return results
+
+    from core.providers.http_clients import get_http_client
+
+    client = get_http_client("gemini")
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    embedded: Dict[str, List[float]] = {}
+    fatal: List[Exception] = []
+
+    async def _embed_chunk(keys: List[str]) -> List[str]:
+        async with semaphore:
+            if fatal:
+                return []
+            try:
+                resp = await client.post(
+                    _GEMINI_BATCH_EMBED_URL,
+                    params={"key": api_key},
+                    json=_batch_payload([to_embed[k] for k in keys], task_type),
+                    timeout=60.0,
+                )
+                resp.raise_for_status()
+                vectors = _parse_batch_response(resp.json(), len(keys))
+            except Exception as e:
+                if not _is_retryable(e):
+                    fatal.append(e)
+                    return []
+                logger.warning(f"[EMBEDDING] Async batch of {len(keys)} failed: {e}")
+                return keys
+        failed = []
+        for key, vector in zip(keys, vectors):
+            if vector is None:
+                failed.append(key)
+            else:
+                embedded[key] = vector
+        return failed
+
+    remaining = list(to_embed)
+    for attempt in range(EMBEDDING_BATCH_MAX_RETRIES + 1):
+        chunks = [
+            remaining[i:i + EMBEDDING_BATCH_SIZE]
+            for i in range(0, len(remaining), EMBEDDING_BATCH_SIZE)
+        ]
+        failed_lists = await asyncio.gather(*(_embed_chunk(c) for c in chunks))
+        remaining = [k for failed in failed_lists for k in failed]
+        if fatal:
+            logger.error(f"Error generating batch embeddings (Gemini): {fatal[0]}")
+            break
+        if not remaining or attempt == EMBEDDING_BATCH_MAX_RETRIES:
+            break
+        await asyncio.sleep(0.5 * 2 ** attempt)
+
+    if remaining and not fatal:
+        logger.error(f"[EMBEDDING] {len(remaining)} texts failed after retries")
+    _fill_results(results, pending, embedded)
+    if embedded:
+        await asyncio.to_thread(_durable_put, embedded, task_type)
+    return results
 
 
 def cosine_similarity(vec1: List[float], vec2: List[float]) -> float:
@@ -228,7 +228,7 @@ def _generate_q3_generic(user_msg: str, lang_info: Dict) -> str:
         f'User message: "{user_msg}"\n\n'
         f"Generic response in {primary}:"
     )
-    raw = _call_judge(prompt, max_tokens=150)
+    raw = _call_judge(prompt, max_tokens=150, verdict=None)
     if raw:
         return _clean_generated(raw)
     return "Entendido. Avísame si necesitas ayuda con algo."
@@ -247,7 +247,7 @@ def _generate_q2_formal(user_msg: str, creator_summary: str, lang_info: Dict) ->
         f'User message: "{user_msg}"\n\n'
         f"Formal response in {primary}:"
     )
-    raw = _call_judge(prompt, max_tokens=150)
+    raw = _call_judge(prompt, max_tokens=150, verdict=None)
     if raw:
         return _clean_generated(raw)
     return "Estimado usuario, su consulta ha sido recibida y será procesada en su debido momento."
@@ -265,7 +265,7 @@ def _generate_q1_wrong_language(user_msg: str, lang_info: Dict) -> str:
         f'User message: "{user_msg}"\n\n'
         f"Response in {opposite} only:"
     )
-    raw = _call_judge(prompt, max_tokens=150)
+    raw = _call_judge(prompt, max_tokens=150, verdict=None)
     if raw:
         return _clean_generated(raw)
     return "Ich habe Ihre Nachricht erhalten und werde sie bearbeiten."
@@ -403,7 +403,7 @@ def _run_ipi_test(
         prompt1 = _build_pairwise_prompt_ipi(user_input, resp_high, resp_low, creator_summary)
         result1 = None
         for _ in range(2):
-            raw = _call_judge(prompt1, max_tokens=400)
+            raw = _call_judge(prompt1, max_tokens=400, verdict="pairwise")
             if raw:
                 result1 = _parse_pairwise_result(raw)
                 if result1:
@@ -414,7 +414,7 @@ def _run_ipi_test(
         prompt2 = _build_pairwise_prompt_ipi(user_input, resp_low, resp_high, creator_summary)
         result2 = None
         for _ in range(2):
-            raw = _call_judge(prompt2, max_tokens=400)
+            raw = _call_judge(prompt2, max_tokens=400, verdict="pairwise")
             if raw:
                 result2 = _parse_pairwise_result(raw)
                 if result2:
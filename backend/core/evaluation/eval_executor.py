@@ -0,0 +1,227 @@
+"""
+CCEE evaluation executor — concurrent metric runs under a judge rate budget.
+
+Every multi-turn metric is an independent, blocking function of one
+conversation whose time is spent waiting on the judge. The executor fans
+(conversation, metric) tasks out over a thread pool, while all judge calls
+share one JudgeBudget (max in-flight requests + max request rate) so
+parallelism never exceeds what the provider account allows.
+
+Each task runs with its metric name in a context variable; _call_judge
+reports every call through record_judge_call(), which attributes calls,
+cache hits and USD cost to that metric. EvalStats.report() returns the
+per-metric wall time / cost table that run_ccee.py stores with the results.
+
+Config:
+  CCEE_EVAL_WORKERS       — concurrent metric tasks (default 8; 1 = serial)
+  CCEE_JUDGE_CONCURRENCY  — max judge requests in flight (default 4)
+  CCEE_JUDGE_RPS          — max judge requests started per second (default 0 = unlimited)
+"""
+
+import contextvars
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+EVAL_WORKERS = int(os.environ.get("CCEE_EVAL_WORKERS", "8"))
+JUDGE_MAX_CONCURRENCY = int(os.environ.get("CCEE_JUDGE_CONCURRENCY", "4"))
+JUDGE_MAX_RPS = float(os.environ.get("CCEE_JUDGE_RPS", "0"))
+
+UNATTRIBUTED = "unattributed"
+
+
+# ---------------------------------------------------------------------------
+# Rate budget
+# ---------------------------------------------------------------------------
+
+class JudgeBudget:
+    """Caps judge requests in flight and spaces request starts to max_rps."""
+
+    def __init__(self, max_concurrency: int, max_rps: float = 0.0):
+        self._sem = threading.BoundedSemaphore(max(1, max_concurrency))
+        self._interval = 1.0 / max_rps if max_rps > 0 else 0.0
+        self._next_start = 0.0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        self._sem.acquire()
+        try:
+            if self._interval:
+                with self._lock:
+                    now = time.monotonic()
+                    start = max(now, self._next_start)
+                    self._next_start = start + self._interval
+                if start > now:
+                    time.sleep(start - now)
+            yield
+        finally:
+            self._sem.release()
+
+
+_budget: Optional[JudgeBudget] = None
+_budget_lock = threading.Lock()
+
+
+def get_judge_budget() -> JudgeBudget:
+    """Process-wide budget shared by every judge call."""
+    global _budget
+    if _budget is None:
+        with _budget_lock:
+            if _budget is None:
+                _budget = JudgeBudget(JUDGE_MAX_CONCURRENCY, JUDGE_MAX_RPS)
+    return _budget
+
+
+# ---------------------------------------------------------------------------
+# Per-metric accounting
+# ---------------------------------------------------------------------------
+
+@dataclass
+class MetricStats:
+    runs: int = 0
+    wall_s: float = 0.0
+    judge_calls: int = 0
+    cache_hits: int = 0
+    cost_usd: float = 0.0
+    saved_usd: float = 0.0
+
+
+class EvalStats:
+    """Thread-safe per-metric totals for one evaluation run."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, MetricStats] = {}
+        self._t0 = time.perf_counter()
+
+    def _entry(self, metric: str) -> MetricStats:
+        if metric not in self._metrics:
+            self._metrics[metric] = MetricStats()
+        return self._metrics[metric]
+
+    def record_run(self, metric: str, wall_s: float) -> None:
+        with self._lock:
+            entry = self._entry(metric)
+            entry.runs += 1
+            entry.wall_s += wall_s
+
+    def record_call(self, metric: str, cost_usd: float, cached: bool, saved_usd: float = 0.0) -> None:
+        with self._lock:
+            entry = self._entry(metric)
+            entry.judge_calls += 1
+            entry.cost_usd += cost_usd
+            if cached:
+                entry.cache_hits += 1
+                entry.saved_usd += saved_usd
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            per_metric = {
+                name: {
+                    **asdict(m),
+                    "wall_s": round(m.wall_s, 2),
+                    "cost_usd": round(m.cost_usd, 5),
+                    "saved_usd": round(m.saved_usd, 5),
+                }
+                for name, m in sorted(self._metrics.items())
+            }
+            totals = {
+                "judge_calls": sum(m.judge_calls for m in self._metrics.values()),
+                "cache_hits": sum(m.cache_hits for m in self._metrics.values()),
+                "cost_usd": round(sum(m.cost_usd for m in self._metrics.values()), 5),
+                "saved_usd": round(sum(m.saved_usd for m in self._metrics.values()), 5),
+            }
+        return {
+            "wall_time_s": round(time.perf_counter() - self._t0, 2),
+            "workers": EVAL_WORKERS,
+            "judge_concurrency": JUDGE_MAX_CONCURRENCY,
+            "judge_rps": JUDGE_MAX_RPS,
+            "totals": totals,
+            "per_metric": per_metric,
+        }
+
+    def format_table(self) -> str:
+        report = self.report()
+        lines = [f"  {'metric':<26} {'runs':>5} {'wall_s':>8} {'calls':>6} {'cached':>6} {'cost_usd':>9}"]
+        for name, m in report["per_metric"].items():
+            lines.append(
+                f"  {name:<26} {m['runs']:>5} {m['wall_s']:>8.1f} {m['judge_calls']:>6} "
+                f"{m['cache_hits']:>6} {m['cost_usd']:>9.4f}"
+            )
+        t = report["totals"]
+        lines.append(
+            f"  total wall={report['wall_time_s']:.1f}s calls={t['judge_calls']} "
+            f"cached={t['cache_hits']} cost=${t['cost_usd']:.4f} saved=${t['saved_usd']:.4f}"
+        )
+        return "\n".join(lines)
+
+
+_current_metric: contextvars.ContextVar[str] = contextvars.ContextVar("ccee_metric", default=UNATTRIBUTED)
+_current_stats: contextvars.ContextVar[Optional[EvalStats]] = contextvars.ContextVar("ccee_stats", default=None)
+
+
+def record_judge_call(cost_usd: float, cached: bool, saved_usd: float = 0.0) -> None:
+    """Attribute one judge call to the metric running on this thread (no-op outside a run)."""
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record_call(_current_metric.get(), cost_usd, cached, saved_usd)
+
+
+@contextmanager
+def metric_scope(metric: str, stats: EvalStats) -> Iterator[None]:
+    """Attribute judge calls and wall time inside the block to `metric`."""
+    metric_token = _current_metric.set(metric)
+    stats_token = _current_stats.set(stats)
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.record_run(metric, time.perf_counter() - t0)
+        _current_stats.reset(stats_token)
+        _current_metric.reset(metric_token)
+
+
+# ---------------------------------------------------------------------------
+# Executor
+# ---------------------------------------------------------------------------
+
+EvalTask = Tuple[Hashable, str, Callable[[], Any]]
+
+
+def run_eval_tasks(
+    tasks: List[EvalTask],
+    stats: EvalStats,
+    max_workers: Optional[int] = None,
+) -> Tuple[Dict[Hashable, Any], Dict[Hashable, float]]:
+    """Run (key, metric, fn) tasks concurrently.
+
+    Returns ({key: result}, {key: wall seconds}). A task that raises
+    re-raises here, as the serial loop it replaces did.
+    """
+    workers = EVAL_WORKERS if max_workers is None else max_workers
+    durations: Dict[Hashable, float] = {}
+
+    def _run(key: Hashable, metric: str, fn: Callable[[], Any]) -> Any:
+        t0 = time.perf_counter()
+        try:
+            with metric_scope(metric, stats):
+                return fn()
+        finally:
+            durations[key] = time.perf_counter() - t0
+
+    if workers <= 1 or len(tasks) <= 1:
+        results = {key: _run(key, metric, fn) for key, metric, fn in tasks}
+        return results, durations
+
+    with ThreadPoolExecutor(max_workers=min(workers, len(tasks)), thread_name_prefix="ccee-eval") as pool:
+        futures = {key: pool.submit(_run, key, metric, fn) for key, metric, fn in tasks}
+        results = {key: future.result() for key, future in futures.items()}
+    return results, durations
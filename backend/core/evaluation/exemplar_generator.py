@@ -6,13 +6,17 @@ creator's Doc D, so the judge has calibration anchors instead of abstract
 rubric descriptions alone.
 
 Exemplars are GENERATED from Doc D via LLM (zero hardcoding) and cached
-per creator_id for the duration of the process.
+per creator_id for the duration of the process. The raw completion also goes
+through the CCEE judge cache, so reruns build byte-identical rubrics (and
+therefore judge prompts that replay from the cache). With the stub judge
+(CCEE_JUDGE_BACKEND=stub) no exemplars are generated and the base rubric is used.
 """
 
 import json
 import logging
 import os
 import re
+import threading
 from typing import Dict, Optional
 
 import openai
@@ -21,6 +25,8 @@ logger = logging.getLogger(__name__)
 
 # In-process cache: {creator_id: {5: "...", 4: "...", ...}}
 _exemplar_cache: Dict[str, Dict[int, str]] = {}
+# Concurrent metrics (J3, L1) for one creator generate the exemplars once
+_exemplar_lock = threading.Lock()
 
 # Use same DeepInfra/Qwen3 config as lead simulator
 _EXEMPLAR_MODEL = os.environ.get("LEAD_SIM_MODEL", "Qwen/Qwen3-30B-A3B")
@@ -56,10 +62,21 @@ def generate_exemplar_responses(
         Dict mapping score level (1-5) to example response string.
         Returns empty dict on failure.
     """
+    with _exemplar_lock:
+        return _generate_exemplar_responses(doc_d_text, creator_id, user_input)
+
+
+def _generate_exemplar_responses(doc_d_text: str, creator_id: str, user_input: str) -> Dict[int, str]:
+    from core.evaluation import m_prometheus_judge
+    from core.evaluation.judge_cache import get_judge_cache, judge_cache_key
+
     # Check cache
     if creator_id and creator_id in _exemplar_cache:
         return _exemplar_cache[creator_id]
 
+    if m_prometheus_judge.JUDGE_BACKEND == "stub":
+        return {}
+
     if not doc_d_text:
         logger.warning("Exemplar generation: no Doc D text provided")
         return {}
@@ -86,19 +103,27 @@ LEVEL 1 (WRONG PERSONA): Completely wrong style. Opposite language, wrong tone,
 
 Output ONLY valid JSON with string keys "5","4","3","2","1" mapping to the example response text. No explanation, no markdown, just the JSON object. /no_think"""
 
-    client = _get_deepinfra_client()
+    disk_cache = get_judge_cache()
+    cache_key = judge_cache_key(_EXEMPLAR_MODEL, "", prompt, 800)
+    cached = disk_cache.get(cache_key) if disk_cache else None
+    client = _get_deepinfra_client() if cached is None else None
+    text = ""
     try:
-        resp = client.chat.completions.create(
-            model=_EXEMPLAR_MODEL,
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.7,
-            max_tokens=800,
-        )
-        text = resp.choices[0].message.content or ""
-
-        # Strip thinking artifacts
-        from core.providers.deepinfra_provider import strip_thinking_artifacts
-        text = strip_thinking_artifacts(text)
+        if cached is not None:
+            text = cached["text"]
+        else:
+            resp = client.chat.completions.create(
+                model=_EXEMPLAR_MODEL,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=0.7,
+                max_tokens=800,
+            )
+            text = resp.choices[0].message.content or ""
+
+            # Strip thinking artifacts
+            from core.providers.deepinfra_provider import strip_thinking_artifacts
+            text = strip_thinking_artifacts(text)
+        raw_text = text
 
         # Extract JSON from response (may be wrapped in ```json blocks)
         text = text.strip()
@@ -120,6 +145,8 @@ Output ONLY valid JSON with string keys "5","4","3","2","1" mapping to the examp
         # Cache
         if creator_id:
             _exemplar_cache[creator_id] = exemplars
+        if disk_cache is not None and cached is None:
+            disk_cache.put(cache_key, {"model": _EXEMPLAR_MODEL, "text": raw_text, "cost_usd": 0.0})
 
         logger.info(f"Generated {len(exemplars)} exemplar responses for {creator_id or 'unknown'}")
         return exemplars
@@ -0,0 +1,110 @@
+"""
+Content-addressed cache for CCEE judge completions.
+
+Judge prompts are deterministic for a given conversation, rubric and Doc D,
+so a rerun of the same CCEE configuration asks the judge the exact same
+questions. Completions are stored on disk keyed by sha256 over
+(judge model, system prompt, prompt, max_tokens) and replayed on later
+runs at zero cost.
+
+Layout: {CCEE_JUDGE_CACHE_DIR}/{key[:2]}/{key}.json — one small JSON file
+per completion, written atomically (tmp file + os.replace) so concurrent
+workers and interrupted runs never leave a torn entry behind.
+
+Config:
+  CCEE_JUDGE_CACHE      — "false" disables the cache (default: true)
+  CCEE_JUDGE_CACHE_DIR  — cache root (default: ~/.cache/clonnect/ccee_judge)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+JUDGE_CACHE_ENABLED = os.environ.get("CCEE_JUDGE_CACHE", "true").lower() == "true"
+JUDGE_CACHE_DIR = os.environ.get(
+    "CCEE_JUDGE_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "clonnect", "ccee_judge"),
+)
+
+
+def judge_cache_key(model: str, system_prompt: str, prompt: str, max_tokens: int) -> str:
+    """sha256 over everything that determines the judge's completion."""
+    payload = json.dumps([model, system_prompt, prompt, max_tokens], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class JudgeCache:
+    """On-disk store of judge completions, safe to share between threads."""
+
+    def __init__(self, root: str):
+        self.root = root
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], f"{key}.json")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the stored entry ({model, text, cost_usd}) or None."""
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            entry = None
+        except (OSError, ValueError) as e:
+            logger.warning(f"[JUDGE_CACHE] Unreadable entry {key[:12]}: {e}")
+            entry = None
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return entry
+
+    def put(self, key: str, entry: Dict[str, Any]) -> None:
+        """Store an entry atomically. Failures are logged, never raised."""
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(entry, f, ensure_ascii=False)
+                os.replace(tmp, path)
+            except BaseException:
+                if os.path.exists(tmp):
+                    os.unlink(tmp)
+                raise
+        except OSError as e:
+            logger.warning(f"[JUDGE_CACHE] Could not store entry {key[:12]}: {e}")
+            return
+        with self._lock:
+            self.writes += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"dir": self.root, "hits": self.hits, "misses": self.misses, "writes": self.writes}
+
+
+_cache: Optional[JudgeCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_judge_cache() -> Optional[JudgeCache]:
+    """Process-wide judge cache, or None when CCEE_JUDGE_CACHE=false."""
+    global _cache
+    if not JUDGE_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = JudgeCache(JUDGE_CACHE_DIR)
+    return _cache
@@ -14,7 +14,9 @@ Scores multi-turn conversations across 10+ parameters:
   L3 — Action Justification (PersonaGym EMNLP 2025)
   H1 — Automated Turing Test (v5 — pairwise comparison with real DB responses)
 
-All judge calls reuse _call_judge from m_prometheus_judge.py.
+All judge calls reuse _call_judge from m_prometheus_judge.py. Metrics and
+conversations run concurrently through core.evaluation.eval_executor, which
+also reports per-metric wall time and judge cost.
 """
 
 import logging
@@ -35,6 +37,7 @@ from core.evaluation.m_prometheus_judge import (
     MAX_RETRIES,
     judge_turing_test,
 )
+from core.evaluation.eval_executor import EvalStats, metric_scope, run_eval_tasks
 
 logger = logging.getLogger(__name__)
 
@@ -2148,54 +2151,37 @@ def score_h1_turing_test(
 # Composite multi-turn scorer
 # ---------------------------------------------------------------------------
 
-def score_multi_turn_conversation(
-    conversation: Dict[str, Any],
+def _conversation_metrics(
     creator_id: str,
-    style_profile: Optional[Dict[str, Any]] = None,
-    enable_v41: bool = False,
-) -> Dict[str, Any]:
-    """Score a single multi-turn conversation across v4 (+ optional v4.1) parameters.
-
-    Args:
-        conversation: Dict from generate_conversation()
-        creator_id: Creator slug
-        style_profile: Optional style profile
-        enable_v41: If True, also run J6, L1, L2, L3 metrics
-
-    Returns:
-        Dict with all scores and composite
-    """
-    t0 = time.time()
-
-    j3 = score_j3_prompt_to_line(conversation, creator_id)
-    j4 = score_j4_line_to_line(conversation)
-    j5 = score_j5_belief_drift(conversation)
-    k1 = score_k1_context_retention(conversation)
-    k2 = score_k2_style_retention(conversation, style_profile)
-    g5 = score_g5_persona_robustness(conversation, creator_id)
-
-    scores = {
-        "J3_prompt_to_line": j3,
-        "J4_line_to_line": j4,
-        "J5_belief_drift": j5,
-        "K1_context_retention": k1,
-        "K2_style_retention": k2,
-        "G5_persona_robustness": g5,
-    }
-
+    style_profile: Optional[Dict[str, Any]],
+    enable_v41: bool,
+) -> List[Tuple[str, Any]]:
+    """(result key, scorer(conversation)) for every per-conversation metric, in report order."""
+    metrics = [
+        ("J3_prompt_to_line", lambda conv: score_j3_prompt_to_line(conv, creator_id)),
+        ("J4_line_to_line", lambda conv: score_j4_line_to_line(conv)),
+        ("J5_belief_drift", lambda conv: score_j5_belief_drift(conv)),
+        ("K1_context_retention", lambda conv: score_k1_context_retention(conv)),
+        ("K2_style_retention", lambda conv: score_k2_style_retention(conv, style_profile)),
+        ("G5_persona_robustness", lambda conv: score_g5_persona_robustness(conv, creator_id)),
+    ]
     # v4.1 new metrics (additive — only when enabled)
     if enable_v41:
-        j6 = score_j6_qa_consistency(conversation, creator_id)
-        l1 = score_l1_persona_tone(conversation, creator_id)
-        l2 = score_l2_logical_reasoning(conversation, creator_id)
-        l3 = score_l3_action_justification(conversation, creator_id)
-        scores["J6_qa_consistency"] = j6
-        scores["L1_persona_tone"] = l1
-        scores["L2_logical_reasoning"] = l2
-        scores["L3_action_justification"] = l3
+        metrics += [
+            ("J6_qa_consistency", lambda conv: score_j6_qa_consistency(conv, creator_id)),
+            ("L1_persona_tone", lambda conv: score_l1_persona_tone(conv, creator_id)),
+            ("L2_logical_reasoning", lambda conv: score_l2_logical_reasoning(conv, creator_id)),
+            ("L3_action_justification", lambda conv: score_l3_action_justification(conv, creator_id)),
+        ]
+    return metrics
 
-    elapsed = time.time() - t0
 
+def _compose_conversation_result(
+    conversation: Dict[str, Any],
+    scores: Dict[str, Dict[str, Any]],
+    elapsed: float,
+) -> Dict[str, Any]:
+    """Attach the MT sub-composite and mean to one conversation's metric scores."""
     # MT sub-composite: weighted formula for multi-turn dimensions
     # J_new = 0.4*J3 + 0.3*J4 + 0.3*J5; K = 0.6*K1 + 0.4*K2
     # mt_composite for per-conversation analysis (NOT the final v4 composite)
@@ -2229,6 +2215,33 @@ def score_multi_turn_conversation(
     }
 
 
+def score_multi_turn_conversation(
+    conversation: Dict[str, Any],
+    creator_id: str,
+    style_profile: Optional[Dict[str, Any]] = None,
+    enable_v41: bool = False,
+    stats: Optional[EvalStats] = None,
+) -> Dict[str, Any]:
+    """Score a single multi-turn conversation across v4 (+ optional v4.1) parameters.
+
+    Args:
+        conversation: Dict from generate_conversation()
+        creator_id: Creator slug
+        style_profile: Optional style profile
+        enable_v41: If True, also run J6, L1, L2, L3 metrics
+        stats: Optional EvalStats collecting per-metric time and judge cost
+
+    Returns:
+        Dict with all scores and composite
+    """
+    t0 = time.time()
+    metrics = _conversation_metrics(creator_id, style_profile, enable_v41)
+    tasks = [(name, name, lambda fn=fn: fn(conversation)) for name, fn in metrics]
+    results, _ = run_eval_tasks(tasks, stats or EvalStats())
+    scores = {name: results[name] for name, _ in metrics}
+    return _compose_conversation_result(conversation, scores, time.time() - t0)
+
+
 def score_multi_turn_batch(
     conversations: List[Dict[str, Any]],
     creator_id: str,
@@ -2238,17 +2251,32 @@ def score_multi_turn_batch(
 ) -> Dict[str, Any]:
     """Score a batch of multi-turn conversations.
 
-    Returns aggregated scores across all conversations.
+    Returns aggregated scores across all conversations, plus "eval_stats"
+    with per-metric wall time, judge calls, cache hits and cost.
     enable_v5 implies enable_v41 (superset).
     """
     if enable_v5:
         enable_v41 = True
     all_scores = []
     per_conv = []
+    stats = EvalStats()
+
+    # Every (conversation, metric) pair is independent — run them all through
+    # the executor, then report per conversation in the original order.
+    metrics = _conversation_metrics(creator_id, style_profile, enable_v41)
+    tasks = [
+        ((i, name), name, lambda fn=fn, conv=conv: fn(conv))
+        for i, conv in enumerate(conversations)
+        for name, fn in metrics
+    ]
+    print(f"  Scoring {len(conversations)} conversations x {len(metrics)} metrics...")
+    results, durations = run_eval_tasks(tasks, stats)
 
     for i, conv in enumerate(conversations):
-        print(f"  Scoring conversation {i+1}/{len(conversations)}...")
-        result = score_multi_turn_conversation(conv, creator_id, style_profile, enable_v41)
+        print(f"  Conversation {i+1}/{len(conversations)}:")
+        scores = {name: results[(i, name)] for name, _ in metrics}
+        elapsed = sum(durations[(i, name)] for name, _ in metrics)
+        result = _compose_conversation_result(conv, scores, elapsed)
         all_scores.append(result)
         conv_summary = {
             "conv_idx": i,
@@ -2321,7 +2349,8 @@ def score_multi_turn_batch(
 
         # v5.2: Cross-session Q&A consistency (Abdulhai NeurIPS 2025)
         if len(conversations) >= 2:
-            cross_j6 = _score_j6_cross_session(conversations, creator_id)
+            with metric_scope("J6_cross_session", stats):
+                cross_j6 = _score_j6_cross_session(conversations, creator_id)
             result["J6_cross_session"] = cross_j6
             cross_score = cross_j6.get("score")
             if cross_score is not None and within_j6 is not None:
@@ -2348,11 +2377,15 @@ def score_multi_turn_batch(
     # v5: H1 Automated Turing Test (batch-level — across all conversations)
     if enable_v5:
         print(f"  Running H1 Automated Turing Test (DB-backed)...")
-        h1 = score_h1_turing_test(conversations, creator_id)
+        with metric_scope("H1_turing_test", stats):
+            h1 = score_h1_turing_test(conversations, creator_id)
         result["H1_turing_test"] = h1
         if h1.get("score") is not None:
             print(f"    H1: {h1['score']:.1f}% ({h1['fooled']}/{h1['total_comparisons']} fooled)")
         else:
             print(f"    H1: N/A ({h1.get('reason', 'unknown')})")
 
+    result["eval_stats"] = stats.report()
+    print(stats.format_table())
+
     return result
@@ -0,0 +1,456 @@
+"""
+Embedded follower-memory store shared by every MemoryStore.
+
+Both MemoryStore classes (core.memory and services.memory_service) used to
+write one pretty-printed JSON file per follower under
+data/followers/{creator}/ with blocking open() inside async methods, and every
+module (api/main.py, the creator router, webhooks, the DM agent) built its own
+MemoryStore with its own cache. Creator-wide queries (get_all_for_creator,
+get_leads, get_high_intent) listed and parsed every file in the directory.
+
+FollowerStore keeps the records in one SQLite database per storage path
+({storage_path}/followers.sqlite3, WAL mode):
+- one row per (creator_id, follower_id), the record as JSON plus the indexed
+  columns purchase_intent_score, is_lead and last_contact, so creator-wide
+  queries are index scans;
+- all SQLite I/O runs on a dedicated single-thread executor, so async callers
+  never block the event loop and statements are applied in submission order;
+- writes are buffered (write-behind) and flushed as one transaction after
+  FOLLOWER_STORE_FLUSH_MS, or immediately once FOLLOWER_STORE_MAX_PENDING
+  records are queued. Reads see buffered writes;
+- legacy JSON files are imported lazily: a single follower on a get() miss,
+  a creator's whole directory on its first creator-wide query.
+
+get_follower_store(path) returns the process-wide instance for a path, and
+object_cache() hands every MemoryStore on that path the same bounded LRU.
+
+Env vars:
+  FOLLOWER_STORE_FLUSH_MS     — write-behind window in ms (default: 200)
+  FOLLOWER_STORE_MAX_PENDING  — flush early after this many queued records (default: 64)
+  FOLLOWER_STORE_CACHE_SIZE   — decoded FollowerMemory objects kept per cache (default: 500)
+"""
+
+import asyncio
+import atexit
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from core.cache import BoundedTTLCache
+
+logger = logging.getLogger(__name__)
+
+FOLLOWER_STORE_FLUSH_S = int(os.getenv("FOLLOWER_STORE_FLUSH_MS", "200")) / 1000
+FOLLOWER_STORE_MAX_PENDING = int(os.getenv("FOLLOWER_STORE_MAX_PENDING", "64"))
+FOLLOWER_STORE_CACHE_SIZE = int(os.getenv("FOLLOWER_STORE_CACHE_SIZE", "500"))
+
+DB_FILENAME = "followers.sqlite3"
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS follower_memory (
+        creator_id TEXT NOT NULL,
+        follower_id TEXT NOT NULL,
+        purchase_intent_score REAL NOT NULL DEFAULT 0,
+        is_lead INTEGER NOT NULL DEFAULT 0,
+        last_contact TEXT NOT NULL DEFAULT '',
+        data TEXT NOT NULL,
+        updated_at REAL NOT NULL,
+        PRIMARY KEY (creator_id, follower_id)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_follower_memory_intent "
+    "ON follower_memory (creator_id, purchase_intent_score DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_follower_memory_last_contact "
+    "ON follower_memory (creator_id, last_contact DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_follower_memory_leads "
+    "ON follower_memory (creator_id, last_contact DESC) WHERE is_lead = 1",
+    # Creators whose legacy JSON directory has already been imported
+    "CREATE TABLE IF NOT EXISTS legacy_import (creator_id TEXT PRIMARY KEY, imported_at REAL NOT NULL)",
+)
+
+_COLUMNS = (
+    "(creator_id, follower_id, purchase_intent_score, is_lead, last_contact, data, updated_at) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+
+_UPSERT = (
+    f"INSERT INTO follower_memory {_COLUMNS} "
+    "ON CONFLICT (creator_id, follower_id) DO UPDATE SET "
+    "purchase_intent_score = excluded.purchase_intent_score, is_lead = excluded.is_lead, "
+    "last_contact = excluded.last_contact, data = excluded.data, updated_at = excluded.updated_at"
+)
+
+# Legacy imports never overwrite a record already written through the store
+_INSERT_IF_MISSING = f"INSERT OR IGNORE INTO follower_memory {_COLUMNS}"
+
+Key = Tuple[str, str]
+
+
+def safe_follower_id(follower_id: str) -> str:
+    """Follower id as used in legacy JSON filenames."""
+    return follower_id.replace("/", "_").replace("\\", "_")
+
+
+def _row_values(record: Dict[str, Any], text: str) -> tuple:
+    return (
+        record["creator_id"],
+        record["follower_id"],
+        float(record.get("purchase_intent_score") or 0.0),
+        1 if record.get("is_lead") else 0,
+        record.get("last_contact") or "",
+        text,
+        time.time(),
+    )
+
+
+class FollowerStore:
+    """SQLite-backed follower records with write-behind and a dedicated I/O thread."""
+
+    def __init__(
+        self,
+        storage_path: str,
+        flush_interval_s: float = FOLLOWER_STORE_FLUSH_S,
+        max_pending: int = FOLLOWER_STORE_MAX_PENDING,
+    ) -> None:
+        self.storage_path = storage_path
+        self.db_path = os.path.join(storage_path, DB_FILENAME)
+        self.flush_interval_s = flush_interval_s
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="follower-store")
+        self._conn: Optional[sqlite3.Connection] = None  # only touched on the executor thread
+        self._lock = threading.Lock()
+        self._pending: Dict[Key, str] = {}
+        self._timer: Optional[threading.Timer] = None
+        self._legacy_checked: Set[str] = set()
+        self._caches: Dict[str, BoundedTTLCache] = {}
+        self._closed = False
+        self.stats = {"reads": 0, "writes": 0, "flushes": 0, "legacy_imported": 0}
+        os.makedirs(storage_path, exist_ok=True)
+        self._executor.submit(self._open).result()
+
+    # ── executor-thread helpers ──────────────────────────────────────────────
+
+    def _open(self) -> None:
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        for statement in _SCHEMA:
+            conn.execute(statement)
+        self._conn = conn
+
+    def _write_batch(self, items: List[Tuple[Key, str]]) -> None:
+        rows = [_row_values(json.loads(text), text) for _, text in items]
+        try:
+            with self._conn:
+                self._conn.executemany(_UPSERT, rows)
+            self.stats["writes"] += len(rows)
+            self.stats["flushes"] += 1
+        except Exception as e:
+            logger.error(f"[FollowerStore] Batch write of {len(rows)} records failed: {e}")
+            # Re-queue for the next flush unless a newer version is already pending
+            with self._lock:
+                for key, text in items:
+                    self._pending.setdefault(key, text)
+
+    def _legacy_path(self, creator_id: str, follower_id: str) -> str:
+        return os.path.join(self.storage_path, creator_id, f"{safe_follower_id(follower_id)}.json")
+
+    def _read_legacy_file(self, path: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else None
+        except Exception as e:
+            logger.error(f"[FollowerStore] Error loading legacy JSON {path}: {e}")
+            return None
+
+    def _import_legacy(self, records: List[Dict[str, Any]]) -> None:
+        rows = []
+        for data in records:
+            text = json.dumps(data, ensure_ascii=False)
+            rows.append(_row_values(data, text))
+        if rows:
+            with self._conn:
+                self._conn.executemany(_INSERT_IF_MISSING, rows)
+            self.stats["legacy_imported"] += len(rows)
+
+    def _read_one(self, creator_id: str, follower_id: str) -> Optional[str]:
+        self.stats["reads"] += 1
+        row = self._conn.execute(
+            "SELECT data FROM follower_memory WHERE creator_id = ? AND follower_id = ?",
+            (creator_id, follower_id),
+        ).fetchone()
+        if row:
+            return row[0]
+        path = self._legacy_path(creator_id, follower_id)
+        if not os.path.exists(path):
+            return None
+        data = self._read_legacy_file(path)
+        if data is None:
+            return None
+        data.setdefault("creator_id", creator_id)
+        data.setdefault("follower_id", follower_id)
+        self._import_legacy([data])
+        return json.dumps(data, ensure_ascii=False)
+
+    def _import_legacy_creator(self, creator_id: str) -> None:
+        if self._conn.execute(
+            "SELECT 1 FROM legacy_import WHERE creator_id = ?", (creator_id,)
+        ).fetchone():
+            return
+        creator_dir = os.path.join(self.storage_path, creator_id)
+        records = []
+        if os.path.isdir(creator_dir):
+            for filename in os.listdir(creator_dir):
+                if not filename.endswith(".json"):
+                    continue
+                data = self._read_legacy_file(os.path.join(creator_dir, filename))
+                if data is None:
+                    continue
+                data.setdefault("creator_id", creator_id)
+                data.setdefault("follower_id", filename[:-5])
+                records.append(data)
+        self._import_legacy(records)
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO legacy_import (creator_id, imported_at) VALUES (?, ?)",
+                (creator_id, time.time()),
+            )
+        if records:
+            logger.info(f"[FollowerStore] Imported {len(records)} legacy JSON records for {creator_id}")
+
+    def _query(
+        self,
+        creator_id: str,
+        min_intent: Optional[float],
+        leads_only: bool,
+        limit: Optional[int],
+    ) -> List[str]:
+        if creator_id not in self._legacy_checked:
+            self._import_legacy_creator(creator_id)
+            self._legacy_checked.add(creator_id)
+        sql = "SELECT data FROM follower_memory WHERE creator_id = ?"
+        params: List[Any] = [creator_id]
+        if leads_only:
+            sql += " AND is_lead = 1 ORDER BY last_contact DESC"
+        elif min_intent is not None:
+            sql += " AND purchase_intent_score >= ? ORDER BY purchase_intent_score DESC"
+            params.append(min_intent)
+        else:
+            sql += " ORDER BY last_contact DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        self.stats["reads"] += 1
+        return [row[0] for row in self._conn.execute(sql, params)]
+
+    def _remove_legacy_file(self, path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except FileNotFoundError:
+            return False
+        except OSError as e:
+            logger.error(f"[FollowerStore] Error removing legacy JSON {path}: {e}")
+            return False
+
+    def _delete(self, creator_id: str, follower_id: Optional[str]) -> int:
+        """Delete rows and their legacy JSON files, so a later miss cannot re-import them."""
+        if follower_id is None:
+            # Import first so the count covers followers that only exist as JSON
+            self._import_legacy_creator(creator_id)
+            self._legacy_checked.add(creator_id)
+            with self._conn:
+                cursor = self._conn.execute(
+                    "DELETE FROM follower_memory WHERE creator_id = ?", (creator_id,)
+                )
+            creator_dir = os.path.join(self.storage_path, creator_id)
+            if os.path.isdir(creator_dir):
+                for filename in os.listdir(creator_dir):
+                    if filename.endswith(".json"):
+                        self._remove_legacy_file(os.path.join(creator_dir, filename))
+            return cursor.rowcount
+        with self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM follower_memory WHERE creator_id = ? AND follower_id = ?",
+                (creator_id, follower_id),
+            )
+        removed = self._remove_legacy_file(self._legacy_path(creator_id, follower_id))
+        return cursor.rowcount or int(removed)
+
+    # ── write-behind ─────────────────────────────────────────────────────────
+
+    def _flush_locked(self) -> Future:
+        """Hand pending writes to the executor. Caller holds the lock.
+
+        Submitting under the lock keeps reads ordered after the writes they
+        could no longer see in ``_pending``.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        items, self._pending = list(self._pending.items()), {}
+        if not items:
+            done: Future = Future()
+            done.set_result(None)
+            return done
+        return self._executor.submit(self._write_batch, items)
+
+    def _flush_from_timer(self) -> None:
+        with self._lock:
+            self._timer = None
+            if not self._closed:
+                self._flush_locked()
+
+    def flush(self, wait: bool = True) -> None:
+        """Write buffered records now; with wait, block until they are committed."""
+        with self._lock:
+            future = self._flush_locked()
+        if wait:
+            future.result()
+
+    def put(self, record: Dict[str, Any]) -> None:
+        """Queue a record (needs creator_id and follower_id) for write-behind."""
+        text = json.dumps(record, ensure_ascii=False)
+        key = (record["creator_id"], record["follower_id"])
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("FollowerStore is closed")
+            self._pending[key] = text
+            if len(self._pending) >= self.max_pending:
+                self._flush_locked()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.flush_interval_s, self._flush_from_timer)
+                self._timer.daemon = True
+                self._timer.start()
+
+    # ── reads ────────────────────────────────────────────────────────────────
+
+    def _submit_read(self, creator_id: str, follower_id: str) -> Tuple[Optional[str], Optional[Future]]:
+        with self._lock:
+            text = self._pending.get((creator_id, follower_id))
+            if text is not None:
+                return text, None
+            return None, self._executor.submit(self._read_one, creator_id, follower_id)
+
+    def get(self, creator_id: str, follower_id: str) -> Optional[Dict[str, Any]]:
+        """Record for a follower, or None (blocking; prefer aget from async code)."""
+        text, future = self._submit_read(creator_id, follower_id)
+        if future is not None:
+            text = future.result()
+        return json.loads(text) if text else None
+
+    async def aget(self, creator_id: str, follower_id: str) -> Optional[Dict[str, Any]]:
+        text, future = self._submit_read(creator_id, follower_id)
+        if future is not None:
+            text = await asyncio.wrap_future(future)
+        return json.loads(text) if text else None
+
+    def _submit_query(self, creator_id, min_intent, leads_only, limit) -> Future:
+        with self._lock:
+            self._flush_locked()
+            return self._executor.submit(self._query, creator_id, min_intent, leads_only, limit)
+
+    def list_for_creator(
+        self,
+        creator_id: str,
+        min_intent: Optional[float] = None,
+        leads_only: bool = False,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Records for a creator: leads by last contact, by intent above min_intent, or all."""
+        future = self._submit_query(creator_id, min_intent, leads_only, limit)
+        return [json.loads(text) for text in future.result()]
+
+    async def alist_for_creator(
+        self,
+        creator_id: str,
+        min_intent: Optional[float] = None,
+        leads_only: bool = False,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        future = self._submit_query(creator_id, min_intent, leads_only, limit)
+        return [json.loads(text) for text in await asyncio.wrap_future(future)]
+
+    def delete(self, creator_id: str, follower_id: Optional[str] = None) -> int:
+        """Delete one follower, or every follower of the creator when follower_id is None."""
+        with self._lock:
+            for key in [k for k in self._pending if k[0] == creator_id]:
+                if follower_id is None or key[1] == follower_id:
+                    del self._pending[key]
+            future = self._executor.submit(self._delete, creator_id, follower_id)
+        return future.result()
+
+    # ── shared caches / lifecycle ────────────────────────────────────────────
+
+    def object_cache(self, namespace: str) -> BoundedTTLCache:
+        """Bounded LRU of decoded objects, shared by every MemoryStore of one kind on this path."""
+        with self._lock:
+            cache = self._caches.get(namespace)
+            if cache is None:
+                cache = BoundedTTLCache(
+                    max_size=FOLLOWER_STORE_CACHE_SIZE, ttl_seconds=600, name="follower_memory"
+                )
+                self._caches[namespace] = cache
+            return cache
+
+    def close(self) -> None:
+        """Flush buffered writes and close the database."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            items, self._pending = list(self._pending.items()), {}
+
+        def _final() -> None:
+            if items:
+                self._write_batch(items)
+            self._close_conn()
+
+        try:
+            self._executor.submit(_final).result()
+        except RuntimeError:
+            # At interpreter exit the executor's worker is already gone
+            _final()
+        self._executor.shutdown(wait=True)
+
+    def _close_conn(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+_stores: Dict[str, FollowerStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_follower_store(storage_path: str = "data/followers") -> FollowerStore:
+    """Process-wide FollowerStore for a storage path."""
+    path = os.path.abspath(storage_path)
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = FollowerStore(path)
+            _stores[path] = store
+        return store
+
+
+@atexit.register
+def _close_all() -> None:
+    with _stores_lock:
+        stores = list(_stores.values())
+        _stores.clear()
+    for store in stores:
+        try:
+            store.close()
+        except Exception as e:
+            logger.error(f"[FollowerStore] Close failed for {store.storage_path}: {e}")
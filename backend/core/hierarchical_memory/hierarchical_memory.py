@@ -187,7 +187,7 @@ class HierarchicalMemoryManager:
 # BUG-EP-08 fix: Cached factory — avoid re-reading JSONL from disk on every message.
 from core.cache import BoundedTTLCache
 
-_hmm_cache: BoundedTTLCache = BoundedTTLCache(max_size=50, ttl_seconds=300)
+_hmm_cache: BoundedTTLCache = BoundedTTLCache(max_size=50, ttl_seconds=300, name="hierarchical_memory")
 
 
 def get_hierarchical_memory(creator_id: str) -> HierarchicalMemoryManager:
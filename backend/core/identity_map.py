@@ -0,0 +1,505 @@
+"""Process-wide identity map: creator/lead ID translation without queries.
+
+Most code paths only need to turn a creator slug into its UUID, a
+(creator, platform_user_id) pair into a lead UUID, or an Instagram
+page_id / ig_user_id / additional id into the creator it belongs to. Each
+module used to run its own lookup (often a full Creator row load) on every
+call. IdentityMap caches those translations once per process:
+
+- creator slug → UUID, UUID → slug, and Instagram id → creator UUID. Any
+  creator row loaded for one mapping fills all of them.
+- (creator UUID, platform_user_id) → lead UUID. platform_user_id is keyed
+  without its ig_/wa_/tg_ prefix and matches every variant (BUG-001), so
+  "ig_123" and "123" share one entry.
+- Misses are cached too (negative entries, IDENTITY_MAP_NEGATIVE_TTL_S) so
+  unknown page IDs and not-yet-created leads don't query on every webhook.
+- resolve_many() translates a batch with one query per kind.
+
+Entries expire after an absolute TTL, and ORM writes invalidate them in every
+worker: an after_flush hook collects Creator identity changes and new,
+deleted or re-keyed Leads, and after commit they go out on the
+invalidation bus (IDENTITY topic). Raw-SQL writes bypass the hook; their
+entries catch up within the TTL.
+
+Lookup failures (DB down) raise and are never cached; callers keep their
+own fallback.
+
+Env vars:
+  IDENTITY_MAP_TTL_S          — lifetime of a resolved entry (default: 3600)
+  IDENTITY_MAP_NEGATIVE_TTL_S — lifetime of a "not found" entry (default: 60)
+  IDENTITY_MAP_MAX_LEADS      — max cached lead entries (default: 50000)
+"""
+
+import asyncio
+import logging
+import os
+import time
+import uuid
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from core.cache import BoundedTTLCache
+from core.observability.metrics import emit_metric
+
+logger = logging.getLogger(__name__)
+
+IDENTITY_MAP_TTL_S = int(os.getenv("IDENTITY_MAP_TTL_S", "3600"))
+IDENTITY_MAP_NEGATIVE_TTL_S = int(os.getenv("IDENTITY_MAP_NEGATIVE_TTL_S", "60"))
+IDENTITY_MAP_MAX_LEADS = int(os.getenv("IDENTITY_MAP_MAX_LEADS", "50000"))
+_MAX_CREATOR_KEYS = 5000
+
+_PLATFORM_PREFIXES = ("ig_", "wa_", "tg_")
+
+# Lookup kinds (stats and the identity_map_lookups_total "kind" label)
+CREATOR_BY_SLUG = "creator_by_slug"
+CREATOR_BY_UUID = "creator_by_uuid"
+CREATOR_BY_PLATFORM_ID = "creator_by_platform_id"
+LEAD = "lead"
+
+# Bus keys: every creator mapping at once, or one lead entry
+_CREATORS_KEY = "creators"
+_LEAD_KEY_PREFIX = "lead:"
+
+_MISS = object()
+
+
+def is_uuid(value: Any) -> bool:
+    try:
+        uuid.UUID(str(value))
+        return True
+    except (ValueError, AttributeError, TypeError):
+        return False
+
+
+def raw_platform_id(platform_user_id: str) -> str:
+    """platform_user_id without its ig_/wa_/tg_ prefix."""
+    for prefix in _PLATFORM_PREFIXES:
+        if platform_user_id.startswith(prefix):
+            return platform_user_id[len(prefix):]
+    return platform_user_id
+
+
+def _lead_key(creator_uuid: str, platform_user_id: str) -> str:
+    return f"{creator_uuid}:{raw_platform_id(platform_user_id)}"
+
+
+class _LookupStats:
+    __slots__ = ("hits", "negative_hits", "misses", "queries")
+
+    def __init__(self):
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.queries = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        lookups = self.hits + self.negative_hits + self.misses
+        return {
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "queries": self.queries,
+            "hit_rate": round((self.hits + self.negative_hits) / lookups, 3) if lookups else None,
+        }
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# DB loader
+# ─────────────────────────────────────────────────────────────────────────────
+
+_CREATOR_COLUMNS = "id, name, instagram_page_id, instagram_user_id, instagram_additional_ids"
+
+
+class DBIdentityLoader:
+    """Bulk identity queries; one round trip per call."""
+
+    def _fetch(self, sql: str, params: dict) -> List[Sequence]:
+        from api.database import SessionLocal
+        from sqlalchemy import text
+
+        if SessionLocal is None:
+            raise RuntimeError("database not configured")
+        session = SessionLocal()
+        try:
+            return session.execute(text(sql), params).fetchall()
+        finally:
+            session.close()
+
+    def creators_by_slug(self, slugs: List[str]) -> List[Sequence]:
+        return self._fetch(
+            f"SELECT {_CREATOR_COLUMNS} FROM creators WHERE name = ANY(:slugs)",
+            {"slugs": slugs},
+        )
+
+    def creators_by_uuid(self, uuids: List[str]) -> List[Sequence]:
+        return self._fetch(
+            f"SELECT {_CREATOR_COLUMNS} FROM creators WHERE id = ANY(CAST(:ids AS uuid[]))",
+            {"ids": uuids},
+        )
+
+    def creators_by_platform_id(self, platform_ids: List[str]) -> List[Sequence]:
+        return self._fetch(
+            f"SELECT {_CREATOR_COLUMNS} FROM creators "
+            "WHERE instagram_page_id = ANY(:ids) OR instagram_user_id = ANY(:ids) "
+            "OR EXISTS (SELECT 1 FROM jsonb_array_elements_text("
+            "COALESCE(CAST(instagram_additional_ids AS jsonb), CAST('[]' AS jsonb))) AS extra(v) "
+            "WHERE extra.v = ANY(:ids))",
+            {"ids": platform_ids},
+        )
+
+    def leads(self, creator_uuid: str, platform_user_ids: List[str]) -> List[Sequence]:
+        """(id, platform_user_id) rows of the creator's leads matching any prefix variant."""
+        variants = set()
+        for pid in platform_user_ids:
+            raw = raw_platform_id(pid)
+            variants.add(pid)
+            variants.add(raw)
+            variants.update(f"{prefix}{raw}" for prefix in _PLATFORM_PREFIXES)
+        return self._fetch(
+            "SELECT id, platform_user_id FROM leads "
+            "WHERE creator_id = CAST(:cid AS uuid) AND platform_user_id = ANY(:pids)",
+            {"cid": creator_uuid, "pids": sorted(variants)},
+        )
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Identity map
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class IdentityMap:
+    """Cached creator/lead ID translation; see module docstring."""
+
+    def __init__(
+        self,
+        loader: Optional[DBIdentityLoader] = None,
+        ttl_s: float = IDENTITY_MAP_TTL_S,
+        negative_ttl_s: float = IDENTITY_MAP_NEGATIVE_TTL_S,
+        max_leads: int = IDENTITY_MAP_MAX_LEADS,
+    ):
+        self.loader = loader if loader is not None else DBIdentityLoader()
+        self.ttl_s = ttl_s
+        self.negative_ttl_s = negative_ttl_s
+        # Entries are (value or None, expires_at); the cache's own sliding TTL only bounds idle entries
+        self._caches: Dict[str, BoundedTTLCache] = {
+            CREATOR_BY_SLUG: BoundedTTLCache(_MAX_CREATOR_KEYS, ttl_s),
+            CREATOR_BY_UUID: BoundedTTLCache(_MAX_CREATOR_KEYS, ttl_s),
+            CREATOR_BY_PLATFORM_ID: BoundedTTLCache(_MAX_CREATOR_KEYS, ttl_s),
+            LEAD: BoundedTTLCache(max_leads, ttl_s),
+        }
+        self._stats: Dict[str, _LookupStats] = {kind: _LookupStats() for kind in self._caches}
+        self.invalidations = 0
+
+    # --- cache primitives --------------------------------------------------
+
+    def _peek(self, kind: str, key: str) -> Any:
+        """Live cached value (None for a negative entry), or _MISS."""
+        entry = self._caches[kind].get(key)
+        if entry is None or entry[1] <= time.monotonic():
+            return _MISS
+        return entry[0]
+
+    def _count(self, kind: str, value: Any) -> None:
+        stats = self._stats[kind]
+        if value is _MISS:
+            stats.misses += 1
+            outcome = "miss"
+        elif value is None:
+            stats.negative_hits += 1
+            outcome = "negative_hit"
+        else:
+            stats.hits += 1
+            outcome = "hit"
+        emit_metric("identity_map_lookups_total", kind=kind, outcome=outcome)
+
+    def _store(self, kind: str, key: str, value: Optional[str]) -> None:
+        ttl = self.ttl_s if value is not None else self.negative_ttl_s
+        self._caches[kind].set(key, (value, time.monotonic() + ttl))
+
+    def _remember_creator(self, row: Sequence) -> None:
+        creator_uuid, slug = str(row[0]), row[1]
+        if slug:
+            self._store(CREATOR_BY_SLUG, slug, creator_uuid)
+            self._store(CREATOR_BY_UUID, creator_uuid, slug)
+        for platform_id in (row[2], row[3], *(row[4] or ())):
+            if platform_id:
+                self._store(CREATOR_BY_PLATFORM_ID, str(platform_id), creator_uuid)
+
+    def _resolve(
+        self,
+        kind: str,
+        keys: Iterable[str],
+        load: Callable[[List[str]], Dict[str, Optional[str]]],
+    ) -> Dict[str, Optional[str]]:
+        result: Dict[str, Optional[str]] = {}
+        missing: List[str] = []
+        for key in dict.fromkeys(keys):
+            value = self._peek(kind, key)
+            self._count(kind, value)
+            if value is _MISS:
+                missing.append(key)
+            else:
+                result[key] = value
+        if missing:
+            self._stats[kind].queries += 1
+            loaded = load(missing)
+            for key in missing:
+                value = loaded.get(key)
+                # Found values were stored by load(); this records the misses
+                if value is None:
+                    self._store(kind, key, None)
+                result[key] = value
+        return result
+
+    # --- loaders -------------------------------------------------------------
+
+    def _load_by_slug(self, slugs: List[str]) -> Dict[str, Optional[str]]:
+        found = {}
+        for row in self.loader.creators_by_slug(slugs):
+            self._remember_creator(row)
+            found[row[1]] = str(row[0])
+        return found
+
+    def _load_by_uuid(self, uuids: List[str]) -> Dict[str, Optional[str]]:
+        found = {}
+        for row in self.loader.creators_by_uuid(uuids):
+            self._remember_creator(row)
+            found[str(row[0])] = row[1]
+        return found
+
+    def _load_by_platform_id(self, platform_ids: List[str]) -> Dict[str, Optional[str]]:
+        rows = self.loader.creators_by_platform_id(platform_ids)
+        found: Dict[str, Optional[str]] = {}
+        # Same precedence as the old sequential queries: page_id, then user_id, then additional ids
+        for column in (2, 3, 4):
+            for row in rows:
+                ids = (row[column] or ()) if column == 4 else (row[column],)
+                for platform_id in ids:
+                    if platform_id and str(platform_id) in platform_ids:
+                        found.setdefault(str(platform_id), str(row[0]))
+        for row in rows:
+            self._remember_creator(row)
+        for platform_id, creator_uuid in found.items():
+            self._store(CREATOR_BY_PLATFORM_ID, platform_id, creator_uuid)
+        return found
+
+    # --- public API ----------------------------------------------------------
+
+    def resolve_creator_uuid(self, ref: str) -> Optional[str]:
+        """Creator UUID for a slug (a UUID passes through unchanged), or None."""
+        if not ref:
+            return None
+        if is_uuid(ref):
+            return str(ref)
+        return self._resolve(CREATOR_BY_SLUG, [ref], self._load_by_slug)[ref]
+
+    def resolve_creator_slug(self, creator_uuid: str) -> Optional[str]:
+        """Creator slug (name) for a UUID, or None."""
+        if not creator_uuid or not is_uuid(creator_uuid):
+            return None
+        key = str(creator_uuid)
+        return self._resolve(CREATOR_BY_UUID, [key], self._load_by_uuid)[key]
+
+    def resolve_creator_by_platform_id(self, platform_id: str) -> Optional[str]:
+        """UUID of the creator owning an Instagram page_id / ig_user_id / additional id."""
+        if not platform_id:
+            return None
+        key = str(platform_id)
+        return self._resolve(CREATOR_BY_PLATFORM_ID, [key], self._load_by_platform_id)[key]
+
+    def resolve_lead_uuid(self, creator_uuid: str, platform_user_id: str) -> Optional[str]:
+        """Lead UUID for (creator UUID, platform_user_id); a UUID lead ref passes through."""
+        if not platform_user_id:
+            return None
+        if is_uuid(platform_user_id):
+            return str(platform_user_id)
+        if not creator_uuid:
+            return None
+        return self.resolve_many([platform_user_id], creator_uuid=creator_uuid)[platform_user_id]
+
+    def resolve_many(
+        self, refs: Iterable[str], creator_uuid: Optional[str] = None
+    ) -> Dict[str, Optional[str]]:
+        """Bulk translation with at most one query for the uncached refs.
+
+        Without creator_uuid, refs are creator slugs (or UUIDs) → creator UUIDs.
+        With it, refs are that creator's platform_user_ids (or lead UUIDs) → lead UUIDs.
+        """
+        refs = [r for r in refs if r]
+        result: Dict[str, Optional[str]] = {r: str(r) for r in refs if is_uuid(r)}
+        pending = [r for r in refs if r not in result]
+        if not pending:
+            return result
+        if creator_uuid is None:
+            result.update(self._resolve(CREATOR_BY_SLUG, pending, self._load_by_slug))
+            return result
+
+        cid = str(creator_uuid)
+        keys = {ref: _lead_key(cid, ref) for ref in pending}
+
+        def _load(missing_keys: List[str]) -> Dict[str, Optional[str]]:
+            wanted = set(missing_keys)
+            found: Dict[str, Optional[str]] = {}
+            for lead_id, pid in self.loader.leads(cid, [k.split(":", 1)[1] for k in missing_keys]):
+                key = _lead_key(cid, pid)
+                if key in wanted and key not in found:
+                    found[key] = str(lead_id)
+                    self._store(LEAD, key, found[key])
+            return found
+
+        by_key = self._resolve(LEAD, keys.values(), _load)
+        result.update({ref: by_key[key] for ref, key in keys.items()})
+        return result
+
+    async def aresolve_creator_uuid(self, ref: str) -> Optional[str]:
+        """Async resolve_creator_uuid: cache hits return inline, misses query in a thread."""
+        if not ref or is_uuid(ref):
+            return self.resolve_creator_uuid(ref)
+        value = self._peek(CREATOR_BY_SLUG, ref)
+        if value is not _MISS:
+            self._count(CREATOR_BY_SLUG, value)
+            return value
+        return await asyncio.to_thread(self.resolve_creator_uuid, ref)
+
+    async def aresolve_lead_uuid(self, creator_uuid: str, platform_user_id: str) -> Optional[str]:
+        """Async resolve_lead_uuid: cache hits return inline, misses query in a thread."""
+        if not platform_user_id or not creator_uuid or is_uuid(platform_user_id):
+            return self.resolve_lead_uuid(creator_uuid, platform_user_id)
+        value = self._peek(LEAD, _lead_key(str(creator_uuid), platform_user_id))
+        if value is not _MISS:
+            self._count(LEAD, value)
+            return value
+        return await asyncio.to_thread(self.resolve_lead_uuid, creator_uuid, platform_user_id)
+
+    # --- invalidation --------------------------------------------------------
+
+    def invalidate(self, key: Optional[str]) -> None:
+        """Drop entries for a bus key: "creators", "lead:<creator_uuid>:<raw id>", or None (all).
+
+        Creator mappings are dropped together: a rename or a moved page_id
+        touches several of them, and there are few creators.
+        """
+        self.invalidations += 1
+        if key is None:
+            for cache in self._caches.values():
+                cache.clear()
+        elif key == _CREATORS_KEY:
+            for kind in (CREATOR_BY_SLUG, CREATOR_BY_UUID, CREATOR_BY_PLATFORM_ID):
+                self._caches[kind].clear()
+        elif key.startswith(_LEAD_KEY_PREFIX):
+            self._caches[LEAD].pop(key[len(_LEAD_KEY_PREFIX):])
+
+    def clear(self) -> None:
+        self.invalidate(None)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = {kind: s.to_dict() for kind, s in self._stats.items()}
+        for kind, cache in self._caches.items():
+            lookups[kind]["size"] = len(cache)
+            lookups[kind]["evictions"] = cache.evictions
+        hits = sum(s.hits + s.negative_hits for s in self._stats.values())
+        total = hits + sum(s.misses for s in self._stats.values())
+        return {
+            "ttl_s": self.ttl_s,
+            "negative_ttl_s": self.negative_ttl_s,
+            "hit_rate": round(hits / total, 3) if total else None,
+            "invalidations": self.invalidations,
+            "lookups": lookups,
+        }
+
+
+identity_map = IdentityMap()
+
+
+def get_identity_map_stats() -> Dict[str, Any]:
+    """Hit rates, sizes and query counts per lookup kind for health endpoints."""
+    return identity_map.stats()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# ORM hooks: invalidate on Creator / Lead writes
+# ─────────────────────────────────────────────────────────────────────────────
+
+_CREATOR_IDENTITY_FIELDS = ("name", "instagram_page_id", "instagram_user_id", "instagram_additional_ids")
+_LEAD_IDENTITY_FIELDS = ("creator_id", "platform_user_id")
+
+
+def _lead_bus_keys(state) -> set:
+    """Bus keys for a Lead's current and (if changed) previous identity."""
+    creators = {state.dict.get("creator_id")}
+    pids = {state.dict.get("platform_user_id")}
+    if state.attrs["creator_id"].history.deleted:
+        creators.update(state.attrs["creator_id"].history.deleted)
+    if state.attrs["platform_user_id"].history.deleted:
+        pids.update(state.attrs["platform_user_id"].history.deleted)
+    return {
+        f"{_LEAD_KEY_PREFIX}{_lead_key(str(cid), pid)}"
+        for cid in creators if cid is not None
+        for pid in pids if pid
+    }
+
+
+def _collect_identity_changes(session, _flush_context) -> None:
+    from sqlalchemy import inspect
+
+    from api.models import Creator, Lead
+
+    keys: set = set()
+    for obj in (*session.new, *session.deleted):
+        if isinstance(obj, Creator):
+            keys.add(_CREATORS_KEY)
+        elif isinstance(obj, Lead):
+            keys.update(_lead_bus_keys(inspect(obj)))
+    for obj in session.dirty:
+        if isinstance(obj, Creator):
+            state = inspect(obj)
+            if any(state.attrs[f].history.has_changes() for f in _CREATOR_IDENTITY_FIELDS):
+                keys.add(_CREATORS_KEY)
+        elif isinstance(obj, Lead):
+            state = inspect(obj)
+            if any(state.attrs[f].history.has_changes() for f in _LEAD_IDENTITY_FIELDS):
+                keys.update(_lead_bus_keys(state))
+    if keys:
+        session.info.setdefault("_invalidate_identities", set()).update(keys)
+
+
+def _publish_identity_changes(session) -> None:
+    # After commit, so no worker reloads the pre-commit rows
+    keys = session.info.pop("_invalidate_identities", None)
+    if not keys:
+        return
+    from core.invalidation_bus import InvalidationTopic, publish_invalidation
+
+    for key in sorted(keys):
+        publish_invalidation(InvalidationTopic.IDENTITY, key)
+
+
+def _discard_identity_changes(session) -> None:
+    session.info.pop("_invalidate_identities", None)
+
+
+_hooks_installed = False
+
+
+def install_identity_map_hooks(target=None) -> None:
+    """Invalidate the identity map in every worker when Creator/Lead identities change.
+
+    Only identity columns count: bot_active / token / score updates leave
+    the map alone.
+    """
+    global _hooks_installed
+    if _hooks_installed:
+        return
+    try:
+        from sqlalchemy import event
+        from sqlalchemy.orm import Session
+
+        from core.invalidation_bus import InvalidationTopic, get_invalidation_bus
+
+        get_invalidation_bus().subscribe(InvalidationTopic.IDENTITY, identity_map.invalidate)
+        target = target if target is not None else Session
+        event.listen(target, "after_flush", _collect_identity_changes)
+        event.listen(target, "after_commit", _publish_identity_changes)
+        event.listen(target, "after_rollback", _discard_identity_changes)
+        _hooks_installed = True
+    except Exception as e:
+        logger.warning(f"[IDENTITY-MAP] ORM invalidation hooks not installed: {e}")
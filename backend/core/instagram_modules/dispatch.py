@@ -191,6 +191,7 @@ async def _handle_autopilot_mode(
 ) -> Dict[str, Any]:
     """AUTOPILOT MODE: Check if creator already responded before sending."""
     from core.instagram_modules.echo import has_creator_responded_recently
+    from core.webhook_queue import mark_queued_message_done
 
     creator_already_responded = await has_creator_responded_recently(
         handler, message.sender_id, window_seconds=300
@@ -214,6 +215,9 @@ async def _handle_autopilot_mode(
 
     # Bot sends directly (guarded by send_response)
     sent = await handler.send_response(message.sender_id, response_text)
+    if sent:
+        # A failure in the bookkeeping below must not send the reply again
+        mark_queued_message_done(message.message_id)
 
     await handler._save_user_message_to_db(
         msg=message, username=username, full_name=full_name,
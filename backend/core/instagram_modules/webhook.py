@@ -6,12 +6,15 @@ extracts messages, handles deduplication, rate limiting, and delegates
 response handling to dispatch module.
 """
 
+import dataclasses
 import logging
 from datetime import datetime
 from typing import Any, Dict, List
 
+from core.dm_coalescer import coalescing_enabled, get_dm_coalescer
 from core.instagram import InstagramMessage
 from core.rate_limiter import get_rate_limiter
+from core.webhook_queue import current_queued_event
 
 logger = logging.getLogger("clonnect-instagram")
 
@@ -84,6 +87,12 @@ async def handle_webhook_impl(
     # Check if copilot mode is enabled
     copilot_enabled = await handler._is_copilot_enabled()
 
+    # A retried queue event skips the dedup below (its burst's messages were
+    # saved before the pipeline ran) and re-runs only the messages its earlier
+    # attempt did not finish (core.webhook_queue per-message marks)
+    event = current_queued_event()
+    retried = event is not None and event.attempts > 1
+
     results = []
     for message in messages:
         # Skip messages from any known creator ID
@@ -101,6 +110,15 @@ async def handle_webhook_impl(
             logger.info(f"Skipping self-message: {message.sender_id}")
             continue
 
+        if retried and event.message_done(message.message_id):
+            logger.info(f"[IG:{message.sender_id}] {message.message_id} finished by an earlier attempt")
+            results.append({
+                "message_id": message.message_id,
+                "sender_id": message.sender_id,
+                "status": "already_processed",
+            })
+            continue
+
         handler._record_received(message)
         input_preview = (
             message.text[:100]
@@ -151,7 +169,7 @@ async def handle_webhook_impl(
             if not hasattr(handler, "_processed_message_ids"):
                 handler._processed_message_ids = set()
 
-            if message.message_id in handler._processed_message_ids:
+            if message.message_id in handler._processed_message_ids and not retried:
                 logger.warning(
                     f"[IG:{message.sender_id}] Skipping duplicate message_id: {message.message_id}"
                 )
@@ -167,7 +185,7 @@ async def handle_webhook_impl(
                 handler._processed_message_ids = set(list(handler._processed_message_ids)[-500:])
 
             # PERSISTENT DEDUP: DB check
-            if message.message_id:
+            if message.message_id and not retried:
                 try:
                     from api.database import SessionLocal
                     from api.models import Message as MsgModel
@@ -192,8 +210,28 @@ async def handle_webhook_impl(
                 except Exception as e:
                     logger.warning(f"[DEDUP:DB] Check failed: {e}")
 
-            # Process with DM agent
-            response = await handler.process_message(message)
+            # Process with DM agent. Bursts of text DMs from one follower are
+            # answered by a single pass (core.dm_coalescer); the earlier
+            # messages of a burst are only saved.
+            coalesce = coalescing_enabled("instagram") and _is_plain_text(message)
+            if coalesce:
+                await handler._save_user_message_to_db(msg=message, username="", full_name="")
+            turn = await get_dm_coalescer().submit(
+                "instagram",
+                f"{getattr(handler, 'creator_id', '')}:{message.sender_id}",
+                message,
+                lambda batch: handler.process_message(_merge_burst(batch)),
+                window_s=None if coalesce else 0,
+            )
+            if turn.absorbed:
+                results.append({
+                    "message_id": message.message_id,
+                    "sender_id": message.sender_id,
+                    "status": "coalesced",
+                    "batch_size": turn.batch_size,
+                })
+                continue
+            response = turn.result
 
             response_text = getattr(response, "content", None) or getattr(response, "response_text", "")
             intent_str = (
@@ -260,12 +298,20 @@ async def handle_webhook_impl(
                 f"Error processing message {message.message_id}: {e}\n{traceback.format_exc()}"
             )
             handler.status.errors += 1
+            # Let a redelivery (Meta retry or core.webhook_queue) process it again
+            getattr(handler, "_processed_message_ids", set()).discard(message.message_id)
             results.append({
                 "message_id": message.message_id,
                 "sender_id": message.sender_id,
+                "status": "failed",
                 "error": str(e),
             })
 
+    if event is not None:
+        for result in results:
+            if result.get("status") != "failed":
+                event.mark_message_done(result["message_id"])
+
     return {
         "status": "ok",
         "messages_processed": len(messages),
@@ -275,6 +321,18 @@ async def handle_webhook_impl(
     }
 
 
+def _is_plain_text(message: InstagramMessage) -> bool:
+    """Only text DMs coalesce; media and story messages keep their own pass."""
+    return bool(message.text) and not message.attachments and not message.story
+
+
+def _merge_burst(batch: List[InstagramMessage]) -> InstagramMessage:
+    """One message carrying the whole burst's text, addressed as the last one."""
+    if len(batch) == 1:
+        return batch[0]
+    return dataclasses.replace(batch[-1], text="\n".join(m.text for m in batch if m.text))
+
+
 async def _extract_echo_messages(handler, payload: Dict[str, Any]) -> List[Dict[str, Any]]:
     """Extract echo messages (creator's manual responses) from webhook payload."""
     echo_messages = []
@@ -196,6 +196,43 @@ class InstagramRateLimiter:
             f"Backoff: {backoff}s"
         )
 
+    def remaining_budget(self, creator_id: str) -> int:
+        """
+        Llamadas restantes para trabajo en background (hora/día).
+
+        No cuenta el límite por minuto: ese es para ráfagas de envío.
+        Devuelve 0 si hay backoff activo.
+        """
+        state = self._states[creator_id]
+        self._clean_old_calls(state)
+        if state.backoff_until > time.time():
+            return 0
+        return max(
+            0,
+            min(
+                self.CALLS_PER_HOUR - len(state.calls_hour),
+                self.CALLS_PER_DAY - len(state.calls_day),
+            ),
+        )
+
+    def consume_budget(self, creator_id: str, endpoint: str, calls: int):
+        """
+        Descontar llamadas de background del presupuesto hora/día.
+
+        A diferencia de record_call, no ocupa la ventana por minuto, para que
+        la reconciliación no bloquee las respuestas a DMs.
+        """
+        if calls <= 0:
+            return
+        now = time.time()
+        state = self._states[creator_id]
+        state.calls_hour.extend([now] * calls)
+        state.calls_day.extend([now] * calls)
+        self._call_history.extend(
+            APICallRecord(timestamp=now, endpoint=endpoint, creator_id=creator_id)
+            for _ in range(calls)
+        )
+
     def reset_backoff(self, creator_id: str) -> Dict:
         """Reset backoff for a specific creator."""
         state = self._states[creator_id]
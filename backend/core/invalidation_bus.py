@@ -0,0 +1,367 @@
+"""
+Cross-worker cache invalidation bus.
+
+Per-process caches (api.cache.api_cache, the DM agent cache, style_retriever's
+examples cache, the webhook page_id → creator lookup) used to be invalidated
+only in the worker that handled the write; every other uvicorn worker kept
+serving stale data until its TTL ran out.
+
+publish(topic, key) applies the invalidation locally right away (so the
+writing worker behaves exactly as before), then queues it for the other
+workers. Bursts are batched: queued invalidations are deduplicated and sent as
+one message after INVALIDATION_BATCH_MS (or immediately once
+INVALIDATION_MAX_BATCH keys are queued). A ``None`` key means "everything in
+this topic" and absorbs the topic's individual keys.
+
+Backends:
+  local     — in-process hub (default; also what tests use to simulate workers)
+  postgres  — LISTEN/NOTIFY on channel ``cache_invalidation``. Needs a direct
+              (non-pgbouncer) connection: INVALIDATION_DATABASE_URL, falling
+              back to DATABASE_URL. After a listener reconnect every subscribed
+              topic is flushed, since notifications may have been missed.
+
+Env vars:
+  INVALIDATION_BUS_BACKEND   — local | postgres (default: local)
+  INVALIDATION_DATABASE_URL  — DSN for LISTEN/NOTIFY (default: DATABASE_URL)
+  INVALIDATION_BATCH_MS      — batching window in ms (default: 50)
+  INVALIDATION_MAX_BATCH     — flush early after this many queued keys (default: 200)
+"""
+
+import json
+import logging
+import os
+import select
+import threading
+import uuid
+from collections import defaultdict
+from enum import Enum
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_BUS_BACKEND = os.getenv("INVALIDATION_BUS_BACKEND", "local").lower()
+INVALIDATION_BATCH_S = int(os.getenv("INVALIDATION_BATCH_MS", "50")) / 1000
+INVALIDATION_MAX_BATCH = int(os.getenv("INVALIDATION_MAX_BATCH", "200"))
+
+NOTIFY_CHANNEL = "cache_invalidation"
+# Postgres NOTIFY payloads must stay under 8000 bytes
+_MAX_PAYLOAD_BYTES = 7500
+
+
+class InvalidationTopic(str, Enum):
+    """One topic per cache; the key's meaning is fixed by the topic."""
+
+    API_CACHE = "api_cache"            # key: api_cache key prefix, e.g. "conversations:iris"
+    DM_AGENT = "dm_agent"              # key: creator_id (name)
+    STYLE_EXAMPLES = "style_examples"  # key: creator DB id (str)
+    CREATOR_LOOKUP = "creator_lookup"  # key: creator name (webhook page_id routing cache)
+    IDENTITY = "identity"              # key: "creators" | "lead:<creator_uuid>:<raw platform_user_id>" (core.identity_map)
+
+
+Handler = Callable[[Optional[str]], None]
+Item = Tuple[str, Optional[str]]
+
+
+def encode_batch(origin: str, items: List[Item]) -> List[str]:
+    """Encode (topic, key) items as JSON payloads, each under the NOTIFY size limit."""
+    payloads: List[str] = []
+    chunk: List[Item] = []
+    size = 0
+    for item in items:
+        item_size = len(json.dumps(item).encode("utf-8")) + 1
+        if chunk and size + item_size > _MAX_PAYLOAD_BYTES:
+            payloads.append(json.dumps({"o": origin, "i": chunk}))
+            chunk, size = [], 0
+        chunk.append(item)
+        size += item_size
+    if chunk:
+        payloads.append(json.dumps({"o": origin, "i": chunk}))
+    return payloads
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Backends
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class InMemoryHub:
+    """Fan-out point shared by InMemoryBackends — one hub per simulated cluster."""
+
+    def __init__(self):
+        self._listeners: List[Callable[[str], None]] = []
+        self._lock = threading.Lock()
+
+    def connect(self, on_message: Callable[[str], None]) -> None:
+        with self._lock:
+            self._listeners.append(on_message)
+
+    def disconnect(self, on_message: Callable[[str], None]) -> None:
+        with self._lock:
+            if on_message in self._listeners:
+                self._listeners.remove(on_message)
+
+    def broadcast(self, payload: str) -> None:
+        with self._lock:
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener(payload)
+
+
+class InMemoryBackend:
+    """Delivers payloads to every bus connected to the same hub (synchronously)."""
+
+    def __init__(self, hub: Optional[InMemoryHub] = None):
+        self.hub = hub or InMemoryHub()
+        self._on_message: Optional[Callable[[str], None]] = None
+
+    def start(self, on_message: Callable[[str], None], on_reconnect: Callable[[], None]) -> None:
+        self._on_message = on_message
+        self.hub.connect(on_message)
+
+    def send(self, payload: str) -> None:
+        self.hub.broadcast(payload)
+
+    def stop(self) -> None:
+        if self._on_message is not None:
+            self.hub.disconnect(self._on_message)
+            self._on_message = None
+
+
+class PostgresNotifyBackend:
+    """LISTEN/NOTIFY over psycopg2: one listener thread + one lazily opened sender connection."""
+
+    def __init__(self, dsn: str, channel: str = NOTIFY_CHANNEL, poll_timeout_s: float = 5.0):
+        self.dsn = dsn
+        self.channel = channel
+        self.poll_timeout_s = poll_timeout_s
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._send_conn = None
+        self._send_lock = threading.Lock()
+
+    def _connect(self):
+        import psycopg2
+
+        conn = psycopg2.connect(self.dsn)
+        conn.autocommit = True
+        return conn
+
+    def start(self, on_message: Callable[[str], None], on_reconnect: Callable[[], None]) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._listen_loop, args=(on_message, on_reconnect),
+            name="invalidation-listener", daemon=True,
+        )
+        self._thread.start()
+
+    def _listen_loop(self, on_message, on_reconnect) -> None:
+        backoff = 1.0
+        connected_once = False
+        while not self._stop.is_set():
+            conn = None
+            try:
+                conn = self._connect()
+                with conn.cursor() as cur:
+                    cur.execute(f"LISTEN {self.channel}")
+                if connected_once:
+                    on_reconnect()
+                connected_once = True
+                backoff = 1.0
+                logger.info("[INVALIDATION] listening on %s", self.channel)
+                while not self._stop.is_set():
+                    if select.select([conn], [], [], self.poll_timeout_s) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        on_message(conn.notifies.pop(0).payload)
+            except Exception as e:
+                logger.warning("[INVALIDATION] listener error: %s — reconnecting in %.0fs", e, backoff)
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 60.0)
+            finally:
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+
+    def send(self, payload: str) -> None:
+        with self._send_lock:
+            for attempt in (1, 2):
+                try:
+                    if self._send_conn is None or self._send_conn.closed:
+                        self._send_conn = self._connect()
+                    with self._send_conn.cursor() as cur:
+                        cur.execute("SELECT pg_notify(%s, %s)", (self.channel, payload))
+                    return
+                except Exception as e:
+                    self._send_conn = None
+                    if attempt == 2:
+                        logger.error("[INVALIDATION] NOTIFY failed: %s", e)
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_timeout_s + 1)
+            self._thread = None
+        with self._send_lock:
+            if self._send_conn is not None:
+                try:
+                    self._send_conn.close()
+                except Exception:
+                    pass
+                self._send_conn = None
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Bus
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class InvalidationBus:
+    """Typed publish/subscribe for cache invalidations with burst batching."""
+
+    def __init__(
+        self,
+        backend=None,
+        batch_window_s: float = INVALIDATION_BATCH_S,
+        max_batch: int = INVALIDATION_MAX_BATCH,
+    ):
+        self.backend = backend if backend is not None else InMemoryBackend()
+        self.batch_window_s = batch_window_s
+        self.max_batch = max_batch
+        self.origin = uuid.uuid4().hex[:12]
+        self._handlers: Dict[InvalidationTopic, List[Handler]] = defaultdict(list)
+        # topic → set of keys, or None for "whole topic"
+        self._pending: Dict[InvalidationTopic, Optional[Set[str]]] = {}
+        self._pending_count = 0
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self._started = False
+        self.stats = {"published": 0, "batches_sent": 0, "received": 0, "resyncs": 0}
+
+    def subscribe(self, topic: InvalidationTopic, handler: Handler) -> None:
+        """Register a local handler: handler(key) drops key (or everything when key is None)."""
+        self._handlers[topic].append(handler)
+
+    def _apply(self, topic: InvalidationTopic, key: Optional[str]) -> None:
+        for handler in self._handlers.get(topic, ()):
+            try:
+                handler(key)
+            except Exception as e:
+                logger.error("[INVALIDATION] handler for %s failed: %s", topic.value, e)
+
+    def publish(self, topic: InvalidationTopic, key: Optional[str] = None) -> None:
+        """Invalidate locally now and broadcast to other workers in the next batch."""
+        self._apply(topic, key)
+        self.stats["published"] += 1
+        flush_now = False
+        with self._lock:
+            if key is None:
+                self._pending_count -= len(self._pending.get(topic) or ())
+                self._pending[topic] = None
+                self._pending_count += 1
+            else:
+                keys = self._pending.setdefault(topic, set())
+                if keys is not None and key not in keys:
+                    keys.add(key)
+                    self._pending_count += 1
+            if self._pending_count >= self.max_batch:
+                flush_now = True
+            elif self._timer is None:
+                self._timer = threading.Timer(self.batch_window_s, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if flush_now:
+            self.flush()
+
+    def _drain(self) -> List[Item]:
+        with self._lock:
+            pending, self._pending, self._pending_count = self._pending, {}, 0
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        items: List[Item] = []
+        for topic, keys in pending.items():
+            if keys is None:
+                items.append((topic.value, None))
+            else:
+                items.extend((topic.value, key) for key in sorted(keys))
+        return items
+
+    def flush(self) -> int:
+        """Send queued invalidations now. Returns the number of items sent."""
+        items = self._drain()
+        if not items:
+            return 0
+        for payload in encode_batch(self.origin, items):
+            try:
+                self.backend.send(payload)
+                self.stats["batches_sent"] += 1
+            except Exception as e:
+                logger.error("[INVALIDATION] send failed: %s", e)
+        return len(items)
+
+    def receive(self, payload: str) -> None:
+        """Apply a batch broadcast by another worker (own batches are ignored)."""
+        try:
+            message = json.loads(payload)
+        except (TypeError, ValueError):
+            logger.warning("[INVALIDATION] ignoring malformed payload")
+            return
+        if message.get("o") == self.origin:
+            return
+        for topic_name, key in message.get("i", ()):
+            try:
+                topic = InvalidationTopic(topic_name)
+            except ValueError:
+                continue  # topic from a newer deploy
+            self.stats["received"] += 1
+            self._apply(topic, key)
+
+    def resync(self) -> None:
+        """Drop everything subscribed — used when notifications may have been missed."""
+        self.stats["resyncs"] += 1
+        for topic in list(self._handlers):
+            self._apply(topic, None)
+
+    def start(self) -> None:
+        if not self._started:
+            self.backend.start(self.receive, self.resync)
+            self._started = True
+
+    def stop(self) -> None:
+        self.flush()
+        if self._started:
+            self.backend.stop()
+            self._started = False
+
+
+def _backend_from_env():
+    if INVALIDATION_BUS_BACKEND == "postgres":
+        dsn = os.getenv("INVALIDATION_DATABASE_URL") or os.getenv("DATABASE_URL", "")
+        if dsn.startswith("postgres://"):
+            dsn = dsn.replace("postgres://", "postgresql://", 1)
+        if dsn:
+            return PostgresNotifyBackend(dsn)
+        logger.warning("[INVALIDATION] postgres backend requested without a DSN — using local")
+    return InMemoryBackend()
+
+
+_bus: Optional[InvalidationBus] = None
+_bus_lock = threading.Lock()
+
+
+def get_invalidation_bus() -> InvalidationBus:
+    """Get the process-wide invalidation bus (backend chosen by INVALIDATION_BUS_BACKEND)."""
+    global _bus
+    if _bus is None:
+        with _bus_lock:
+            if _bus is None:
+                _bus = InvalidationBus(_backend_from_env())
+    return _bus
+
+
+def publish_invalidation(topic: InvalidationTopic, key: Optional[str] = None) -> None:
+    """Shortcut for get_invalidation_bus().publish(topic, key)."""
+    get_invalidation_bus().publish(topic, key)
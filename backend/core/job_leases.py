@@ -0,0 +1,253 @@
+"""
+Distributed leases for TaskScheduler jobs.
+
+Every uvicorn worker and every replica registers the same scheduled jobs.
+A lease makes a cluster-scoped job run on exactly one node per interval.
+Before each run a node tries to take the job's lease. It succeeds only if
+no other node holds an unexpired lease and the job's last start (on any
+node) is at least one interval old. The holder renews the lease while
+the job runs, so a long job never overlaps itself. On finish it records
+the run's duration and error.
+
+Because "due" is decided from the shared last start, runs missed while no
+node was up collapse into a single catch-up run. A redeploy no longer
+restarts every daily job.
+
+Backends:
+  local     — in-process store (default; leases only deduplicate inside
+              one process, which is the pre-lease behaviour; tests share
+              one InMemoryLeaseStore between schedulers to simulate nodes)
+  postgres  — scheduler_leases table (migration 055). Single-statement
+              upserts, so it works through pgbouncer, unlike session
+              advisory locks.
+
+Times in LeaseState come from the backend's clock (state.now), so nodes
+never compare their own clocks against another node's timestamps.
+
+Env vars:
+  SCHEDULER_LEASE_BACKEND — local | postgres (default: local)
+  SCHEDULER_LEASE_TTL_S   — lease lifetime, renewed every third of it while running (default: 120)
+"""
+
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+SCHEDULER_LEASE_BACKEND = os.getenv("SCHEDULER_LEASE_BACKEND", "local").lower()
+SCHEDULER_LEASE_TTL_S = float(os.getenv("SCHEDULER_LEASE_TTL_S", "120"))
+
+
+def node_id() -> str:
+    """Lease owner id for this process: host, pid and a per-start suffix."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+@dataclass
+class LeaseState:
+    """Result of an acquire attempt; timestamps are epoch seconds on the backend's clock."""
+
+    acquired: bool
+    now: float
+    owner: Optional[str] = None
+    lease_until: Optional[float] = None
+    last_started_at: Optional[float] = None
+    last_finished_at: Optional[float] = None
+    last_duration_ms: Optional[float] = None
+    last_error: Optional[str] = None
+
+    def seconds_until_due(self, interval_s: float) -> float:
+        """How long until another acquire attempt can succeed."""
+        due = self.now
+        if self.last_started_at is not None:
+            due = max(due, self.last_started_at + interval_s)
+        if self.lease_until is not None:
+            due = max(due, self.lease_until)
+        return due - self.now
+
+    def to_dict(self, owner: Optional[str] = None) -> Dict[str, Any]:
+        def _age(ts: Optional[float]) -> Optional[float]:
+            return round(self.now - ts, 1) if ts is not None else None
+
+        return {
+            "owner": self.owner,
+            "held_by_this_node": owner is not None and self.owner == owner
+            and self.lease_until is not None and self.lease_until > self.now,
+            "lease_expires_in_s": round(self.lease_until - self.now, 1)
+            if self.lease_until is not None and self.lease_until > self.now else None,
+            "last_started_s_ago": _age(self.last_started_at),
+            "last_finished_s_ago": _age(self.last_finished_at),
+            "last_duration_ms": self.last_duration_ms,
+            "last_error": self.last_error,
+        }
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# In-memory backend
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class InMemoryLeaseStore:
+    """Lease table in a dict; share one between schedulers to simulate nodes."""
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self.clock = clock
+        self.rows: Dict[str, Dict[str, Any]] = {}
+        self.lock = threading.Lock()
+
+
+class InMemoryLeaseBackend:
+    """Lease backend over an InMemoryLeaseStore (a private one by default)."""
+
+    def __init__(self, store: Optional[InMemoryLeaseStore] = None):
+        self.store = store if store is not None else InMemoryLeaseStore()
+
+    def _state(self, acquired: bool, row: Dict[str, Any], now: float) -> LeaseState:
+        return LeaseState(acquired=acquired, now=now, **row)
+
+    def try_acquire(self, job: str, owner: str, interval_s: float, ttl_s: float) -> LeaseState:
+        with self.store.lock:
+            now = self.store.clock()
+            row = self.store.rows.setdefault(job, {})
+            free = row.get("lease_until") is None or row["lease_until"] < now
+            due = row.get("last_started_at") is None or row["last_started_at"] <= now - interval_s
+            if free and due:
+                row.update(owner=owner, lease_until=now + ttl_s, last_started_at=now)
+            return self._state(free and due, row, now)
+
+    def renew(self, job: str, owner: str, ttl_s: float) -> bool:
+        with self.store.lock:
+            now = self.store.clock()
+            row = self.store.rows.get(job)
+            if not row or row.get("owner") != owner or row["lease_until"] < now:
+                return False
+            row["lease_until"] = now + ttl_s
+            return True
+
+    def release(self, job: str, owner: str, duration_ms: float, error: Optional[str]) -> None:
+        with self.store.lock:
+            now = self.store.clock()
+            row = self.store.rows.get(job)
+            if not row or row.get("owner") != owner:
+                return
+            row.update(lease_until=now, last_finished_at=now,
+                       last_duration_ms=round(duration_ms, 1), last_error=error)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Postgres backend
+# ─────────────────────────────────────────────────────────────────────────────
+
+_ACQUIRE_SQL = """
+    INSERT INTO scheduler_leases (job_name, owner, lease_until, last_started_at)
+    VALUES (:job, :owner, NOW() + make_interval(secs => :ttl), NOW())
+    ON CONFLICT (job_name) DO UPDATE
+       SET owner = EXCLUDED.owner,
+           lease_until = EXCLUDED.lease_until,
+           last_started_at = EXCLUDED.last_started_at
+     WHERE scheduler_leases.lease_until < NOW()
+       AND (scheduler_leases.last_started_at IS NULL
+            OR scheduler_leases.last_started_at <= NOW() - make_interval(secs => :interval))
+    RETURNING job_name
+"""
+
+_STATE_SQL = """
+    SELECT EXTRACT(EPOCH FROM NOW()), owner, EXTRACT(EPOCH FROM lease_until),
+           EXTRACT(EPOCH FROM last_started_at), EXTRACT(EPOCH FROM last_finished_at),
+           last_duration_ms, last_error
+      FROM scheduler_leases WHERE job_name = :job
+"""
+
+_RENEW_SQL = """
+    UPDATE scheduler_leases SET lease_until = NOW() + make_interval(secs => :ttl)
+     WHERE job_name = :job AND owner = :owner AND lease_until >= NOW()
+    RETURNING job_name
+"""
+
+_RELEASE_SQL = """
+    UPDATE scheduler_leases
+       SET lease_until = NOW(), last_finished_at = NOW(),
+           last_duration_ms = :duration_ms, last_error = :error
+     WHERE job_name = :job AND owner = :owner
+"""
+
+
+class PostgresLeaseBackend:
+    """Lease backend over the scheduler_leases table. Blocking; call from a thread."""
+
+    def __init__(self, session_factory: Optional[Callable] = None):
+        self._session_factory = session_factory
+
+    def _session(self):
+        factory = self._session_factory
+        if factory is None:
+            from api.database import SessionLocal
+            factory = SessionLocal
+        if factory is None:
+            raise RuntimeError("database not configured")
+        return factory()
+
+    def try_acquire(self, job: str, owner: str, interval_s: float, ttl_s: float) -> LeaseState:
+        from sqlalchemy import text
+
+        session = self._session()
+        try:
+            acquired = session.execute(
+                text(_ACQUIRE_SQL),
+                {"job": job, "owner": owner, "ttl": ttl_s, "interval": interval_s},
+            ).fetchone() is not None
+            session.commit()
+            row = session.execute(text(_STATE_SQL), {"job": job}).fetchone()
+            session.commit()
+        finally:
+            session.close()
+        now, owner_, lease_until, started, finished, duration_ms, error = row
+        return LeaseState(
+            acquired=acquired, now=float(now), owner=owner_,
+            lease_until=float(lease_until) if lease_until is not None else None,
+            last_started_at=float(started) if started is not None else None,
+            last_finished_at=float(finished) if finished is not None else None,
+            last_duration_ms=float(duration_ms) if duration_ms is not None else None,
+            last_error=error,
+        )
+
+    def renew(self, job: str, owner: str, ttl_s: float) -> bool:
+        from sqlalchemy import text
+
+        session = self._session()
+        try:
+            renewed = session.execute(
+                text(_RENEW_SQL), {"job": job, "owner": owner, "ttl": ttl_s}
+            ).fetchone() is not None
+            session.commit()
+            return renewed
+        finally:
+            session.close()
+
+    def release(self, job: str, owner: str, duration_ms: float, error: Optional[str]) -> None:
+        from sqlalchemy import text
+
+        session = self._session()
+        try:
+            session.execute(
+                text(_RELEASE_SQL),
+                {"job": job, "owner": owner, "duration_ms": round(duration_ms, 1),
+                 "error": error[:500] if error else None},
+            )
+            session.commit()
+        finally:
+            session.close()
+
+
+def lease_backend_from_env():
+    if SCHEDULER_LEASE_BACKEND == "postgres":
+        return PostgresLeaseBackend()
+    if SCHEDULER_LEASE_BACKEND != "local":
+        logger.warning("[LEASES] unknown SCHEDULER_LEASE_BACKEND=%s — using local", SCHEDULER_LEASE_BACKEND)
+    return InMemoryLeaseBackend()
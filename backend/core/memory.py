@@ -1,6 +1,6 @@
 """
 Sistema de memoria simplificado para Clonnect Creators
-Usa almacenamiento en JSON para persistencia
+Persiste en el FollowerStore compartido (core.follower_store, SQLite)
 
 DEPRECATED: This module is deprecated as of v2.0.0.
 Use the FollowerMemory and MemoryStore classes from core.dm_agent instead,
@@ -10,8 +10,6 @@ This file is kept for backward compatibility with existing imports.
 All classes here re-export from dm_agent.py for compatibility.
 """
 
-import os
-import json
 import warnings
 from typing import Optional, List, Dict
 from dataclasses import dataclass, asdict, field
@@ -95,55 +93,67 @@ class FollowerMemory:
 
 
 class MemoryStore:
-    """Almacen de memoria para seguidores"""
+    """Almacen de memoria para seguidores (sobre el FollowerStore compartido)"""
 
     def __init__(self, storage_path: str = "data/followers"):
-        self.storage_path = storage_path
-        os.makedirs(storage_path, exist_ok=True)
-        self._cache: Dict[str, FollowerMemory] = {}
+        from core.follower_store import get_follower_store
 
-    def _get_file_path(self, creator_id: str, follower_id: str) -> str:
-        creator_dir = os.path.join(self.storage_path, creator_id)
-        os.makedirs(creator_dir, exist_ok=True)
-        return os.path.join(creator_dir, f"{follower_id}.json")
+        self.storage_path = storage_path
+        self._store = get_follower_store(storage_path)
+        self._cache = self._store.object_cache("core.memory")
 
     def _get_cache_key(self, creator_id: str, follower_id: str) -> str:
         return f"{creator_id}:{follower_id}"
 
+    def _from_record(self, data: dict) -> FollowerMemory:
+        """FollowerMemory para un registro, reutilizando el objeto cacheado si existe"""
+        cache_key = self._get_cache_key(data["creator_id"], data["follower_id"])
+        memory = self._cache.get(cache_key)
+        if memory is None:
+            memory = FollowerMemory.from_dict(data)
+            self._cache.set(cache_key, memory)
+        return memory
+
     async def get(self, creator_id: str, follower_id: str) -> Optional[FollowerMemory]:
         """Obtener memoria de un seguidor"""
         cache_key = self._get_cache_key(creator_id, follower_id)
 
         # Buscar en cache
-        if cache_key in self._cache:
-            return self._cache[cache_key]
-
-        # Buscar en disco
-        file_path = self._get_file_path(creator_id, follower_id)
-        if os.path.exists(file_path):
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    memory = FollowerMemory.from_dict(data)
-                    self._cache[cache_key] = memory
-                    return memory
-            except Exception as e:
-                logger.error(f"Error loading memory: {e}")
-
-        return None
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        # Buscar en el store
+        try:
+            data = await self._store.aget(creator_id, follower_id)
+        except Exception as e:
+            logger.error(f"Error loading memory: {e}")
+            return None
+        if data is None:
+            return None
+        memory = FollowerMemory.from_dict(data)
+        self._cache.set(cache_key, memory)
+        return memory
 
     async def save(self, memory: FollowerMemory):
         """Guardar memoria de un seguidor"""
         cache_key = self._get_cache_key(memory.creator_id, memory.follower_id)
-        self._cache[cache_key] = memory
-
-        file_path = self._get_file_path(memory.creator_id, memory.follower_id)
+        self._cache.set(cache_key, memory)
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(memory.to_dict(), f, indent=2, ensure_ascii=False)
+            self._store.put(memory.to_dict())
         except Exception as e:
             logger.error(f"Error saving memory: {e}")
 
+    def clear_creator_cache(self, creator_id: str):
+        """Vaciar de la cache los seguidores de un creador (el store no se toca)"""
+        self._cache.pop_prefix(f"{creator_id}:")
+
+    def delete_creator_followers(self, creator_id: str) -> int:
+        """Borrar del store todos los seguidores de un creador; devuelve cuantos se borraron"""
+        deleted = self._store.delete(creator_id)
+        self.clear_creator_cache(creator_id)
+        return deleted
+
     async def get_or_create(
         self,
         creator_id: str,
@@ -214,25 +224,15 @@ class MemoryStore:
 
     async def get_all_for_creator(self, creator_id: str) -> List[FollowerMemory]:
         """Obtener todas las memorias de un creador"""
-        creator_dir = os.path.join(self.storage_path, creator_id)
-        memories = []
-
-        if os.path.exists(creator_dir):
-            for filename in os.listdir(creator_dir):
-                if filename.endswith('.json'):
-                    follower_id = filename[:-5]
-                    memory = await self.get(creator_id, follower_id)
-                    if memory:
-                        memories.append(memory)
-
-        return memories
+        records = await self._store.alist_for_creator(creator_id)
+        return [self._from_record(data) for data in records]
 
     async def get_leads(self, creator_id: str) -> List[FollowerMemory]:
         """Obtener leads de un creador"""
-        all_memories = await self.get_all_for_creator(creator_id)
-        return [m for m in all_memories if m.is_lead]
+        records = await self._store.alist_for_creator(creator_id, leads_only=True)
+        return [self._from_record(data) for data in records]
 
     async def get_high_intent(self, creator_id: str, threshold: float = 0.5) -> List[FollowerMemory]:
         """Obtener seguidores con alta intencion de compra"""
-        all_memories = await self.get_all_for_creator(creator_id)
-        return [m for m in all_memories if m.purchase_intent_score >= threshold]
+        records = await self._store.alist_for_creator(creator_id, min_intent=threshold)
+        return [self._from_record(data) for data in records]
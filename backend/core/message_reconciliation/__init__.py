@@ -13,6 +13,7 @@ Features:
 
 from core.message_reconciliation.core import (
     MAX_CONVERSATIONS_PER_CYCLE,
+    RECONCILIATION_CONCURRENCY,
     RECONCILIATION_INTERVAL_MINUTES,
     RECONCILIATION_LOOKBACK_HOURS,
     _extract_media_from_attachments,
@@ -40,6 +41,7 @@ __all__ = [
     "RECONCILIATION_LOOKBACK_HOURS",
     "RECONCILIATION_INTERVAL_MINUTES",
     "MAX_CONVERSATIONS_PER_CYCLE",
+    "RECONCILIATION_CONCURRENCY",
     # Enrichment
     "_fetch_profile_for_lead",
     "_queue_profile_enrichment",
@@ -7,6 +7,8 @@ cycle management, gap detection, and status reporting.
 
 import asyncio
 import logging
+import os
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional
 
@@ -18,6 +20,8 @@ from core.message_reconciliation.fetcher import (
     get_db_message_ids,
     get_instagram_conversations,
 )
+from core.instagram_rate_limiter import InstagramRateLimiter, get_instagram_rate_limiter
+from core.observability.metrics import emit_metric
 
 logger = logging.getLogger("clonnect-reconciliation")
 
@@ -25,6 +29,24 @@ logger = logging.getLogger("clonnect-reconciliation")
 RECONCILIATION_LOOKBACK_HOURS = 24  # How far back to check on startup
 RECONCILIATION_INTERVAL_MINUTES = 5  # How often to run periodic reconciliation
 MAX_CONVERSATIONS_PER_CYCLE = 20  # Limit per reconciliation cycle (reduced to avoid API limits)
+RECONCILIATION_CONCURRENCY = int(os.getenv("RECONCILIATION_CONCURRENCY", "4"))  # Creators in parallel
+# Fraction of a token's remaining hourly/daily Meta calls a cycle may spend (rest is for DMs)
+RECONCILIATION_BUDGET_SHARE = float(os.getenv("RECONCILIATION_BUDGET_SHARE", "0.25"))
+
+_RECONCILIATION_FOLDERS = ("inbox", "other")  # get_instagram_conversations default folders
+
+
+def _budget_max_conversations(limiter: InstagramRateLimiter, creator_id: str) -> int:
+    """
+    Conversations per folder this creator can afford this cycle.
+
+    Each folder costs one list call plus one /messages call per conversation,
+    so a limit of N costs up to len(folders) * (N + 1) calls. Returns 0 when
+    the creator should be skipped.
+    """
+    budget = int(limiter.remaining_budget(creator_id) * RECONCILIATION_BUDGET_SHARE)
+    affordable = budget // len(_RECONCILIATION_FOLDERS) - 1
+    return max(0, min(MAX_CONVERSATIONS_PER_CYCLE, affordable))
 
 
 def _extract_media_from_attachments(attachments: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -178,9 +200,6 @@ async def reconcile_messages_for_creator(
 
     since = datetime.now(timezone.utc) - timedelta(hours=lookback_hours)
 
-    # Get existing message IDs from DB
-    existing_ids = await get_db_message_ids(creator_id, since)
-
     limit = max_conversations if max_conversations > 0 else MAX_CONVERSATIONS_PER_CYCLE
 
     # Fetch conversations from Instagram
@@ -196,6 +215,14 @@ async def reconcile_messages_for_creator(
     if not conversations:
         return result
 
+    # Diff only the fetched IDs against the DB (one indexed query, not a full scan)
+    candidate_ids = [
+        msg.get("id")
+        for conv in conversations
+        for msg in conv.get("messages", {}).get("data", [])
+    ]
+    existing_ids = await get_db_message_ids(creator_id, since, candidate_ids=candidate_ids)
+
     def _get_creator_with_ids():
         session = SessionLocal()
         try:
@@ -532,6 +559,11 @@ async def run_reconciliation_cycle(lookback_hours: int = 1) -> Dict[str, Any]:
     """
     Run reconciliation for all creators with Instagram connections.
 
+    Creators are reconciled concurrently (at most RECONCILIATION_CONCURRENCY
+    at a time). Each creator's conversation limit is sized from its own
+    InstagramRateLimiter budget; creators in backoff or without budget are
+    skipped and counted in creators_skipped_budget.
+
     Args:
         lookback_hours: How many hours to look back
 
@@ -547,6 +579,8 @@ async def run_reconciliation_cycle(lookback_hours: int = 1) -> Dict[str, Any]:
         "creators_processed": 0,
         "total_missing": 0,
         "total_inserted": 0,
+        "creators_skipped_budget": 0,
+        "cycle_ms": 0.0,
         "by_creator": [],
     }
 
@@ -580,33 +614,68 @@ async def run_reconciliation_cycle(lookback_hours: int = 1) -> Dict[str, Any]:
         logger.debug("[Reconciliation] No active creators with Instagram found")
         return results
 
-    for creator_info in creator_infos:
-        try:
-            result = await reconcile_messages_for_creator(
-                creator_id=creator_info["name"],
-                access_token=creator_info["token"],
-                ig_user_id=creator_info["ig_user_id"],
-                lookback_hours=lookback_hours,
-            )
-
+    limiter = get_instagram_rate_limiter()
+    semaphore = asyncio.Semaphore(max(1, RECONCILIATION_CONCURRENCY))
+    cycle_start = time.monotonic()
+
+    async def _reconcile_one(creator_info: Dict[str, str]) -> Dict[str, Any]:
+        creator_id = creator_info["name"]
+        max_conversations = _budget_max_conversations(limiter, creator_id)
+        if max_conversations <= 0:
+            reason = "backoff" if limiter.get_stats(creator_id)["backoff_active"] else "budget"
+            emit_metric("reconciliation_creator_skipped_total", creator_id=creator_id, reason=reason)
+            return {"creator_id": creator_id, "skipped": reason}
+
+        async with semaphore:
+            start = time.monotonic()
+            status = "ok"
+            try:
+                result = await reconcile_messages_for_creator(
+                    creator_id=creator_id,
+                    access_token=creator_info["token"],
+                    ig_user_id=creator_info["ig_user_id"],
+                    lookback_hours=lookback_hours,
+                    max_conversations=max_conversations,
+                )
+                # One list page per folder + one /messages call per conversation
+                limiter.consume_budget(
+                    creator_id,
+                    "reconciliation",
+                    len(_RECONCILIATION_FOLDERS) + result.get("conversations_checked", 0),
+                )
+            except Exception as e:
+                status = "error"
+                logger.error(f"[Reconciliation] Error for {creator_id}: {e}")
+                result = {"creator_id": creator_id, "error": str(e)}
+            latency_ms = round((time.monotonic() - start) * 1000, 1)
+            result["latency_ms"] = latency_ms
+            emit_metric("reconciliation_creator_duration_ms", latency_ms, creator_id=creator_id, status=status)
+            return result
+
+    # gather preserves input order, so by_creator stays in creator order
+    outcomes = await asyncio.gather(*(_reconcile_one(info) for info in creator_infos))
+
+    for result in outcomes:
+        results["by_creator"].append(result)
+        if "skipped" in result:
+            results["creators_skipped_budget"] += 1
+        elif "error" not in result:
             results["creators_processed"] += 1
             results["total_missing"] += result["messages_missing"]
             results["total_inserted"] += result["messages_inserted"]
-            results["by_creator"].append(result)
 
-        except Exception as e:
-            logger.error(f"[Reconciliation] Error for {creator_info['name']}: {e}")
-            results["by_creator"].append(
-                {
-                    "creator_id": creator_info["name"],
-                    "error": str(e),
-                }
-            )
+    results["cycle_ms"] = round((time.monotonic() - cycle_start) * 1000, 1)
+    emit_metric("reconciliation_cycle_duration_ms", results["cycle_ms"], lookback_hours=lookback_hours)
 
+    if results["creators_skipped_budget"]:
+        logger.info(
+            f"[Reconciliation] Skipped {results['creators_skipped_budget']} creators "
+            f"(rate budget exhausted or backoff active)"
+        )
     if results["total_inserted"] > 0:
         logger.info(
             f"[Reconciliation] Cycle complete: {results['total_inserted']} messages "
-            f"inserted for {results['creators_processed']} creators"
+            f"inserted for {results['creators_processed']} creators in {results['cycle_ms']}ms"
         )
 
     return results
@@ -7,7 +7,7 @@ Functions for fetching Instagram conversations and getting DB message IDs.
 import asyncio
 import logging
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
 import httpx
 
@@ -153,46 +153,65 @@ async def get_instagram_conversations(
     return conversations
 
 
+# Max IDs per IN (...) probe — keeps bind-parameter lists bounded
+_ID_PROBE_CHUNK = 500
+
+
 async def get_db_message_ids(
     creator_id: str,
     since: Optional[datetime] = None,
+    candidate_ids: Optional[Iterable[str]] = None,
 ) -> set:
     """
-    Get all platform_message_ids from database for a creator.
+    Get platform_message_ids from database for a creator.
+
+    With candidate_ids (the IDs just fetched from Instagram) only those are
+    probed, so the query scales with the lookback window instead of the
+    creator's lifetime message count; `since` is ignored in that mode because
+    the check is exact. Without candidates, every ID since `since` is returned.
 
     Args:
         creator_id: Creator name/ID
         since: Only get messages since this time
+        candidate_ids: Platform message IDs to check for existence
 
     Returns:
         Set of platform_message_ids
     """
+    candidates = None
+    if candidate_ids is not None:
+        candidates = sorted({mid for mid in candidate_ids if mid})
+        if not candidates:
+            return set()
+
     def _query_message_ids():
         from api.database import SessionLocal
         from api.models import Creator, Lead, Message
 
-        message_ids = set()
         session = SessionLocal()
         try:
-            creator = session.query(Creator).filter_by(name=creator_id).first()
-            if not creator:
-                logger.warning(f"[Reconciliation] Creator {creator_id} not found")
-                return message_ids
+            query = (
+                session.query(Message.platform_message_id)
+                .join(Lead, Lead.id == Message.lead_id)
+                .join(Creator, Creator.id == Lead.creator_id)
+                .filter(Creator.name == creator_id, Message.platform_message_id.isnot(None))
+            )
 
-            leads = session.query(Lead).filter_by(creator_id=creator.id).all()
-            lead_ids = [lead.id for lead in leads]
-            if not lead_ids:
+            if candidates is not None:
+                message_ids = set()
+                for i in range(0, len(candidates), _ID_PROBE_CHUNK):
+                    chunk = candidates[i : i + _ID_PROBE_CHUNK]
+                    rows = query.filter(Message.platform_message_id.in_(chunk)).all()
+                    message_ids.update(r[0] for r in rows if r[0])
+                logger.debug(
+                    f"[Reconciliation] {len(message_ids)}/{len(candidates)} candidate "
+                    f"messages already in DB"
+                )
                 return message_ids
 
-            query = session.query(Message.platform_message_id).filter(
-                Message.lead_id.in_(lead_ids),
-                Message.platform_message_id.isnot(None),
-            )
             if since:
                 query = query.filter(Message.created_at >= since)
-
-            results = query.all()
-            message_ids = {r[0] for r in results if r[0]}
+            message_ids = {r[0] for r in query.all() if r[0]}
             logger.debug(f"[Reconciliation] Found {len(message_ids)} existing messages in DB")
             return message_ids
         finally:
@@ -67,6 +67,19 @@ _METRIC_SPECS = [
      ["creator_id", "intent"],
      {"buckets": [5, 10, 50, 100, 200, 500]}),
 
+    ("dm_coalesce_batch_size", Histogram if _PROMETHEUS_AVAILABLE else None,
+     "Inbound messages answered by one coalesced DM pipeline pass (core.dm_coalescer)",
+     ["platform"],
+     {"buckets": [1, 2, 3, 4, 6, 8]}),
+
+    ("dm_coalesce_passes_saved_total", Counter if _PROMETHEUS_AVAILABLE else None,
+     "DM pipeline passes (context load + LLM call) avoided by burst coalescing",
+     ["platform"], {}),
+
+    ("dm_coalesce_superseded_total", Counter if _PROMETHEUS_AVAILABLE else None,
+     "In-flight DM generations cancelled because the follower kept typing",
+     ["platform"], {}),
+
     # ── Memory / ARC2 ───────────────────────────────────────────────────────
     ("compaction_applied_total", Counter if _PROMETHEUS_AVAILABLE else None,
      "Memory compaction applied events",
@@ -103,6 +116,32 @@ _METRIC_SPECS = [
      ["provider", "model"],
      {"buckets": [100, 500, 1000, 3000, 10000, 30000]}),
 
+    ("llm_hedge_total", Counter if _PROMETHEUS_AVAILABLE else None,
+     "Hedged DM generation outcomes (core.providers.hedging)",
+     ["primary", "backup", "outcome"], {}),   # outcome: fired | primary_won | backup_won | both_failed | skipped_budget | skipped_circuit
+
+    ("llm_provider_latency_ms", Histogram if _PROMETHEUS_AVAILABLE else None,
+     "End-to-end DM generation latency per provider in milliseconds (hedge delays are learned from it)",
+     ["provider"],
+     {"buckets": [250, 500, 1000, 2000, 3000, 5000, 10000, 30000]}),
+
+    ("dm_stream_total", Counter if _PROMETHEUS_AVAILABLE else None,
+     "Streamed DM generations by outcome (core.dm.streaming)",
+     ["provider", "outcome"], {}),   # outcome: completed | aborted_loop | aborted_too_long | aborted_stream_error | failed | empty | hedged
+
+    ("llm_prompt_tokens_total", Counter if _PROMETHEUS_AVAILABLE else None,
+     "DM prompt tokens per provider; cache=hit counts the ones served from a prefix cache (core.providers.prefix_cache)",
+     ["provider", "cache"], {}),   # cache: all | hit
+
+    ("llm_http_requests_total", Counter if _PROMETHEUS_AVAILABLE else None,
+     "LLM provider HTTP requests through the pooled clients",
+     ["provider", "status"], {}),
+
+    ("llm_http_request_duration_ms", Histogram if _PROMETHEUS_AVAILABLE else None,
+     "LLM provider HTTP time-to-headers in milliseconds (pooled clients)",
+     ["provider"],
+     {"buckets": [50, 100, 250, 500, 1000, 2500, 5000, 15000]}),
+
     # ── Cache ────────────────────────────────────────────────────────────────
     ("cache_hit_total", Counter if _PROMETHEUS_AVAILABLE else None,
      "Cache hits by cache name",
@@ -112,6 +151,18 @@ _METRIC_SPECS = [
      "Cache misses by cache name",
      ["cache_name"], {}),
 
+    ("cache_eviction_total", Counter if _PROMETHEUS_AVAILABLE else None,
+     "LRU evictions by cache name (core.cache.BoundedTTLCache)",
+     ["cache_name"], {}),
+
+    ("identity_map_lookups_total", Counter if _PROMETHEUS_AVAILABLE else None,
+     "Creator/lead ID translations served by core.identity_map",
+     ["kind", "outcome"], {}),   # outcome: hit | negative_hit | miss
+
+    ("media_store_bytes_total", Counter if _PROMETHEUS_AVAILABLE else None,
+     "Bytes written to the content-addressed media store (services.media_store)",
+     ["backend"], {}),
+
     # ── Webhooks ─────────────────────────────────────────────────────────────
     ("webhook_received_total", Counter if _PROMETHEUS_AVAILABLE else None,
      "Webhooks received by platform",
@@ -121,6 +172,23 @@ _METRIC_SPECS = [
      "Webhooks processed by platform and status",
      ["platform", "status"], {}),
 
+    ("webhook_queue_events_total", Counter if _PROMETHEUS_AVAILABLE else None,
+     "Durable webhook queue events by outcome (core.webhook_queue)",
+     ["source", "outcome"], {}),   # outcome: enqueued | duplicate | done | retry | dead
+
+    ("webhook_queue_lag_ms", Histogram if _PROMETHEUS_AVAILABLE else None,
+     "Time from webhook receipt to consumer claim in milliseconds",
+     ["source"],
+     {"buckets": [10, 50, 100, 500, 1000, 5000, 30000, 120000, 600000]}),
+
+    ("webhook_queue_depth", Gauge if _PROMETHEUS_AVAILABLE else None,
+     "Queued webhook events by status",
+     ["status"], {}),   # status: pending | processing | dead
+
+    ("webhook_queue_in_flight", Gauge if _PROMETHEUS_AVAILABLE else None,
+     "Webhook events being processed by this consumer",
+     ["source"], {}),
+
     # ── ARC1 Budget Orchestrator ─────────────────────────────────────────────
     ("budget_orchestrator_duration_ms", Histogram if _PROMETHEUS_AVAILABLE else None,
      "BudgetOrchestrator assembly duration in milliseconds",
@@ -321,6 +389,41 @@ _METRIC_SPECS = [
     ("dna_auto_create_circuit_tripped_total", Counter if _PROMETHEUS_AVAILABLE else None,
      "DNA auto-create circuit breaker tripped after downstream failure",
      ["creator_id"], {}),
+
+    # ── Message reconciliation (concurrent multi-creator cycle) ─────────────
+    ("reconciliation_cycle_duration_ms", Histogram if _PROMETHEUS_AVAILABLE else None,
+     "Wall time of one multi-creator reconciliation cycle in milliseconds",
+     ["lookback_hours"],
+     {"buckets": [500, 1000, 5000, 15000, 30000, 60000, 120000, 300000]}),
+
+    ("reconciliation_creator_duration_ms", Histogram if _PROMETHEUS_AVAILABLE else None,
+     "Per-creator reconciliation latency in milliseconds",
+     ["creator_id", "status"],   # status: ok | error
+     {"buckets": [250, 1000, 5000, 15000, 30000, 60000]}),
+
+    ("reconciliation_creator_skipped_total", Counter if _PROMETHEUS_AVAILABLE else None,
+     "Creators skipped in a reconciliation cycle",
+     ["creator_id", "reason"], {}),   # reason: backoff | budget
+
+    # ── Database pools ───────────────────────────────────────────────────────
+    ("db_pool_wait_ms", Histogram if _PROMETHEUS_AVAILABLE else None,
+     "Time waiting for a pooled DB connection in milliseconds",
+     ["engine"],   # engine: sync | async
+     {"buckets": [1, 5, 10, 50, 100, 500, 1000, 5000, 10000]}),
+
+    ("db_pool_checked_out", Gauge if _PROMETHEUS_AVAILABLE else None,
+     "Connections currently checked out of the pool",
+     ["engine"], {}),
+
+    # ── Scheduler ────────────────────────────────────────────────────────────
+    ("scheduler_job_duration_ms", Histogram if _PROMETHEUS_AVAILABLE else None,
+     "TaskScheduler job run time in milliseconds",
+     ["job", "outcome"],   # outcome: ok | error
+     {"buckets": [100, 1000, 10000, 60000, 300000, 1800000, 3600000]}),
+
+    ("scheduler_lease_total", Counter if _PROMETHEUS_AVAILABLE else None,
+     "Cluster job lease attempts (core.job_leases)",
+     ["job", "outcome"], {}),   # outcome: acquired | held_elsewhere | not_due | error | lost
 ]
 
 # _REGISTRY_META maps metric name → type string for dispatch (avoids isinstance on mocks in tests)
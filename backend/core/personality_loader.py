@@ -23,7 +23,7 @@ logger = logging.getLogger(__name__)
 # In-memory cache — bounded to prevent memory leaks
 from core.cache import BoundedTTLCache
 _CACHE_TTL = float(os.getenv("PERSONALITY_CACHE_TTL", "300"))
-_cache = BoundedTTLCache(max_size=50, ttl_seconds=_CACHE_TTL)
+_cache = BoundedTTLCache(max_size=50, ttl_seconds=_CACHE_TTL, name="personality")
 
 EXTRACTIONS_DIR = os.path.join(
     os.path.dirname(os.path.dirname(__file__)),
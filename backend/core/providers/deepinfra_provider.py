@@ -17,7 +17,7 @@ import os
 import re
 import time
 import time as _time
-from typing import Optional
+from typing import AsyncIterator, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -124,6 +124,20 @@ async def _try_openrouter_fallback(
         return None
 
 
+def _legacy_no_think(messages: list[dict], model: str) -> list[dict]:
+    """Legacy path: append /no_think to the last user turn for Qwen3 models."""
+    if "Qwen3" not in model and "qwen3" not in model.lower():
+        return messages
+    send_messages = []
+    for i, msg in enumerate(messages):
+        if i == len(messages) - 1 and msg.get("role") == "user":
+            content = msg["content"].rstrip()
+            if not content.endswith("/no_think"):
+                msg = {**msg, "content": content + " /no_think"}
+        send_messages.append(msg)
+    return send_messages
+
+
 async def call_deepinfra(
     messages: list[dict],
     max_tokens: Optional[int] = None,
@@ -236,22 +250,18 @@ async def call_deepinfra(
         else:
             send_messages = messages
     else:
-        send_messages = messages
-        if "Qwen3" in model or "qwen3" in model.lower():
-            send_messages = []
-            for i, msg in enumerate(messages):
-                if i == len(messages) - 1 and msg.get("role") == "user":
-                    content = msg["content"].rstrip()
-                    if not content.endswith("/no_think"):
-                        msg = {**msg, "content": content + " /no_think"}
-                send_messages.append(msg)
+        send_messages = _legacy_no_think(messages, model)
 
     try:
         from openai import AsyncOpenAI
 
+        from core.providers.http_clients import get_http_client
+        from core.providers.prefix_cache import openai_cached_tokens, record_prompt_usage
+
         client = AsyncOpenAI(
             api_key=api_key,
             base_url=base_url,
+            http_client=get_http_client("deepinfra"),
         )
 
         # frequency_penalty: caller arg > config > env var > 0.0
@@ -295,6 +305,7 @@ async def call_deepinfra(
         usage = response.usage
         tokens_in = usage.prompt_tokens if usage else 0
         tokens_out = usage.completion_tokens if usage else 0
+        cached_tokens = openai_cached_tokens(usage) if usage else 0
 
         if not content:
             logger.warning("DeepInfra returned empty content")
@@ -302,10 +313,11 @@ async def call_deepinfra(
             return await _try_openrouter_fallback(messages, _max_tokens, _temperature, model)
 
         logger.info(
-            "DeepInfra OK: model=%s latency=%dms tokens_in=%d tokens_out=%d len=%d finish_reason=%s",
-            model, latency_ms, tokens_in, tokens_out, len(content), finish_reason,
+            "DeepInfra OK: model=%s latency=%dms tokens_in=%d cached=%d tokens_out=%d len=%d finish_reason=%s",
+            model, latency_ms, tokens_in, cached_tokens, tokens_out, len(content), finish_reason,
         )
         _record_success()
+        record_prompt_usage("deepinfra", tokens_in, cached_tokens)
         return {
             "content": content,
             "model": model,
@@ -313,6 +325,7 @@ async def call_deepinfra(
             "latency_ms": latency_ms,
             "tokens_in": tokens_in,
             "tokens_out": tokens_out,
+            "cached_tokens": cached_tokens,
             "finish_reason": finish_reason,
         }
 
@@ -324,3 +337,80 @@ async def call_deepinfra(
         logger.error("DeepInfra error: %s", e)
         _record_failure()
         return await _try_openrouter_fallback(messages, _max_tokens, _temperature, model)
+
+
+async def stream_deepinfra(
+    messages: list[dict],
+    max_tokens: int,
+    temperature: float,
+    meta: dict,
+) -> AsyncIterator[str]:
+    """Stream a DeepInfra chat completion as text deltas (OpenAI-compatible SSE).
+
+    Legacy-path settings only (DEEPINFRA_MODEL, /no_think for Qwen3). Fills
+    `meta` with model/provider and, from the final usage chunk, tokens_in,
+    tokens_out, cached_tokens and finish_reason. Closing the generator early
+    drops the connection, which stops generation server-side. Raises on
+    errors so the caller can fall back to the blocking cascade; the circuit
+    breaker only records completed streams and failures before the first token.
+    """
+    import json
+
+    from core.providers.http_clients import get_http_client
+    from core.providers.prefix_cache import openai_cached_tokens, record_prompt_usage
+
+    api_key = os.getenv("DEEPINFRA_API_KEY")
+    if not api_key:
+        raise RuntimeError("DEEPINFRA_API_KEY not set")
+    if _circuit_is_open():
+        raise RuntimeError("DeepInfra circuit breaker open")
+
+    meta.update(model=DEEPINFRA_MODEL, provider="deepinfra")
+    payload = {
+        "model": DEEPINFRA_MODEL,
+        "messages": _legacy_no_think(messages, DEEPINFRA_MODEL),
+        "max_tokens": max_tokens,
+        "temperature": temperature,
+        "stream": True,
+        "stream_options": {"include_usage": True},
+    }
+    frequency_penalty = float(os.getenv("DEEPINFRA_FREQUENCY_PENALTY", "0.0"))
+    if frequency_penalty > 0:
+        payload["frequency_penalty"] = frequency_penalty
+
+    timeout = float(os.getenv("DEEPINFRA_TIMEOUT", "30"))
+    yielded = False
+    try:
+        client = get_http_client("deepinfra")
+        async with client.stream(
+            "POST", f"{DEEPINFRA_BASE_URL}/chat/completions", json=payload,
+            headers={"Authorization": f"Bearer {api_key}"}, timeout=timeout,
+        ) as resp:
+            resp.raise_for_status()
+            async for line in resp.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+                chunk = json.loads(data)
+                usage = chunk.get("usage")
+                if usage:
+                    meta["tokens_in"] = usage.get("prompt_tokens", 0)
+                    meta["tokens_out"] = usage.get("completion_tokens", 0)
+                    meta["cached_tokens"] = openai_cached_tokens(usage)
+                for choice in chunk.get("choices", [])[:1]:
+                    if choice.get("finish_reason"):
+                        meta["finish_reason"] = choice["finish_reason"].lower()
+                    delta = (choice.get("delta") or {}).get("content")
+                    if delta:
+                        yielded = True
+                        yield delta
+    except (GeneratorExit, asyncio.CancelledError):
+        raise
+    except Exception:
+        if not yielded:
+            _record_failure()
+        raise
+    _record_success()
+    record_prompt_usage("deepinfra", meta.get("tokens_in", 0), meta.get("cached_tokens", 0))
@@ -136,9 +136,12 @@ async def call_fireworks(
     try:
         from openai import AsyncOpenAI
 
+        from core.providers.http_clients import get_http_client
+
         client = AsyncOpenAI(
             api_key=api_key,
             base_url=base_url,
+            http_client=get_http_client("fireworks"),
         )
 
         create_kwargs: dict = dict(
@@ -9,15 +9,19 @@ Entry point: generate_dm_response() — called from dm_agent_v2.py
 """
 
 import asyncio
+import json
 import logging
 import os
 import time
 import time as _time
-from typing import Optional
+from typing import AsyncIterator, Optional, Tuple
 
 import httpx
 
 from core.config.llm_models import GEMINI_PRIMARY_MODEL, LLM_PRIMARY_PROVIDER, safe_model
+from core.providers.hedging import HedgeBackup, hedged_call
+from core.providers.http_clients import get_http_client
+from core.providers.prefix_cache import apply_gemini_prefix_cache, prefix_cache_manager, record_prompt_usage
 
 logger = logging.getLogger(__name__)
 
@@ -108,28 +112,22 @@ async def _async_log_usage(result: dict, call_type: str) -> None:
         pass
 
 
-async def _call_gemini(
-    model: str,
-    api_key: str,
+def _normalize_finish_reason(finish_reason: str) -> str:
+    """Normalize Gemini finishReason to OpenAI standard ("length" = max_tokens hit)."""
+    _fr_map = {"STOP": "stop", "MAX_TOKENS": "length", "SAFETY": "safety",
+               "RECITATION": "recitation", "OTHER": "other"}
+    return _fr_map.get(finish_reason, finish_reason.lower() if finish_reason else "")
+
+
+def _gemini_payload(
     system_prompt: str,
-    user_message: str,
+    contents: list,
     max_tokens: int,
     temperature: float,
-    max_retries: int = 2,
-    contents: Optional[list] = None,
     model_id: Optional[str] = None,
-) -> Optional[str]:
-    """Call Google Gemini API with fast retry (fail fast for interactive use).
-
-    If `contents` is provided (multi-turn format), it takes priority over `user_message`.
-    `contents` should be a list of {"role": "user"|"model", "parts": [{"text": "..."}]}.
-
-    When `model_id` is provided, frequency_penalty / presence_penalty / safety
-    settings are loaded from config/models/{model_id}.json. Otherwise, the
-    legacy GEMINI_*_PENALTY env vars and BLOCK_ONLY_HIGH safety defaults apply.
-    """
-    url = f"{GEMINI_API_URL}/{model}:generateContent?key={api_key}"
-
+    cached_content: Optional[str] = None,
+) -> dict:
+    """generateContent request body, shared by the blocking and streaming calls."""
     # ── Optional config-driven sampling/safety ──
     cfg_sampling: dict = {}
     cfg_safety: dict = {}
@@ -170,7 +168,7 @@ async def _call_gemini(
         ]
 
     payload = {
-        "contents": contents if contents is not None else [{"parts": [{"text": user_message}]}],
+        "contents": contents,
         "systemInstruction": {"parts": [{"text": system_prompt}]},
         "generationConfig": {
             "maxOutputTokens": max_tokens,
@@ -186,71 +184,112 @@ async def _call_gemini(
         # genuinely harmful content while allowing "amor", "cariño", exercise terminology.
         "safetySettings": safety_settings,
     }
+    if cached_content:
+        # Gemini rejects systemInstruction alongside cachedContent
+        payload["cachedContent"] = cached_content
+        del payload["systemInstruction"]
+    return payload
+
+
+async def _call_gemini(
+    model: str,
+    api_key: str,
+    system_prompt: str,
+    user_message: str,
+    max_tokens: int,
+    temperature: float,
+    max_retries: int = 2,
+    contents: Optional[list] = None,
+    model_id: Optional[str] = None,
+    cached_content: Optional[str] = None,
+    uncached: Optional[Tuple[str, list]] = None,
+) -> Optional[str]:
+    """Call Google Gemini API with fast retry (fail fast for interactive use).
+
+    If `contents` is provided (multi-turn format), it takes priority over `user_message`.
+    `contents` should be a list of {"role": "user"|"model", "parts": [{"text": "..."}]}.
+
+    `cached_content` names a context cache holding the system prompt prefix
+    (core/providers/prefix_cache.py); `system_prompt` is then only the rest.
+    If Gemini refuses the cache (expired or deleted), the request is sent once
+    more as `uncached` — the full (system_prompt, contents) pair.
+
+    When `model_id` is provided, frequency_penalty / presence_penalty / safety
+    settings are loaded from config/models/{model_id}.json. Otherwise, the
+    legacy GEMINI_*_PENALTY env vars and BLOCK_ONLY_HIGH safety defaults apply.
+    """
+    url = f"{GEMINI_API_URL}/{model}:generateContent?key={api_key}"
+
+    payload = _gemini_payload(
+        system_prompt,
+        contents if contents is not None else [{"parts": [{"text": user_message}]}],
+        max_tokens, temperature, model_id=model_id, cached_content=cached_content,
+    )
 
     for attempt in range(max_retries):
         start = time.monotonic()
         try:
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                resp = await client.post(url, json=payload)
-                latency_ms = int((time.monotonic() - start) * 1000)
-
-                if resp.status_code == 429:
-                    wait = 2 ** attempt + 1
-                    logger.warning(
-                        "Gemini rate limited, waiting %ds (attempt %d/%d)",
-                        wait, attempt + 1, max_retries,
-                    )
-                    await asyncio.sleep(wait)
-                    continue
+            client = get_http_client("gemini")
+            resp = await client.post(url, json=payload, timeout=15.0)
+            latency_ms = int((time.monotonic() - start) * 1000)
 
-                resp.raise_for_status()
-                data = resp.json()
-
-                # Safety filter / empty candidates: Gemini returns 200 but
-                # candidates is empty or candidate has no content.
-                candidates = data.get("candidates", [])
-                if not candidates:
-                    reason = data.get("promptFeedback", {}).get("blockReason", "unknown")
-                    logger.warning(
-                        "Gemini no candidates (blockReason=%s), attempt %d/%d",
-                        reason, attempt + 1, max_retries,
-                    )
-                    await asyncio.sleep(1)
-                    continue
+            if resp.status_code == 429:
+                wait = 2 ** attempt + 1
+                logger.warning(
+                    "Gemini rate limited, waiting %ds (attempt %d/%d)",
+                    wait, attempt + 1, max_retries,
+                )
+                await asyncio.sleep(wait)
+                continue
 
-                candidate = candidates[0]
-                finish_reason = candidate.get("finishReason", "")
-                if finish_reason == "SAFETY" or "content" not in candidate:
-                    safety_ratings = candidate.get("safetyRatings", [])
-                    logger.warning(
-                        "Gemini safety filter (finishReason=%s, ratings=%s), attempt %d/%d",
-                        finish_reason, safety_ratings, attempt + 1, max_retries,
-                    )
-                    await asyncio.sleep(1)
-                    continue
+            resp.raise_for_status()
+            data = resp.json()
+
+            # Safety filter / empty candidates: Gemini returns 200 but
+            # candidates is empty or candidate has no content.
+            candidates = data.get("candidates", [])
+            if not candidates:
+                reason = data.get("promptFeedback", {}).get("blockReason", "unknown")
+                logger.warning(
+                    "Gemini no candidates (blockReason=%s), attempt %d/%d",
+                    reason, attempt + 1, max_retries,
+                )
+                await asyncio.sleep(1)
+                continue
 
-                content = candidate["content"]["parts"][0]["text"].strip()
-                usage = data.get("usageMetadata", {})
-                tokens_in = usage.get("promptTokenCount", 0)
-                tokens_out = usage.get("candidatesTokenCount", 0)
-                # Normalize Gemini finishReason to OpenAI standard ("length" = max_tokens hit)
-                _fr_map = {"STOP": "stop", "MAX_TOKENS": "length", "SAFETY": "safety",
-                           "RECITATION": "recitation", "OTHER": "other"}
-                normalized_finish_reason = _fr_map.get(finish_reason, finish_reason.lower() if finish_reason else "")
-
-                logger.info(
-                    "Gemini OK: model=%s latency=%dms tokens_in=%d tokens_out=%d len=%d finish_reason=%s",
-                    model, latency_ms, tokens_in, tokens_out, len(content), normalized_finish_reason,
+            candidate = candidates[0]
+            finish_reason = candidate.get("finishReason", "")
+            if finish_reason == "SAFETY" or "content" not in candidate:
+                safety_ratings = candidate.get("safetyRatings", [])
+                logger.warning(
+                    "Gemini safety filter (finishReason=%s, ratings=%s), attempt %d/%d",
+                    finish_reason, safety_ratings, attempt + 1, max_retries,
                 )
-                return {
-                    "content": content,
-                    "model": model,
-                    "provider": "gemini",
-                    "latency_ms": latency_ms,
-                    "tokens_in": tokens_in,
-                    "tokens_out": tokens_out,
-                    "finish_reason": normalized_finish_reason,
-                }
+                await asyncio.sleep(1)
+                continue
+
+            content = candidate["content"]["parts"][0]["text"].strip()
+            usage = data.get("usageMetadata", {})
+            tokens_in = usage.get("promptTokenCount", 0)
+            tokens_out = usage.get("candidatesTokenCount", 0)
+            cached_tokens = usage.get("cachedContentTokenCount", 0)
+            record_prompt_usage("gemini", tokens_in, cached_tokens)
+            normalized_finish_reason = _normalize_finish_reason(finish_reason)
+
+            logger.info(
+                "Gemini OK: model=%s latency=%dms tokens_in=%d cached=%d tokens_out=%d len=%d finish_reason=%s",
+                model, latency_ms, tokens_in, cached_tokens, tokens_out, len(content), normalized_finish_reason,
+            )
+            return {
+                "content": content,
+                "model": model,
+                "provider": "gemini",
+                "latency_ms": latency_ms,
+                "tokens_in": tokens_in,
+                "tokens_out": tokens_out,
+                "cached_tokens": cached_tokens,
+                "finish_reason": normalized_finish_reason,
+            }
 
         except httpx.TimeoutException:
             logger.warning(
@@ -270,6 +309,17 @@ async def _call_gemini(
                 )
                 await asyncio.sleep(1)  # Fixed 1s — don't escalate for interactive copilot
                 continue
+            if cached_content and status in (400, 403, 404):
+                # Cache expired or deleted out of band — re-register on the next call
+                prefix_cache_manager.invalidate(cached_content)
+                if uncached is not None:
+                    logger.warning("Gemini refused cache %s (%d), retrying uncached", cached_content, status)
+                    full_system_prompt, full_contents = uncached
+                    return await _call_gemini(
+                        model, api_key, full_system_prompt, user_message,
+                        max_tokens, temperature, max_retries=max_retries,
+                        contents=full_contents, model_id=model_id,
+                    )
             logger.error("Gemini HTTP error: %s", e)
             return None
         except Exception as e:
@@ -279,6 +329,25 @@ async def _call_gemini(
     return None
 
 
+def _to_gemini_contents(messages: list[dict]) -> tuple[str, list]:
+    """Split OpenAI-format messages into Gemini's system prompt and multi-turn contents.
+
+    Gemini uses "model" for assistant role; content must alternate user/model.
+    """
+    system_prompt = ""
+    contents = []
+    for msg in messages:
+        role = msg.get("role", "")
+        content = msg.get("content", "")
+        if role == "system":
+            system_prompt = content
+        elif role == "user":
+            contents.append({"role": "user", "parts": [{"text": content}]})
+        elif role == "assistant":
+            contents.append({"role": "model", "parts": [{"text": content}]})
+    return system_prompt, contents
+
+
 async def generate_response_gemini(
     messages: list[dict],
     max_tokens: int = 60,
@@ -316,32 +385,93 @@ async def generate_response_gemini(
     else:
         model = safe_model(os.getenv("GEMINI_MODEL", GEMINI_PRIMARY_MODEL))
 
-    # Build system prompt and multi-turn contents from OpenAI-format messages.
-    # Gemini uses "model" for assistant role; content must alternate user/model.
-    system_prompt = ""
-    contents = []
-    for msg in messages:
-        role = msg.get("role", "")
-        content = msg.get("content", "")
-        if role == "system":
-            system_prompt = content
-        elif role == "user":
-            contents.append({"role": "user", "parts": [{"text": content}]})
-        elif role == "assistant":
-            contents.append({"role": "model", "parts": [{"text": content}]})
-
+    system_prompt, contents = _to_gemini_contents(messages)
     if not contents:
         logger.error("Gemini: no user message found in messages")
         return None
 
+    # Explicit context cache for the creator's static prefix, when one is bound
+    cached_content, cached_system_prompt, cached_contents = await apply_gemini_prefix_cache(
+        model, api_key, system_prompt, contents,
+    )
+
     result = await _call_gemini(
-        model, api_key, system_prompt, "",
-        max_tokens, temperature, contents=contents,
-        model_id=model_id,
+        model, api_key, cached_system_prompt, "",
+        max_tokens, temperature, contents=cached_contents,
+        model_id=model_id, cached_content=cached_content,
+        uncached=(system_prompt, contents) if cached_content else None,
     )
     return result  # dict or None
 
 
+async def stream_gemini(
+    messages: list[dict],
+    max_tokens: int,
+    temperature: float,
+    meta: dict,
+) -> AsyncIterator[str]:
+    """Stream a Flash-Lite DM reply as text deltas (streamGenerateContent, SSE).
+
+    Legacy-path settings only (GOOGLE_API_KEY, GEMINI_MODEL). Fills `meta`
+    with model/provider and, from the usage chunks, tokens_in, tokens_out,
+    cached_tokens and finish_reason. Closing the generator early drops the
+    connection, which stops generation server-side. Raises on errors so the
+    caller can fall back to the blocking cascade.
+    """
+    api_key = os.getenv("GOOGLE_API_KEY")
+    if not api_key:
+        raise RuntimeError("GOOGLE_API_KEY not set")
+    if _gemini_circuit_is_open():
+        raise RuntimeError("Gemini circuit breaker open")
+    model = safe_model(os.getenv("GEMINI_MODEL", GEMINI_PRIMARY_MODEL))
+    system_prompt, contents = _to_gemini_contents(messages)
+    if not contents:
+        raise ValueError("Gemini: no user message found in messages")
+    cached_content, system_prompt, contents = await apply_gemini_prefix_cache(
+        model, api_key, system_prompt, contents,
+    )
+    payload = _gemini_payload(system_prompt, contents, max_tokens, temperature, cached_content=cached_content)
+    url = f"{GEMINI_API_URL}/{model}:streamGenerateContent?alt=sse&key={api_key}"
+    meta.update(model=model, provider="gemini")
+
+    yielded = False
+    try:
+        client = get_http_client("gemini")
+        async with client.stream("POST", url, json=payload, timeout=15.0) as resp:
+            resp.raise_for_status()
+            async for line in resp.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                chunk = json.loads(line[5:])
+                usage = chunk.get("usageMetadata")
+                if usage:
+                    meta["tokens_in"] = usage.get("promptTokenCount", 0)
+                    meta["tokens_out"] = usage.get("candidatesTokenCount", 0)
+                    meta["cached_tokens"] = usage.get("cachedContentTokenCount", 0)
+                for candidate in chunk.get("candidates", [])[:1]:
+                    if candidate.get("finishReason"):
+                        meta["finish_reason"] = _normalize_finish_reason(candidate["finishReason"])
+                    for part in (candidate.get("content") or {}).get("parts", []):
+                        if part.get("text"):
+                            yielded = True
+                            yield part["text"]
+    except (GeneratorExit, asyncio.CancelledError):
+        raise
+    except Exception as e:
+        if (
+            cached_content
+            and isinstance(e, httpx.HTTPStatusError)
+            and e.response.status_code in (400, 403, 404)
+        ):
+            # Refused cache: the blocking fallback re-registers and retries uncached
+            prefix_cache_manager.invalidate(cached_content)
+        if not yielded:
+            _gemini_record_failure()
+        raise
+    _gemini_record_success()
+    record_prompt_usage("gemini", meta.get("tokens_in", 0), meta.get("cached_tokens", 0))
+
+
 async def generate_simple(
     prompt: str,
     system_prompt: str = "",
@@ -526,6 +656,51 @@ async def _try_openrouter(
 # Production DM response: [Together/DeepInfra/OpenRouter →] Gemini → None
 # =============================================================================
 
+async def _gemini_dm_attempt(
+    messages: list[dict],
+    max_tokens: int,
+    temperature: float,
+) -> Optional[dict]:
+    """One Flash-Lite DM attempt under LLM_PRIMARY_TIMEOUT, feeding the circuit breaker.
+
+    A cancelled attempt (the losing side of a hedge) records nothing.
+    """
+    primary_timeout = float(os.getenv("LLM_PRIMARY_TIMEOUT", "5"))
+    try:
+        result = await asyncio.wait_for(
+            generate_response_gemini(messages, max_tokens, temperature),
+            timeout=primary_timeout,
+        )
+        if result:
+            _gemini_record_success()
+            asyncio.create_task(_async_log_usage(result, "dm_response"))
+            return result
+        logger.warning("Flash-Lite returned empty, falling back")
+        _gemini_record_failure()
+    except asyncio.TimeoutError:
+        logger.warning("Flash-Lite timeout after %.0fs, falling back", primary_timeout)
+        _gemini_record_failure()
+    except Exception as e:
+        logger.warning("Flash-Lite failed: %s, falling back", e)
+        _gemini_record_failure()
+    return None
+
+
+def _gemini_hedge_backup(
+    messages: list[dict],
+    max_tokens: int,
+    temperature: float,
+) -> Optional[HedgeBackup]:
+    """Flash-Lite as the hedge backup for a non-Gemini primary (None when fallback is disabled)."""
+    if os.getenv("CCEE_NO_FALLBACK") or os.environ.get("DISABLE_FALLBACK") == "true":
+        return None
+    return HedgeBackup(
+        "gemini",
+        lambda: _gemini_dm_attempt(messages, max_tokens, temperature),
+        available=lambda: not _gemini_circuit_is_open(),
+    )
+
+
 async def generate_dm_response(
     messages: list[dict],
     max_tokens: int = 60,
@@ -535,7 +710,10 @@ async def generate_dm_response(
 
     Pipeline:
       1. Active model config provider (DeepInfra/Together/OpenRouter/GoogleAI) if set
+         (hedged with Gemini Flash-Lite like step 2)
       2. Gemini Flash-Lite (primary/fallback) — skipped if circuit breaker is open
+         (with LLM_HEDGE_ENABLED, raced against a slow alternative primary;
+         see core/providers/hedging.py)
       3. None if all fail (no OpenAI fallback)
 
     Returns:
@@ -547,6 +725,7 @@ async def generate_dm_response(
     # When set, the active model config picks the provider; the legacy
     # LLM_PRIMARY_PROVIDER cascade is bypassed for the primary attempt.
     # Falls through to Gemini fallback if the active provider fails.
+    # Non-Gemini providers are hedged with Gemini like the cascade below.
     from core.config.llm_models import get_active_model_config
     _active_cfg = get_active_model_config()
     if _active_cfg:
@@ -554,15 +733,27 @@ async def generate_dm_response(
         _model_id = os.getenv("LLM_MODEL_NAME") or _LMN_static
         _prov_name = (_active_cfg.get("provider", {}) or {}).get("name", "")
         if _prov_name == "deepinfra":
-            result = await _try_deepinfra(messages, max_tokens, temperature, "dm_response", model_id=_model_id)
+            result, _ = await hedged_call(
+                "deepinfra",
+                lambda: _try_deepinfra(messages, max_tokens, temperature, "dm_response", model_id=_model_id),
+                _gemini_hedge_backup(messages, max_tokens, temperature),
+            )
             if result:
                 return result
         elif _prov_name == "together":
-            result = await _try_together(messages, max_tokens, temperature, "dm_response", model_id=_model_id)
+            result, _ = await hedged_call(
+                "together",
+                lambda: _try_together(messages, max_tokens, temperature, "dm_response", model_id=_model_id),
+                _gemini_hedge_backup(messages, max_tokens, temperature),
+            )
             if result:
                 return result
         elif _prov_name == "openrouter":
-            result = await _try_openrouter(messages, max_tokens, temperature, "dm_response", model_id=_model_id)
+            result, _ = await hedged_call(
+                "openrouter",
+                lambda: _try_openrouter(messages, max_tokens, temperature, "dm_response", model_id=_model_id),
+                _gemini_hedge_backup(messages, max_tokens, temperature),
+            )
             if result:
                 return result
             if os.getenv("CCEE_NO_FALLBACK"):
@@ -587,7 +778,11 @@ async def generate_dm_response(
                     logger.warning("Gemini (config-driven) failed: %s", e)
                     _gemini_record_failure()
         elif _prov_name == "google_ai_studio":
-            result = await _try_google_ai(messages, "dm_response")
+            result, _ = await hedged_call(
+                "google_ai_studio",
+                lambda: _try_google_ai(messages, "dm_response"),
+                _gemini_hedge_backup(messages, max_tokens, temperature),
+            )
             if result:
                 return result
             if os.getenv("CCEE_NO_FALLBACK"):
@@ -605,9 +800,16 @@ async def generate_dm_response(
         logger.critical("[LLM-ALL-DOWN] Active model %s failed, no fallback available", _model_id)
         return None
 
-    # 1. PRIMARY: route based on LLM_PRIMARY_PROVIDER
+    # 1. PRIMARY: route based on LLM_PRIMARY_PROVIDER.
+    # With LLM_HEDGE_ENABLED, Gemini is raced against a primary that runs
+    # past its learned latency percentile instead of waiting for it to fail.
+    gemini_tried = False
+    hedge_backup = _gemini_hedge_backup(messages, max_tokens, temperature)
+
     if LLM_PRIMARY_PROVIDER == "google_ai_studio":
-        result = await _try_google_ai(messages, "dm_response")
+        result, gemini_tried = await hedged_call(
+            "google_ai_studio", lambda: _try_google_ai(messages, "dm_response"), hedge_backup,
+        )
         if result:
             return result
         # CCEE_NO_FALLBACK: evaluation mode — return None instead of mixing models.
@@ -616,18 +818,24 @@ async def generate_dm_response(
             logger.info("[CCEE] Fallback disabled — primary provider failed, returning None")
             return None
     elif LLM_PRIMARY_PROVIDER == "together":
-        result = await _try_together(messages, max_tokens, temperature, "dm_response")
+        result, gemini_tried = await hedged_call(
+            "together", lambda: _try_together(messages, max_tokens, temperature, "dm_response"), hedge_backup,
+        )
         if result:
             return result
     elif LLM_PRIMARY_PROVIDER == "deepinfra":
-        result = await _try_deepinfra(messages, max_tokens, temperature, "dm_response")
+        result, gemini_tried = await hedged_call(
+            "deepinfra", lambda: _try_deepinfra(messages, max_tokens, temperature, "dm_response"), hedge_backup,
+        )
         if result:
             return result
         if os.getenv("CCEE_NO_FALLBACK"):
             logger.info("[CCEE] Fallback disabled — DeepInfra failed, returning None")
             return None
     elif LLM_PRIMARY_PROVIDER == "openrouter":
-        result = await _try_openrouter(messages, max_tokens, temperature, "dm_response")
+        result, gemini_tried = await hedged_call(
+            "openrouter", lambda: _try_openrouter(messages, max_tokens, temperature, "dm_response"), hedge_backup,
+        )
         if result:
             return result
         if os.getenv("CCEE_NO_FALLBACK"):
@@ -638,28 +846,14 @@ async def generate_dm_response(
     if os.environ.get("DISABLE_FALLBACK") == "true":
         logger.error("[DISABLE_FALLBACK] Primary provider failed and DISABLE_FALLBACK=true, returning None")
         return None
-    if _gemini_circuit_is_open():
+    if gemini_tried:
+        logger.info("Gemini already raced as hedge — not retrying")
+    elif _gemini_circuit_is_open():
         logger.info("Circuit breaker open — skipping Gemini")
     else:
-        try:
-            primary_timeout = float(os.getenv("LLM_PRIMARY_TIMEOUT", "5"))
-            result = await asyncio.wait_for(
-                generate_response_gemini(messages, max_tokens, temperature),
-                timeout=primary_timeout,
-            )
-            if result:
-                _gemini_record_success()
-                asyncio.create_task(_async_log_usage(result, "dm_response"))
-                return result
-            logger.warning("Flash-Lite returned empty, falling back")
-            _gemini_record_failure()
-        except asyncio.TimeoutError:
-            logger.warning("Flash-Lite timeout after %.0fs, falling back",
-                            float(os.getenv("LLM_PRIMARY_TIMEOUT", "5")))
-            _gemini_record_failure()
-        except Exception as e:
-            logger.warning("Flash-Lite failed: %s, falling back", e)
-            _gemini_record_failure()
+        result = await _gemini_dm_attempt(messages, max_tokens, temperature)
+        if result:
+            return result
 
     if os.environ.get("DISABLE_FALLBACK") == "true":
         logger.error("[DISABLE_FALLBACK] All primary providers failed and DISABLE_FALLBACK=true, returning None")
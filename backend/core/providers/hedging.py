@@ -0,0 +1,325 @@
+"""Hedged DM generation: race a backup provider against a slow primary.
+
+generate_dm_response() used to wait for the primary provider to fail or
+time out before trying Gemini, so a slow primary became a slow DM. With
+hedging on, the primary runs alone until it has taken longer than its own
+learned latency percentile; then one backup request goes to the next
+provider and the first valid response wins. The loser is cancelled.
+
+Hedge delays come from a rolling window of each provider's end-to-end
+latencies, learned online. Until a provider has LLM_HEDGE_MIN_SAMPLES
+latencies, LLM_HEDGE_DEFAULT_DELAY_MS applies.
+
+Extra spend is capped by a credit budget. Every primary request earns
+LLM_HEDGE_BUDGET credits (0.1 = at most ~10% extra requests), up to
+LLM_HEDGE_BURST banked credits, and each hedge spends one credit. A backup
+whose circuit breaker is open is never fired.
+
+Env vars:
+  LLM_HEDGE_ENABLED          — "true" to race providers (default: false)
+  LLM_HEDGE_PERCENTILE       — primary latency percentile that triggers the hedge (default: 95)
+  LLM_HEDGE_MIN_SAMPLES      — latencies needed before the percentile is trusted (default: 20)
+  LLM_HEDGE_DEFAULT_DELAY_MS — hedge delay until then (default: 3000)
+  LLM_HEDGE_MIN_DELAY_MS     — floor for the hedge delay (default: 500)
+  LLM_HEDGE_BUDGET           — hedge credits earned per primary request (default: 0.1)
+  LLM_HEDGE_BURST            — max banked credits (default: 5)
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+from core.observability.metrics import emit_metric
+
+logger = logging.getLogger(__name__)
+
+HEDGE_ENABLED = os.getenv("LLM_HEDGE_ENABLED", "false").lower() == "true"
+HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", "95"))
+HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+HEDGE_DEFAULT_DELAY_MS = float(os.getenv("LLM_HEDGE_DEFAULT_DELAY_MS", "3000"))
+HEDGE_MIN_DELAY_MS = float(os.getenv("LLM_HEDGE_MIN_DELAY_MS", "500"))
+HEDGE_BUDGET = float(os.getenv("LLM_HEDGE_BUDGET", "0.1"))
+HEDGE_BURST = float(os.getenv("LLM_HEDGE_BURST", "5"))
+
+# Rolling window used for latency percentiles (same size as the HTTP pool stats)
+_LATENCY_WINDOW = 512
+
+ProviderCall = Callable[[], Awaitable[Optional[dict]]]
+
+
+@dataclass
+class HedgeBackup:
+    """The provider raced against a slow primary."""
+
+    provider: str
+    call: ProviderCall
+    available: Callable[[], bool] = lambda: True  # False while its circuit breaker is open
+
+
+class ProviderHedgeStats:
+    """Per-provider latency window plus hedge counters (as primary)."""
+
+    def __init__(self, provider: str):
+        self.provider = provider
+        self.requests = 0
+        self.hedged = 0
+        self.backup_wins = 0
+        self.skipped_budget = 0
+        self.skipped_circuit = 0
+        self.latencies_ms: Deque[float] = deque(maxlen=_LATENCY_WINDOW)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        if not self.latencies_ms:
+            return None
+        ordered = sorted(self.latencies_ms)
+        idx = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+        return round(ordered[idx], 1)
+
+    def hedge_delay_ms(self) -> float:
+        if len(self.latencies_ms) < HEDGE_MIN_SAMPLES:
+            return max(HEDGE_MIN_DELAY_MS, HEDGE_DEFAULT_DELAY_MS)
+        return max(HEDGE_MIN_DELAY_MS, self.percentile(HEDGE_PERCENTILE))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "hedged": self.hedged,
+            "hedge_rate": round(self.hedged / self.requests, 3) if self.requests else None,
+            "backup_wins": self.backup_wins,
+            "backup_win_rate": round(self.backup_wins / self.hedged, 3) if self.hedged else None,
+            "skipped_budget": self.skipped_budget,
+            "skipped_circuit": self.skipped_circuit,
+            "hedge_delay_ms": round(self.hedge_delay_ms(), 1),
+            "latency_p50_ms": self.percentile(50),
+            "latency_p95_ms": self.percentile(95),
+            "latency_p99_ms": self.percentile(99),
+        }
+
+
+class HedgeBudget:
+    """Credits earned per primary request; a hedge spends one."""
+
+    def __init__(self, ratio: float, burst: float):
+        self.ratio = ratio
+        self.burst = burst
+        self.credits = 0.0
+
+    def earn(self) -> None:
+        self.credits = min(self.burst, self.credits + self.ratio)
+
+    def try_spend(self) -> bool:
+        if self.credits < 1.0 - 1e-9:  # ten 0.1 earnings make one credit
+            return False
+        self.credits -= 1.0
+        return True
+
+
+_stats: Dict[str, ProviderHedgeStats] = {}
+_budget = HedgeBudget(HEDGE_BUDGET, HEDGE_BURST)
+
+
+def _provider_stats(provider: str) -> ProviderHedgeStats:
+    return _stats.setdefault(provider, ProviderHedgeStats(provider))
+
+
+def _record_latency(provider: str, started: float) -> None:
+    latency_ms = (time.monotonic() - started) * 1000
+    _provider_stats(provider).latencies_ms.append(latency_ms)
+    emit_metric("llm_provider_latency_ms", latency_ms, provider=provider)
+
+
+def _valid(result: Any) -> bool:
+    return isinstance(result, dict) and bool(result.get("content"))
+
+
+def _task_result(task: "asyncio.Task") -> Optional[dict]:
+    if task.cancelled() or task.exception() is not None:
+        if not task.cancelled():
+            logger.warning("[HEDGE] provider call raised: %s", task.exception())
+        return None
+    return task.result()
+
+
+async def hedged_call(
+    primary: str,
+    call: ProviderCall,
+    backup: Optional[HedgeBackup] = None,
+) -> Tuple[Optional[dict], bool]:
+    """Run the primary provider call, hedging with `backup` once it runs slow.
+
+    Provider calls follow the _try_* contract: a result dict, or None on
+    failure (they log and swallow their own errors).
+
+    Returns:
+        (result or None, whether the backup was called) — callers skip their
+        own fallback to the backup provider when it was already tried.
+    """
+    stats = _provider_stats(primary)
+    stats.requests += 1
+    _budget.earn()
+    started = time.monotonic()
+
+    if backup is None or not HEDGE_ENABLED:
+        result = await call()
+        if _valid(result):
+            _record_latency(primary, started)
+        return result, False
+
+    primary_task = asyncio.ensure_future(call())
+    try:
+        done, _ = await asyncio.wait({primary_task}, timeout=stats.hedge_delay_ms() / 1000)
+    except BaseException:
+        primary_task.cancel()
+        raise
+    skipped = None
+    if not done:
+        if not backup.available():
+            skipped = "skipped_circuit"
+        elif not _budget.try_spend():
+            skipped = "skipped_budget"
+    if done or skipped:
+        if skipped:
+            setattr(stats, skipped, getattr(stats, skipped) + 1)
+            emit_metric("llm_hedge_total", 1, primary=primary, backup=backup.provider, outcome=skipped)
+        result = await primary_task
+        if _valid(result):
+            _record_latency(primary, started)
+        return result, False
+
+    stats.hedged += 1
+    emit_metric("llm_hedge_total", 1, primary=primary, backup=backup.provider, outcome="fired")
+    logger.info("[HEDGE] %s slower than %.0fms, racing %s", primary, stats.hedge_delay_ms(), backup.provider)
+    backup_started = time.monotonic()
+    backup_task = asyncio.ensure_future(backup.call())
+
+    pending = {primary_task, backup_task}
+    winner = None
+    result = None
+    try:
+        while pending and winner is None:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                value = _task_result(task)
+                if winner is None and _valid(value):
+                    winner, result = task, value
+    finally:
+        # The loser (or both, if our caller was cancelled) stops here; a
+        # cancelled call records nothing against its circuit breaker.
+        for task in pending:
+            task.cancel()
+
+    if winner is primary_task:
+        _record_latency(primary, started)
+        outcome = "primary_won"
+    elif winner is backup_task:
+        _record_latency(backup.provider, backup_started)
+        # The primary's latency is at least this long; keeping that lower
+        # bound stops cancelled calls from erasing the slow tail
+        _provider_stats(primary).latencies_ms.append((time.monotonic() - started) * 1000)
+        stats.backup_wins += 1
+        outcome = "backup_won"
+    else:
+        outcome = "both_failed"
+    emit_metric("llm_hedge_total", 1, primary=primary, backup=backup.provider, outcome=outcome)
+    return result, True
+
+
+async def hedged_first_token(
+    primary: str,
+    first: Callable[[], Awaitable[Optional[str]]],
+    backup: Optional[HedgeBackup] = None,
+) -> Tuple[Optional[str], Optional[dict]]:
+    """Await a streaming call's first delta, hedging with `backup` once it runs slow.
+
+    Same delay, budget and circuit rules as hedged_call(), but the latency
+    window is the primary's time to first token ("<primary>:first_token").
+    A stream that has spoken wins outright; the backup is cancelled.
+
+    Returns:
+        (first delta, None) when the stream answered first, or
+        (None, backup result) when the backup won. Raises the stream's error
+        when it fails and no backup result is available.
+    """
+    key = f"{primary}:first_token"
+    stats = _provider_stats(key)
+    stats.requests += 1
+    _budget.earn()
+    started = time.monotonic()
+
+    if backup is None or not HEDGE_ENABLED:
+        delta = await first()
+        _record_latency(key, started)
+        return delta, None
+
+    first_task = asyncio.ensure_future(first())
+    try:
+        done, _ = await asyncio.wait({first_task}, timeout=stats.hedge_delay_ms() / 1000)
+    except BaseException:
+        first_task.cancel()
+        await asyncio.wait({first_task})
+        raise
+    skipped = None
+    if not done:
+        if not backup.available():
+            skipped = "skipped_circuit"
+        elif not _budget.try_spend():
+            skipped = "skipped_budget"
+    if done or skipped:
+        if skipped:
+            setattr(stats, skipped, getattr(stats, skipped) + 1)
+            emit_metric("llm_hedge_total", 1, primary=key, backup=backup.provider, outcome=skipped)
+        delta = await first_task
+        _record_latency(key, started)
+        return delta, None
+
+    stats.hedged += 1
+    emit_metric("llm_hedge_total", 1, primary=key, backup=backup.provider, outcome="fired")
+    logger.info("[HEDGE] %s first token slower than %.0fms, racing %s", primary, stats.hedge_delay_ms(), backup.provider)
+    backup_started = time.monotonic()
+    backup_task = asyncio.ensure_future(backup.call())
+
+    pending = {first_task, backup_task}
+    winner = None
+    result = None
+    try:
+        while pending and winner is None:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            if first_task in done and not first_task.cancelled() and first_task.exception() is None:
+                winner = first_task
+            elif backup_task in done:
+                value = _task_result(backup_task)
+                if _valid(value):
+                    winner, result = backup_task, value
+    finally:
+        for task in pending:
+            task.cancel()
+        if first_task in pending:
+            # The caller closes the stream next, which fails while this read unwinds
+            await asyncio.wait({first_task})
+
+    if winner is first_task:
+        _record_latency(key, started)
+        emit_metric("llm_hedge_total", 1, primary=key, backup=backup.provider, outcome="primary_won")
+        return first_task.result(), None
+    if winner is backup_task:
+        _record_latency(backup.provider, backup_started)
+        stats.latencies_ms.append((time.monotonic() - started) * 1000)
+        stats.backup_wins += 1
+        emit_metric("llm_hedge_total", 1, primary=key, backup=backup.provider, outcome="backup_won")
+        return None, result
+    emit_metric("llm_hedge_total", 1, primary=key, backup=backup.provider, outcome="both_failed")
+    raise first_task.exception()
+
+
+def get_hedge_stats() -> Dict[str, Any]:
+    """Hedging config, budget and per-provider rates/percentiles for health endpoints."""
+    return {
+        "enabled": HEDGE_ENABLED,
+        "percentile": HEDGE_PERCENTILE,
+        "budget": {"ratio": HEDGE_BUDGET, "burst": HEDGE_BURST, "credits": round(_budget.credits, 2)},
+        "providers": {name: s.to_dict() for name, s in _stats.items()},
+    }
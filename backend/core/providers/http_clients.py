@@ -0,0 +1,246 @@
+"""Process-wide pooled HTTP clients for LLM providers.
+
+Every provider call used to open its own ``httpx.AsyncClient``, paying a
+fresh TCP + TLS handshake per DM inside the LLM_PRIMARY_TIMEOUT window.
+This module keeps one long-lived client (and therefore one connection pool)
+per provider, opened/closed from the FastAPI startup/shutdown handlers.
+
+Usage:
+    from core.providers.http_clients import get_http_client
+    client = get_http_client("gemini")
+    resp = await client.post(url, json=payload, timeout=15.0)
+
+    # OpenAI-compatible SDKs accept the pooled client directly:
+    AsyncOpenAI(api_key=..., base_url=..., http_client=get_http_client("deepinfra"))
+
+Clients are bound to the event loop that created them. If a caller runs on a
+different loop (scripts calling asyncio.run() repeatedly, tests), a fresh
+client is created for that loop instead of reusing a dead pool; the replaced
+client is closed on its own loop if that loop is still running, otherwise it
+is kept and closed by aclose().
+
+Env vars:
+  LLM_HTTP_MAX_CONNECTIONS      — max connections per provider pool (default: 20)
+  LLM_HTTP_MAX_KEEPALIVE        — idle keep-alive connections kept per pool (default: 10)
+  LLM_HTTP_KEEPALIVE_EXPIRY     — seconds an idle connection is kept (default: 60)
+  LLM_HTTP_TIMEOUT              — default request timeout in seconds (default: 30)
+  LLM_HTTP2                     — enable HTTP/2 when the `h2` package is installed (default: true)
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+import httpx
+
+from core.observability.metrics import emit_metric
+
+logger = logging.getLogger(__name__)
+
+MAX_CONNECTIONS = int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "20"))
+MAX_KEEPALIVE = int(os.getenv("LLM_HTTP_MAX_KEEPALIVE", "10"))
+KEEPALIVE_EXPIRY = float(os.getenv("LLM_HTTP_KEEPALIVE_EXPIRY", "60"))
+DEFAULT_TIMEOUT = float(os.getenv("LLM_HTTP_TIMEOUT", "30"))
+
+try:
+    import h2  # noqa: F401
+    _H2_AVAILABLE = True
+except ImportError:
+    _H2_AVAILABLE = False
+
+HTTP2_ENABLED = _H2_AVAILABLE and os.getenv("LLM_HTTP2", "true").lower() == "true"
+
+# Providers opened eagerly at startup. Others are created lazily on first use.
+DEFAULT_PROVIDERS = ("gemini", "deepinfra", "together", "openrouter", "fireworks")
+
+# Rolling window used for latency percentiles in get_pool_stats()
+_LATENCY_WINDOW = 512
+
+
+class ProviderPoolStats:
+    """Per-provider counters: requests, errors, new connections and latency."""
+
+    def __init__(self, provider: str):
+        self.provider = provider
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.connections_opened = 0
+        self.tls_handshakes = 0
+        self.latencies_ms: Deque[float] = deque(maxlen=_LATENCY_WINDOW)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        if not self.latencies_ms:
+            return None
+        ordered = sorted(self.latencies_ms)
+        idx = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+        return round(ordered[idx], 1)
+
+    def to_dict(self) -> Dict[str, Any]:
+        reused = max(0, self.requests - self.connections_opened)
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "in_flight": self.in_flight,
+            "connections_opened": self.connections_opened,
+            "tls_handshakes": self.tls_handshakes,
+            "connection_reuse_rate": round(reused / self.requests, 3) if self.requests else None,
+            "latency_p50_ms": self.percentile(50),
+            "latency_p95_ms": self.percentile(95),
+            "latency_p99_ms": self.percentile(99),
+        }
+
+
+class _InstrumentedTransport(httpx.AsyncBaseTransport):
+    """Transport wrapper that records per-provider pool metrics."""
+
+    def __init__(self, provider: str, inner: httpx.AsyncHTTPTransport, stats: ProviderPoolStats):
+        self._provider = provider
+        self._inner = inner
+        self._stats = stats
+
+    async def _trace(self, event_name: str, info: dict) -> None:
+        # httpcore only emits these events when a new connection is made
+        if event_name == "connection.connect_tcp.complete":
+            self._stats.connections_opened += 1
+        elif event_name == "connection.start_tls.complete":
+            self._stats.tls_handshakes += 1
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        stats = self._stats
+        stats.requests += 1
+        stats.in_flight += 1
+        request.extensions = {**request.extensions, "trace": self._trace}
+        start = time.monotonic()
+        status = "error"
+        try:
+            response = await self._inner.handle_async_request(request)
+            status = "ok" if response.status_code < 400 else str(response.status_code)
+            return response
+        finally:
+            stats.in_flight -= 1
+            # Time to response headers — body streaming is not included
+            latency_ms = (time.monotonic() - start) * 1000
+            stats.latencies_ms.append(latency_ms)
+            if status != "ok":
+                stats.errors += 1
+            emit_metric("llm_http_requests_total", 1, provider=self._provider, status=status)
+            emit_metric("llm_http_request_duration_ms", latency_ms, provider=self._provider)
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+class HTTPClientRegistry:
+    """Registry of pooled ``httpx.AsyncClient`` instances, one per provider."""
+
+    def __init__(self):
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._loops: Dict[str, asyncio.AbstractEventLoop] = {}
+        self._stats: Dict[str, ProviderPoolStats] = {}
+        # Clients replaced by get() whose loop is gone, closed by aclose()
+        self._retired: List[httpx.AsyncClient] = []
+
+    def _build_client(self, provider: str) -> httpx.AsyncClient:
+        limits = httpx.Limits(
+            max_connections=MAX_CONNECTIONS,
+            max_keepalive_connections=MAX_KEEPALIVE,
+            keepalive_expiry=KEEPALIVE_EXPIRY,
+        )
+        stats = self._stats.setdefault(provider, ProviderPoolStats(provider))
+        transport = _InstrumentedTransport(
+            provider,
+            httpx.AsyncHTTPTransport(limits=limits, http2=HTTP2_ENABLED),
+            stats,
+        )
+        return httpx.AsyncClient(timeout=DEFAULT_TIMEOUT, transport=transport)
+
+    def get(self, provider: str) -> httpx.AsyncClient:
+        """Return the pooled client for a provider, creating it if needed."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        client = self._clients.get(provider)
+        if client is not None and not client.is_closed:
+            if loop is None or self._loops.get(provider) is loop:
+                return client
+            # Pool belongs to another (likely finished) event loop — its
+            # connections cannot be reused here, so start a new one.
+            logger.debug("[HTTP-POOL] %s client bound to another loop, recreating", provider)
+            self._retire(client, self._loops.get(provider))
+
+        client = self._build_client(provider)
+        self._clients[provider] = client
+        self._loops[provider] = loop
+        return client
+
+    def _retire(self, client: httpx.AsyncClient, loop: Optional[asyncio.AbstractEventLoop]) -> None:
+        """Close a replaced client on its own loop, or keep it for aclose()."""
+        if loop is not None and loop.is_running() and not loop.is_closed():
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+        else:
+            self._retired.append(client)
+
+    def open(self, providers=DEFAULT_PROVIDERS) -> None:
+        """Eagerly create clients for the given providers (startup)."""
+        for provider in providers:
+            self.get(provider)
+        logger.info(
+            "[HTTP-POOL] opened %d provider clients (http2=%s, max_conn=%d, keepalive=%d/%.0fs)",
+            len(self._clients), HTTP2_ENABLED, MAX_CONNECTIONS, MAX_KEEPALIVE, KEEPALIVE_EXPIRY,
+        )
+
+    async def aclose(self) -> None:
+        """Close every pooled client (shutdown). Never raises."""
+        clients = list(self._clients.items())
+        retired, self._retired = self._retired, []
+        self._clients.clear()
+        self._loops.clear()
+        for provider, client in clients:
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning("[HTTP-POOL] failed to close %s client: %s", provider, e)
+        for client in retired:
+            try:
+                await client.aclose()
+            except Exception as e:
+                # Connections opened on a closed loop cannot be shut down cleanly
+                logger.debug("[HTTP-POOL] failed to close retired client: %s", e)
+        if clients:
+            logger.info("[HTTP-POOL] closed %d provider clients", len(clients))
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-provider connection/latency metrics for health endpoints."""
+        return {
+            "http2": HTTP2_ENABLED,
+            "providers": {name: s.to_dict() for name, s in self._stats.items()},
+        }
+
+
+_registry = HTTPClientRegistry()
+
+
+def get_http_client(provider: str) -> httpx.AsyncClient:
+    """Get the shared pooled client for a provider."""
+    return _registry.get(provider)
+
+
+def open_http_clients() -> None:
+    """Open provider pools. Called from the FastAPI startup handler."""
+    _registry.open()
+
+
+async def close_http_clients() -> None:
+    """Close provider pools. Called from the FastAPI shutdown handler."""
+    await _registry.aclose()
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """Return per-provider connection metrics."""
+    return _registry.stats()
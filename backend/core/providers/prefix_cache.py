@@ -0,0 +1,429 @@
+"""Prompt prefix caching: explicit Gemini context caches + cached-token accounting.
+
+core/dm/cache_boundary.py measures the static per-creator prefix that leads
+every DM system prompt (the style section / Doc D) and DeepInfra caches it
+implicitly. This module makes that prefix do work on every provider:
+
+- The generation phase binds the creator's prefix around its LLM calls
+  (bound_prompt_prefix). The binding is refused when the system prompt no
+  longer starts with the exact bytes the context phase hashed, so a
+  truncated or rewritten prompt is never paired with a stale cache.
+- Gemini: with GEMINI_PREFIX_CACHE_ENABLED, the prefix is registered once per
+  (creator, model) as a cachedContents resource and re-registered when the
+  prefix hash changes or the cache nears expiry; the old one is deleted.
+  Requests reference the cache by name. Gemini rejects systemInstruction
+  next to cachedContent, so the dynamic rest of the system prompt is sent as
+  its own leading turn, ahead of (never merged into) the conversation. A
+  refused cache is forgotten and the request retried uncached.
+- Providers report cached prompt tokens from their usage fields (Gemini
+  usageMetadata.cachedContentTokenCount, OpenAI-compatible
+  usage.prompt_tokens_details.cached_tokens) through record_prompt_usage,
+  which keeps per-creator hit rates for /health/prompt-cache.
+
+FakePrefixCacheProvider simulates a provider-side prefix cache (block
+matching, cached-token pricing and latency) so tests catch prompt changes
+that break the prefix.
+
+Env vars:
+  GEMINI_PREFIX_CACHE_ENABLED   — "true" to register explicit Gemini caches (default: false)
+  GEMINI_PREFIX_CACHE_TTL_S     — cache lifetime requested from Gemini (default: 3600)
+  GEMINI_PREFIX_CACHE_MIN_CHARS — shortest prefix worth caching (default: 4096, ~1024 tokens,
+                                  Gemini's minimum cache size)
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from core.dm.cache_boundary import _CACHED_PRICE, _CHARS_PER_TOKEN, _INPUT_PRICE, compute_prefix_hash
+from core.observability.metrics import emit_metric
+from core.providers.http_clients import get_http_client
+
+logger = logging.getLogger(__name__)
+
+GEMINI_PREFIX_CACHE_ENABLED = os.getenv("GEMINI_PREFIX_CACHE_ENABLED", "false").lower() == "true"
+GEMINI_PREFIX_CACHE_TTL_S = int(os.getenv("GEMINI_PREFIX_CACHE_TTL_S", "3600"))
+GEMINI_PREFIX_CACHE_MIN_CHARS = int(os.getenv("GEMINI_PREFIX_CACHE_MIN_CHARS", "4096"))
+
+GEMINI_CACHE_API_URL = "https://generativelanguage.googleapis.com/v1beta/cachedContents"
+
+# Re-register this long before Gemini expires the cache, so no request races the expiry
+_REFRESH_MARGIN_S = 60
+# After a failed registration, send uncached requests for this long before retrying
+_RETRY_AFTER_FAILURE_S = 300
+
+
+@dataclass(frozen=True)
+class PromptPrefix:
+    """The static leading bytes of one creator's system prompt."""
+
+    creator_id: str
+    text: str
+    hash: str
+
+
+_bound_prefix: ContextVar[Optional[PromptPrefix]] = ContextVar("prompt_prefix", default=None)
+
+
+class PrefixCacheStats:
+    """Per-creator prompt token counters, split by provider."""
+
+    def __init__(self) -> None:
+        self.providers: Dict[str, Dict[str, int]] = {}
+        self.prefix_changes = 0
+        self.prefix_mismatches = 0
+        self.caches_created = 0
+        self.cache_errors = 0
+
+    def record(self, provider: str, prompt_tokens: int, cached_tokens: int) -> None:
+        counts = self.providers.setdefault(provider, {"calls": 0, "prompt_tokens": 0, "cached_tokens": 0})
+        counts["calls"] += 1
+        counts["prompt_tokens"] += prompt_tokens
+        counts["cached_tokens"] += cached_tokens
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "providers": {
+                name: {
+                    **counts,
+                    "hit_rate": (round(counts["cached_tokens"] / counts["prompt_tokens"], 3)
+                                 if counts["prompt_tokens"] else None),
+                }
+                for name, counts in self.providers.items()
+            },
+            "prefix_changes": self.prefix_changes,
+            "prefix_mismatches": self.prefix_mismatches,
+            "caches_created": self.caches_created,
+            "cache_errors": self.cache_errors,
+        }
+
+
+_stats: Dict[str, PrefixCacheStats] = {}
+
+
+def _creator_stats(creator_id: str) -> PrefixCacheStats:
+    return _stats.setdefault(creator_id, PrefixCacheStats())
+
+
+# ---------------------------------------------------------------------------
+# Prefix binding
+# ---------------------------------------------------------------------------
+
+def bind_prompt_prefix(
+    creator_id: str,
+    system_prompt: str,
+    prefix_chars: int,
+    expected_hash: Optional[str] = None,
+):
+    """Bind the creator's static prefix for LLM calls made in this context.
+
+    Returns the ContextVar token (pass it to reset_prompt_prefix), or None
+    when there is no usable prefix or the prompt's leading bytes no longer
+    hash to `expected_hash` (the hash the context phase computed).
+    """
+    if prefix_chars <= 0 or prefix_chars > len(system_prompt):
+        return None
+    text = system_prompt[:prefix_chars]
+    prefix_hash = compute_prefix_hash(text)
+    if expected_hash and prefix_hash != expected_hash:
+        _creator_stats(creator_id).prefix_mismatches += 1
+        logger.warning(
+            "[PrefixCache] creator=%s prompt no longer starts with the hashed prefix "
+            "(expected=%s got=%s), sending uncached",
+            creator_id, expected_hash, prefix_hash,
+        )
+        return None
+    return _bound_prefix.set(PromptPrefix(creator_id, text, prefix_hash))
+
+
+def reset_prompt_prefix(token) -> None:
+    if token is not None:
+        _bound_prefix.reset(token)
+
+
+@contextmanager
+def bound_prompt_prefix(creator_id: str, system_prompt: str, cognitive_metadata: Dict) -> Iterator[None]:
+    """bind_prompt_prefix() from the cache_prefix_* keys the context phase leaves in cognitive_metadata."""
+    token = bind_prompt_prefix(
+        creator_id,
+        system_prompt,
+        cognitive_metadata.get("cache_prefix_chars", 0),
+        cognitive_metadata.get("cache_prefix_hash"),
+    )
+    try:
+        yield
+    finally:
+        reset_prompt_prefix(token)
+
+
+def current_prompt_prefix() -> Optional[PromptPrefix]:
+    return _bound_prefix.get()
+
+
+# ---------------------------------------------------------------------------
+# Cached-token accounting
+# ---------------------------------------------------------------------------
+
+def record_prompt_usage(provider: str, prompt_tokens: int, cached_tokens: int) -> None:
+    """Count one call's prompt and cached tokens against the bound creator."""
+    prefix = _bound_prefix.get()
+    creator_id = prefix.creator_id if prefix else "unbound"
+    _creator_stats(creator_id).record(provider, prompt_tokens or 0, cached_tokens or 0)
+    emit_metric("llm_prompt_tokens_total", prompt_tokens or 0, provider=provider, cache="all")
+    if cached_tokens:
+        emit_metric("llm_prompt_tokens_total", cached_tokens, provider=provider, cache="hit")
+
+
+def openai_cached_tokens(usage: Any) -> int:
+    """Cached prompt tokens from an OpenAI-compatible usage object or dict (0 if not reported)."""
+    if isinstance(usage, dict):
+        details = usage.get("prompt_tokens_details")
+    else:
+        details = getattr(usage, "prompt_tokens_details", None)
+    if isinstance(details, dict):
+        cached = details.get("cached_tokens")
+    else:
+        cached = getattr(details, "cached_tokens", None)
+    return cached if isinstance(cached, int) else 0
+
+
+# ---------------------------------------------------------------------------
+# Gemini explicit context caching
+# ---------------------------------------------------------------------------
+
+@dataclass
+class GeminiPrefixCache:
+    name: str
+    prefix_hash: str
+    expires_at: float
+
+
+class PrefixCacheManager:
+    """Owns the Gemini cachedContents registered for each (creator, model)."""
+
+    def __init__(self, ttl_s: int = GEMINI_PREFIX_CACHE_TTL_S, min_chars: int = GEMINI_PREFIX_CACHE_MIN_CHARS):
+        self.ttl_s = ttl_s
+        self.min_chars = min_chars
+        self._caches: Dict[Tuple[str, str], GeminiPrefixCache] = {}
+        self._locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+        self._retry_after: Dict[Tuple[str, str], float] = {}
+
+    def _usable(self, entry: Optional[GeminiPrefixCache], prefix: PromptPrefix) -> bool:
+        return (
+            entry is not None
+            and entry.prefix_hash == prefix.hash
+            and entry.expires_at - _REFRESH_MARGIN_S > time.time()
+        )
+
+    async def gemini_cache_name(self, model: str, api_key: str, prefix: PromptPrefix) -> Optional[str]:
+        """Name of a live cache holding `prefix` for `model`, registering it if needed.
+
+        Returns None when caching is off, the prefix is too short to cache,
+        or registration failed recently — callers then send the full prompt.
+        """
+        if not GEMINI_PREFIX_CACHE_ENABLED or len(prefix.text) < self.min_chars:
+            return None
+        key = (prefix.creator_id, model)
+        entry = self._caches.get(key)
+        if self._usable(entry, prefix):
+            return entry.name
+        if time.monotonic() < self._retry_after.get(key, 0.0):
+            return None
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            entry = self._caches.get(key)
+            if self._usable(entry, prefix):
+                return entry.name
+            created = await self._create(model, api_key, prefix)
+            if created is None:
+                self._retry_after[key] = time.monotonic() + _RETRY_AFTER_FAILURE_S
+                return None
+            self._caches[key] = created
+
+        if entry is not None and entry.prefix_hash != prefix.hash:
+            _creator_stats(prefix.creator_id).prefix_changes += 1
+            logger.warning(
+                "[PrefixCache] creator=%s prefix changed %s→%s, re-registered Gemini cache",
+                prefix.creator_id, entry.prefix_hash, prefix.hash,
+            )
+        if entry is not None and entry.name != created.name:
+            asyncio.create_task(self._delete(entry.name, api_key))
+        return created.name
+
+    async def _create(self, model: str, api_key: str, prefix: PromptPrefix) -> Optional[GeminiPrefixCache]:
+        payload = {
+            "model": f"models/{model}",
+            "displayName": f"dm-prefix-{prefix.creator_id}-{prefix.hash}"[:128],
+            "systemInstruction": {"parts": [{"text": prefix.text}]},
+            "ttl": f"{self.ttl_s}s",
+        }
+        try:
+            client = get_http_client("gemini")
+            resp = await client.post(f"{GEMINI_CACHE_API_URL}?key={api_key}", json=payload, timeout=15.0)
+            resp.raise_for_status()
+            name = resp.json()["name"]
+        except Exception as e:
+            _creator_stats(prefix.creator_id).cache_errors += 1
+            logger.warning("[PrefixCache] Gemini cache registration failed for %s: %s", prefix.creator_id, e)
+            return None
+        _creator_stats(prefix.creator_id).caches_created += 1
+        logger.info(
+            "[PrefixCache] creator=%s model=%s hash=%s cached %d chars as %s",
+            prefix.creator_id, model, prefix.hash, len(prefix.text), name,
+        )
+        return GeminiPrefixCache(name=name, prefix_hash=prefix.hash, expires_at=time.time() + self.ttl_s)
+
+    async def _delete(self, name: str, api_key: str) -> None:
+        try:
+            client = get_http_client("gemini")
+            resp = await client.delete(f"{GEMINI_CACHE_API_URL.rsplit('/', 1)[0]}/{name}?key={api_key}", timeout=15.0)
+            resp.raise_for_status()
+        except Exception as e:
+            logger.debug("[PrefixCache] deleting %s failed (expires on its own): %s", name, e)
+
+    def invalidate(self, name: str) -> None:
+        """Forget a cache Gemini refused (expired or deleted out of band)."""
+        for key, entry in list(self._caches.items()):
+            if entry.name == name:
+                del self._caches[key]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            f"{creator_id}/{model}": {
+                "name": entry.name,
+                "prefix_hash": entry.prefix_hash,
+                "expires_in_s": int(entry.expires_at - time.time()),
+            }
+            for (creator_id, model), entry in self._caches.items()
+        }
+
+
+prefix_cache_manager = PrefixCacheManager()
+
+
+async def apply_gemini_prefix_cache(
+    model: str,
+    api_key: str,
+    system_prompt: str,
+    contents: List[dict],
+) -> Tuple[Optional[str], str, List[dict]]:
+    """Point a Gemini request at the bound prefix's cache when there is one.
+
+    Returns (cache name or None, system prompt to send, contents to send).
+    With a cache, the prefix is dropped from the system prompt and the rest
+    of it becomes a dedicated leading user turn, so it is never read as part
+    of the lead's own message.
+    """
+    prefix = _bound_prefix.get()
+    if prefix is None or not system_prompt.startswith(prefix.text):
+        return None, system_prompt, contents
+    name = await prefix_cache_manager.gemini_cache_name(model, api_key, prefix)
+    if name is None:
+        return None, system_prompt, contents
+
+    dynamic = system_prompt[len(prefix.text):].strip()
+    if not dynamic:
+        return name, "", contents
+    return name, "", [{"role": "user", "parts": [{"text": dynamic}]}] + contents
+
+
+def get_prefix_cache_stats() -> Dict[str, Any]:
+    """Cached-token hit rates per creator and the live Gemini caches, for health endpoints."""
+    return {
+        "gemini_enabled": GEMINI_PREFIX_CACHE_ENABLED,
+        "creators": {creator_id: s.to_dict() for creator_id, s in _stats.items()},
+        "gemini_caches": prefix_cache_manager.to_dict(),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Fake provider for tests
+# ---------------------------------------------------------------------------
+
+class FakePrefixCacheProvider:
+    """In-process provider with an automatic prefix cache, for tests.
+
+    Prompts are matched against earlier prompts in blocks of `block_tokens`
+    (tokens ≈ chars / CACHE_BOUNDARY_CHARS_PER_TOKEN), the way vLLM-style
+    prefix caching works: only whole blocks of an identical leading prefix
+    hit, and the first differing byte ends the hit. Results follow the
+    provider contract plus cached_tokens, cost_usd (cache_boundary prices)
+    and a simulated latency in which prefill of uncached tokens dominates.
+    """
+
+    def __init__(
+        self,
+        provider: str = "fake",
+        block_tokens: int = 16,
+        cached_price_per_m: float = _CACHED_PRICE,
+        input_price_per_m: float = _INPUT_PRICE,
+        base_latency_ms: float = 150.0,
+        uncached_ms_per_token: float = 0.4,
+        cached_ms_per_token: float = 0.02,
+        sleep: bool = False,
+    ):
+        self.provider = provider
+        self.block_chars = block_tokens * _CHARS_PER_TOKEN
+        self.cached_price_per_m = cached_price_per_m
+        self.input_price_per_m = input_price_per_m
+        self.base_latency_ms = base_latency_ms
+        self.uncached_ms_per_token = uncached_ms_per_token
+        self.cached_ms_per_token = cached_ms_per_token
+        self.sleep = sleep
+        self._blocks: set = set()
+        self.calls: List[dict] = []
+
+    @staticmethod
+    def render(messages: List[dict]) -> str:
+        return "".join(f"<{m.get('role', '')}>{m.get('content', '')}\n" for m in messages)
+
+    def _cached_chars(self, prompt: str) -> int:
+        digest = hashlib.sha256()
+        cached = 0
+        hit = True
+        for start in range(0, len(prompt) - len(prompt) % self.block_chars, self.block_chars):
+            digest.update(prompt[start:start + self.block_chars].encode("utf-8"))
+            block = digest.hexdigest()
+            if hit and block in self._blocks:
+                cached += self.block_chars
+            else:
+                hit = False
+                self._blocks.add(block)
+        return cached
+
+    async def __call__(self, messages: List[dict], max_tokens: int = 60, temperature: float = 0.7) -> dict:
+        prompt = self.render(messages)
+        tokens_in = len(prompt) // _CHARS_PER_TOKEN
+        cached_tokens = self._cached_chars(prompt) // _CHARS_PER_TOKEN
+        uncached_tokens = tokens_in - cached_tokens
+        latency_ms = (
+            self.base_latency_ms
+            + uncached_tokens * self.uncached_ms_per_token
+            + cached_tokens * self.cached_ms_per_token
+        )
+        if self.sleep:
+            await asyncio.sleep(latency_ms / 1000)
+        cost_usd = (
+            cached_tokens * self.cached_price_per_m + uncached_tokens * self.input_price_per_m
+        ) / 1_000_000
+        record_prompt_usage(self.provider, tokens_in, cached_tokens)
+        result = {
+            "content": "ok",
+            "model": "fake-prefix-cache",
+            "provider": self.provider,
+            "latency_ms": int(latency_ms),
+            "tokens_in": tokens_in,
+            "tokens_out": min(max_tokens, 5),
+            "cached_tokens": cached_tokens,
+            "cost_usd": cost_usd,
+            "finish_reason": "stop",
+        }
+        self.calls.append(result)
+        return result
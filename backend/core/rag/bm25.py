@@ -8,6 +8,7 @@ BM25 (Best Match 25) is a ranking function used by search engines
 to rank documents based on term frequency and document length.
 """
 
+import heapq
 import math
 import re
 import logging
@@ -92,6 +93,11 @@ class BM25Retriever:
     """
     BM25-based document retriever for lexical search.
 
+    Backed by an inverted index: each term maps to a posting list of
+    {doc_id: term_frequency}, so a query only scores documents that share
+    at least one term with it. Corpus statistics (total length, document
+    frequencies) are maintained incrementally, making add/remove O(|doc|).
+
     Parameters:
         k1: Term frequency saturation parameter (default: 1.5)
         b: Document length normalization parameter (default: 0.75)
@@ -105,7 +111,12 @@ class BM25Retriever:
         self.avg_doc_length: float = 0.0
         self.term_doc_freq: Dict[str, int] = {}  # How many docs contain each term
         self.doc_term_freq: Dict[str, Counter] = {}  # Term frequencies per doc
+        self.postings: Dict[str, Dict[str, int]] = {}  # term -> {doc_id: tf}
         self.corpus_size: int = 0
+        self._total_length: int = 0
+        # IDF depends on corpus_size, so the cache is dropped on every mutation
+        # and refilled lazily by the terms that queries actually touch.
+        self._idf_cache: Dict[str, float] = {}
 
     def _tokenize(self, text: str) -> List[str]:
         """
@@ -128,32 +139,42 @@ class BM25Retriever:
 
         return tokens
 
+    def _update_corpus_stats(self):
+        """Refresh corpus size / average length from the running totals (O(1))."""
+        self.corpus_size = len(self.documents)
+        self.avg_doc_length = self._total_length / self.corpus_size if self.corpus_size > 0 else 0
+        self._idf_cache.clear()
+
     def add_document(self, doc_id: str, text: str, metadata: Dict[str, Any] = None):
         """
         Add a document to the index.
 
+        Re-adding an existing doc_id replaces the previous version.
+
         Args:
             doc_id: Unique document identifier
             text: Document text content
             metadata: Optional metadata
         """
+        if doc_id in self.documents:
+            self._unindex(doc_id)
+
         doc = BM25Document(doc_id=doc_id, text=text, metadata=metadata)
         tokens = self._tokenize(text)
+        term_freqs = Counter(tokens)
 
         # Store document
         self.documents[doc_id] = doc
         self.doc_lengths[doc_id] = len(tokens)
-        self.doc_term_freq[doc_id] = Counter(tokens)
+        self.doc_term_freq[doc_id] = term_freqs
+        self._total_length += len(tokens)
 
-        # Update term document frequencies
-        unique_terms = set(tokens)
-        for term in unique_terms:
+        # Update postings and term document frequencies
+        for term, tf in term_freqs.items():
+            self.postings.setdefault(term, {})[doc_id] = tf
             self.term_doc_freq[term] = self.term_doc_freq.get(term, 0) + 1
 
-        # Update corpus stats
-        self.corpus_size = len(self.documents)
-        total_length = sum(self.doc_lengths.values())
-        self.avg_doc_length = total_length / self.corpus_size if self.corpus_size > 0 else 0
+        self._update_corpus_stats()
 
         logger.debug(f"Added document {doc_id} with {len(tokens)} tokens")
 
@@ -181,6 +202,10 @@ class BM25Retriever:
         Returns:
             IDF score
         """
+        cached = self._idf_cache.get(term)
+        if cached is not None:
+            return cached
+
         n = self.corpus_size
         df = self.term_doc_freq.get(term, 0)
 
@@ -188,7 +213,9 @@ class BM25Retriever:
             return 0.0
 
         # Standard IDF formula with smoothing
-        return math.log((n - df + 0.5) / (df + 0.5) + 1)
+        idf = math.log((n - df + 0.5) / (df + 0.5) + 1)
+        self._idf_cache[term] = idf
+        return idf
 
     def _score_document(self, doc_id: str, query_terms: List[str]) -> float:
         """
@@ -223,6 +250,16 @@ class BM25Retriever:
 
         return score
 
+    def _matches_filter(self, doc_id: str, filter_metadata: Dict[str, Any]) -> bool:
+        """Check a document against a metadata filter (docs without metadata pass)."""
+        doc = self.documents[doc_id]
+        if not doc.metadata:
+            return True
+        for key, value in filter_metadata.items():
+            if doc.metadata.get(key) != value:
+                return False
+        return True
+
     def search(
         self,
         query: str,
@@ -233,6 +270,9 @@ class BM25Retriever:
         """
         Search for documents matching the query.
 
+        Only documents present in the posting list of at least one query term
+        are scored; the top_k are selected with a bounded heap.
+
         Args:
             query: Search query
             top_k: Maximum number of results
@@ -251,32 +291,32 @@ class BM25Retriever:
             logger.debug("No valid query terms after tokenization")
             return []
 
-        # Score all documents
-        scores: List[Tuple[str, float]] = []
-
-        for doc_id in self.documents:
-            # Apply metadata filter if specified
-            if filter_metadata:
-                doc = self.documents[doc_id]
-                if doc.metadata:
-                    skip = False
-                    for key, value in filter_metadata.items():
-                        if doc.metadata.get(key) != value:
-                            skip = True
-                            break
-                    if skip:
-                        continue
-
-            score = self._score_document(doc_id, query_terms)
-            if score > min_score:
-                scores.append((doc_id, score))
-
-        # Sort by score descending
-        scores.sort(key=lambda x: x[1], reverse=True)
+        # Accumulate scores term-at-a-time over the posting lists.
+        # Repeated query terms contribute once per occurrence, as before.
+        scores: Dict[str, float] = {}
+        k1 = self.k1
+        length_norm = self.k1 * self.b / self.avg_doc_length if self.avg_doc_length else 0.0
+        length_base = self.k1 * (1 - self.b)
+
+        for term, query_tf in Counter(query_terms).items():
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+            weight = self._idf(term) * query_tf
+            for doc_id, tf in posting.items():
+                denominator = tf + length_base + length_norm * self.doc_lengths[doc_id]
+                scores[doc_id] = scores.get(doc_id, 0.0) + weight * (tf * (k1 + 1) / denominator)
+
+        candidates = (
+            (doc_id, score) for doc_id, score in scores.items()
+            if score > min_score
+            and (not filter_metadata or self._matches_filter(doc_id, filter_metadata))
+        )
+        top: List[Tuple[str, float]] = heapq.nlargest(top_k, candidates, key=lambda x: x[1])
 
         # Build results
         results = []
-        for doc_id, score in scores[:top_k]:
+        for doc_id, score in top:
             doc = self.documents[doc_id]
             results.append(BM25Result(
                 doc_id=doc_id,
@@ -288,6 +328,23 @@ class BM25Retriever:
         logger.info(f"BM25 search: query='{query[:50]}...', results={len(results)}")
         return results
 
+    def _unindex(self, doc_id: str):
+        """Drop a document's postings and length from the corpus totals."""
+        term_freqs = self.doc_term_freq.pop(doc_id, Counter())
+        for term in term_freqs:
+            posting = self.postings.get(term)
+            if posting is not None:
+                posting.pop(doc_id, None)
+                if not posting:
+                    del self.postings[term]
+            if term in self.term_doc_freq:
+                self.term_doc_freq[term] -= 1
+                if self.term_doc_freq[term] <= 0:
+                    del self.term_doc_freq[term]
+
+        self._total_length -= self.doc_lengths.pop(doc_id, 0)
+        del self.documents[doc_id]
+
     def remove_document(self, doc_id: str) -> bool:
         """
         Remove a document from the index.
@@ -301,25 +358,8 @@ class BM25Retriever:
         if doc_id not in self.documents:
             return False
 
-        # Get terms to update frequencies
-        term_freqs = self.doc_term_freq.get(doc_id, Counter())
-        for term in term_freqs:
-            if term in self.term_doc_freq:
-                self.term_doc_freq[term] -= 1
-                if self.term_doc_freq[term] <= 0:
-                    del self.term_doc_freq[term]
-
-        # Remove document
-        del self.documents[doc_id]
-        del self.doc_lengths[doc_id]
-        del self.doc_term_freq[doc_id]
-
-        # Update corpus stats
-        self.corpus_size = len(self.documents)
-        if self.corpus_size > 0:
-            self.avg_doc_length = sum(self.doc_lengths.values()) / self.corpus_size
-        else:
-            self.avg_doc_length = 0
+        self._unindex(doc_id)
+        self._update_corpus_stats()
 
         return True
 
@@ -329,6 +369,9 @@ class BM25Retriever:
         self.doc_lengths.clear()
         self.term_doc_freq.clear()
         self.doc_term_freq.clear()
+        self.postings.clear()
+        self._idf_cache.clear()
+        self._total_length = 0
         self.corpus_size = 0
         self.avg_doc_length = 0
 
@@ -338,6 +381,7 @@ class BM25Retriever:
             "corpus_size": self.corpus_size,
             "avg_doc_length": self.avg_doc_length,
             "vocabulary_size": len(self.term_doc_freq),
+            "postings": sum(len(p) for p in self.postings.values()),
             "k1": self.k1,
             "b": self.b
         }
@@ -346,7 +390,7 @@ class BM25Retriever:
 # BUG-RAG-05 fix: Use BoundedTTLCache instead of unbounded dict.
 # Each retriever holds full corpus in memory — limit to 50 creators with 1h TTL.
 from core.cache import BoundedTTLCache
-_retrievers: BoundedTTLCache = BoundedTTLCache(max_size=50, ttl_seconds=3600)
+_retrievers: BoundedTTLCache = BoundedTTLCache(max_size=50, ttl_seconds=3600, name="bm25_retrievers")
 
 
 def get_bm25_retriever(creator_id: str = "default") -> BM25Retriever:
@@ -22,7 +22,7 @@ logger = logging.getLogger(__name__)
 # RAG results cache: avoid repeating full search pipeline for same query
 # Bounded to prevent memory leaks
 from core.cache import BoundedTTLCache
-_rag_cache = BoundedTTLCache(max_size=200, ttl_seconds=300)
+_rag_cache = BoundedTTLCache(max_size=200, ttl_seconds=300, name="rag")
 RAG_CACHE_TTL = 300  # 5 minutes
 
 # =============================================================================
@@ -41,6 +41,11 @@ ENABLE_BM25_HYBRID = os.getenv("ENABLE_BM25_HYBRID", "true").lower() == "true"
 HYBRID_SEMANTIC_WEIGHT = float(os.getenv("HYBRID_SEMANTIC_WEIGHT", "0.7"))
 HYBRID_BM25_WEIGHT = float(os.getenv("HYBRID_BM25_WEIGHT", "0.3"))
 
+# In-process vector index: answer semantic top-k with a NumPy matmul instead of
+# a pgvector round-trip for creators under VECTOR_INDEX_MAX_CHUNKS chunks.
+# Default: FALSE — hydrated in load_from_db when enabled (see core/rag/vector_index.py)
+ENABLE_VECTOR_INDEX = os.getenv("ENABLE_VECTOR_INDEX", "false").lower() == "true"
+
 
 @dataclass
 class Document:
@@ -115,6 +120,15 @@ class SemanticRAG:
                 if embedding:
                     store_embedding(doc_id, creator_id, text, embedding)
                     logger.debug(f"Stored embedding for {doc_id}")
+                    if ENABLE_VECTOR_INDEX:
+                        from core.rag.vector_index import get_vector_index_registry
+
+                        get_vector_index_registry().upsert(creator_id, doc_id, embedding, {
+                            "content": text,
+                            "source_url": metadata.get("source_url"),
+                            "title": metadata.get("title"),
+                            "source_type": metadata.get("type"),
+                        })
             except Exception as e:
                 logger.error(f"Error storing embedding: {e}")
 
@@ -226,11 +240,20 @@ class SemanticRAG:
 
                 query_embedding = generate_embedding(query)
                 if query_embedding:
-                    results = search_similar(
-                        query_embedding=query_embedding,
-                        creator_id=creator_id,
-                        top_k=top_k
-                    )
+                    results = None
+                    if ENABLE_VECTOR_INDEX:
+                        from core.embeddings import DEFAULT_MIN_SIMILARITY
+                        from core.rag.vector_index import get_vector_index_registry
+
+                        results = get_vector_index_registry().search(
+                            creator_id, query_embedding, top_k, DEFAULT_MIN_SIMILARITY
+                        )
+                    if results is None:
+                        results = search_similar(
+                            query_embedding=query_embedding,
+                            creator_id=creator_id,
+                            top_k=top_k
+                        )
 
                     if results:
                         logger.info(f"Semantic search: '{query[:30]}...' -> {len(results)} results")
@@ -439,6 +462,11 @@ class SemanticRAG:
         if doc_id in self._doc_list:
             self._doc_list.remove(doc_id)
 
+        if ENABLE_VECTOR_INDEX:
+            from core.rag.vector_index import get_vector_index_registry
+
+            get_vector_index_registry().remove(doc_id)
+
         # Also delete from embeddings table
         try:
             from api.database import SessionLocal
@@ -464,6 +492,22 @@ class SemanticRAG:
         """Count documents in memory."""
         return len(self._documents)
 
+    def _hydrate_vector_indexes(self, creator_id: str = None) -> None:
+        """Build in-memory vector indexes for one creator, or every loaded creator."""
+        from core.rag.vector_index import get_vector_index_registry
+
+        registry = get_vector_index_registry()
+        if creator_id:
+            creator_ids = {creator_id}
+        else:
+            creator_ids = {
+                doc.metadata.get("creator_id")
+                for doc in self._documents.values()
+                if doc.metadata and doc.metadata.get("creator_id")
+            }
+        for cid in sorted(creator_ids):
+            registry.hydrate(cid)
+
     def load_from_db(self, creator_id: str = None) -> int:
         """
         Load documents from PostgreSQL content_chunks table.
@@ -514,6 +558,10 @@ class SemanticRAG:
                 if ENABLE_BM25_HYBRID and loaded > 0:
                     self._prebuild_bm25_indexes()
 
+                # Hydrate in-memory vector indexes alongside the documents
+                if ENABLE_VECTOR_INDEX:
+                    self._hydrate_vector_indexes(creator_id)
+
                 return loaded
 
             finally:
@@ -0,0 +1,273 @@
+"""
+In-process vector index per creator (pgvector fallback).
+
+SemanticRAG._semantic_search used to call core.embeddings.search_similar on
+every query: serialize the 1536-float query as a text literal, round-trip to
+Neon, cosine-scan content_embeddings. Most creators have a few thousand
+chunks, which fit comfortably in memory, so the scan can be a single matmul.
+
+- One L2-normalised float32/float16 matrix per creator, hydrated from
+  content_embeddings JOIN content_chunks (same rows search_similar sees).
+- Cosine similarity = dot product of normalised vectors, i.e. the same
+  ``1 - (a <=> b)`` pgvector computes; results match within float tolerance.
+- add_document / delete_document keep the index in sync incrementally.
+- Creators above VECTOR_INDEX_MAX_CHUNKS are not indexed and keep using pgvector.
+
+Enabled with ENABLE_VECTOR_INDEX (core/rag/semantic.py, default: false).
+
+Env vars:
+  VECTOR_INDEX_MAX_CHUNKS   — max chunks per creator to hold in memory (default: 5000)
+  VECTOR_INDEX_DTYPE        — float32 | float16 (default: float32; float16 halves memory)
+"""
+
+import json
+import logging
+import os
+import threading
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+VECTOR_INDEX_MAX_CHUNKS = int(os.getenv("VECTOR_INDEX_MAX_CHUNKS", "5000"))
+VECTOR_INDEX_DTYPE = np.float16 if os.getenv("VECTOR_INDEX_DTYPE", "float32") == "float16" else np.float32
+
+_INITIAL_CAPACITY = 64
+
+
+def _normalize(vec: Sequence[float]) -> Optional[np.ndarray]:
+    arr = np.asarray(vec, dtype=np.float32)
+    norm = float(np.linalg.norm(arr))
+    if arr.ndim != 1 or norm == 0.0 or not np.isfinite(norm):
+        return None
+    return arr / norm
+
+
+class CreatorVectorIndex:
+    """Normalised embedding matrix for one creator with row-level upsert/remove."""
+
+    def __init__(self, dim: int, dtype=VECTOR_INDEX_DTYPE):
+        self.dim = dim
+        self.dtype = dtype
+        self._matrix = np.zeros((_INITIAL_CAPACITY, dim), dtype=dtype)
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._meta: List[Dict] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, chunk_id: str) -> bool:
+        return chunk_id in self._rows
+
+    def upsert(self, chunk_id: str, embedding: Sequence[float], meta: Dict) -> bool:
+        """Insert or replace one vector. Returns False for an invalid embedding."""
+        vec = _normalize(embedding)
+        if vec is None or vec.shape[0] != self.dim:
+            return False
+        with self._lock:
+            row = self._rows.get(chunk_id)
+            if row is None:
+                row = len(self._ids)
+                if row == self._matrix.shape[0]:
+                    grown = np.zeros((row * 2, self.dim), dtype=self.dtype)
+                    grown[:row] = self._matrix
+                    self._matrix = grown
+                self._ids.append(chunk_id)
+                self._meta.append(meta)
+                self._rows[chunk_id] = row
+            else:
+                self._meta[row] = meta
+            self._matrix[row] = vec
+        return True
+
+    def remove(self, chunk_id: str) -> bool:
+        """Remove one vector by moving the last row into its slot."""
+        with self._lock:
+            row = self._rows.pop(chunk_id, None)
+            if row is None:
+                return False
+            last = len(self._ids) - 1
+            if row != last:
+                self._matrix[row] = self._matrix[last]
+                self._ids[row] = self._ids[last]
+                self._meta[row] = self._meta[last]
+                self._rows[self._ids[row]] = row
+            self._ids.pop()
+            self._meta.pop()
+        return True
+
+    def search(self, query_embedding: Sequence[float], top_k: int, min_similarity: float) -> List[dict]:
+        """Top-k by cosine similarity, same shape as core.embeddings.search_similar."""
+        query = _normalize(query_embedding)
+        if query is None or query.shape[0] != self.dim or top_k <= 0:
+            return []
+        with self._lock:
+            n = len(self._ids)
+            if n == 0:
+                return []
+            scores = self._matrix[:n].astype(np.float32, copy=False) @ query
+            k = min(top_k, n)
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind="stable")]
+            hits = [
+                (self._ids[i], self._meta[i], float(scores[i]))
+                for i in top
+                if scores[i] >= min_similarity
+            ]
+        return [
+            {
+                "chunk_id": chunk_id,
+                "content": meta.get("content", ""),
+                "source_url": meta.get("source_url"),
+                "title": meta.get("title"),
+                "source_type": meta.get("source_type"),
+                "similarity": score,
+            }
+            for chunk_id, meta, score in hits
+        ]
+
+
+class VectorIndexRegistry:
+    """Per-creator in-memory indexes. Creators without an index use pgvector."""
+
+    def __init__(self, max_chunks: int = VECTOR_INDEX_MAX_CHUNKS):
+        self.max_chunks = max_chunks
+        self._indexes: Dict[str, CreatorVectorIndex] = {}
+        self._too_large: set = set()
+
+    def get(self, creator_id: str) -> Optional[CreatorVectorIndex]:
+        return self._indexes.get(creator_id)
+
+    def build(self, creator_id: str, rows: Sequence[dict]) -> Optional[CreatorVectorIndex]:
+        """Build an index from rows of {chunk_id, embedding, content, source_url, title, source_type}."""
+        if len(rows) > self.max_chunks:
+            self._indexes.pop(creator_id, None)
+            self._too_large.add(creator_id)
+            logger.info(
+                "[VECTOR-INDEX] %s has >%d chunks, staying on pgvector", creator_id, self.max_chunks
+            )
+            return None
+        self._too_large.discard(creator_id)
+        index = None
+        for row in rows:
+            embedding = row["embedding"]
+            if index is None:
+                index = CreatorVectorIndex(dim=len(embedding))
+            index.upsert(row["chunk_id"], embedding, {
+                "content": row.get("content", ""),
+                "source_url": row.get("source_url"),
+                "title": row.get("title"),
+                "source_type": row.get("source_type"),
+            })
+        if index is None:
+            self._indexes.pop(creator_id, None)
+            return None
+        self._indexes[creator_id] = index
+        return index
+
+    def hydrate(self, creator_id: str) -> int:
+        """Load a creator's embeddings from pgvector. Returns indexed chunk count."""
+        try:
+            rows = _fetch_creator_embeddings(creator_id, self.max_chunks + 1)
+        except Exception as e:
+            logger.error(f"[VECTOR-INDEX] hydrate failed for {creator_id}: {e}")
+            return 0
+        index = self.build(creator_id, rows)
+        count = len(index) if index is not None else 0
+        if index is not None:
+            logger.info(
+                f"[VECTOR-INDEX] {creator_id}: {count} chunks in memory "
+                f"({index.dtype.__name__}, dim={index.dim})"
+            )
+        return count
+
+    def upsert(self, creator_id: str, chunk_id: str, embedding: Sequence[float], meta: Dict) -> None:
+        index = self._indexes.get(creator_id)
+        if index is None:
+            return
+        if chunk_id not in index and len(index) >= self.max_chunks:
+            # Crossed the size cap — drop back to pgvector for this creator
+            self._indexes.pop(creator_id, None)
+            self._too_large.add(creator_id)
+            return
+        index.upsert(chunk_id, embedding, meta)
+
+    def remove(self, chunk_id: str) -> None:
+        for index in list(self._indexes.values()):
+            if index.remove(chunk_id):
+                return
+
+    def search(
+        self, creator_id: str, query_embedding: Sequence[float], top_k: int, min_similarity: float
+    ) -> Optional[List[dict]]:
+        """Search a creator's index; None means "not indexed, use pgvector"."""
+        index = self._indexes.get(creator_id)
+        if index is None:
+            return None
+        return index.search(query_embedding, top_k, min_similarity)
+
+    def clear(self) -> None:
+        self._indexes.clear()
+        self._too_large.clear()
+
+    def stats(self) -> Dict:
+        return {
+            "creators_indexed": len(self._indexes),
+            "creators_on_pgvector": len(self._too_large),
+            "chunks": {cid: len(ix) for cid, ix in self._indexes.items()},
+            "bytes": sum(ix._matrix.nbytes for ix in self._indexes.values()),
+        }
+
+
+def _fetch_creator_embeddings(creator_id: str, limit: int) -> List[dict]:
+    """Read embeddings + chunk fields for one creator (same JOIN as search_similar)."""
+    from api.database import SessionLocal
+    from sqlalchemy import text
+
+    if SessionLocal is None:
+        return []
+
+    db = SessionLocal()
+    try:
+        result = db.execute(
+            text(
+                """
+            SELECT
+                e.chunk_id,
+                CAST(e.embedding AS text) AS embedding,
+                c.content,
+                c.source_url,
+                c.title,
+                c.source_type
+            FROM content_embeddings e
+            JOIN content_chunks c ON e.chunk_id = c.chunk_id
+            WHERE e.creator_id = :creator_id
+            LIMIT :limit
+        """
+            ),
+            {"creator_id": creator_id, "limit": limit},
+        )
+        return [
+            {
+                "chunk_id": row.chunk_id,
+                "embedding": json.loads(row.embedding),
+                "content": row.content,
+                "source_url": row.source_url,
+                "title": row.title,
+                "source_type": row.source_type,
+            }
+            for row in result
+        ]
+    finally:
+        db.close()
+
+
+_registry = VectorIndexRegistry()
+
+
+def get_vector_index_registry() -> VectorIndexRegistry:
+    """Get the process-wide vector index registry."""
+    return _registry
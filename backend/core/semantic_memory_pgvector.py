@@ -39,6 +39,28 @@ ENABLE_SEMANTIC_MEMORY_PGVECTOR = (
 # Minimum message length to store (avoid storing greetings like "hola", "ok")
 MIN_MESSAGE_LENGTH = 20
 
+# Search using cosine similarity with temporal decay boost (O5, Memobase).
+# score = cosine_similarity * recency_boost
+# recency_boost = 1.0 for messages from today, decays to 0.7 over 90 days.
+# This prevents stale old messages from dominating when similarity is equal.
+# Shared with the async hot path (services/dm_context_repository.py).
+SEARCH_SQL = """
+    SELECT
+        content,
+        message_role,
+        msg_metadata,
+        created_at,
+        (1 - (embedding <=> CAST(:query AS vector)))
+          * (0.7 + 0.3 * GREATEST(0, 1.0 - EXTRACT(EPOCH FROM (NOW() - created_at)) / (90 * 86400)))
+          as similarity
+    FROM conversation_embeddings
+    WHERE creator_id = :creator_id
+      AND follower_id = :follower_id
+      AND 1 - (embedding <=> CAST(:query AS vector)) >= :min_sim
+    ORDER BY similarity DESC
+    LIMIT :k
+"""
+
 # Default similarity threshold for search
 DEFAULT_MIN_SIMILARITY = 0.70
 
@@ -235,29 +257,8 @@ class SemanticMemoryPgvector:
             embedding_str = "[" + ",".join(str(x) for x in query_embedding) + "]"
 
             with get_db_session() as db:
-                # Search using cosine similarity with temporal decay boost (O5, Memobase).
-                # score = cosine_similarity * recency_boost
-                # recency_boost = 1.0 for messages from today, decays to 0.7 over 90 days.
-                # This prevents stale old messages from dominating when similarity is equal.
                 results = db.execute(
-                    text(
-                        """
-                    SELECT
-                        content,
-                        message_role,
-                        msg_metadata,
-                        created_at,
-                        (1 - (embedding <=> CAST(:query AS vector)))
-                          * (0.7 + 0.3 * GREATEST(0, 1.0 - EXTRACT(EPOCH FROM (NOW() - created_at)) / (90 * 86400)))
-                          as similarity
-                    FROM conversation_embeddings
-                    WHERE creator_id = :creator_id
-                      AND follower_id = :follower_id
-                      AND 1 - (embedding <=> CAST(:query AS vector)) >= :min_sim
-                    ORDER BY similarity DESC
-                    LIMIT :k
-                """
-                    ),
+                    text(SEARCH_SQL),
                     {
                         "query": embedding_str,
                         "creator_id": self.creator_id,
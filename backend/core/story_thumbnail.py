@@ -3,36 +3,41 @@ Story Thumbnail Service
 Downloads and saves Instagram story thumbnails before they expire.
 
 Instagram CDN URLs expire after ~24 hours, so we must save immediately.
+Thumbnails go to the content-addressed media store (services/media_store.py)
+and msg_metadata only keeps the returned URL. Without a durable store, or if
+the upload fails, the thumbnail is kept inline as a base64 data URL.
 """
 
-import logging
+import asyncio
 import base64
+import logging
 import httpx
 from typing import Optional
 
 logger = logging.getLogger(__name__)
 
-# Max size for base64 storage (500KB after encoding)
+# Max thumbnail size accepted from the CDN (500KB)
 MAX_THUMBNAIL_SIZE = 500 * 1024
 
 
 async def download_story_thumbnail(cdn_url: str, timeout: float = 10.0) -> Optional[str]:
     """
-    Download a story thumbnail from Instagram CDN and convert to base64.
+    Download a story thumbnail from Instagram CDN and save it to the media store.
 
     Args:
         cdn_url: Instagram CDN URL (expires after ~24h)
         timeout: Request timeout in seconds
 
     Returns:
-        Base64 data URL (data:image/jpeg;base64,...) or None if failed
+        Permanent media store URL, a base64 data URL when it cannot be
+        stored, or None if failed
     """
     if not cdn_url:
         return None
 
-    # Skip if already a data URL
+    # Legacy data URL: move it to the store instead of downloading
     if cdn_url.startswith("data:"):
-        return cdn_url
+        return await _store_data_url(cdn_url) or cdn_url
 
     try:
         headers = {
@@ -60,12 +65,7 @@ async def download_story_thumbnail(cdn_url: str, timeout: float = 10.0) -> Optio
             if ";" in content_type:
                 content_type = content_type.split(";")[0].strip()
 
-            # Convert to base64
-            b64_content = base64.b64encode(content).decode("utf-8")
-            data_url = f"data:{content_type};base64,{b64_content}"
-
-            logger.info(f"Saved story thumbnail: {len(content)} bytes -> base64")
-            return data_url
+            return await _store_content(content, content_type)
 
     except httpx.TimeoutException:
         logger.warning(f"Story thumbnail download timeout: {cdn_url[:50]}...")
@@ -75,6 +75,36 @@ async def download_story_thumbnail(cdn_url: str, timeout: float = 10.0) -> Optio
         return None
 
 
+async def _store_content(content: bytes, content_type: str) -> str:
+    from services.media_store import get_media_store
+
+    store = get_media_store()
+    if store.durable:
+        try:
+            stored = await asyncio.to_thread(store.put, content, content_type)
+            logger.info(f"Saved story thumbnail: {len(content)} bytes -> {stored.sha256[:12]}")
+            return stored.url
+        except Exception as e:
+            logger.warning(f"Story thumbnail store error, keeping it inline: {e}")
+    b64_content = base64.b64encode(content).decode("utf-8")
+    logger.info(f"Saved story thumbnail: {len(content)} bytes -> base64")
+    return f"data:{content_type};base64,{b64_content}"
+
+
+async def _store_data_url(data_url: str) -> Optional[str]:
+    try:
+        from services.media_store import get_media_store
+
+        store = get_media_store()
+        if not store.durable:
+            return None
+        stored = await asyncio.to_thread(store.put_data_url, data_url)
+        return stored.url if stored else None
+    except Exception as e:
+        logger.warning(f"Story thumbnail store error: {e}")
+        return None
+
+
 def is_story_url_expired(url: str) -> bool:
     """
     Check if an Instagram CDN URL has likely expired.
@@ -101,18 +131,25 @@ async def ensure_story_thumbnail(cdn_url: str, existing_thumbnail: Optional[str]
     """
     Ensure we have a permanent thumbnail for a story.
 
-    If existing_thumbnail is already a data URL, returns it.
-    Otherwise downloads and converts the CDN URL.
+    If existing_thumbnail is a media store URL, returns it; a legacy data URL
+    is moved to the store first. Otherwise downloads the CDN URL.
 
     Args:
         cdn_url: Original Instagram CDN URL
         existing_thumbnail: Previously saved thumbnail (if any)
 
     Returns:
-        Permanent thumbnail (data URL) or None
+        Permanent thumbnail URL or None
     """
+    from services.media_store import MEDIA_PUBLIC_BASE_URL
+
     # Already have a permanent thumbnail
     if existing_thumbnail and existing_thumbnail.startswith("data:"):
+        return await _store_data_url(existing_thumbnail) or existing_thumbnail
+    if existing_thumbnail and (
+        existing_thumbnail.startswith(f"{MEDIA_PUBLIC_BASE_URL}/media/")
+        or "res.cloudinary.com" in existing_thumbnail
+    ):
         return existing_thumbnail
 
     # Try to download and save
@@ -1,12 +1,44 @@
-"""Centralized background task scheduler with health monitoring."""
+"""Centralized background task scheduler with health monitoring.
+
+Jobs are cluster-scoped by default: with a shared lease backend
+(SCHEDULER_LEASE_BACKEND=postgres, see core/job_leases.py) each run
+happens on exactly one node, whichever takes the lease first. Jobs about
+the process itself (keep-alive pings, cache eviction, the health watchdog)
+register with scope="process" and run in every process.
+
+SCHEDULER_ROLE splits the work between processes:
+  all    — cluster and process jobs (default)
+  web    — process jobs only; HTTP processes leave cluster jobs to workers
+  worker — cluster and process jobs, no HTTP traffic (python -m api.worker)
+
+Env vars:
+  SCHEDULER_ROLE     — all | web | worker (default: all)
+  SCHEDULER_JITTER_S — max random delay added to each lease attempt (default: 15;
+                       never more than a tenth of the job's interval)
+"""
 import asyncio
 import logging
+import os
+import random
+import time
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Callable, Dict, Optional
 
+from core.job_leases import SCHEDULER_LEASE_TTL_S, LeaseState, lease_backend_from_env, node_id
+from core.observability.metrics import emit_metric
+
 logger = logging.getLogger(__name__)
 
+SCHEDULER_ROLE = os.getenv("SCHEDULER_ROLE", "all").lower()
+SCHEDULER_JITTER_S = float(os.getenv("SCHEDULER_JITTER_S", "15"))
+
+CLUSTER = "cluster"
+PROCESS = "process"
+
+# Retry delay after a lease backend error (capped by the job's own interval)
+_LEASE_ERROR_RETRY_S = 60
+
 
 @dataclass
 class ScheduledTask:
@@ -14,20 +46,29 @@ class ScheduledTask:
     func: Callable
     interval_seconds: int
     initial_delay_seconds: int = 0
+    scope: str = CLUSTER
     last_run: Optional[datetime] = None
     last_error: Optional[str] = None
     run_count: int = 0
     error_count: int = 0
     is_running: bool = False
+    last_duration_ms: Optional[float] = None
+    max_duration_ms: Optional[float] = None
+    skipped_not_leader: int = 0
+    lease: Optional[LeaseState] = field(default=None, repr=False)
     _task: Optional[asyncio.Task] = field(default=None, repr=False)
 
 
 class TaskScheduler:
     """Manages background tasks with health tracking and graceful shutdown."""
 
-    def __init__(self):
+    def __init__(self, lease_backend=None, role: str = SCHEDULER_ROLE, owner: Optional[str] = None):
         self._tasks: Dict[str, ScheduledTask] = {}
         self._shutdown_event = asyncio.Event()
+        self.leases = lease_backend if lease_backend is not None else lease_backend_from_env()
+        self.role = role
+        self.owner = owner or node_id()
+        self.lease_ttl_s = SCHEDULER_LEASE_TTL_S
 
     def register(
         self,
@@ -35,23 +76,33 @@ class TaskScheduler:
         func: Callable,
         interval_seconds: int,
         initial_delay_seconds: int = 0,
+        scope: str = CLUSTER,
     ) -> None:
-        """Register a task to run on a schedule."""
+        """Register a task to run on a schedule (once per cluster, or per process)."""
         self._tasks[name] = ScheduledTask(
             name=name,
             func=func,
             interval_seconds=interval_seconds,
             initial_delay_seconds=initial_delay_seconds,
+            scope=scope,
         )
 
+    def _runs_here(self, task_info: ScheduledTask) -> bool:
+        return task_info.scope == PROCESS or self.role != "web"
+
     async def start_all(self) -> None:
-        """Start all registered tasks."""
+        """Start all registered tasks this process's role runs."""
         for name, task_info in self._tasks.items():
+            if not self._runs_here(task_info):
+                logger.info(f"Skipping scheduled task: {name} (cluster job, SCHEDULER_ROLE=web)")
+                continue
             task_info._task = asyncio.create_task(
                 self._run_task_loop(task_info),
                 name=f"scheduler:{name}",
             )
-            logger.info(f"Started scheduled task: {name} (every {task_info.interval_seconds}s)")
+            logger.info(
+                f"Started scheduled task: {name} (every {task_info.interval_seconds}s, {task_info.scope})"
+            )
 
     async def shutdown(self, timeout: float = 30.0) -> None:
         """Gracefully stop all tasks."""
@@ -68,7 +119,7 @@ class TaskScheduler:
         logger.info("Task scheduler shutdown complete")
 
     def health_report(self) -> Dict:
-        """Return health status of all tasks."""
+        """Return health status of all tasks, with lease ownership for cluster jobs."""
         return {
             name: {
                 "is_running": t.is_running,
@@ -77,30 +128,107 @@ class TaskScheduler:
                 "last_run": t.last_run.isoformat() if t.last_run else None,
                 "last_error": t.last_error,
                 "interval_seconds": t.interval_seconds,
+                "scope": t.scope,
+                "runs_here": self._runs_here(t),
+                "last_duration_ms": t.last_duration_ms,
+                "max_duration_ms": t.max_duration_ms,
+                "skipped_not_leader": t.skipped_not_leader,
+                "lease": t.lease.to_dict(self.owner) if t.lease else None,
             }
             for name, t in self._tasks.items()
         }
 
+    async def _execute(self, task_info: ScheduledTask) -> Optional[str]:
+        """Run the job once; returns the error message, if any."""
+        task_info.is_running = True
+        started = time.monotonic()
+        error = None
+        try:
+            await task_info.func()
+            task_info.run_count += 1
+            task_info.last_run = datetime.now(timezone.utc)
+            task_info.last_error = None
+        except Exception as e:
+            error = str(e)
+            task_info.error_count += 1
+            task_info.last_error = error
+            logger.error(f"Task {task_info.name} error: {e}", exc_info=True)
+        finally:
+            task_info.is_running = False
+            duration_ms = round((time.monotonic() - started) * 1000, 1)
+            task_info.last_duration_ms = duration_ms
+            task_info.max_duration_ms = max(task_info.max_duration_ms or 0.0, duration_ms)
+            emit_metric("scheduler_job_duration_ms", duration_ms, job=task_info.name,
+                        outcome="error" if error else "ok")
+        return error
+
+    async def _hold_lease(self, task_info: ScheduledTask) -> None:
+        """Renew the lease every third of its TTL while the job runs."""
+        while True:
+            await asyncio.sleep(self.lease_ttl_s / 3)
+            try:
+                renewed = await asyncio.to_thread(
+                    self.leases.renew, task_info.name, self.owner, self.lease_ttl_s
+                )
+            except Exception as e:
+                logger.warning(f"[SCHEDULER] lease renew failed for {task_info.name}: {e}")
+                continue
+            if not renewed:
+                # Another node may start the job too; it keeps running here
+                logger.warning(f"[SCHEDULER] lost lease for {task_info.name} mid-run")
+                emit_metric("scheduler_lease_total", job=task_info.name, outcome="lost")
+                return
+
+    async def _run_leased(self, task_info: ScheduledTask) -> float:
+        """Run a cluster job if this node wins its lease. Returns seconds until the next attempt."""
+        name, interval = task_info.name, task_info.interval_seconds
+        try:
+            state = await asyncio.to_thread(
+                self.leases.try_acquire, name, self.owner, interval, self.lease_ttl_s
+            )
+        except Exception as e:
+            logger.warning(f"[SCHEDULER] lease backend error for {name}, retrying: {e}")
+            emit_metric("scheduler_lease_total", job=name, outcome="error")
+            return min(interval, _LEASE_ERROR_RETRY_S)
+
+        task_info.lease = state
+        if not state.acquired:
+            task_info.skipped_not_leader += 1
+            outcome = "held_elsewhere" if state.lease_until and state.lease_until > state.now else "not_due"
+            emit_metric("scheduler_lease_total", job=name, outcome=outcome)
+            return max(1.0, state.seconds_until_due(interval))
+
+        emit_metric("scheduler_lease_total", job=name, outcome="acquired")
+        started = time.monotonic()
+        holder = asyncio.create_task(self._hold_lease(task_info))
+        try:
+            error = await self._execute(task_info)
+        finally:
+            holder.cancel()
+        try:
+            await asyncio.to_thread(
+                self.leases.release, name, self.owner, task_info.last_duration_ms or 0.0, error
+            )
+        except Exception as e:
+            # The lease expires on its own; the next run waits for that
+            logger.warning(f"[SCHEDULER] lease release failed for {name}: {e}")
+        return max(1.0, interval - (time.monotonic() - started))
+
+    def _jitter(self, interval_seconds: float) -> float:
+        return random.uniform(0, min(SCHEDULER_JITTER_S, interval_seconds / 10))
+
     async def _run_task_loop(self, task_info: ScheduledTask) -> None:
         """Run a single task on its schedule."""
         if task_info.initial_delay_seconds > 0:
             await self._interruptible_sleep(task_info.initial_delay_seconds)
 
         while not self._shutdown_event.is_set():
-            task_info.is_running = True
-            try:
-                await task_info.func()
-                task_info.run_count += 1
-                task_info.last_run = datetime.now(timezone.utc)
-                task_info.last_error = None
-            except Exception as e:
-                task_info.error_count += 1
-                task_info.last_error = str(e)
-                logger.error(f"Task {task_info.name} error: {e}", exc_info=True)
-            finally:
-                task_info.is_running = False
-
-            await self._interruptible_sleep(task_info.interval_seconds)
+            if task_info.scope == PROCESS:
+                await self._execute(task_info)
+                await self._interruptible_sleep(task_info.interval_seconds)
+                continue
+            delay = await self._run_leased(task_info)
+            await self._interruptible_sleep(delay + self._jitter(task_info.interval_seconds))
 
     async def _interruptible_sleep(self, seconds: float) -> None:
         """Sleep that can be interrupted by shutdown."""
@@ -315,22 +315,14 @@ def load_user_context(
 
 
 def _load_from_follower_memory(context: UserContext):
-    """Load data from FollowerMemory (JSON storage)."""
+    """Load data from FollowerMemory (shared follower store)."""
     try:
-        # BUG-UC-05 fix: Use services.memory_service.MemoryStore (not deprecated core.memory)
-        from services.memory_service import MemoryStore
-
-        store = MemoryStore()
-        # Use sync approach - MemoryStore.get is async but we need sync here
-        # Read directly from file
-        import json
-        from pathlib import Path
-
-        file_path = Path(store.storage_path) / context.creator_id / f"{context.follower_id}.json"
-        if file_path.exists():
-            with open(file_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+        # BUG-UC-05 fix: same storage as services.memory_service.MemoryStore (not deprecated core.memory)
+        from core.follower_store import get_follower_store
 
+        # Sync read - MemoryStore.get is async but we need sync here
+        data = get_follower_store().get(context.creator_id, context.follower_id)
+        if data:
             # Fill context from memory data
             context.username = data.get("username", context.username) or context.username
             context.name = data.get("name", context.name) or context.name
@@ -469,7 +461,7 @@ def _calculate_flags(context: UserContext):
 
 from core.cache import BoundedTTLCache
 _CACHE_TTL_SECONDS = 60  # 1 minute (shorter than creator data)
-_user_context_cache = BoundedTTLCache(max_size=200, ttl_seconds=_CACHE_TTL_SECONDS)
+_user_context_cache = BoundedTTLCache(max_size=200, ttl_seconds=_CACHE_TTL_SECONDS, name="user_context")
 
 
 def get_user_context(
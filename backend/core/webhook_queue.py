@@ -0,0 +1,820 @@
+"""
+Durable inbound webhook queue.
+
+The Instagram and Evolution webhook routes used to do creator lookup, media
+download, dedup and pipeline dispatch inside the request (or in a bare
+asyncio.create_task), so a restart dropped every in-flight message and
+concurrent events of one conversation raced each other. With
+WEBHOOK_QUEUE_ENABLED=true a route only validates the payload, stores it
+here and returns 200. A WebhookQueueConsumer in each process claims events
+and runs the platform handler registered for the event's source.
+
+Guarantees:
+- idempotency: (source, idempotency_key) is unique; a redelivered webhook
+  is acknowledged but not stored twice;
+- per-conversation FIFO: only the oldest unfinished event of a
+  conversation_key can be claimed, so a conversation's events are processed
+  one at a time in arrival order. A failing event is retried with backoff
+  and blocks its conversation until it succeeds or is dead-lettered after
+  WEBHOOK_QUEUE_MAX_ATTEMPTS;
+- at-least-once: a claimed event whose consumer died is claimed again once
+  its lock expires (WEBHOOK_QUEUE_LOCK_TTL_S);
+- bounded concurrency: each consumer runs at most WEBHOOK_QUEUE_CONCURRENCY
+  events; the rest wait in the queue (webhook_queue_depth, webhook_queue_lag_ms);
+- batching: a source registered with a batch window gets a conversation's
+  events as one list. The consumer holds the claimed head for the quiet
+  window, claims the events that queue up behind it, and completes or
+  retries them together (DM burst coalescing, core.dm_coalescer). A batch
+  handler that raises BatchFailed retries only the events that failed;
+- per-message completion: a handler marks each message of an event it has
+  finished (mark_queued_message_done). The marks are stored with a failed
+  event, so its retry skips messages that were already answered.
+
+Backends:
+  sqlite    — local file (default; single host). On open, events left
+              'processing' by a previous run of this process are re-queued.
+  postgres  — webhook_events table (migration 056), claimed with
+              FOR UPDATE SKIP LOCKED so several workers can consume.
+
+Env vars:
+  WEBHOOK_QUEUE_ENABLED      — route webhooks through the queue (default: false)
+  WEBHOOK_QUEUE_BACKEND      — sqlite | postgres (default: sqlite)
+  WEBHOOK_QUEUE_SQLITE_PATH  — sqlite file (default: data/webhook_queue.sqlite3)
+  WEBHOOK_QUEUE_CONSUMER     — run a consumer in this process (default: true)
+  WEBHOOK_QUEUE_CONCURRENCY  — events processed at once per consumer (default: 8)
+  WEBHOOK_QUEUE_POLL_MS      — idle poll interval in ms (default: 500)
+  WEBHOOK_QUEUE_LOCK_TTL_S   — claim lifetime before another consumer may retry (default: 300)
+  WEBHOOK_QUEUE_MAX_ATTEMPTS — attempts before an event is dead-lettered (default: 5)
+  WEBHOOK_QUEUE_RETENTION_H  — finished events kept for dedup (default: 24)
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional
+
+from core.job_leases import node_id
+from core.observability.metrics import emit_metric
+
+logger = logging.getLogger(__name__)
+
+WEBHOOK_QUEUE_ENABLED = os.getenv("WEBHOOK_QUEUE_ENABLED", "false").lower() == "true"
+WEBHOOK_QUEUE_BACKEND = os.getenv("WEBHOOK_QUEUE_BACKEND", "sqlite").lower()
+WEBHOOK_QUEUE_SQLITE_PATH = os.getenv("WEBHOOK_QUEUE_SQLITE_PATH", "data/webhook_queue.sqlite3")
+WEBHOOK_QUEUE_CONSUMER = os.getenv("WEBHOOK_QUEUE_CONSUMER", "true").lower() == "true"
+WEBHOOK_QUEUE_CONCURRENCY = int(os.getenv("WEBHOOK_QUEUE_CONCURRENCY", "8"))
+WEBHOOK_QUEUE_POLL_S = int(os.getenv("WEBHOOK_QUEUE_POLL_MS", "500")) / 1000
+WEBHOOK_QUEUE_LOCK_TTL_S = float(os.getenv("WEBHOOK_QUEUE_LOCK_TTL_S", "300"))
+WEBHOOK_QUEUE_MAX_ATTEMPTS = int(os.getenv("WEBHOOK_QUEUE_MAX_ATTEMPTS", "5"))
+WEBHOOK_QUEUE_RETENTION_H = float(os.getenv("WEBHOOK_QUEUE_RETENTION_H", "24"))
+
+# Retry backoff: 5s, 10s, 20s ... capped
+_RETRY_BASE_S = 5
+_RETRY_MAX_S = 300
+# Queue depth gauges are refreshed at most this often
+_STATS_REFRESH_S = 15
+
+
+@dataclass
+class QueuedEvent:
+    """A claimed webhook event. age_s is measured on the backend's clock at claim time."""
+
+    id: int
+    source: str
+    idempotency_key: str
+    conversation_key: str
+    payload: Dict[str, Any]
+    meta: Dict[str, Any] = field(default_factory=dict)
+    attempts: int = 1
+    age_s: float = 0.0
+
+    def message_done(self, message_id: str) -> bool:
+        """Whether an earlier attempt of this event already finished message_id."""
+        return bool(message_id) and message_id in self.meta.get("done_messages", ())
+
+    def mark_message_done(self, message_id: str) -> None:
+        """Record message_id as finished; the mark is stored if this attempt fails."""
+        done = self.meta.setdefault("done_messages", [])
+        if message_id and message_id not in done:
+            done.append(message_id)
+
+
+class BatchFailed(Exception):
+    """Raised by a batch handler when only some events failed: errors[i] is events[i]'s error or None."""
+
+    def __init__(self, errors: List[Optional[BaseException]]):
+        self.errors = errors
+        first = next(e for e in errors if e is not None)
+        super().__init__(str(first) or type(first).__name__)
+
+
+_current_event: ContextVar[Optional[QueuedEvent]] = ContextVar("webhook_queue_event", default=None)
+
+
+def current_queued_event() -> Optional[QueuedEvent]:
+    """The queue event being handled in this task, or None outside the consumer."""
+    return _current_event.get()
+
+
+@contextmanager
+def handling_event(event: QueuedEvent) -> Iterator[QueuedEvent]:
+    """Make event the current_queued_event() of the block (one event of a batch)."""
+    token = _current_event.set(event)
+    try:
+        yield event
+    finally:
+        _current_event.reset(token)
+
+
+def queued_message_done(message_id: str) -> bool:
+    """Whether the current queue event already finished message_id on an earlier attempt."""
+    event = _current_event.get()
+    return event is not None and event.message_done(message_id)
+
+
+def mark_queued_message_done(message_id: str) -> None:
+    """Mark message_id finished on the current queue event (no-op outside the consumer)."""
+    event = _current_event.get()
+    if event is not None:
+        event.mark_message_done(message_id)
+
+
+def retry_delay_s(attempts: int) -> float:
+    return min(_RETRY_BASE_S * 2 ** max(attempts - 1, 0), _RETRY_MAX_S)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# SQLite backend
+# ─────────────────────────────────────────────────────────────────────────────
+
+_SQLITE_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS webhook_events (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        source TEXT NOT NULL,
+        idempotency_key TEXT NOT NULL,
+        conversation_key TEXT NOT NULL,
+        payload TEXT NOT NULL,
+        meta TEXT,
+        status TEXT NOT NULL DEFAULT 'pending',
+        attempts INTEGER NOT NULL DEFAULT 0,
+        received_at REAL NOT NULL,
+        available_at REAL NOT NULL,
+        locked_by TEXT,
+        locked_until REAL,
+        finished_at REAL,
+        last_error TEXT,
+        UNIQUE (source, idempotency_key)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_webhook_events_open ON webhook_events (status, conversation_key, id)",
+)
+
+# Heads: the oldest pending/processing event of each conversation
+_SQLITE_CLAIMABLE = """
+    SELECT id FROM webhook_events e
+     WHERE ((e.status = 'pending' AND e.available_at <= :now)
+            OR (e.status = 'processing' AND e.locked_until < :now))
+       AND e.id = (SELECT MIN(h.id) FROM webhook_events h
+                    WHERE h.conversation_key = e.conversation_key
+                      AND h.status IN ('pending', 'processing'))
+     ORDER BY e.id
+     LIMIT :limit
+"""
+
+
+class SQLiteWebhookQueue:
+    """Queue in a local SQLite file (or ":memory:"). Blocking; call from a thread."""
+
+    def __init__(self, path: str = WEBHOOK_QUEUE_SQLITE_PATH, clock: Callable[[], float] = time.time):
+        self.path = path
+        self.clock = clock
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        for statement in _SQLITE_SCHEMA:
+            self._conn.execute(statement)
+        # Only this process consumes a local queue: whatever a previous run
+        # left mid-flight is picked up again right away.
+        requeued = self._conn.execute(
+            "UPDATE webhook_events SET status = 'pending', locked_by = NULL, locked_until = NULL"
+            " WHERE status = 'processing'"
+        ).rowcount
+        if requeued:
+            logger.warning(f"[WEBHOOK-QUEUE] re-queued {requeued} event(s) interrupted by a restart")
+
+    def enqueue(self, source: str, idempotency_key: str, conversation_key: str,
+                payload: Dict[str, Any], meta: Optional[Dict[str, Any]] = None) -> Optional[int]:
+        now = self.clock()
+        with self._lock:
+            cur = self._conn.execute(
+                "INSERT OR IGNORE INTO webhook_events"
+                " (source, idempotency_key, conversation_key, payload, meta, received_at, available_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (source, idempotency_key, conversation_key, json.dumps(payload),
+                 json.dumps(meta or {}), now, now),
+            )
+            return cur.lastrowid if cur.rowcount else None
+
+    def claim(self, owner: str, limit: int, lock_ttl_s: float) -> List[QueuedEvent]:
+        return self._claim_where(
+            owner, lock_ttl_s,
+            lambda now: [r[0] for r in self._conn.execute(_SQLITE_CLAIMABLE, {"now": now, "limit": limit})],
+        )
+
+    def claim_successors(self, owner: str, conversation_key: str, after_id: int,
+                         limit: int, lock_ttl_s: float) -> List[QueuedEvent]:
+        """Claim the claimable events queued right behind after_id in its conversation.
+
+        Stops at the first event that is not claimable yet (retry backoff), so
+        a batch never skips over an event of its conversation.
+        """
+        def _ids(now: float) -> List[int]:
+            ids = []
+            for event_id, status, available_at, locked_until in self._conn.execute(
+                "SELECT id, status, available_at, locked_until FROM webhook_events"
+                " WHERE conversation_key = ? AND id > ? AND status IN ('pending', 'processing')"
+                " ORDER BY id LIMIT ?",
+                (conversation_key, after_id, limit),
+            ):
+                if not ((status == "pending" and available_at <= now)
+                        or (status == "processing" and locked_until < now)):
+                    break
+                ids.append(event_id)
+            return ids
+
+        return self._claim_where(owner, lock_ttl_s, _ids)
+
+    def _claim_where(self, owner: str, lock_ttl_s: float,
+                     select_ids: Callable[[float], List[int]]) -> List[QueuedEvent]:
+        now = self.clock()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                ids = select_ids(now)
+                if ids:
+                    marks = ",".join("?" * len(ids))
+                    self._conn.execute(
+                        f"UPDATE webhook_events SET status = 'processing', locked_by = ?,"
+                        f" locked_until = ?, attempts = attempts + 1 WHERE id IN ({marks})",
+                        (owner, now + lock_ttl_s, *ids),
+                    )
+                    rows = self._conn.execute(
+                        "SELECT id, source, idempotency_key, conversation_key, payload, meta,"
+                        f" attempts, received_at FROM webhook_events WHERE id IN ({marks}) ORDER BY id",
+                        ids,
+                    ).fetchall()
+                else:
+                    rows = []
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return [
+            QueuedEvent(id=r[0], source=r[1], idempotency_key=r[2], conversation_key=r[3],
+                        payload=json.loads(r[4]), meta=json.loads(r[5] or "{}"),
+                        attempts=r[6], age_s=max(0.0, now - r[7]))
+            for r in rows
+        ]
+
+    def complete(self, event_id: int, owner: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE webhook_events SET status = 'done', finished_at = ?, locked_until = NULL"
+                " WHERE id = ? AND locked_by = ?",
+                (self.clock(), event_id, owner),
+            )
+
+    def fail(self, event_id: int, owner: str, error: str, retry_in_s: float, dead: bool,
+             meta: Optional[Dict[str, Any]] = None) -> None:
+        now = self.clock()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE webhook_events SET status = ?, available_at = ?, locked_by = NULL,"
+                " locked_until = NULL, last_error = ?, finished_at = ?, meta = COALESCE(?, meta)"
+                " WHERE id = ? AND locked_by = ?",
+                ("dead" if dead else "pending", now + retry_in_s, error[:500],
+                 now if dead else None, json.dumps(meta) if meta is not None else None,
+                 event_id, owner),
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        now = self.clock()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*), MIN(received_at) FROM webhook_events"
+                " WHERE status IN ('pending', 'processing', 'dead') GROUP BY status"
+            ).fetchall()
+        return _stats_from_rows([(s, n, now - oldest if oldest is not None else None) for s, n, oldest in rows])
+
+    def purge(self, older_than_s: float) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "DELETE FROM webhook_events WHERE status = 'done' AND finished_at < ?",
+                (self.clock() - older_than_s,),
+            ).rowcount
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Postgres backend
+# ─────────────────────────────────────────────────────────────────────────────
+
+_PG_ENQUEUE_SQL = """
+    INSERT INTO webhook_events (source, idempotency_key, conversation_key, payload, meta)
+    VALUES (:source, :key, :conversation, CAST(:payload AS JSONB), CAST(:meta AS JSONB))
+    ON CONFLICT (source, idempotency_key) DO NOTHING
+    RETURNING id
+"""
+
+# The status conditions sit on e (not only in heads) so the row re-check
+# under FOR UPDATE drops an event another consumer claimed meanwhile.
+_PG_CLAIM_SQL = """
+    WITH heads AS (
+        SELECT DISTINCT ON (conversation_key) id
+          FROM webhook_events
+         WHERE status IN ('pending', 'processing')
+         ORDER BY conversation_key, id
+    ), claimable AS (
+        SELECT e.id
+          FROM webhook_events e JOIN heads h ON h.id = e.id
+         WHERE (e.status = 'pending' AND e.available_at <= NOW())
+            OR (e.status = 'processing' AND e.locked_until < NOW())
+         ORDER BY e.id
+         LIMIT :limit
+           FOR UPDATE OF e SKIP LOCKED
+    )
+    UPDATE webhook_events w
+       SET status = 'processing', locked_by = :owner,
+           locked_until = NOW() + make_interval(secs => :ttl), attempts = w.attempts + 1
+      FROM claimable c
+     WHERE w.id = c.id
+    RETURNING w.id, w.source, w.idempotency_key, w.conversation_key, w.payload, w.meta,
+              w.attempts, EXTRACT(EPOCH FROM NOW() - w.received_at)
+"""
+
+# Events behind a claimed head, locked in id order; the caller claims the
+# leading run of claimable ones
+_PG_SUCCESSORS_SQL = """
+    SELECT id, (status = 'pending' AND available_at <= NOW())
+               OR (status = 'processing' AND locked_until < NOW())
+      FROM webhook_events
+     WHERE conversation_key = :conversation AND id > :after
+       AND status IN ('pending', 'processing')
+     ORDER BY id
+     LIMIT :limit
+       FOR UPDATE
+"""
+
+_PG_CLAIM_IDS_SQL = """
+    UPDATE webhook_events w
+       SET status = 'processing', locked_by = :owner,
+           locked_until = NOW() + make_interval(secs => :ttl), attempts = w.attempts + 1
+     WHERE w.id = ANY(:ids)
+    RETURNING w.id, w.source, w.idempotency_key, w.conversation_key, w.payload, w.meta,
+              w.attempts, EXTRACT(EPOCH FROM NOW() - w.received_at)
+"""
+
+_PG_COMPLETE_SQL = """
+    UPDATE webhook_events SET status = 'done', finished_at = NOW(), locked_until = NULL
+     WHERE id = :id AND locked_by = :owner
+"""
+
+_PG_FAIL_SQL = """
+    UPDATE webhook_events
+       SET status = :status, available_at = NOW() + make_interval(secs => :retry),
+           locked_by = NULL, locked_until = NULL, last_error = :error,
+           finished_at = CASE WHEN :status = 'dead' THEN NOW() END,
+           meta = COALESCE(CAST(:meta AS JSONB), meta)
+     WHERE id = :id AND locked_by = :owner
+"""
+
+_PG_STATS_SQL = """
+    SELECT status, COUNT(*), EXTRACT(EPOCH FROM NOW() - MIN(received_at))
+      FROM webhook_events
+     WHERE status IN ('pending', 'processing', 'dead')
+     GROUP BY status
+"""
+
+_PG_PURGE_SQL = """
+    DELETE FROM webhook_events
+     WHERE status = 'done' AND finished_at < NOW() - make_interval(secs => :age)
+"""
+
+
+class PostgresWebhookQueue:
+    """Queue over the webhook_events table. Blocking; call from a thread."""
+
+    def __init__(self, session_factory: Optional[Callable] = None):
+        self._session_factory = session_factory
+
+    def _session(self):
+        factory = self._session_factory
+        if factory is None:
+            from api.database import SessionLocal
+            factory = SessionLocal
+        if factory is None:
+            raise RuntimeError("database not configured")
+        return factory()
+
+    def _run(self, sql: str, params: Dict[str, Any], fetch: bool = False):
+        from sqlalchemy import text
+
+        session = self._session()
+        try:
+            result = session.execute(text(sql), params)
+            rows = result.fetchall() if fetch else None
+            session.commit()
+            return rows if fetch else result.rowcount
+        finally:
+            session.close()
+
+    def enqueue(self, source: str, idempotency_key: str, conversation_key: str,
+                payload: Dict[str, Any], meta: Optional[Dict[str, Any]] = None) -> Optional[int]:
+        rows = self._run(_PG_ENQUEUE_SQL, {
+            "source": source, "key": idempotency_key, "conversation": conversation_key,
+            "payload": json.dumps(payload), "meta": json.dumps(meta or {}),
+        }, fetch=True)
+        return rows[0][0] if rows else None
+
+    def claim(self, owner: str, limit: int, lock_ttl_s: float) -> List[QueuedEvent]:
+        rows = self._run(_PG_CLAIM_SQL, {"owner": owner, "limit": limit, "ttl": lock_ttl_s}, fetch=True)
+        return _pg_events(rows)
+
+    def claim_successors(self, owner: str, conversation_key: str, after_id: int,
+                         limit: int, lock_ttl_s: float) -> List[QueuedEvent]:
+        """Claim the claimable events queued right behind after_id in its conversation."""
+        from sqlalchemy import text
+
+        session = self._session()
+        try:
+            ids = []
+            for event_id, claimable in session.execute(text(_PG_SUCCESSORS_SQL), {
+                "conversation": conversation_key, "after": after_id, "limit": limit,
+            }):
+                if not claimable:
+                    break
+                ids.append(event_id)
+            rows = []
+            if ids:
+                rows = session.execute(text(_PG_CLAIM_IDS_SQL), {
+                    "owner": owner, "ttl": lock_ttl_s, "ids": ids,
+                }).fetchall()
+            session.commit()
+            return _pg_events(rows)
+        finally:
+            session.close()
+
+    def complete(self, event_id: int, owner: str) -> None:
+        self._run(_PG_COMPLETE_SQL, {"id": event_id, "owner": owner})
+
+    def fail(self, event_id: int, owner: str, error: str, retry_in_s: float, dead: bool,
+             meta: Optional[Dict[str, Any]] = None) -> None:
+        self._run(_PG_FAIL_SQL, {
+            "id": event_id, "owner": owner, "status": "dead" if dead else "pending",
+            "retry": retry_in_s, "error": error[:500],
+            "meta": json.dumps(meta) if meta is not None else None,
+        })
+
+    def stats(self) -> Dict[str, Any]:
+        rows = self._run(_PG_STATS_SQL, {}, fetch=True)
+        return _stats_from_rows([(s, n, float(age) if age is not None else None) for s, n, age in rows])
+
+    def purge(self, older_than_s: float) -> int:
+        return self._run(_PG_PURGE_SQL, {"age": older_than_s})
+
+
+def _pg_events(rows) -> List[QueuedEvent]:
+    events = [
+        QueuedEvent(id=r[0], source=r[1], idempotency_key=r[2], conversation_key=r[3],
+                    payload=r[4] or {}, meta=r[5] or {}, attempts=r[6], age_s=float(r[7] or 0))
+        for r in rows
+    ]
+    return sorted(events, key=lambda e: e.id)
+
+
+def _stats_from_rows(rows) -> Dict[str, Any]:
+    stats: Dict[str, Any] = {"pending": 0, "processing": 0, "dead": 0, "oldest_pending_age_s": None}
+    for status, count, oldest_age_s in rows:
+        stats[status] = count
+        if status == "pending" and oldest_age_s is not None:
+            stats["oldest_pending_age_s"] = round(oldest_age_s, 1)
+    return stats
+
+
+def queue_backend_from_env():
+    if WEBHOOK_QUEUE_BACKEND == "postgres":
+        return PostgresWebhookQueue()
+    if WEBHOOK_QUEUE_BACKEND != "sqlite":
+        logger.warning("[WEBHOOK-QUEUE] unknown WEBHOOK_QUEUE_BACKEND=%s — using sqlite", WEBHOOK_QUEUE_BACKEND)
+    return SQLiteWebhookQueue()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Consumer
+# ─────────────────────────────────────────────────────────────────────────────
+
+EventHandler = Callable[[QueuedEvent], Awaitable[Any]]
+BatchHandler = Callable[[List[QueuedEvent]], Awaitable[Any]]
+
+
+@dataclass
+class _Batching:
+    window_s: Callable[[], float]  # quiet window, read per batch (0 = one event per call)
+    max_wait_s: float
+    max_size: int
+
+
+class WebhookQueueConsumer:
+    """Enqueues webhook events and processes claimed ones with bounded concurrency."""
+
+    def __init__(
+        self,
+        backend,
+        concurrency: int = WEBHOOK_QUEUE_CONCURRENCY,
+        poll_interval_s: float = WEBHOOK_QUEUE_POLL_S,
+        lock_ttl_s: float = WEBHOOK_QUEUE_LOCK_TTL_S,
+        max_attempts: int = WEBHOOK_QUEUE_MAX_ATTEMPTS,
+        owner: Optional[str] = None,
+    ):
+        self.backend = backend
+        self.concurrency = max(1, concurrency)
+        self.poll_interval_s = poll_interval_s
+        self.lock_ttl_s = lock_ttl_s
+        self.max_attempts = max_attempts
+        self.owner = owner or node_id()
+        self._handlers: Dict[str, EventHandler] = {}
+        self._batching: Dict[str, _Batching] = {}
+        self._in_flight: Dict[int, asyncio.Task] = {}
+        self._in_flight_by_source: Counter = Counter()
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._last_stats: Dict[str, Any] = {}
+        self._last_stats_at = 0.0
+        self.counters: Counter = Counter()
+
+    def register_handler(self, source: str, handler: EventHandler) -> None:
+        self._handlers[source] = handler
+        self._batching.pop(source, None)
+
+    def register_batch_handler(
+        self,
+        source: str,
+        handler: BatchHandler,
+        window_s: Callable[[], float],
+        max_wait_s: float,
+        max_size: int,
+    ) -> None:
+        """Handle a source's events per conversation burst.
+
+        After claiming a conversation's head the consumer keeps claiming the
+        events queued behind it until window_s() passes without a new one,
+        max_wait_s after the head arrived, or max_size events. The handler
+        gets them in order; they are completed or retried together, unless
+        it raises BatchFailed to name the events that failed.
+        """
+        self._handlers[source] = handler
+        self._batching[source] = _Batching(window_s, max_wait_s, max(1, max_size))
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    # ── producer side ────────────────────────────────────────────────────────
+
+    async def enqueue(self, source: str, idempotency_key: str, conversation_key: str,
+                      payload: Dict[str, Any], meta: Optional[Dict[str, Any]] = None) -> bool:
+        """Persist an event; False if (source, idempotency_key) was already queued."""
+        event_id = await asyncio.to_thread(
+            self.backend.enqueue, source, idempotency_key, conversation_key, payload, meta
+        )
+        outcome = "enqueued" if event_id is not None else "duplicate"
+        self.counters[outcome] += 1
+        emit_metric("webhook_queue_events_total", source=source, outcome=outcome)
+        if event_id is not None and self._wake is not None:
+            self._wake.set()
+        return event_id is not None
+
+    # ── consumer side ────────────────────────────────────────────────────────
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stopping = False
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="webhook-queue-consumer")
+        logger.info(
+            f"[WEBHOOK-QUEUE] consumer started (concurrency={self.concurrency}, "
+            f"sources={sorted(self._handlers)})"
+        )
+
+    async def stop(self, timeout: float = 30.0) -> None:
+        """Stop claiming and wait for in-flight events; unfinished ones are retried after their lock expires."""
+        self._stopping = True
+        if self._wake is not None:
+            self._wake.set()
+        if self._task is not None:
+            await asyncio.wait([self._task], timeout=timeout)
+            if not self._task.done():
+                self._task.cancel()
+        logger.info("[WEBHOOK-QUEUE] consumer stopped")
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                claimed = await self.run_once()
+            except Exception as e:
+                logger.warning(f"[WEBHOOK-QUEUE] claim failed: {e}")
+                claimed = 0
+            await self._refresh_stats()
+            if self._stopping:
+                break
+            if len(self._in_flight) >= self.concurrency:
+                # Saturated: new events wait in the queue until a slot frees up
+                await asyncio.wait(list(self._in_flight.values()), return_when=asyncio.FIRST_COMPLETED)
+            elif not claimed:
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval_s)
+                except asyncio.TimeoutError:
+                    pass
+        if self._in_flight:
+            await asyncio.wait(list(self._in_flight.values()))
+
+    async def run_once(self) -> int:
+        """Claim up to the free concurrency slots and start processing; returns the number claimed."""
+        free = self.concurrency - len(self._in_flight)
+        if free <= 0:
+            self.counters["saturated"] += 1
+            return 0
+        events = await asyncio.to_thread(self.backend.claim, self.owner, free, self.lock_ttl_s)
+        for event in events:
+            self._in_flight[event.id] = asyncio.create_task(
+                self._process(event), name=f"webhook-queue:{event.source}:{event.id}"
+            )
+        return len(events)
+
+    async def drain(self) -> None:
+        """Process until nothing is claimable or in flight (tests, one-shot tools)."""
+        while True:
+            claimed = await self.run_once()
+            if self._in_flight:
+                await asyncio.wait(list(self._in_flight.values()), return_when=asyncio.FIRST_COMPLETED)
+            elif not claimed:
+                return
+
+    async def _process(self, event: QueuedEvent) -> None:
+        source = event.source
+        self._in_flight_by_source[source] += 1
+        emit_metric("webhook_queue_in_flight", self._in_flight_by_source[source], source=source)
+        emit_metric("webhook_queue_lag_ms", event.age_s * 1000, source=source)
+        try:
+            handler = self._handlers.get(source)
+            if handler is None:
+                await self._fail(event, f"no handler registered for source {source!r}", dead=True)
+                return
+            batching = self._batching.get(source)
+            events = [event]
+            token = _current_event.set(event)
+            try:
+                if batching is None:
+                    await handler(event)
+                else:
+                    events = await self._collect_batch(event, batching)
+                    await handler(events)
+            except BatchFailed as e:
+                # Only the events that failed are retried; the rest are done
+                errors = e.errors if len(e.errors) == len(events) else [e] * len(events)
+                logger.error(f"[WEBHOOK-QUEUE] {source} batch of event {event.id} failed "
+                             f"(attempt {event.attempts}, {sum(err is not None for err in errors)}"
+                             f" of {len(events)} event(s)): {e}")
+                for failed, err in zip(events, errors):
+                    if err is not None:
+                        await self._fail(failed, str(err) or type(err).__name__,
+                                         dead=failed.attempts >= self.max_attempts)
+                events = [done for done, err in zip(events, errors) if err is None]
+            except Exception as e:
+                logger.error(f"[WEBHOOK-QUEUE] {source} event {event.id} failed "
+                             f"(attempt {event.attempts}, batch of {len(events)}): {e}", exc_info=True)
+                for failed in events:
+                    await self._fail(failed, str(e) or type(e).__name__,
+                                     dead=failed.attempts >= self.max_attempts)
+                return
+            finally:
+                _current_event.reset(token)
+            for done in events:
+                await asyncio.to_thread(self.backend.complete, done.id, self.owner)
+                self.counters["done"] += 1
+                emit_metric("webhook_queue_events_total", source=source, outcome="done")
+        except Exception as e:
+            # Backend unreachable: the lock expires and the event is claimed again
+            logger.warning(f"[WEBHOOK-QUEUE] could not record result of event {event.id}: {e}")
+        finally:
+            self._in_flight.pop(event.id, None)
+            self._in_flight_by_source[source] -= 1
+            emit_metric("webhook_queue_in_flight", self._in_flight_by_source[source], source=source)
+            if self._wake is not None:
+                self._wake.set()
+
+    async def _collect_batch(self, head: QueuedEvent, batching: _Batching) -> List[QueuedEvent]:
+        """Claim the events queued behind head until its conversation goes quiet."""
+        events = [head]
+        window_s = batching.window_s()
+        if window_s <= 0:
+            return events
+        first_at = time.monotonic() - head.age_s
+        last_at = first_at
+        while len(events) < batching.max_size and not self._stopping:
+            delay = min(last_at + window_s, first_at + batching.max_wait_s) - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            try:
+                more = await asyncio.to_thread(
+                    self.backend.claim_successors, self.owner, head.conversation_key,
+                    events[-1].id, batching.max_size - len(events), self.lock_ttl_s,
+                )
+            except Exception as e:
+                logger.warning(f"[WEBHOOK-QUEUE] could not extend batch of event {head.id}: {e}")
+                break
+            if not more:
+                break
+            events.extend(more)
+            now = time.monotonic()
+            last_at = max(last_at, now - more[-1].age_s)
+            if now >= first_at + batching.max_wait_s:
+                break
+        if len(events) > 1:
+            self.counters["batched"] += len(events) - 1
+        return events
+
+    async def _fail(self, event: QueuedEvent, error: str, dead: bool) -> None:
+        outcome = "dead" if dead else "retry"
+        await asyncio.to_thread(
+            self.backend.fail, event.id, self.owner, error, retry_delay_s(event.attempts), dead,
+            event.meta,
+        )
+        self.counters[outcome] += 1
+        emit_metric("webhook_queue_events_total", source=event.source, outcome=outcome)
+        if dead:
+            logger.error(f"[WEBHOOK-QUEUE] {event.source} event {event.id} dead-lettered "
+                         f"after {event.attempts} attempt(s): {error}")
+
+    async def _refresh_stats(self, force: bool = False) -> Dict[str, Any]:
+        now = time.monotonic()
+        if force or now - self._last_stats_at >= _STATS_REFRESH_S:
+            self._last_stats_at = now
+            try:
+                self._last_stats = await asyncio.to_thread(self.backend.stats)
+            except Exception as e:
+                logger.warning(f"[WEBHOOK-QUEUE] stats query failed: {e}")
+                return self._last_stats
+            for status in ("pending", "processing", "dead"):
+                emit_metric("webhook_queue_depth", self._last_stats.get(status, 0), status=status)
+        return self._last_stats
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": WEBHOOK_QUEUE_ENABLED,
+            "backend": type(self.backend).__name__,
+            "consumer_running": self.running,
+            "owner": self.owner,
+            "concurrency": self.concurrency,
+            "in_flight": len(self._in_flight),
+            "in_flight_by_source": {k: v for k, v in self._in_flight_by_source.items() if v},
+            "handlers": sorted(self._handlers),
+            "counters": dict(self.counters),
+            "queue": dict(self._last_stats),
+        }
+
+
+_queue: Optional[WebhookQueueConsumer] = None
+_queue_lock = threading.Lock()
+
+
+def get_webhook_queue() -> WebhookQueueConsumer:
+    """Process-wide queue, built from the env on first use."""
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = WebhookQueueConsumer(queue_backend_from_env())
+    return _queue
+
+
+async def get_webhook_queue_stats() -> Dict[str, Any]:
+    if _queue is None:
+        return {"enabled": WEBHOOK_QUEUE_ENABLED, "consumer_running": False}
+    await _queue._refresh_stats(force=True)
+    return _queue.stats()
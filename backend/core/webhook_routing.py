@@ -89,10 +89,11 @@ def get_creator_by_any_instagram_id(instagram_id: str) -> Optional[Dict[str, Any
     """
     Find a creator by ANY type of Instagram ID.
 
-    Search order (all indexed for performance):
+    The ID is translated by core.identity_map, which matches (in order):
     1. instagram_page_id (exact match)
     2. instagram_user_id (exact match)
     3. instagram_additional_ids (JSON array contains)
+    and caches unknown IDs, so repeated payloads from unknown accounts don't query.
 
     Args:
         instagram_id: Any Instagram ID to search for
@@ -115,27 +116,20 @@ def get_creator_by_any_instagram_id(instagram_id: str) -> Optional[Dict[str, Any
 
     # Cache miss - query DB
     try:
+        import uuid
+
         from api.database import SessionLocal
         from api.models import Creator
+        from core.identity_map import identity_map
+
+        creator_uuid = identity_map.resolve_creator_by_platform_id(instagram_id)
+        if not creator_uuid:
+            _creator_cache[cache_key] = (None, current_time)
+            return None
 
         session = SessionLocal()
         try:
-            # 1. Search by instagram_page_id (most common)
-            creator = session.query(Creator).filter_by(instagram_page_id=instagram_id).first()
-
-            # 2. Search by instagram_user_id
-            if not creator:
-                creator = session.query(Creator).filter_by(instagram_user_id=instagram_id).first()
-
-            # 3. Search in instagram_additional_ids (JSON array)
-            if not creator:
-                # PostgreSQL JSONB contains operator
-                creator = (
-                    session.query(Creator)
-                    .filter(Creator.instagram_additional_ids.contains([instagram_id]))
-                    .first()
-                )
-
+            creator = session.get(Creator, uuid.UUID(creator_uuid))
             if not creator:
                 _creator_cache[cache_key] = (None, current_time)
                 return None
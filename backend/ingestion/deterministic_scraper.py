@@ -10,18 +10,22 @@ Anti-hallucination principles:
 3. No creative interpretation - just structured extraction
 """
 
+import asyncio
 import logging
 import os
 import re
 import time
+from collections import deque
+from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Deque, Dict, List, Optional, Tuple
 from urllib.parse import urljoin, urlparse
 from urllib.robotparser import RobotFileParser
 
 import httpx
 import pybreaker
+from core.cache import BoundedTTLCache
 from core.metrics import (
     observe_scrape_duration,
     record_ingestion_error,
@@ -51,6 +55,24 @@ ROBOTS_TXT_CACHE_TTL = int(os.getenv("SCRAPER_ROBOTS_CACHE_TTL", "3600"))
 # User agent to identify as when checking robots.txt
 SCRAPER_USER_AGENT = "ClonnectBot"
 
+# =============================================================================
+# CRAWLER CONFIGURATION
+# =============================================================================
+# scrape_website runs a bounded pool of workers over one pooled client.
+# Politeness is per host: at most SCRAPER_PER_HOST_CONCURRENCY requests in
+# flight and request starts spaced by SCRAPER_HOST_DELAY_MS (or the robots.txt
+# Crawl-delay, capped at SCRAPER_MAX_CRAWL_DELAY seconds, when larger).
+SCRAPER_CONCURRENCY = int(os.getenv("SCRAPER_CONCURRENCY", "8"))
+SCRAPER_PER_HOST_CONCURRENCY = int(os.getenv("SCRAPER_PER_HOST_CONCURRENCY", "4"))
+SCRAPER_HOST_DELAY_S = int(os.getenv("SCRAPER_HOST_DELAY_MS", "250")) / 1000
+SCRAPER_MAX_CRAWL_DELAY = float(os.getenv("SCRAPER_MAX_CRAWL_DELAY", "10"))
+
+# Re-crawls send If-None-Match / If-Modified-Since for pages scraped before;
+# a 304 reuses the cached ScrapedPage. Entries live for a week.
+SCRAPER_REVALIDATION_CACHE_SIZE = int(os.getenv("SCRAPER_REVALIDATION_CACHE_SIZE", "500"))
+
+_CLIENT_HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; ClonnectBot/1.0; +https://clonnect.com)"}
+
 
 class RobotsTxtChecker:
     """
@@ -60,7 +82,7 @@ class RobotsTxtChecker:
     - Caches parsed robots.txt per domain
     - TTL-based cache expiration
     - Graceful handling of fetch failures (allow by default)
-    - Async-compatible synchronous fetching
+    - ais_allowed: fetches robots.txt in a worker thread, off the event loop
     """
 
     def __init__(self, user_agent: str = SCRAPER_USER_AGENT, cache_ttl: int = ROBOTS_TXT_CACHE_TTL):
@@ -158,6 +180,25 @@ class RobotsTxtChecker:
 
         return allowed
 
+    async def ais_allowed(self, url: str) -> bool:
+        """is_allowed for async callers: a missing/expired robots.txt is fetched in a thread."""
+        if not RESPECT_ROBOTS_TXT:
+            return True
+
+        domain = self._get_domain(url)
+        if not self._is_cache_valid(domain):
+            parser = await asyncio.to_thread(self._fetch_robots_txt, domain)
+            self._cache[domain] = (parser, time.time())
+        return self.is_allowed(url)
+
+    def crawl_delay(self, url: str) -> Optional[float]:
+        """Crawl-delay from the cached robots.txt for this URL's domain, if any."""
+        entry = self._cache.get(self._get_domain(url))
+        if not entry or entry[0] is None:
+            return None
+        delay = entry[0].crawl_delay(self.user_agent)
+        return float(delay) if delay else None
+
     def clear_cache(self):
         """Clear the robots.txt cache."""
         self._cache.clear()
@@ -246,6 +287,36 @@ class ScrapedPage:
         return len(self.main_content.strip()) > 100
 
 
+# Sentinel returned by _fetch_page_html for a 304 Not Modified response
+NOT_MODIFIED = object()
+
+# url -> {"etag", "last_modified", "page"} for conditional re-crawls
+_revalidation_cache = BoundedTTLCache(
+    max_size=SCRAPER_REVALIDATION_CACHE_SIZE, ttl_seconds=7 * 86400, name="scraper_revalidation"
+)
+
+
+class _HostThrottle:
+    """Per-host politeness: bounded concurrency and a minimum gap between request starts."""
+
+    def __init__(self, concurrency: int, delay_s: float):
+        self.delay_s = delay_s
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._lock = asyncio.Lock()
+        self._next_start = 0.0
+
+    @asynccontextmanager
+    async def slot(self):
+        async with self._semaphore:
+            async with self._lock:
+                now = time.monotonic()
+                if self._next_start > now:
+                    await asyncio.sleep(self._next_start - now)
+                    now = self._next_start
+                self._next_start = now + self.delay_s
+            yield
+
+
 class DeterministicScraper:
     """
     Deterministic web scraper using BeautifulSoup.
@@ -305,10 +376,13 @@ class DeterministicScraper:
         '[id*="modal"]',
     ]
 
-    def __init__(self, timeout: float = 15.0, max_pages: int = 100):
+    def __init__(self, timeout: float = 15.0, max_pages: int = 100, concurrency: int = SCRAPER_CONCURRENCY):
         self.timeout = timeout
         self.max_pages = max_pages
+        self.concurrency = max(1, concurrency)
         self._visited: set = set()
+        # url -> (etag, last_modified) from the latest 200 response
+        self._validators: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
 
     def _should_skip_url(self, url: str) -> bool:
         """Check if URL should be skipped."""
@@ -406,13 +480,18 @@ class DeterministicScraper:
 
         return links[:30]  # Limit
 
-    async def scrape_page(self, url: str, creator_id: str = "unknown") -> Optional[ScrapedPage]:
+    async def scrape_page(
+        self, url: str, creator_id: str = "unknown", client: Optional[httpx.AsyncClient] = None
+    ) -> Optional[ScrapedPage]:
         """
         Scrape a single page deterministically.
 
         Args:
             url: URL to scrape
             creator_id: Creator ID for metrics tracking
+            client: Shared client (crawls); a short-lived client is created when None.
+                With a shared client the request is conditional when the page was
+                scraped before, and a 304 returns the cached page.
 
         Returns:
             ScrapedPage with extracted content, or None if failed
@@ -440,9 +519,16 @@ class DeterministicScraper:
             logger.info(f"Blocked by robots.txt: {url}")
             return None
 
+        cached = _revalidation_cache.get(url) if client is not None else None
+
         try:
             # Circuit breaker wraps the HTTP fetch
-            html, response_url = await self._fetch_page_with_circuit_breaker(url)
+            html, response_url = await self._fetch_page_with_circuit_breaker(url, client, cached)
+            etag, last_modified = self._validators.pop(url, (None, None))
+            if html is NOT_MODIFIED:
+                logger.debug(f"Not modified since last crawl: {url}")
+                record_page_scraped(creator_id)
+                return cached["page"]
             if html is None:
                 return None
 
@@ -537,7 +623,7 @@ class DeterministicScraper:
             observe_scrape_duration(duration)
             record_page_scraped(creator_id)
 
-            return ScrapedPage(
+            page = ScrapedPage(
                 url=response_url,
                 title=title,
                 main_content=main_content,
@@ -545,6 +631,11 @@ class DeterministicScraper:
                 links=links,
                 metadata=metadata,
             )
+            if client is not None and (etag or last_modified):
+                _revalidation_cache.set(
+                    url, {"etag": etag, "last_modified": last_modified, "page": page}
+                )
+            return page
 
         except pybreaker.CircuitBreakerError:
             logger.warning(
@@ -564,92 +655,167 @@ class DeterministicScraper:
             record_ingestion_error("scrape_error")
             return None
 
-    async def _fetch_page_with_circuit_breaker(self, url: str) -> tuple:
+    async def _fetch_page_with_circuit_breaker(
+        self, url: str, client: Optional[httpx.AsyncClient] = None, cached: Optional[dict] = None
+    ) -> tuple:
         """
         Fetch page HTML with circuit breaker protection.
 
         Returns:
-            Tuple of (html_content, final_url) or (None, None) if failed
+            Tuple of (html_content, final_url), (NOT_MODIFIED, url) for a 304,
+            or (None, url) if failed
         """
         # Direct call — pybreaker.call_async has a bug ('gen' not defined)
-        return await self._fetch_page_html(url)
+        return await self._fetch_page_html(url, client, cached)
 
-    async def _fetch_page_html(self, url: str) -> tuple:
+    async def _fetch_page_html(
+        self, url: str, client: Optional[httpx.AsyncClient] = None, cached: Optional[dict] = None
+    ) -> tuple:
         """
         Actual HTTP request to fetch page HTML.
 
         Separated for circuit breaker wrapping.
         Raises exceptions on failure so circuit breaker can track them.
+        Uses the shared crawl ``client`` when given, otherwise a short-lived one.
         """
-        import httpx
-
-        async with httpx.AsyncClient(
-            timeout=self.timeout,
-            follow_redirects=True,
-            verify=VERIFY_SSL,  # Use global SSL config (BUG-004 FIX)
-            headers={
-                "User-Agent": "Mozilla/5.0 (compatible; ClonnectBot/1.0; +https://clonnect.com)"
-            },
-        ) as client:
-            response = await client.get(url)
-
-            if response.status_code >= 500:
-                # Server errors should trip the circuit breaker
-                raise Exception(f"Server error {response.status_code} for {url}")
-
-            if response.status_code == 429:
-                # Rate limit - trip the circuit breaker
-                raise Exception(f"Rate limited (429) for {url}")
-
-            if response.status_code != 200:
-                logger.warning(f"Got status {response.status_code} for {url}")
-                return (None, url)
-
-            content_type = response.headers.get("content-type", "")
-            if "text/html" not in content_type:
-                return (None, url)
-
-            return (response.text, str(response.url))
+        if client is None:
+            async with httpx.AsyncClient(
+                timeout=self.timeout,
+                follow_redirects=True,
+                verify=VERIFY_SSL,  # Use global SSL config (BUG-004 FIX)
+                headers=_CLIENT_HEADERS,
+            ) as own_client:
+                return await self._fetch_page_html(url, own_client)
+
+        headers = {}
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+        response = await (client.get(url, headers=headers) if headers else client.get(url))
+
+        if response.status_code >= 500:
+            # Server errors should trip the circuit breaker
+            raise Exception(f"Server error {response.status_code} for {url}")
+
+        if response.status_code == 429:
+            # Rate limit - trip the circuit breaker
+            raise Exception(f"Rate limited (429) for {url}")
+
+        if response.status_code == 304 and cached:
+            return (NOT_MODIFIED, url)
+
+        if response.status_code != 200:
+            logger.warning(f"Got status {response.status_code} for {url}")
+            return (None, url)
+
+        content_type = response.headers.get("content-type", "")
+        if "text/html" not in content_type:
+            return (None, url)
+
+        etag = response.headers.get("etag")
+        last_modified = response.headers.get("last-modified")
+        if etag or last_modified:
+            self._validators[url] = (etag, last_modified)
+        return (response.text, str(response.url))
 
     async def scrape_website(self, start_url: str) -> List[ScrapedPage]:
         """
         Scrape a website starting from a URL.
 
+        Breadth-first crawl over a deque frontier with a seen-set, run by up to
+        ``concurrency`` workers sharing one pooled client. Each host gets a
+        _HostThrottle (per-host concurrency + delay, honouring robots.txt
+        Crawl-delay). Pages are returned in discovery order, as the sequential
+        crawl did.
+
         Args:
             start_url: Starting URL
 
         Returns:
             List of ScrapedPage objects
         """
-        pages = []
-        to_visit = [start_url]
-        self._visited = set()
-
-        while to_visit and len(pages) < self.max_pages:
-            current_url = to_visit.pop(0)
-
-            if current_url in self._visited:
-                continue
-
-            self._visited.add(current_url)
-
-            page = await self.scrape_page(current_url)
-            if page and page.has_content:
-                pages.append(page)
-                logger.info(
-                    f"Scraped {current_url}: {len(page.main_content)} chars, {len(page.sections)} sections"
-                )
-
-                # Add discovered links to queue (check robots.txt first)
-                robots_checker = get_robots_checker()
-                for link in page.links:
-                    if link not in self._visited and link not in to_visit:
+        robots_checker = get_robots_checker()
+        self._visited = {start_url}
+        frontier: Deque[Tuple[int, str]] = deque([(0, start_url)])
+        results: List[Tuple[int, ScrapedPage]] = []
+        throttles: Dict[str, _HostThrottle] = {}
+        cond = asyncio.Condition()
+        in_flight = 0
+        next_seq = 1
+
+        def throttle_for(url: str) -> _HostThrottle:
+            host = urlparse(url).netloc
+            throttle = throttles.get(host)
+            if throttle is None:
+                crawl_delay = min(robots_checker.crawl_delay(url) or 0.0, SCRAPER_MAX_CRAWL_DELAY)
+                throttle = _HostThrottle(SCRAPER_PER_HOST_CONCURRENCY, max(SCRAPER_HOST_DELAY_S, crawl_delay))
+                throttles[host] = throttle
+            return throttle
+
+        async def crawl(url: str, client) -> Optional[ScrapedPage]:
+            # Loads robots.txt off the event loop; scrape_page's own check is then a cache hit
+            if not await robots_checker.ais_allowed(url):
+                logger.info(f"Blocked by robots.txt: {url}")
+                return None
+            async with throttle_for(url).slot():
+                return await self.scrape_page(url, client=client)
+
+        async def worker(client) -> None:
+            nonlocal in_flight, next_seq
+            while True:
+                async with cond:
+                    while not frontier and in_flight and len(results) < self.max_pages:
+                        await cond.wait()
+                    if not frontier or len(results) >= self.max_pages:
+                        return
+                    seq, url = frontier.popleft()
+                    in_flight += 1
+
+                page = None
+                new_links: List[str] = []
+                try:
+                    page = await crawl(url, client)
+                    if page and page.has_content:
                         # Pre-check robots.txt to avoid queueing blocked URLs
-                        if robots_checker.is_allowed(link):
-                            to_visit.append(link)
-                        else:
-                            logger.debug(f"Not queueing {link} - blocked by robots.txt")
+                        for link in page.links:
+                            if link in self._visited:
+                                continue
+                            if await robots_checker.ais_allowed(link):
+                                new_links.append(link)
+                            else:
+                                logger.debug(f"Not queueing {link} - blocked by robots.txt")
+                except Exception as e:
+                    logger.error(f"Error crawling {url}: {e}")
+                finally:
+                    async with cond:
+                        in_flight -= 1
+                        if page and page.has_content:
+                            results.append((seq, page))
+                            logger.info(
+                                f"Scraped {url}: {len(page.main_content)} chars, {len(page.sections)} sections"
+                            )
+                            for link in new_links:
+                                if link not in self._visited:
+                                    self._visited.add(link)
+                                    frontier.append((next_seq, link))
+                                    next_seq += 1
+                        cond.notify_all()
+
+        n_workers = max(1, min(self.concurrency, self.max_pages))
+        limits = httpx.Limits(max_connections=n_workers, max_keepalive_connections=n_workers)
+        async with httpx.AsyncClient(
+            timeout=self.timeout,
+            follow_redirects=True,
+            verify=VERIFY_SSL,
+            headers=_CLIENT_HEADERS,
+            limits=limits,
+        ) as client:
+            await asyncio.gather(*(worker(client) for _ in range(n_workers)))
 
+        results.sort(key=lambda item: item[0])
+        pages = [page for _, page in results[: self.max_pages]]
         logger.info(f"Total pages scraped: {len(pages)}")
         return pages
 
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""Move inline base64 media from messages.msg_metadata to the media store.
+
+Story thumbnails were saved as data: URLs (core/story_thumbnail.py) and
+older rows still carry thumbnail_base64, so msg_metadata reads dragged the
+blobs along. Each blob is written to the content-addressed store
+(services/media_store.py, keyed by sha256) and replaced by its URL; hashes
+are listed in msg_metadata.media_refs.
+
+Batches commit one at a time, so the script can be stopped and rerun at
+any point; a rerun finds only what is left. A blob whose upload fails stays
+inline and is logged.
+
+Usage: source .env && python3 scripts/backfill_message_media.py [--batch-size 200]
+"""
+import argparse
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+logger = logging.getLogger("backfill_message_media")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=200)
+    args = parser.parse_args()
+
+    if not os.getenv("DATABASE_URL"):
+        logger.error("DATABASE_URL not set — run: source .env && python3 scripts/backfill_message_media.py")
+        sys.exit(1)
+
+    from api.database import engine
+    from services.media_store import backfill_message_media, get_media_store
+
+    store = get_media_store()
+    if not store.durable:
+        logger.error("No durable media backend — configure Cloudinary or set MEDIA_STORE_BACKEND=filesystem")
+        sys.exit(1)
+    logger.info(f"Media store backend: {store.backend.name}")
+    counts = backfill_message_media(
+        engine,
+        batch_size=args.batch_size,
+        progress=lambda c: logger.info(f"progress: {c}"),
+    )
+    logger.info(f"Done: {counts}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Gemini tokenizer calibration benchmark.
+
+Compares the offline GeminiLocalTokenizer (core/dm/budget/local_tokenizer.py)
+against the remote GenerativeModel.count_tokens and reports the error the
+BudgetOrchestrator sees. The TokenCounter contract is <3% aggregate error.
+
+Corpus: a built-in sample of DM-style texts (ES/CA/EN/IT, emoji, prices, links,
+long Doc D-like blocks) plus optional extra texts from --texts-file (one text
+per line, or a .jsonl with a "text" field).
+
+Usage:
+    cd backend && GOOGLE_API_KEY=... python -m scripts.benchmark_gemini_tokenizer
+    cd backend && GOOGLE_API_KEY=... python -m scripts.benchmark_gemini_tokenizer \
+        --texts-file data/sections_sample.jsonl --fit
+
+--fit grid-searches the approximation coefficients on the corpus and rewrites
+core/dm/budget/gemini_token_calibration.json.
+Exit code is 1 when the aggregate error exceeds --max-error (default 3%).
+"""
+
+import argparse
+import itertools
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List
+
+REPO_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from core.dm.budget.local_tokenizer import (  # noqa: E402
+    CALIBRATION_PATH,
+    GeminiLocalTokenizer,
+    load_calibration,
+)
+
+SAMPLE_TEXTS = [
+    "Hola guapa!! 😍😍 cómo estás???",
+    "Holaaa, m'encanta el teu contingut! Quan és la propera classe?",
+    "El curso cuesta 297€ y empieza el 12 de marzo. Te paso el link: https://clonnect.io/pago/abc123",
+    "Ciao! Quanto costa il programma di allenamento online?",
+    "Hey! I saw your reel about morning routines, do you offer 1:1 coaching?",
+    "jajajaja sii total, mañana te escribo y lo vemos 💪🔥",
+    "Gracias por tu mensaje ❤️ Ahora mismo estoy de viaje, te respondo en cuanto pueda.",
+    "¿Tienes plazas para el retiro de yoga en Ibiza del 14 al 21 de junio?",
+    (
+        "Eres Iris Bertran, instructora de baile y bienestar en Barcelona. "
+        "Hablas en catalán o castellano según el lead, con un tono cercano, "
+        "frases cortas, muchos emojis y nunca suenas a vendedora.\n\n"
+        "REGLAS:\n- No inventes precios.\n- Si preguntan por clases, ofrece la clase de prueba.\n"
+        "- Nunca compartas datos personales de otros alumnos.\n"
+    ) * 3,
+    "[Lead] Hola, vi tu story\n[Iris] Holaa 🩷 qué tal?\n[Lead] Bien! Quería info del taller\n",
+    "Producto: Mentoría 1:1 (3 meses) — 1.200€ — incluye 12 sesiones, acceso a comunidad y plantillas.",
+    "OK", "Sí", "👍", "...", "Vale!!! 🙌🙌🙌",
+]
+
+
+def load_texts(path: str) -> List[str]:
+    texts: List[str] = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if not line.strip():
+                continue
+            if path.endswith(".jsonl"):
+                texts.append(json.loads(line).get("text", ""))
+            else:
+                texts.append(line.replace("\\n", "\n"))
+    return [t for t in texts if t]
+
+
+def remote_counts(texts: List[str], model: str) -> List[int]:
+    import google.generativeai as genai  # type: ignore[import]
+
+    api_key = os.getenv("GOOGLE_API_KEY")
+    if not api_key:
+        sys.exit("GOOGLE_API_KEY not set — remote counter unavailable")
+    genai.configure(api_key=api_key)
+    gm = genai.GenerativeModel(model)
+    counts = []
+    for text in texts:
+        counts.append(gm.count_tokens(text).total_tokens)
+        time.sleep(0.05)  # stay well below the countTokens QPS limit
+    return counts
+
+
+def evaluate(texts: List[str], remote: List[int], tok: GeminiLocalTokenizer) -> Dict[str, float]:
+    local = [tok.count(t) for t in texts]
+    per_text = [abs(lc - rc) / rc for lc, rc in zip(local, remote) if rc > 0]
+    total_remote = sum(remote)
+    total_local = sum(local)
+    return {
+        "samples": len(texts),
+        "total_remote": total_remote,
+        "total_local": total_local,
+        "aggregate_error": abs(total_local - total_remote) / total_remote if total_remote else 0.0,
+        "mean_abs_error": statistics.mean(per_text) if per_text else 0.0,
+        "p95_abs_error": (
+            sorted(per_text)[int(0.95 * (len(per_text) - 1))] if per_text else 0.0
+        ),
+    }
+
+
+def fit(texts: List[str], remote: List[int]) -> Dict[str, float]:
+    """Grid-search structural coefficients, then solve the global scale in closed form."""
+    base = load_calibration()
+    best_params, best_err = dict(base), float("inf")
+    total_remote = sum(remote)
+    for single_max, per_extra, symbol in itertools.product(
+        (6, 7, 8, 9, 10, 11), (3, 4, 5), (1.0, 1.5, 2.0)
+    ):
+        params = dict(base, word_single_max_chars=single_max,
+                      word_chars_per_extra=per_extra, symbol_cost=symbol, scale=1.0)
+        tok = GeminiLocalTokenizer(calibration=params)
+        tok._spm = None  # fit the approximation, not sentencepiece
+        raw_total = sum(tok.approximate(t) for t in texts)
+        params["scale"] = round(total_remote / raw_total, 4) if raw_total else 1.0
+        tok.params = params
+        per_text = [abs(tok.approximate(t) - rc) / rc for t, rc in zip(texts, remote) if rc > 0]
+        err = statistics.mean(per_text) if per_text else 0.0
+        if err < best_err:
+            best_params, best_err = params, err
+    return best_params
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=os.getenv("GEMINI_MODEL", "gemini-2.5-flash-lite"))
+    parser.add_argument("--texts-file", help="extra texts (.txt one per line, or .jsonl with 'text')")
+    parser.add_argument("--fit", action="store_true", help="re-fit and write the calibration JSON")
+    parser.add_argument("--max-error", type=float, default=0.03)
+    args = parser.parse_args()
+
+    texts = list(SAMPLE_TEXTS)
+    if args.texts_file:
+        texts.extend(load_texts(args.texts_file))
+
+    print(f"Counting {len(texts)} texts remotely with {args.model}...")
+    remote = remote_counts(texts, args.model)
+
+    tok = GeminiLocalTokenizer()
+    report = evaluate(texts, remote, tok)
+    print(f"\nBackend: {tok.backend}")
+    print(json.dumps(report, indent=2))
+
+    if args.fit:
+        params = fit(texts, remote)
+        payload = {
+            "description": "Coefficients for GeminiLocalTokenizer.approximate(). "
+                           "Re-fit with: python -m scripts.benchmark_gemini_tokenizer --fit",
+            "model": args.model,
+            "fitted_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "samples": len(texts),
+            "params": params,
+        }
+        CALIBRATION_PATH.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+        fitted = GeminiLocalTokenizer(calibration=params)
+        fitted._spm = None
+        report = evaluate(texts, remote, fitted)
+        print(f"\nFitted params written to {CALIBRATION_PATH}")
+        print(json.dumps(report, indent=2))
+
+    ok = report["aggregate_error"] <= args.max_error
+    print(f"\nAggregate error {report['aggregate_error']:.2%} "
+          f"({'OK' if ok else 'ABOVE'} contract of {args.max_error:.0%})")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
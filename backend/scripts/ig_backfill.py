@@ -36,6 +36,7 @@ async def backfill(creator_name: str, days: int = 3, dry_run: bool = False, max_
     from api.database import SessionLocal
     from api.models import Creator, Lead, Message
     from core.instagram import InstagramConnector
+    from services.lead_scoring import rebuild_signal_state
 
     session = SessionLocal()
     try:
@@ -215,6 +216,8 @@ async def backfill(creator_name: str, days: int = 3, dry_run: bool = False, max_
 
             if batch:
                 session.bulk_save_objects(batch)
+                # Bulk inserts skip the after_flush signal-state hook
+                rebuild_signal_state(session, lead_id)
                 # Update lead's last_contact_at
                 latest = max(b.created_at for b in batch)
                 if not lead.last_contact_at or latest > lead.last_contact_at:
@@ -24,6 +24,10 @@ from datetime import datetime, timezone
 import psycopg2
 import requests
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.lead_scoring import mark_signal_states_stale  # noqa: E402
+
 # ─── Config ───────────────────────────────────────────────────────────────────
 DB_URL = os.environ.get("DATABASE_URL")
 if not DB_URL:
@@ -275,6 +279,8 @@ def main():
                 # Update lead timestamps
                 if not args.dry_run and inserted > 0:
                     update_lead_timestamps(cur, lead_id)
+                    # Raw inserts bypass the ORM signal-state hook; scoring rebuilds this lead on read
+                    mark_signal_states_stale(cur, [lead_id])
 
                 # Commit after each conversation
                 if not args.dry_run:
@@ -7,6 +7,7 @@ Run: railway run python3 scripts/recover_unmatched_dms.py
 import asyncio
 import logging
 import os
+import sys
 import uuid
 from datetime import datetime, timedelta, timezone
 
@@ -14,6 +15,10 @@ import httpx
 import psycopg2
 import psycopg2.extras
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.lead_scoring import mark_signal_states_stale  # noqa: E402
+
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
 logger = logging.getLogger("recover_dms")
 
@@ -299,6 +304,10 @@ async def run():
                 conn.rollback()
                 logger.error(f"  Insert failed for {msg_id}: {e}")
 
+        if conv_inserted:
+            # Raw inserts bypass the ORM signal-state hook; scoring rebuilds this lead on read
+            mark_signal_states_stale(cur, [lead_id])
+            conn.commit()
         logger.info(f"  Inserted {conv_inserted} messages for {follower_id}")
 
     # 5. Mark all unmatched webhooks as resolved
@@ -5,12 +5,17 @@ Uses UPSERT logic to avoid duplicates.
 """
 import json
 import os
+import sys
 import uuid
 from datetime import datetime
 
 import psycopg2
 from psycopg2.extras import execute_values
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.lead_scoring import mark_signal_states_stale  # noqa: E402
+
 # Database connection
 DATABASE_URL = os.environ.get("DATABASE_URL")
 if not DATABASE_URL:
@@ -177,6 +182,8 @@ def update_lead_timestamps(conn, lead_id: str):
     """,
         (lead_id, lead_id, lead_id),
     )
+    # Raw inserts bypass the ORM signal-state hook; scoring rebuilds this lead on read
+    mark_signal_states_stale(cursor, [lead_id])
     cursor.close()
 
 
@@ -334,7 +334,8 @@ class TurboOnboarding:
 
             session = SessionLocal()
             try:
-                score_results = batch_recalculate_scores(session, self.creator_name)
+                # Messages were bulk-inserted (no ORM hooks) — rescan signal state
+                score_results = batch_recalculate_scores(session, self.creator_name, rebuild=True)
                 results["scoring"] = score_results
                 self._log(f"Lead scoring: {score_results}")
             finally:
@@ -20,11 +20,10 @@ logger = logging.getLogger(__name__)
 _profile_cache: dict[tuple[str, str], Optional[dict]] = {}
 
 
-def _resolve_creator_uuid(session, creator_slug: str):
-    """Resolve creator slug (e.g. 'iris_bertran') to UUID."""
-    from api.models.creator import Creator
-    creator = session.query(Creator.id).filter(Creator.name == creator_slug).first()
-    return creator.id if creator else None
+def _resolve_creator_uuid(creator_slug: str):
+    """Resolve creator slug (e.g. 'iris_bertran') to UUID via the identity map."""
+    from core.identity_map import identity_map
+    return identity_map.resolve_creator_uuid(creator_slug)
 
 
 def get_profile(creator_id: str, profile_type: str) -> Optional[dict]:
@@ -42,7 +41,7 @@ def get_profile(creator_id: str, profile_type: str) -> Optional[dict]:
 
         session = SessionLocal()
         try:
-            creator_uuid = _resolve_creator_uuid(session, creator_id)
+            creator_uuid = _resolve_creator_uuid(creator_id)
             if not creator_uuid:
                 _profile_cache[cache_key] = None
                 return None
@@ -76,7 +75,7 @@ def save_profile(creator_id: str, profile_type: str, data: dict) -> bool:
 
         session = SessionLocal()
         try:
-            creator_uuid = _resolve_creator_uuid(session, creator_id)
+            creator_uuid = _resolve_creator_uuid(creator_id)
             if not creator_uuid:
                 logger.warning("save_profile: creator '%s' not found in DB", creator_id)
                 return False
@@ -131,7 +130,7 @@ def get_existing_types(creator_id: str) -> dict[str, str]:
 
         session = SessionLocal()
         try:
-            creator_uuid = _resolve_creator_uuid(session, creator_id)
+            creator_uuid = _resolve_creator_uuid(creator_id)
             if not creator_uuid:
                 return {}
             rows = session.execute(
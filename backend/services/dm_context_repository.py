@@ -0,0 +1,347 @@
+"""Async repository functions for the DM context-phase hot path.
+
+The context phase used to wrap each read in ``asyncio.to_thread`` with its own
+``SessionLocal()`` (_get_raw_dna, _read_arc2_memories_sync, _episodic_search).
+Under bursty webhook load one DM turn held up to three threads and three
+connections of the 12-connection sync pool at once.
+
+Here the same reads run on the asyncpg engine (api.database.AsyncSessionLocal)
+through a ``TurnSession``: each loader checks out its own pooled session for
+the duration of its reads, so loaders never queue behind each other and a
+loader cancelled by its timeout discards only its own connection.
+
+Results match the sync functions they replace, and the SQL is shared with them:
+- get_relationship_dna       → services.relationship_dna_repository.get_relationship_dna
+- read_arc2_memories         → context._read_arc2_memories_sync (unformatted LeadMemory list)
+- search_episodic            → SemanticMemoryPgvector.search after ID resolution
+
+Enabled with ENABLE_ASYNC_DB (api/database.py, default: false). When the async
+engine is unavailable ``open_turn_session`` yields None and callers keep the
+to_thread path.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import text
+
+from core.observability.metrics import emit_metric
+
+logger = logging.getLogger(__name__)
+
+_PLATFORM_PREFIXES = ("ig_", "wa_", "tg_")
+
+# ID resolution queries, shared with the sync to_thread fallbacks in
+# core/dm/phases/context.py.
+CREATOR_ID_SQL = "SELECT id FROM creators WHERE name = :name LIMIT 1"
+LEAD_ID_SQL = "SELECT id FROM leads WHERE platform_user_id = :pid AND creator_id = :cid LIMIT 1"
+LEAD_ID_ANY_PREFIX_SQL = (
+    "SELECT id FROM leads "
+    "WHERE creator_id = CAST(:cid AS uuid) "
+    "AND platform_user_id = ANY(ARRAY[:pid, :raw, :ig, :wa, :tg]) "
+    "LIMIT 1"
+)
+
+
+class LoaderSession:
+    """One loader's async session (one pooled connection).
+
+    The connection is acquired on first use. A failed statement is rolled back
+    so the loader can retry; a cancelled one (loader timeout or phase deadline)
+    leaves the connection mid-protocol, so close() invalidates it instead of
+    returning it to the pool.
+    """
+
+    def __init__(self, session_factory):
+        self._factory = session_factory
+        self._session = None
+        self._broken = False
+
+    async def _ensure(self):
+        if self._session is None:
+            self._session = self._factory()
+            start = time.monotonic()
+            await self._session.connection()
+            emit_metric("db_pool_wait_ms", (time.monotonic() - start) * 1000, engine="async")
+        return self._session
+
+    async def execute(self, statement, params: Optional[Dict[str, Any]] = None):
+        try:
+            session = await self._ensure()
+            try:
+                return await session.execute(statement, params or {})
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                await session.rollback()
+                raise
+        except asyncio.CancelledError:
+            self._broken = True
+            raise
+
+    async def fetchone(self, sql: str, params: Optional[Dict[str, Any]] = None):
+        result = await self.execute(text(sql), params)
+        return result.fetchone()
+
+    async def fetchall(self, sql: str, params: Optional[Dict[str, Any]] = None) -> Sequence:
+        result = await self.execute(text(sql), params)
+        return result.fetchall()
+
+    async def close(self) -> None:
+        if self._session is None:
+            return
+        session, self._session = self._session, None
+        if self._broken:
+            await session.invalidate()
+        else:
+            await session.close()
+
+
+class TurnSession:
+    """A DM turn's handle on the async engine; hands each loader its own session."""
+
+    def __init__(self, session_factory):
+        self._factory = session_factory
+        self._open: Set[LoaderSession] = set()
+
+    @asynccontextmanager
+    async def loader(self) -> AsyncIterator[LoaderSession]:
+        session = LoaderSession(self._factory)
+        self._open.add(session)
+        try:
+            yield session
+        finally:
+            self._open.discard(session)
+            # Shielded so a cancelled loader still releases (or invalidates)
+            # its connection.
+            await asyncio.shield(_close_quietly(session))
+
+    async def close(self) -> None:
+        """Release sessions whose loader task never reached its cleanup."""
+        while self._open:
+            session = self._open.pop()
+            session._broken = True
+            await _close_quietly(session)
+
+
+async def _close_quietly(session: LoaderSession) -> None:
+    try:
+        await session.close()
+    except Exception as e:
+        logger.debug("[DM-ASYNC-DB] session close failed: %s", e)
+
+
+@asynccontextmanager
+async def open_turn_session() -> AsyncIterator[Optional[TurnSession]]:
+    """Yield a TurnSession, or None when the async engine is not configured."""
+    try:
+        from api.database import AsyncSessionLocal
+    except Exception:
+        AsyncSessionLocal = None
+    if AsyncSessionLocal is None:
+        yield None
+        return
+    turn = TurnSession(AsyncSessionLocal)
+    try:
+        yield turn
+    finally:
+        await turn.close()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# ID resolution
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def _strip_platform_prefix(platform_user_id: str) -> str:
+    for prefix in _PLATFORM_PREFIXES:
+        if platform_user_id.startswith(prefix):
+            return platform_user_id[len(prefix):]
+    return platform_user_id
+
+
+def lead_id_any_prefix_params(creator_uuid: str, platform_user_id: str) -> Dict[str, str]:
+    """Bind parameters for LEAD_ID_ANY_PREFIX_SQL (raw id plus ig_/wa_/tg_ variants)."""
+    raw = _strip_platform_prefix(platform_user_id)
+    return {
+        "cid": creator_uuid,
+        "pid": platform_user_id,
+        "raw": raw,
+        "ig": f"ig_{raw}",
+        "wa": f"wa_{raw}",
+        "tg": f"tg_{raw}",
+    }
+
+
+async def resolve_creator_uuid(db: LoaderSession, creator_slug: str) -> Optional[str]:
+    row = await db.fetchone(CREATOR_ID_SQL, {"name": creator_slug})
+    return str(row[0]) if row else None
+
+
+async def resolve_lead_uuid(
+    db: LoaderSession, creator_uuid: str, platform_user_id: str, any_prefix: bool = True
+) -> Optional[str]:
+    """Lead UUID for a platform user; with any_prefix, also matches ig_/wa_/tg_ variants."""
+    if any_prefix:
+        row = await db.fetchone(
+            LEAD_ID_ANY_PREFIX_SQL, lead_id_any_prefix_params(creator_uuid, platform_user_id)
+        )
+    else:
+        row = await db.fetchone(LEAD_ID_SQL, {"pid": platform_user_id, "cid": creator_uuid})
+    return str(row[0]) if row else None
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Hot-path reads
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+async def get_relationship_dna(turn: TurnSession, creator_id: str, follower_id: str) -> Optional[Dict]:
+    """Async get_relationship_dna: same follower_id variants, one query, JSON fallback."""
+    from sqlalchemy import select
+
+    from api.models import RelationshipDNAModel
+    from services.relationship_dna_repository import _dna_to_dict, _get_dna_from_json
+
+    follower_ids = [follower_id]
+    if "_" in follower_id:
+        follower_ids.append(follower_id.split("_", 1)[1])
+    else:
+        follower_ids.append(f"ig_{follower_id}")
+
+    try:
+        async with turn.loader() as db:
+            result = await db.execute(
+                select(RelationshipDNAModel).where(
+                    RelationshipDNAModel.creator_id == creator_id,
+                    RelationshipDNAModel.follower_id.in_(follower_ids),
+                )
+            )
+            by_follower = {dna.follower_id: dna for dna in result.scalars().all()}
+        for fid in follower_ids:
+            if fid in by_follower:
+                return _dna_to_dict(by_follower[fid])
+    except Exception as e:
+        logger.error(f"get_relationship_dna (async) error: {e}")
+    return _get_dna_from_json(creator_id, follower_id)
+
+
+async def read_arc2_memories(
+    turn: TurnSession, creator_slug: str, platform_user_id: str, message: str = ""
+) -> list:
+    """Async _read_arc2_memories_sync: semantic recall first, get_all fallback.
+
+    Returns LeadMemory objects (unformatted); [] when the lead is unknown.
+    """
+    from services.lead_memory_service import GET_ALL_SQL, RECALL_SEMANTIC_SQL, LeadMemory
+
+    # Embed before checking out a connection: the Gemini call must not hold one
+    query_embedding = None
+    if message:
+        try:
+            from core.embeddings import agenerate_embeddings_batch
+
+            query_embedding = (await agenerate_embeddings_batch([message]))[0]
+        except Exception as emb_exc:
+            logger.warning("[ARC2-MEMORY] query embedding failed, falling back: %s", emb_exc)
+
+    async with turn.loader() as db:
+        creator_uuid = await resolve_creator_uuid(db, creator_slug)
+        if not creator_uuid:
+            return []
+        lead_uuid = await resolve_lead_uuid(db, creator_uuid, platform_user_id)
+        if not lead_uuid:
+            return []
+
+        params = {"cid": creator_uuid, "lid": lead_uuid}
+        if query_embedding:
+            try:
+                rows = await db.fetchall(
+                    RECALL_SEMANTIC_SQL,
+                    {**params, "emb": str(query_embedding), "thr": 0.6, "top_k": 10},
+                )
+                if rows:
+                    return [LeadMemory(r) for r in rows]
+            except Exception as emb_exc:
+                logger.warning("[ARC2-MEMORY] semantic search failed, falling back: %s", emb_exc)
+
+        rows = await db.fetchall(GET_ALL_SQL, params)
+    return [LeadMemory(r) for r in rows]
+
+
+async def _search_conversation_embeddings(
+    db: LoaderSession, creator_id: str, follower_id: str, embedding_str: str, k: int, min_similarity: float
+) -> List[Dict[str, Any]]:
+    """Same query and row shape as SemanticMemoryPgvector.search."""
+    from core.semantic_memory_pgvector import SEARCH_SQL
+
+    rows = await db.fetchall(
+        SEARCH_SQL,
+        {
+            "query": embedding_str,
+            "creator_id": creator_id,
+            "follower_id": follower_id,
+            "min_sim": min_similarity,
+            "k": k,
+        },
+    )
+    matches = []
+    for row in rows:
+        metadata = row.msg_metadata or {}
+        if isinstance(metadata, str):  # asyncpg returns json/jsonb as text
+            metadata = json.loads(metadata)
+        matches.append({
+            "content": row.content,
+            "role": row.message_role,
+            "similarity": round(float(row.similarity), 3),
+            "created_at": row.created_at.isoformat() if row.created_at else None,
+            "metadata": metadata,
+        })
+    return matches
+
+
+async def search_episodic(
+    turn: TurnSession, creator_slug: str, sender_id: str, message: str, k: int, min_similarity: float
+) -> List[Dict[str, Any]]:
+    """Async episodic lookup: UUID pair first (canonical), slug pair as fallback."""
+    from core.semantic_memory_pgvector import ENABLE_SEMANTIC_MEMORY_PGVECTOR
+
+    if not ENABLE_SEMANTIC_MEMORY_PGVECTOR:
+        return []
+
+    # Embed before checking out a connection: the Gemini call must not hold one
+    from core.embeddings import agenerate_embeddings_batch
+
+    query_embedding = (await agenerate_embeddings_batch([message]))[0]
+    if not query_embedding:
+        logger.warning("Failed to generate query embedding")
+        return []
+    embedding_str = "[" + ",".join(str(x) for x in query_embedding) + "]"
+
+    async with turn.loader() as db:
+        creator_uuid = lead_uuid = None
+        try:
+            creator_uuid = await resolve_creator_uuid(db, creator_slug)
+            if creator_uuid:
+                lead_uuid = await resolve_lead_uuid(db, creator_uuid, sender_id, any_prefix=False)
+        except Exception as e:
+            logger.debug("[EPISODIC] ID resolution failed for %s/%s: %s", creator_slug, sender_id, e)
+
+        pairs: List[Tuple[Optional[str], Optional[str]]] = [(creator_uuid, lead_uuid), (creator_slug, sender_id)]
+        pairs = [(cid, fid) for cid, fid in pairs if cid and fid]
+        if not pairs:
+            return []
+
+        for cid, fid in pairs:
+            try:
+                results = await _search_conversation_embeddings(db, cid, fid, embedding_str, k, min_similarity)
+            except Exception as e:
+                logger.error(f"Error searching semantic memory: {e}")
+                results = []
+            if results:
+                return results
+    return []
@@ -10,7 +10,7 @@ Design rules:
   - Fail-silent: every exception is caught, logged, NOT re-raised.
   - Flag OFF → zero overhead (early return before any work).
   - No LLM calls — classification is pure mapping (dict lookup).
-  - ID resolution via asyncio.to_thread (non-blocking).
+  - ID resolution via core.identity_map (cached; misses query in a thread).
   - upsert ON CONFLICT handles dedup naturally.
 """
 
@@ -96,64 +96,19 @@ _CONV_FACT_MAP: Dict[str, Optional[str]] = {
 # ─────────────────────────────────────────────────────────────────────────────
 
 async def _resolve_creator_uuid(creator_id: str) -> Optional[str]:
-    try:
-        _uuid.UUID(creator_id)
-        return creator_id
-    except (ValueError, AttributeError):
-        pass
-
-    def _lookup() -> Optional[str]:
-        from api.database import SessionLocal
-        from sqlalchemy import text
-        session = SessionLocal()
-        try:
-            row = session.execute(
-                text("SELECT id FROM creators WHERE name = :name LIMIT 1"),
-                {"name": creator_id},
-            ).fetchone()
-            return str(row[0]) if row else None
-        finally:
-            session.close()
+    from core.identity_map import identity_map
 
     try:
-        return await asyncio.to_thread(_lookup)
+        return await identity_map.aresolve_creator_uuid(creator_id)
     except Exception:
         return None
 
 
 async def _resolve_lead_uuid(creator_uuid: str, lead_id: str) -> Optional[str]:
-    try:
-        _uuid.UUID(lead_id)
-        return lead_id
-    except (ValueError, AttributeError):
-        pass
-
-    raw_id = lead_id
-    for prefix in ("ig_", "wa_", "tg_"):
-        if raw_id.startswith(prefix):
-            raw_id = raw_id[len(prefix):]
-            break
-
-    def _lookup() -> Optional[str]:
-        from api.database import SessionLocal
-        from sqlalchemy import text
-        session = SessionLocal()
-        try:
-            row = session.execute(
-                text(
-                    "SELECT id FROM leads "
-                    "WHERE creator_id = CAST(:cid AS uuid) "
-                    "AND platform_user_id = ANY(ARRAY[:pid, :pid_raw]) "
-                    "LIMIT 1"
-                ),
-                {"cid": creator_uuid, "pid": lead_id, "pid_raw": raw_id},
-            ).fetchone()
-            return str(row[0]) if row else None
-        finally:
-            session.close()
+    from core.identity_map import identity_map
 
     try:
-        return await asyncio.to_thread(_lookup)
+        return await identity_map.aresolve_lead_uuid(creator_uuid, lead_id)
     except Exception:
         return None
 
@@ -30,6 +30,26 @@ MEMORY_TYPES: list[str] = [
 # Types that require why + how_to_apply (mirrors DB CHECK constraints)
 _REQUIRES_WHY_HOW: frozenset[str] = frozenset({"objection", "relationship_state"})
 
+# Read queries shared with the async hot path (services/dm_context_repository.py).
+GET_ALL_SQL = (
+    "SELECT * FROM arc2_lead_memories "
+    "WHERE creator_id = :cid AND lead_id = :lid "
+    "AND deleted_at IS NULL "
+    "ORDER BY created_at"
+)
+
+# CAST rather than ``:emb::vector``: text() would read the latter as a ``:emb``
+# bind followed by a ``:vector`` one.
+RECALL_SEMANTIC_SQL = (
+    "SELECT *, 1 - (embedding <=> CAST(:emb AS vector)) AS _score "
+    "FROM arc2_lead_memories "
+    "WHERE creator_id = :cid AND lead_id = :lid "
+    "AND deleted_at IS NULL AND embedding IS NOT NULL "
+    "AND 1 - (embedding <=> CAST(:emb AS vector)) >= :thr "
+    "ORDER BY embedding <=> CAST(:emb AS vector) "
+    "LIMIT :top_k"
+)
+
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Data models
@@ -261,12 +281,7 @@ class LeadMemoryService:
         lead_id: UUID,
     ) -> list[LeadMemory]:
         rows = self._db.execute(
-            text(
-                "SELECT * FROM arc2_lead_memories "
-                "WHERE creator_id = :cid AND lead_id = :lid "
-                "AND deleted_at IS NULL "
-                "ORDER BY created_at"
-            ),
+            text(GET_ALL_SQL),
             {"cid": str(creator_id), "lid": str(lead_id)},
         ).fetchall()
         return [LeadMemory(r) for r in rows]
@@ -324,15 +339,7 @@ class LeadMemoryService:
     ) -> list[LeadMemory]:
         """pgvector cosine similarity search, filtered by threshold."""
         rows = self._db.execute(
-            text(
-                "SELECT *, 1 - (embedding <=> :emb::vector) AS _score "
-                "FROM arc2_lead_memories "
-                "WHERE creator_id = :cid AND lead_id = :lid "
-                "AND deleted_at IS NULL AND embedding IS NOT NULL "
-                "AND 1 - (embedding <=> :emb::vector) >= :thr "
-                "ORDER BY embedding <=> :emb::vector "
-                "LIMIT :top_k"
-            ),
+            text(RECALL_SEMANTIC_SQL),
             {
                 "cid": str(creator_id),
                 "lid": str(lead_id),
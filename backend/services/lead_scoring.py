@@ -6,6 +6,13 @@ Architecture:
   2. classify_lead(signals) -> Status string (one of 6 categories)
   3. calculate_score(status, signals) -> Score 0-100
 
+Signal state:
+  The per-message counters behind extract_signals() are persisted per lead in
+  lead_signal_state and advanced in O(1) by an ORM after_flush hook whenever a
+  Message is saved (install_signal_state_hooks). Scoring reads that row and
+  only rescans messages when it is missing, stale or from an older keyword
+  dictionary. check_signal_state() diffs stored rows against a fresh scan.
+
 Categories:
   cliente     — Existing customer (preserved, never auto-downgraded)
   caliente    — Purchase/scheduling/interest signals from follower
@@ -28,8 +35,11 @@ purchase intent. Creator mentioning "precio" is a sales pitch, not a signal.
 """
 
 import logging
+import time
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from core.derived_tables import TableProbe, rules_version
 
 logger = logging.getLogger(__name__)
 
@@ -94,56 +104,175 @@ SCORE_RANGES = {
 # STEP 1: Extract Signals
 # =============================================================================
 
-def extract_signals(session, lead) -> Dict[str, Any]:
+# Signals are computed over a lead's first SIGNAL_WINDOW non-empty messages
+SIGNAL_WINDOW = 100
+
+# Additive per-message counters — one lead_signal_state column each
+SIGNAL_COUNTERS = (
+    "follower_messages",
+    "creator_messages",
+    "follower_purchase_hits",
+    "follower_interest_hits",
+    "follower_scheduling_hits",
+    "follower_negative_hits",
+    "follower_social_hits",
+    "creator_social_hits",
+    "collaboration_hits",
+    "follower_length_sum",
+    "short_reactions",
+    "story_replies",
+    "strong_intents",
+    "soft_intents",
+)
+
+_STORY_REPLY_PHRASES = [
+    "replied to your story", "respondió a tu historia",
+    "mencionó tu historia",
+]
+
+# Stored states built with different keyword lists are rebuilt on read
+SIGNALS_VERSION = rules_version(
+    SIGNAL_WINDOW, SIGNAL_COUNTERS, FOLLOWER_PURCHASE_KEYWORDS, FOLLOWER_INTEREST_KEYWORDS,
+    FOLLOWER_SCHEDULING_KEYWORDS, SOCIAL_KEYWORDS, COLLABORATION_KEYWORDS, NEGATIVE_KEYWORDS,
+    _STORY_REPLY_PHRASES,
+)
+
+
+def message_signal_deltas(role: str, content: Optional[str], intent: Optional[str], meta_type: Optional[str]) -> Dict[str, int]:
     """
-    Extract conversation signals from a lead's message history.
+    Counter increments contributed by one message.
 
     Distinguishes between follower messages (role="user") and
     creator messages (role="assistant") for keyword analysis.
     Tracks social keywords per-side for bidirectional friendship detection.
     """
+    deltas = dict.fromkeys(SIGNAL_COUNTERS, 0)
+    text = (content or "").strip().lower()
+
+    if role == "user":
+        deltas["follower_messages"] = 1
+        deltas["follower_length_sum"] = len(text)
+
+        # Short reaction detection (emoji-only, "ok", "si", etc.)
+        if len(text) <= 5:
+            deltas["short_reactions"] = 1
+
+        # Story reply detection via metadata type key only
+        if meta_type in ("story_mention", "story_reply"):
+            deltas["story_replies"] = 1
+        elif any(p in text for p in _STORY_REPLY_PHRASES):
+            deltas["story_replies"] = 1
+
+        # Purchase keywords (FOLLOWER ONLY)
+        if any(kw in text for kw in FOLLOWER_PURCHASE_KEYWORDS):
+            deltas["follower_purchase_hits"] = 1
+
+        # Interest keywords (FOLLOWER ONLY)
+        if any(kw in text for kw in FOLLOWER_INTEREST_KEYWORDS):
+            deltas["follower_interest_hits"] = 1
+
+        # Scheduling keywords (FOLLOWER ONLY)
+        if any(kw in text for kw in FOLLOWER_SCHEDULING_KEYWORDS):
+            deltas["follower_scheduling_hits"] = 1
+
+        # Negative keywords (FOLLOWER ONLY)
+        if any(kw in text for kw in NEGATIVE_KEYWORDS):
+            deltas["follower_negative_hits"] = 1
+
+        # Intent signals
+        if intent in ("purchase", "interest_strong"):
+            deltas["strong_intents"] = 1
+        elif intent in ("interest_soft", "question_product", "product_question"):
+            deltas["soft_intents"] = 1
+
+        # Social keywords (follower side)
+        if any(kw in text for kw in SOCIAL_KEYWORDS):
+            deltas["follower_social_hits"] = 1
+
+    elif role == "assistant":
+        deltas["creator_messages"] = 1
+
+        # Social keywords (creator side)
+        if any(kw in text for kw in SOCIAL_KEYWORDS):
+            deltas["creator_social_hits"] = 1
+
+    # Collaboration keywords (both sides count)
+    if any(kw in text for kw in COLLABORATION_KEYWORDS):
+        deltas["collaboration_hits"] = 1
+
+    return deltas
+
+
+def scan_signal_state(session, lead_id) -> Dict[str, Any]:
+    """
+    Build a lead's signal counters from scratch out of its message history.
+
+    Returns the counters plus message_count (all non-empty messages, not just
+    the window) and last_message_at, as stored in lead_signal_state.
+    """
     from sqlalchemy import text as _text
 
     # Use raw SQL to select only msg_metadata->>'type' (story detection needs only the 'type'
     # key). Fetching the full msg_metadata JSONB column can transfer 100+ MB for active leads
     # (avg 988 KB/msg × 100 messages), making scoring 100x slower than necessary.
+    # Window aggregates are evaluated before LIMIT, so they cover every message.
     messages = session.execute(
         _text("""
             SELECT role, content, intent, created_at,
-                   msg_metadata ->> 'type' AS meta_type
+                   msg_metadata ->> 'type' AS meta_type,
+                   COUNT(*) OVER () AS message_count,
+                   MAX(created_at) OVER () AS last_message_at
             FROM messages
             WHERE lead_id = :lead_id
               AND content IS NOT NULL AND content != ''
             ORDER BY created_at ASC
-            LIMIT 100
+            LIMIT :window
         """),
-        {"lead_id": lead.id},
+        {"lead_id": lead_id, "window": SIGNAL_WINDOW},
     ).mappings().fetchall()
 
+    state: Dict[str, Any] = dict.fromkeys(SIGNAL_COUNTERS, 0)
+    state["message_count"] = messages[0]["message_count"] if messages else 0
+    state["last_message_at"] = messages[0]["last_message_at"] if messages else None
+
+    for row in messages:
+        # msg_metadata->>'type' only (avoids fetching huge JSONB)
+        deltas = message_signal_deltas(row["role"], row["content"], row["intent"], row["meta_type"])
+        for key, value in deltas.items():
+            state[key] += value
+
+    return state
+
+
+def signals_from_state(state: Dict[str, Any], lead) -> Dict[str, Any]:
+    """Turn stored counters into the signals dict consumed by classify_lead/calculate_score."""
+    f = state["follower_messages"]
+    c = state["creator_messages"]
+
     signals: Dict[str, Any] = {
         # Counts
-        "total_messages": len(messages),
-        "follower_messages": 0,
-        "creator_messages": 0,
+        "total_messages": min(state["message_count"], SIGNAL_WINDOW),
+        "follower_messages": f,
+        "creator_messages": c,
         # Keyword hits (FOLLOWER only)
-        "follower_purchase_hits": 0,
-        "follower_interest_hits": 0,
-        "follower_scheduling_hits": 0,
-        "follower_negative_hits": 0,
+        "follower_purchase_hits": state["follower_purchase_hits"],
+        "follower_interest_hits": state["follower_interest_hits"],
+        "follower_scheduling_hits": state["follower_scheduling_hits"],
+        "follower_negative_hits": state["follower_negative_hits"],
         # Social signals — tracked PER SIDE for bidirectional detection
-        "follower_social_hits": 0,
-        "creator_social_hits": 0,
-        "social_hits": 0,  # Combined (kept for scoring)
-        "collaboration_hits": 0,
+        "follower_social_hits": state["follower_social_hits"],
+        "creator_social_hits": state["creator_social_hits"],
+        "social_hits": state["follower_social_hits"] + state["creator_social_hits"],  # Combined (kept for scoring)
+        "collaboration_hits": state["collaboration_hits"],
         # Content patterns
-        "follower_avg_length": 0.0,
-        "short_reactions": 0,
-        "story_replies": 0,
+        "follower_avg_length": state["follower_length_sum"] / f if f else 0.0,
+        "short_reactions": state["short_reactions"],
+        "story_replies": state["story_replies"],
         # Engagement
-        "bidirectional_ratio": 0.0,
+        "bidirectional_ratio": min(f, c) / max(f, c) if max(f, c) > 0 else 0.0,
         # Intents (from intent classifier)
-        "strong_intents": 0,
-        "soft_intents": 0,
+        "strong_intents": state["strong_intents"],
+        "soft_intents": state["soft_intents"],
         # Recency
         "days_since_last": 999,
         "days_since_first": 999,
@@ -151,78 +280,6 @@ def extract_signals(session, lead) -> Dict[str, Any]:
         "is_existing_customer": lead.status == "cliente",
     }
 
-    follower_lengths = []
-
-    for row in messages:
-        role, content, intent, created_at = row["role"], row["content"], row["intent"], row["created_at"]
-        meta_type = row["meta_type"]  # msg_metadata->>'type' only (avoids fetching huge JSONB)
-        text = (content or "").strip().lower()
-
-        if role == "user":
-            signals["follower_messages"] += 1
-            follower_lengths.append(len(text))
-
-            # Short reaction detection (emoji-only, "ok", "si", etc.)
-            if len(text) <= 5:
-                signals["short_reactions"] += 1
-
-            # Story reply detection via metadata type key only
-            if meta_type in ("story_mention", "story_reply"):
-                signals["story_replies"] += 1
-            elif any(p in text for p in [
-                "replied to your story", "respondió a tu historia",
-                "mencionó tu historia",
-            ]):
-                signals["story_replies"] += 1
-
-            # Purchase keywords (FOLLOWER ONLY)
-            if any(kw in text for kw in FOLLOWER_PURCHASE_KEYWORDS):
-                signals["follower_purchase_hits"] += 1
-
-            # Interest keywords (FOLLOWER ONLY)
-            if any(kw in text for kw in FOLLOWER_INTEREST_KEYWORDS):
-                signals["follower_interest_hits"] += 1
-
-            # Scheduling keywords (FOLLOWER ONLY)
-            if any(kw in text for kw in FOLLOWER_SCHEDULING_KEYWORDS):
-                signals["follower_scheduling_hits"] += 1
-
-            # Negative keywords (FOLLOWER ONLY)
-            if any(kw in text for kw in NEGATIVE_KEYWORDS):
-                signals["follower_negative_hits"] += 1
-
-            # Intent signals
-            if intent in ("purchase", "interest_strong"):
-                signals["strong_intents"] += 1
-            elif intent in ("interest_soft", "question_product", "product_question"):
-                signals["soft_intents"] += 1
-
-            # Social keywords (follower side)
-            if any(kw in text for kw in SOCIAL_KEYWORDS):
-                signals["follower_social_hits"] += 1
-                signals["social_hits"] += 1
-
-        elif role == "assistant":
-            signals["creator_messages"] += 1
-
-            # Social keywords (creator side)
-            if any(kw in text for kw in SOCIAL_KEYWORDS):
-                signals["creator_social_hits"] += 1
-                signals["social_hits"] += 1
-
-        # Collaboration keywords (both sides count)
-        if any(kw in text for kw in COLLABORATION_KEYWORDS):
-            signals["collaboration_hits"] += 1
-
-    # Derived metrics
-    if follower_lengths:
-        signals["follower_avg_length"] = sum(follower_lengths) / len(follower_lengths)
-
-    f = signals["follower_messages"]
-    c = signals["creator_messages"]
-    if max(f, c) > 0:
-        signals["bidirectional_ratio"] = min(f, c) / max(f, c)
-
     # Recency
     if lead.last_contact_at:
         lca = lead.last_contact_at
@@ -239,6 +296,250 @@ def extract_signals(session, lead) -> Dict[str, Any]:
     return signals
 
 
+def extract_signals(session, lead) -> Dict[str, Any]:
+    """
+    Extract conversation signals from a lead's message history (full rescan).
+
+    Reference computation for the stored signal state; scoring paths use
+    get_signal_state() instead.
+    """
+    return signals_from_state(scan_signal_state(session, lead.id), lead)
+
+
+# =============================================================================
+# Signal state persistence (lead_signal_state)
+# =============================================================================
+
+_STATE_COLUMNS = ("message_count", "last_message_at") + SIGNAL_COUNTERS
+
+_UPSERT_STATE_SQL = (
+    "INSERT INTO lead_signal_state (lead_id, version, stale, "
+    + ", ".join(_STATE_COLUMNS)
+    + ", updated_at) VALUES (:lead_id, :version, FALSE, "
+    + ", ".join(f":{c}" for c in _STATE_COLUMNS)
+    + ", NOW()) ON CONFLICT (lead_id) DO UPDATE SET version = EXCLUDED.version, stale = FALSE, "
+    + ", ".join(f"{c} = EXCLUDED.{c}" for c in _STATE_COLUMNS)
+    + ", updated_at = NOW()"
+)
+
+# One message saved: add its deltas while the window has room, and flag the
+# row stale when the message predates the newest one already counted
+# (backfilled history shifts the first-N window). Every right-hand side sees
+# the pre-update row, so concurrent saves for one lead serialize on the row lock.
+_INCREMENT_STATE_SQL = (
+    "UPDATE lead_signal_state SET "
+    + ", ".join(f"{c} = {c} + CASE WHEN message_count < :window THEN :{c} ELSE 0 END" for c in SIGNAL_COUNTERS)
+    + ", message_count = message_count + 1"
+    ", stale = stale OR COALESCE(COALESCE(CAST(:created_at AS TIMESTAMPTZ), NOW()) < last_message_at, FALSE)"
+    ", last_message_at = GREATEST(last_message_at, COALESCE(CAST(:created_at AS TIMESTAMPTZ), NOW()))"
+    ", updated_at = NOW()"
+    " WHERE lead_id = :lead_id AND version = :version AND NOT stale"
+)
+
+_MARK_STALE_SQL = "UPDATE lead_signal_state SET stale = TRUE, updated_at = NOW() WHERE lead_id = :lead_id"
+
+
+def mark_signal_states_stale(cursor, lead_ids: Iterable) -> int:
+    """Flag stored states stale after raw-SQL message writes (DB-API cursor, e.g. psycopg2).
+
+    Those inserts bypass the after_flush hook; the next scoring read rebuilds
+    the flagged leads. Call it in the same transaction as the inserts.
+    """
+    ids = [str(i) for i in lead_ids if i]
+    if not ids:
+        return 0
+    cursor.execute("SELECT to_regclass('lead_signal_state') IS NOT NULL AS present")
+    row = cursor.fetchone()
+    if not (row["present"] if isinstance(row, dict) else row[0]):
+        return 0
+    cursor.execute(
+        "UPDATE lead_signal_state SET stale = TRUE, updated_at = NOW() WHERE lead_id = ANY(%s::uuid[])",
+        (ids,),
+    )
+    return cursor.rowcount
+
+
+_signal_table_present = TableProbe("lead_signal_state")
+
+
+def _row_to_state(row) -> Dict[str, Any]:
+    return {c: row[c] for c in _STATE_COLUMNS}
+
+
+def save_signal_state(session, lead_id, state: Dict[str, Any]) -> None:
+    """Upsert a freshly scanned state (clears the stale flag)."""
+    from sqlalchemy import text as _text
+
+    session.execute(
+        _text(_UPSERT_STATE_SQL),
+        {"lead_id": lead_id, "version": SIGNALS_VERSION, **{c: state[c] for c in _STATE_COLUMNS}},
+    )
+
+
+def rebuild_signal_state(session, lead_id) -> Dict[str, Any]:
+    """Full rebuild path: rescan the lead's messages and persist the result."""
+    state = scan_signal_state(session, lead_id)
+    # Before migration 053 scoring still works from the scan alone
+    if _signal_table_present(session.connection()):
+        save_signal_state(session, lead_id, state)
+    return state
+
+
+def load_signal_states(session, lead_ids: Iterable) -> Dict[str, Dict[str, Any]]:
+    """Usable stored states for lead_ids in one query ({str(lead_id): state}).
+
+    Missing, stale and outdated-version rows are left out so callers rebuild them.
+    """
+    from sqlalchemy import bindparam
+    from sqlalchemy import text as _text
+
+    ids = [str(i) for i in lead_ids]
+    if not ids or not _signal_table_present(session.connection()):
+        return {}
+    rows = session.execute(
+        _text(
+            "SELECT lead_id, " + ", ".join(_STATE_COLUMNS) + " FROM lead_signal_state "
+            "WHERE lead_id IN :lead_ids AND version = :version AND NOT stale"
+        ).bindparams(bindparam("lead_ids", expanding=True)),
+        {"lead_ids": ids, "version": SIGNALS_VERSION},
+    ).mappings().fetchall()
+    return {str(row["lead_id"]): _row_to_state(row) for row in rows}
+
+
+def get_signal_state(session, lead_id) -> Dict[str, Any]:
+    """Stored signal state for one lead, rebuilt from messages when unusable."""
+    state = load_signal_states(session, [lead_id]).get(str(lead_id))
+    if state is not None:
+        return state
+    return rebuild_signal_state(session, lead_id)
+
+
+def check_signal_state(session, lead_ids: Iterable, repair: bool = False) -> Dict[str, Any]:
+    """
+    Consistency checker: compare stored states against a from-scratch scan.
+
+    Args:
+        session: SQLAlchemy session
+        lead_ids: Leads to check
+        repair: Overwrite missing/stale/mismatched rows with the fresh scan
+
+    Returns:
+        {"checked", "consistent", "missing", "mismatched": [{"lead_id", "fields": {name: [stored, fresh]}}], "repaired"}
+    """
+    lead_ids = list(lead_ids)
+    stored = load_signal_states(session, lead_ids)
+    report: Dict[str, Any] = {"checked": 0, "consistent": 0, "missing": 0, "mismatched": [], "repaired": 0}
+
+    for lead_id in lead_ids:
+        report["checked"] += 1
+        fresh = scan_signal_state(session, lead_id)
+        current = stored.get(str(lead_id))
+        if current is None:
+            report["missing"] += 1
+        else:
+            diff = {
+                c: [current[c], fresh[c]]
+                for c in ("message_count",) + SIGNAL_COUNTERS
+                if current[c] != fresh[c]
+            }
+            if not diff:
+                report["consistent"] += 1
+                continue
+            report["mismatched"].append({"lead_id": str(lead_id), "fields": diff})
+        if repair:
+            save_signal_state(session, lead_id, fresh)
+            report["repaired"] += 1
+
+    if report["mismatched"]:
+        logger.warning(f"[SCORING-V3] Signal state drift on {len(report['mismatched'])}/{report['checked']} leads")
+    return report
+
+
+# --- ORM hooks: advance the state as messages are saved ---------------------
+
+_SIGNAL_FIELDS = ("lead_id", "role", "content", "intent", "msg_metadata", "created_at")
+
+
+def _changed_signal_leads(obj) -> List[Any]:
+    """Leads whose window an updated message affects (old and new lead on reassignment)."""
+    from sqlalchemy import inspect
+
+    attrs = inspect(obj).attrs
+    if not any(attrs[name].history.has_changes() for name in _SIGNAL_FIELDS):
+        return []
+    return [obj.lead_id, *attrs["lead_id"].history.deleted]
+
+
+def _advance_signal_states(session, _flush_context) -> None:
+    from sqlalchemy import inspect
+
+    from api.models import Message
+
+    increments: List[Dict[str, Any]] = []
+    stale: set = set()
+    for obj in session.new:
+        if not isinstance(obj, Message):
+            continue
+        # Instance dict only: expired server defaults (created_at) must not load mid-flush
+        values = inspect(obj).dict
+        if not values.get("lead_id") or not values.get("content"):
+            continue
+        metadata = values.get("msg_metadata")
+        meta_type = metadata.get("type") if isinstance(metadata, dict) else None
+        increments.append({
+            **message_signal_deltas(values.get("role"), values["content"], values.get("intent"), meta_type),
+            "lead_id": values["lead_id"],
+            "created_at": values.get("created_at"),
+            "window": SIGNAL_WINDOW,
+            "version": SIGNALS_VERSION,
+        })
+    for obj in session.deleted:
+        if isinstance(obj, Message):
+            stale.add(inspect(obj).dict.get("lead_id"))
+    for obj in session.dirty:
+        if isinstance(obj, Message):
+            stale.update(_changed_signal_leads(obj))
+    stale.discard(None)
+
+    if not increments and not stale:
+        return
+    connection = session.connection()
+    if not _signal_table_present(connection):
+        return
+
+    from sqlalchemy import text as _text
+
+    if increments:
+        connection.execute(_text(_INCREMENT_STATE_SQL), increments)
+    if stale:
+        connection.execute(_text(_MARK_STALE_SQL), [{"lead_id": lead_id} for lead_id in stale])
+
+
+_hooks_installed = False
+
+
+def install_signal_state_hooks(target=None) -> None:
+    """Keep lead_signal_state current on every flush that saves Message rows.
+
+    Hooked at the ORM level because messages are written from many paths
+    (webhooks, sync workers, copilot, onboarding). Raw-SQL and bulk inserts
+    bypass it — rebuild those leads (rebuild_signal_state,
+    batch_recalculate_scores(rebuild=True)) or flag them with
+    mark_signal_states_stale(); check_signal_state(repair=True) catches the rest.
+    """
+    global _hooks_installed
+    if _hooks_installed:
+        return
+    try:
+        from sqlalchemy import event
+        from sqlalchemy.orm import Session
+
+        event.listen(target if target is not None else Session, "after_flush", _advance_signal_states)
+        _hooks_installed = True
+    except Exception as e:
+        logger.warning(f"[SCORING-V3] Signal state hooks not installed: {e}")
+
+
 # =============================================================================
 # STEP 2: Classify Lead (V3 — 6 Categories)
 # =============================================================================
@@ -435,6 +736,35 @@ def calculate_score(status: str, signals: Dict[str, Any]) -> int:
 # MAIN ENTRY POINT
 # =============================================================================
 
+def _apply_lead_score(lead, signals: Dict[str, Any]) -> Tuple[float, str]:
+    """Steps 2-3 on extracted signals, written onto the lead row."""
+    # Step 2: Classify lead (returns status directly)
+    status = classify_lead(signals)
+
+    # Step 3: Calculate score within type range
+    score = calculate_score(status, signals)
+
+    # Update lead — status is the single source of truth
+    lead.status = status
+    lead.relationship_type = status  # Mirror for backwards compat
+    lead.score = score
+    lead.purchase_intent = score / 100.0  # Derived from score for backwards compat
+    lead.score_updated_at = datetime.now(timezone.utc)
+
+    logger.info(
+        f"[SCORING-V3] {lead.username or lead.platform_user_id}: "
+        f"status={status}, score={score} "
+        f"(msgs={signals['total_messages']}, follower={signals['follower_messages']}, "
+        f"purchase_kw={signals['follower_purchase_hits']}, "
+        f"interest_kw={signals['follower_interest_hits']}, "
+        f"social={signals['social_hits']} "
+        f"[f={signals['follower_social_hits']}/c={signals['creator_social_hits']}], "
+        f"bidir={signals['bidirectional_ratio']:.2f})"
+    )
+
+    return score / 100.0, status
+
+
 def recalculate_lead_score(session, lead_id: str) -> Optional[Tuple[float, str]]:
     """
     Recalculate a lead's score using V3 6-category classification.
@@ -442,7 +772,7 @@ def recalculate_lead_score(session, lead_id: str) -> Optional[Tuple[float, str]]
     This is the SINGLE SOURCE OF TRUTH for lead scoring.
     All code paths that need to update a lead's score should call this function.
 
-    Pipeline: extract_signals -> classify_lead -> calculate_score
+    Pipeline: get_signal_state -> signals_from_state -> classify_lead -> calculate_score
 
     Args:
         session: SQLAlchemy session
@@ -463,40 +793,38 @@ def recalculate_lead_score(session, lead_id: str) -> Optional[Tuple[float, str]]
         logger.warning(f"[SCORING-V3] Lead not found: {lead_id}")
         return None
 
-    # Step 1: Extract signals
-    signals = extract_signals(session, lead)
+    # Step 1: Signals from the incrementally maintained state
+    signals = signals_from_state(get_signal_state(session, lead.id), lead)
 
-    # Step 2: Classify lead (returns status directly)
-    status = classify_lead(signals)
+    return _apply_lead_score(lead, signals)
 
-    # Step 3: Calculate score within type range
-    score = calculate_score(status, signals)
 
-    # Update lead — status is the single source of truth
-    lead.status = status
-    lead.relationship_type = status  # Mirror for backwards compat
-    lead.score = score
-    lead.purchase_intent = score / 100.0  # Derived from score for backwards compat
-    lead.score_updated_at = datetime.now(timezone.utc)
+def _score_leads(session, leads: List[Any], rebuild: bool = False) -> Tuple[Dict[str, int], int]:
+    """Score already-loaded leads from one bulk state read.
 
-    logger.info(
-        f"[SCORING-V3] {lead.username or lead.platform_user_id}: "
-        f"status={status}, score={score} "
-        f"(msgs={signals['total_messages']}, follower={signals['follower_messages']}, "
-        f"purchase_kw={signals['follower_purchase_hits']}, "
-        f"interest_kw={signals['follower_interest_hits']}, "
-        f"social={signals['social_hits']} "
-        f"[f={signals['follower_social_hits']}/c={signals['creator_social_hits']}], "
-        f"bidir={signals['bidirectional_ratio']:.2f})"
-    )
+    Returns (count by status, number of leads whose state had to be rescanned).
+    """
+    states = {} if rebuild else load_signal_states(session, [lead.id for lead in leads])
 
-    return score / 100.0, status
+    by_status: Dict[str, int] = {}
+    rebuilt = 0
+    for lead in leads:
+        state = states.get(str(lead.id))
+        if state is None:
+            state = rebuild_signal_state(session, lead.id)
+            rebuilt += 1
+        _, status = _apply_lead_score(lead, signals_from_state(state, lead))
+        by_status[status] = by_status.get(status, 0) + 1
+    return by_status, rebuilt
 
 
-def batch_recalculate_scores(session, creator_id: str) -> dict:
+def batch_recalculate_scores(session, creator_id: str, rebuild: bool = False) -> dict:
     """
     Recalculate scores for all leads of a creator using V3 algorithm.
 
+    rebuild=True rescans every lead's messages first — use after bulk or raw-SQL
+    message imports, which bypass the signal state hooks.
+
     Returns distribution by status for verification.
     """
     from api.models import Creator, Lead
@@ -512,30 +840,25 @@ def batch_recalculate_scores(session, creator_id: str) -> dict:
 
     leads = session.query(Lead).filter_by(creator_id=creator.id).limit(100).all()
 
+    by_status, rebuilt = _score_leads(session, leads, rebuild=rebuild)
     results = {
         "total": len(leads),
-        "updated": 0,
-        "by_status": {},
+        "updated": len(leads),
+        "rebuilt": rebuilt,
+        "by_status": by_status,
     }
 
-    for lead in leads:
-        result = recalculate_lead_score(session, str(lead.id))
-        if result:
-            results["updated"] += 1
-            _, status = result
-            results["by_status"][status] = results["by_status"].get(status, 0) + 1
-
     session.commit()
 
     logger.info(
-        f"[SCORING-V3] Batch complete: {results['updated']}/{results['total']} leads. "
-        f"Status: {results['by_status']}"
+        f"[SCORING-V3] Batch complete: {results['updated']}/{results['total']} leads "
+        f"({rebuilt} rescanned). Status: {results['by_status']}"
     )
 
     return results
 
 
-def batch_recalculate_scores_paged(creator_id: str, batch_size: int = 25) -> dict:
+def batch_recalculate_scores_paged(creator_id: str, batch_size: int = 25, rebuild: bool = False) -> dict:
     """
     Recalculate scores for all leads of a creator using small, independent batches.
 
@@ -544,10 +867,10 @@ def batch_recalculate_scores_paged(creator_id: str, batch_size: int = 25) -> dic
     closed before the next batch starts. This prevents monopolizing the connection
     pool during long scoring runs (1500+ leads across all creators).
 
-    A 50ms sleep between batches gives other queries a window to acquire a connection.
+    Each page is one lead query plus one signal state query; only leads without
+    a usable state rescan their messages. Pages that rescanned pause 1s so
+    other queries get a window to acquire a connection.
     """
-    import time
-
     from api.database import SessionLocal
     from api.models import Creator, Lead
 
@@ -572,20 +895,21 @@ def batch_recalculate_scores_paged(creator_id: str, batch_size: int = 25) -> dic
     finally:
         session.close()
 
-    results: dict = {"total": len(lead_ids), "updated": 0, "by_status": {}}
+    results: dict = {"total": len(lead_ids), "updated": 0, "rebuilt": 0, "by_status": {}}
 
     # --- Step 2: process in pages, each page with its own short-lived session ---
     for page_start in range(0, len(lead_ids), batch_size):
         batch = lead_ids[page_start : page_start + batch_size]
+        rebuilt = 0
         session = SessionLocal()
         try:
-            for lead_id in batch:
-                result = recalculate_lead_score(session, lead_id)
-                if result:
-                    results["updated"] += 1
-                    _, status = result
-                    results["by_status"][status] = results["by_status"].get(status, 0) + 1
+            leads = session.query(Lead).filter(Lead.id.in_(batch)).all()
+            by_status, rebuilt = _score_leads(session, leads, rebuild=rebuild)
             session.commit()
+            results["updated"] += len(leads)
+            results["rebuilt"] += rebuilt
+            for status, count in by_status.items():
+                results["by_status"][status] = results["by_status"].get(status, 0) + count
         except Exception as e:
             logger.warning(f"[SCORING-V3] Batch page {page_start // batch_size + 1} error: {e}")
             try:
@@ -597,11 +921,11 @@ def batch_recalculate_scores_paged(creator_id: str, batch_size: int = 25) -> dic
 
         # Pause between batches so API requests can acquire a DB connection.
         # 1s gives conversations endpoint (now capped at 500 leads, ~3s) time to acquire.
-        if page_start + batch_size < len(lead_ids):
+        if rebuilt and page_start + batch_size < len(lead_ids):
             time.sleep(1.0)
 
     logger.info(
-        f"[SCORING-V3] Paged complete: {results['updated']}/{results['total']} leads. "
-        f"Status: {results['by_status']}"
+        f"[SCORING-V3] Paged complete: {results['updated']}/{results['total']} leads "
+        f"({results['rebuilt']} rescanned). Status: {results['by_status']}"
     )
     return results
@@ -0,0 +1,430 @@
+"""
+Content-addressed media store for message attachments.
+
+msg_metadata used to carry media inline as base64 (story thumbnails saved as
+data: URLs, legacy thumbnail_base64 previews), so every query touching the
+column dragged the blobs across the wire. Blobs now live in a store keyed by
+their sha256 and messages keep only a URL:
+
+- FilesystemMediaBackend — files under MEDIA_STORE_PATH, served by the cached
+  GET /media/{sha256} endpoint (api/routers/media.py);
+- CloudinaryMediaBackend — the existing CloudinaryService, public_id = sha256.
+
+The filesystem backend is only used when MEDIA_STORE_BACKEND=filesystem says
+MEDIA_STORE_PATH is durable storage (a mounted volume); a container's local
+disk is wiped on redeploy. With no durable backend the store is "inline":
+nothing is externalized and blobs stay in msg_metadata as before.
+
+Identical blobs are stored once. Writers externalize their own media off the
+event loop (core/story_thumbnail.py). install_media_store_hooks() is a safety
+net on every Message flush for the local filesystem backend only; blobs that
+reach a flush with a network backend stay inline until
+scripts/backfill_message_media.py moves them (backfill_message_media()).
+
+Env vars:
+  MEDIA_STORE_BACKEND           — auto | filesystem | cloudinary (default: auto = cloudinary when configured, else inline)
+  MEDIA_STORE_PATH              — filesystem backend root (default: data/media)
+  MEDIA_STORE_CLOUDINARY_FOLDER — Cloudinary folder (default: clonnect/media)
+  MEDIA_PUBLIC_BASE_URL         — base URL for /media links (default: API_URL)
+  MEDIA_INLINE_MAX_BYTES        — data: URLs up to this size stay inline (default: 2048)
+"""
+
+import base64
+import binascii
+import hashlib
+import logging
+import os
+import re
+import tempfile
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from core.cache import BoundedTTLCache
+from core.observability.metrics import emit_metric
+
+logger = logging.getLogger(__name__)
+
+MEDIA_STORE_BACKEND = os.getenv("MEDIA_STORE_BACKEND", "auto").lower()
+MEDIA_STORE_PATH = os.getenv("MEDIA_STORE_PATH", "data/media")
+MEDIA_STORE_CLOUDINARY_FOLDER = os.getenv("MEDIA_STORE_CLOUDINARY_FOLDER", "clonnect/media")
+MEDIA_PUBLIC_BASE_URL = os.getenv(
+    "MEDIA_PUBLIC_BASE_URL", os.getenv("API_URL", "https://api.clonnectapp.com")
+).rstrip("/")
+MEDIA_INLINE_MAX_BYTES = int(os.getenv("MEDIA_INLINE_MAX_BYTES", "2048"))
+
+_SHA256_RE = re.compile(r"^[0-9a-f]{64}$")
+_DATA_URL_RE = re.compile(r"^data:([\w.+-]+/[\w.+-]+)?(?:;[\w-]+=[^;,]*)*;base64,", re.IGNORECASE)
+
+# Keys that held raw base64 without the data: prefix → key for the stored URL
+_LEGACY_BLOB_KEYS = {"thumbnail_base64": "thumbnail_url"}
+
+
+def is_media_hash(value: str) -> bool:
+    return bool(value) and bool(_SHA256_RE.match(value))
+
+
+def parse_data_url(value: str) -> Optional[Tuple[bytes, str]]:
+    """(content, content_type) for a base64 data: URL, None for anything else."""
+    if not isinstance(value, str):
+        return None
+    match = _DATA_URL_RE.match(value)
+    if not match:
+        return None
+    try:
+        content = base64.b64decode(value[match.end():], validate=False)
+    except (binascii.Error, ValueError):
+        return None
+    return content, (match.group(1) or "application/octet-stream").lower()
+
+
+def _decode_base64(value: str) -> Optional[bytes]:
+    try:
+        return base64.b64decode(value, validate=True)
+    except (binascii.Error, ValueError):
+        return None
+
+
+@dataclass
+class StoredMedia:
+    sha256: str
+    url: str
+    content_type: str
+    size: int
+
+
+class FilesystemMediaBackend:
+    """Blobs at root/ab/cd/<sha256>, content type in a .type sidecar."""
+
+    name = "filesystem"
+
+    def __init__(self, root: str = MEDIA_STORE_PATH, base_url: str = MEDIA_PUBLIC_BASE_URL):
+        self.root = root
+        self.base_url = base_url.rstrip("/")
+
+    def _path(self, sha256: str) -> str:
+        return os.path.join(self.root, sha256[:2], sha256[2:4], sha256)
+
+    def url_for(self, sha256: str) -> str:
+        return f"{self.base_url}/media/{sha256}"
+
+    def put(self, sha256: str, content: bytes, content_type: str) -> str:
+        path = self._path(sha256)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            for target, data in ((path + ".type", content_type.encode()), (path, content)):
+                fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+                try:
+                    with os.fdopen(fd, "wb") as fh:
+                        fh.write(data)
+                    os.replace(tmp, target)
+                except BaseException:
+                    if os.path.exists(tmp):
+                        os.unlink(tmp)
+                    raise
+        return self.url_for(sha256)
+
+    def get(self, sha256: str) -> Optional[Tuple[bytes, str]]:
+        path = self._path(sha256)
+        try:
+            with open(path, "rb") as fh:
+                content = fh.read()
+        except FileNotFoundError:
+            return None
+        try:
+            with open(path + ".type", "r") as fh:
+                content_type = fh.read().strip() or "application/octet-stream"
+        except FileNotFoundError:
+            content_type = "application/octet-stream"
+        return content, content_type
+
+
+class CloudinaryMediaBackend:
+    """Uploads through CloudinaryService; the sha256 is the public_id, so re-uploads overwrite in place."""
+
+    name = "cloudinary"
+
+    def __init__(self, service=None, folder: str = MEDIA_STORE_CLOUDINARY_FOLDER):
+        if service is None:
+            from services.cloudinary_service import get_cloudinary_service
+            service = get_cloudinary_service()
+        self.service = service
+        self.folder = folder
+
+    def put(self, sha256: str, content: bytes, content_type: str) -> str:
+        media_type = content_type.split("/", 1)[0] if "/" in content_type else "image"
+        data_url = f"data:{content_type};base64,{base64.b64encode(content).decode('ascii')}"
+        result = self.service.upload_from_url(
+            data_url, media_type=media_type, folder=self.folder, public_id=sha256, tags=["media_store"],
+        )
+        if not result.success or not result.url:
+            raise RuntimeError(f"Cloudinary upload failed: {result.error}")
+        return result.url
+
+    def get(self, sha256: str) -> Optional[Tuple[bytes, str]]:
+        return None  # served by Cloudinary's CDN, never by /media
+
+
+class MediaStoreUnavailable(RuntimeError):
+    """No durable backend is configured; the caller keeps the blob inline."""
+
+
+class InlineMediaBackend:
+    """Stand-in when no durable backend is configured: refuses every write."""
+
+    name = "inline"
+    durable = False
+
+    def put(self, sha256: str, content: bytes, content_type: str) -> str:
+        raise MediaStoreUnavailable("no durable media backend configured")
+
+    def get(self, sha256: str) -> Optional[Tuple[bytes, str]]:
+        return None
+
+
+class MediaStore:
+    """sha256-keyed put/get plus msg_metadata externalization."""
+
+    def __init__(self, backend, inline_max_bytes: int = MEDIA_INLINE_MAX_BYTES):
+        self.backend = backend
+        self.inline_max_bytes = inline_max_bytes
+        # sha256 → URL, so repeated blobs (same sticker, same story) skip the backend
+        self._urls = BoundedTTLCache(max_size=5000, ttl_seconds=3600, name="media_store_urls")
+        # sha256 → (content, content_type) for /media reads
+        self._hot = BoundedTTLCache(max_size=64, ttl_seconds=600, name="media_store_hot")
+
+    @property
+    def durable(self) -> bool:
+        return getattr(self.backend, "durable", True)
+
+    def put(self, content: bytes, content_type: str = "application/octet-stream") -> StoredMedia:
+        sha256 = hashlib.sha256(content).hexdigest()
+        url = self._urls.get(sha256)
+        if url is None:
+            url = self.backend.put(sha256, content, content_type)
+            self._urls.set(sha256, url)
+            emit_metric("media_store_bytes_total", len(content), backend=self.backend.name)
+        return StoredMedia(sha256=sha256, url=url, content_type=content_type, size=len(content))
+
+    def put_data_url(self, data_url: str) -> Optional[StoredMedia]:
+        parsed = parse_data_url(data_url)
+        if parsed is None:
+            return None
+        content, content_type = parsed
+        return self.put(content, content_type)
+
+    def get(self, sha256: str) -> Optional[Tuple[bytes, str]]:
+        if not is_media_hash(sha256):
+            return None
+        return self._hot.get_or_load(sha256, lambda: self.backend.get(sha256))
+
+    def _externalize_value(self, value: Any, refs: List[str]) -> Any:
+        if isinstance(value, dict):
+            return self._externalize_dict(value, refs)
+        if isinstance(value, list):
+            return [self._externalize_value(v, refs) for v in value]
+        if isinstance(value, str) and len(value) > self.inline_max_bytes:
+            stored = self.put_data_url(value)
+            if stored is not None:
+                refs.append(stored.sha256)
+                return stored.url
+        return value
+
+    def _externalize_dict(self, meta: Dict[str, Any], refs: List[str]) -> Dict[str, Any]:
+        out: Dict[str, Any] = {}
+        legacy_urls: Dict[str, str] = {}
+        for key, value in meta.items():
+            url_key = _LEGACY_BLOB_KEYS.get(key)
+            if url_key and isinstance(value, str):
+                parsed = parse_data_url(value)
+                content = parsed[0] if parsed else _decode_base64(value)
+                if content:
+                    stored = self.put(content, parsed[1] if parsed else "image/jpeg")
+                    refs.append(stored.sha256)
+                    legacy_urls[url_key] = stored.url
+                    continue
+            out[key] = self._externalize_value(value, refs)
+        for url_key, url in legacy_urls.items():
+            if not out.get(url_key):  # an existing CDN URL wins
+                out[url_key] = url
+        return out
+
+    def externalize(self, meta: Optional[Dict[str, Any]]) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """Replace inline blobs in a msg_metadata dict with store URLs.
+
+        Returns (metadata, changed). Stored hashes are appended to
+        metadata["media_refs"]. Without a durable backend the metadata is
+        returned unchanged. Backend errors propagate; callers decide whether
+        to keep the blob inline.
+        """
+        if not isinstance(meta, dict) or not self.durable:
+            return meta, False
+        refs: List[str] = []
+        out = self._externalize_dict(meta, refs)
+        if not refs:
+            return meta, False
+        out["media_refs"] = list(dict.fromkeys(list(meta.get("media_refs") or []) + refs))
+        return out, True
+
+
+def media_backend_from_env():
+    """Backend named by MEDIA_STORE_BACKEND; the filesystem one is never picked implicitly."""
+    backend = MEDIA_STORE_BACKEND
+    if backend == "filesystem":
+        return FilesystemMediaBackend()
+    if backend not in ("auto", "cloudinary"):
+        logger.warning(f"[MEDIA-STORE] Unknown MEDIA_STORE_BACKEND={backend!r}, keeping media inline")
+        return InlineMediaBackend()
+    try:
+        from services.cloudinary_service import get_cloudinary_service
+        configured = get_cloudinary_service().is_configured
+    except Exception as e:
+        logger.warning(f"[MEDIA-STORE] Cloudinary unavailable, keeping media inline: {e}")
+        return InlineMediaBackend()
+    if not configured:
+        if backend == "cloudinary":
+            logger.warning("[MEDIA-STORE] Cloudinary not configured, keeping media inline")
+        return InlineMediaBackend()
+    return CloudinaryMediaBackend()
+
+
+_store: Optional[MediaStore] = None
+
+
+def get_media_store() -> MediaStore:
+    global _store
+    if _store is None:
+        _store = MediaStore(media_backend_from_env())
+        logger.info(f"[MEDIA-STORE] backend={_store.backend.name}")
+    return _store
+
+
+def get_media_store_stats() -> Dict[str, Any]:
+    store = get_media_store()
+    return {
+        "backend": store.backend.name,
+        "durable": store.durable,
+        "inline_max_bytes": store.inline_max_bytes,
+        "url_cache": store._urls.stats(),
+        "hot_cache": store._hot.stats(),
+    }
+
+
+# =============================================================================
+# ORM hook + backfill
+# =============================================================================
+
+_hooks_installed = False
+
+
+def _externalize_pending_messages(session, flush_context, instances) -> None:
+    from api.models import Message
+
+    store = get_media_store()
+    if not isinstance(store.backend, FilesystemMediaBackend):
+        # No network uploads inside a flush: the transaction is open and sync
+        # sessions run inside async handlers. The backfill script moves them.
+        return
+    for obj in list(session.new) + list(session.dirty):
+        if not isinstance(obj, Message) or not obj.msg_metadata:
+            continue
+        try:
+            meta, changed = store.externalize(obj.msg_metadata)
+        except Exception as e:
+            logger.warning(f"[MEDIA-STORE] Keeping media inline for message {obj.id}: {e}")
+            continue
+        if changed:
+            obj.msg_metadata = meta
+
+
+def install_media_store_hooks(target=None) -> None:
+    """Externalize inline media on every flush that saves Message rows.
+
+    Hooked at the ORM level because msg_metadata is written from many paths
+    (webhooks, sync workers, media capture). Only the filesystem backend is
+    written from the hook; raw-SQL writes and network backends are left to
+    backfill_message_media().
+    """
+    global _hooks_installed
+    if _hooks_installed:
+        return
+    try:
+        from sqlalchemy import event
+        from sqlalchemy.orm import Session
+
+        event.listen(target if target is not None else Session, "before_flush", _externalize_pending_messages)
+        _hooks_installed = True
+    except Exception as e:
+        logger.warning(f"[MEDIA-STORE] Flush hooks not installed: {e}")
+
+
+# Rows that can hold a blob: any data: URL in the JSON text, or a legacy key
+_BACKFILL_SELECT = """
+    SELECT id, msg_metadata
+    FROM messages
+    WHERE id > CAST(:after AS uuid)
+      AND msg_metadata IS NOT NULL
+      AND (msg_metadata::text LIKE '%;base64,%' OR msg_metadata ? 'thumbnail_base64')
+    ORDER BY id
+    LIMIT :batch_size
+"""
+
+
+# Only rewrites a row whose metadata is still what the batch read
+_BACKFILL_UPDATE = """
+    UPDATE messages SET msg_metadata = CAST(:meta AS jsonb)
+    WHERE id = CAST(:id AS uuid) AND msg_metadata = CAST(:old AS jsonb)
+"""
+
+
+def backfill_message_media(
+    engine,
+    store: Optional[MediaStore] = None,
+    batch_size: int = 200,
+    progress: Optional[Callable[[Dict[str, int]], None]] = None,
+) -> Dict[str, int]:
+    """Move inline blobs from existing messages into the store.
+
+    Streams keyset batches ordered by id, so memory stays at one batch of
+    rows however large the table is. Uploads run outside any transaction and
+    each batch's updates commit on their own, so an interrupted run keeps
+    its progress and a rerun skips rows already moved. A row changed since
+    its batch was read is left for the next run.
+    """
+    import json
+
+    from sqlalchemy import text
+
+    store = store or get_media_store()
+    if not store.durable:
+        raise MediaStoreUnavailable("no durable media backend configured; set MEDIA_STORE_BACKEND")
+    select = text(_BACKFILL_SELECT)
+    update = text(_BACKFILL_UPDATE)
+    counts = {"scanned": 0, "updated": 0, "failed": 0}
+    after = "00000000-0000-0000-0000-000000000000"
+    while True:
+        with engine.connect() as conn:
+            rows = conn.execute(select, {"after": after, "batch_size": batch_size}).fetchall()
+        if not rows:
+            break
+        updates = []
+        for row_id, meta in rows:
+            counts["scanned"] += 1
+            if isinstance(meta, str):
+                meta = json.loads(meta)
+            try:
+                new_meta, changed = store.externalize(meta)
+            except Exception as e:
+                counts["failed"] += 1
+                logger.warning(f"[MEDIA-STORE] Backfill skipped message {row_id}: {e}")
+                continue
+            if changed:
+                updates.append({"id": str(row_id), "meta": json.dumps(new_meta), "old": json.dumps(meta)})
+        if updates:
+            with engine.begin() as conn:
+                for params in updates:
+                    counts["updated"] += conn.execute(update, params).rowcount
+        after = str(rows[-1][0])
+        if progress:
+            progress(dict(counts))
+    logger.info(f"[MEDIA-STORE] Backfill done: {counts}")
+    return counts
@@ -48,7 +48,7 @@ DECAY_THRESHOLD = float(os.getenv("MEMORY_DECAY_THRESHOLD", "0.1"))
 from core.cache import BoundedTTLCache as _BoundedTTLCache
 _RECALL_CACHE_MAX_SIZE = int(os.getenv("MEMORY_RECALL_CACHE_MAX_SIZE", "500"))
 _RECALL_CACHE_TTL = int(os.getenv("MEMORY_RECALL_CACHE_TTL", "60"))
-_recall_cache = _BoundedTTLCache(max_size=_RECALL_CACHE_MAX_SIZE, ttl_seconds=_RECALL_CACHE_TTL)
+_recall_cache = _BoundedTTLCache(max_size=_RECALL_CACHE_MAX_SIZE, ttl_seconds=_RECALL_CACHE_TTL, name="memory_recall")
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -164,28 +164,10 @@ class MemoryEngine:
     @staticmethod
     async def _resolve_creator_uuid(creator_id: str) -> str:
         """Return the DB UUID for a creator, resolving slug names if needed."""
+        from core.identity_map import identity_map
+
         try:
-            uuid.UUID(creator_id)
-            return creator_id  # Already a valid UUID
-        except (ValueError, AttributeError):
-            pass
-        # Slug path: look up by name
-        def _lookup():
-            from api.database import SessionLocal
-            from sqlalchemy import text
-            session = SessionLocal()
-            try:
-                row = session.execute(
-                    text("SELECT id FROM creators WHERE name = :name LIMIT 1"),
-                    {"name": creator_id},
-                ).fetchone()
-                if row:
-                    return str(row[0])
-            finally:
-                session.close()
-            return None
-        try:
-            result = await asyncio.to_thread(_lookup)
+            result = await identity_map.aresolve_creator_uuid(creator_id)
             if result:
                 return result
         except Exception as e:
@@ -195,52 +177,14 @@ class MemoryEngine:
     async def _resolve_lead_uuid(self, creator_uuid: str, lead_id: str) -> str:
         """Return the DB UUID for a lead, resolving platform_user_id if needed.
 
-        BUG-001 fix: Strip platform prefixes (ig_, wa_, tg_) before building
-        the search array so both "ig_1234567890" and "1234567890" resolve to
-        the same lead regardless of how platform_user_id is stored in the DB.
+        BUG-001 fix: "ig_1234567890" and "1234567890" resolve to the same
+        lead regardless of how platform_user_id is stored in the DB (the
+        identity map matches every ig_/wa_/tg_ variant).
         """
+        from core.identity_map import identity_map
+
         try:
-            uuid.UUID(lead_id)
-            return lead_id  # Already a valid UUID
-        except (ValueError, AttributeError):
-            pass
-
-        # Strip platform prefix to get raw numeric ID (BUG-001)
-        raw_id = lead_id
-        for prefix in ("ig_", "wa_", "tg_"):
-            if raw_id.startswith(prefix):
-                raw_id = raw_id[len(prefix):]
-                break
-
-        # platform_user_id path: look up by creator + platform_user_id
-        def _lookup():
-            from api.database import SessionLocal
-            from sqlalchemy import text
-            session = SessionLocal()
-            try:
-                row = session.execute(
-                    text(
-                        "SELECT id FROM leads "
-                        "WHERE creator_id = CAST(:cid AS uuid) "
-                        "AND platform_user_id = ANY(ARRAY[:pid, :pid_raw, :pid_ig, :pid_wa, :pid_tg]) "
-                        "LIMIT 1"
-                    ),
-                    {
-                        "cid": creator_uuid,
-                        "pid": lead_id,
-                        "pid_raw": raw_id,
-                        "pid_ig": f"ig_{raw_id}",
-                        "pid_wa": f"wa_{raw_id}",
-                        "pid_tg": f"tg_{raw_id}",
-                    },
-                ).fetchone()
-                if row:
-                    return str(row[0])
-            finally:
-                session.close()
-            return None
-        try:
-            result = await asyncio.to_thread(_lookup)
+            result = await identity_map.aresolve_lead_uuid(creator_uuid, lead_id)
             if result:
                 return result
         except Exception as e:
@@ -758,7 +702,7 @@ class MemoryEngine:
                 # Strip any JSON/markdown wrapping the LLM might add
                 if text.startswith("```"):
                     lines = text.split("\n")
-                    lines = [l for l in lines if not l.strip().startswith("```")]
+                    lines = [line for line in lines if not line.strip().startswith("```")]
                     text = "\n".join(lines).strip()
                 if text.startswith("{") and text.endswith("}"):
                     # LLM wrapped in JSON despite instructions — extract the value
@@ -783,7 +727,7 @@ class MemoryEngine:
         text = response.strip()
         if text.startswith("```"):
             lines = text.split("\n")
-            lines = [l for l in lines if not l.strip().startswith("```")]
+            lines = [line for line in lines if not line.strip().startswith("```")]
             text = "\n".join(lines)
 
         try:
@@ -820,9 +764,9 @@ class MemoryEngine:
             return []
 
         try:
-            from core.embeddings import generate_embeddings_batch
+            from core.embeddings import agenerate_embeddings_batch
 
-            return await asyncio.to_thread(generate_embeddings_batch, texts)
+            return await agenerate_embeddings_batch(texts)
         except Exception as e:
             logger.error("[MemoryEngine] Batch embedding generation failed: %s", e)
             return [None] * len(texts)
@@ -2,7 +2,8 @@
 Memory Service - Manage follower conversation memory.
 
 Extracted from dm_agent.py as part of REFACTOR-PHASE2.
-Provides in-memory caching with JSON file persistence.
+Provides in-memory caching with persistence in the shared follower store
+(core.follower_store).
 """
 import json
 import logging
@@ -163,7 +164,10 @@ class MemoryStore:
     """
     Store for follower memory.
 
-    Provides BoundedTTLCache with JSON file persistence.
+    Thin facade over the process-wide FollowerStore (core.follower_store):
+    SQLite persistence with write-behind on a dedicated I/O thread, plus a
+    BoundedTTLCache of FollowerMemory objects shared by every MemoryStore
+    on the same storage path.
     """
 
     def __init__(self, storage_path: str = "data/followers") -> None:
@@ -171,61 +175,26 @@ class MemoryStore:
         Initialize memory store.
 
         Args:
-            storage_path: Directory path for JSON file storage
+            storage_path: Directory holding the follower database (and legacy JSON files)
         """
+        from core.follower_store import get_follower_store
+
         self.storage_path = storage_path
-        os.makedirs(storage_path, exist_ok=True)
+        self._store = get_follower_store(storage_path)
         # BUG-MEM-07 fix: bounded cache instead of unbounded dict
-        from core.cache import BoundedTTLCache
-        self._cache = BoundedTTLCache(max_size=500, ttl_seconds=600)
-        logger.info(f"[MemoryStore] Initialized with path: {storage_path}")
+        self._cache = self._store.object_cache("services.memory_service")
 
     def _get_cache_key(self, creator_id: str, follower_id: str) -> str:
         """Generate cache key for creator/follower pair."""
         return f"{creator_id}:{follower_id}"
 
-    def _get_file_path(self, creator_id: str, follower_id: str) -> str:
-        """Get JSON file path for a follower."""
-        creator_dir = os.path.join(self.storage_path, creator_id)
-        os.makedirs(creator_dir, exist_ok=True)
-        # Sanitize follower_id for filename
-        safe_id = follower_id.replace("/", "_").replace("\\", "_")
-        return os.path.join(creator_dir, f"{safe_id}.json")
-
-    def _load_from_json(
-        self, creator_id: str, follower_id: str
-    ) -> Optional[FollowerMemory]:
-        """Load follower memory from JSON file."""
-        file_path = self._get_file_path(creator_id, follower_id)
-        if not os.path.exists(file_path):
-            return None
-
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                return FollowerMemory.from_dict(data)
-        except Exception as e:
-            logger.error(f"[MemoryStore] Error loading from JSON: {e}")
-            return None
-
-    def _save_to_json(self, memory: FollowerMemory) -> bool:
-        """Save follower memory to JSON file."""
-        file_path = self._get_file_path(memory.creator_id, memory.follower_id)
-        try:
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump(memory.to_dict(), f, indent=2, ensure_ascii=False)
-            return True
-        except Exception as e:
-            logger.error(f"[MemoryStore] Error saving to JSON: {e}")
-            return False
-
     async def get(
         self, creator_id: str, follower_id: str
     ) -> Optional[FollowerMemory]:
         """
         Get follower memory.
 
-        Checks cache first, then loads from JSON if not cached.
+        Checks cache first, then loads from the follower store if not cached.
 
         Args:
             creator_id: Creator identifier
@@ -242,26 +211,34 @@ class MemoryStore:
             logger.debug(f"[MemoryStore] Cache hit for {follower_id}")
             return cached
 
-        # Load from JSON
-        memory = self._load_from_json(creator_id, follower_id)
-        if memory:
-            self._cache.set(cache_key, memory)
-            logger.debug(f"[MemoryStore] Loaded {follower_id} from JSON")
+        try:
+            data = await self._store.aget(creator_id, follower_id)
+        except Exception as e:
+            logger.error(f"[MemoryStore] Error loading from store: {e}")
+            return None
+        if data is None:
+            return None
 
+        memory = FollowerMemory.from_dict(data)
+        self._cache.set(cache_key, memory)
+        logger.debug(f"[MemoryStore] Loaded {follower_id} from store")
         return memory
 
     async def save(self, memory: FollowerMemory) -> None:
         """
         Save follower memory.
 
-        Updates cache and persists to JSON.
+        Updates cache and queues the record for write-behind persistence.
 
         Args:
             memory: FollowerMemory to save
         """
         cache_key = self._get_cache_key(memory.creator_id, memory.follower_id)
         self._cache.set(cache_key, memory)
-        self._save_to_json(memory)
+        try:
+            self._store.put(memory.to_dict())
+        except Exception as e:
+            logger.error(f"[MemoryStore] Error saving to store: {e}")
         logger.debug(f"[MemoryStore] Saved {memory.follower_id}")
         # ARC2 A2.4: dual-write (fire-and-forget, fail-silent)
         try:
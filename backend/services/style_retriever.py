@@ -735,9 +735,29 @@ async def curate_examples(creator_id: str, creator_db_id) -> Dict[str, Any]:
 
 
 def _invalidate_examples_cache(creator_db_id_str: str):
-    """Remove all cache entries for a creator. Thread-safe."""
+    """Remove all cache entries for a creator, in this and every other worker."""
+    from core.invalidation_bus import InvalidationTopic, publish_invalidation
+
+    publish_invalidation(InvalidationTopic.STYLE_EXAMPLES, creator_db_id_str)
+
+
+def _drop_examples_cache(creator_db_id_str: Optional[str]):
+    """Local handler for STYLE_EXAMPLES invalidations. Thread-safe."""
     with _cache_lock:
+        if creator_db_id_str is None:
+            _examples_cache.clear()
+            _examples_cache_ts.clear()
+            return
         keys_to_remove = [k for k in _examples_cache if k.startswith(creator_db_id_str)]
         for k in keys_to_remove:
             _examples_cache.pop(k, None)
             _examples_cache_ts.pop(k, None)
+
+
+def _subscribe_invalidations():
+    from core.invalidation_bus import InvalidationTopic, get_invalidation_bus
+
+    get_invalidation_bus().subscribe(InvalidationTopic.STYLE_EXAMPLES, _drop_examples_cache)
+
+
+_subscribe_invalidations()
@@ -533,7 +533,8 @@ class WhatsAppOnboardingPipeline:
 
             session = SessionLocal()
             try:
-                score_results = batch_recalculate_scores(session, self.creator_name)
+                # Messages were bulk-inserted (no ORM hooks) — rescan signal state
+                score_results = batch_recalculate_scores(session, self.creator_name, rebuild=True)
                 results["scoring"] = score_results
             finally:
                 session.close()
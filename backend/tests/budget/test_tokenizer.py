@@ -163,6 +163,85 @@ class TestGeminiProvider:
         assert tc.truncate("hello", 0) == ""
 
     def test_resolve_falls_back_on_import_error(self):
-        with patch.dict("sys.modules", {"google.generativeai": None}):
+        with patch.dict("os.environ", {"TOKEN_COUNTER_GEMINI_MODE": "remote"}), \
+             patch.dict("sys.modules", {"google.generativeai": None}):
             tc = TokenCounter(provider="gemini", model="gemini-2.5-flash-lite")
         assert tc._impl is None
+
+    def test_remote_failure_not_memoized(self):
+        tc = TokenCounter(provider="unknown", model="x")
+        tc.provider = "gemini"
+        model_mock = MagicMock()
+        model_mock.count_tokens.side_effect = [RuntimeError("API down"), MagicMock(total_tokens=7)]
+        tc._impl = model_mock
+
+        assert tc.count("a" * 40) == 10   # fallback estimate
+        assert tc.count("a" * 40) == 7    # retried remotely, not served from cache
+        assert tc.count("a" * 40) == 7    # now cached
+        assert model_mock.count_tokens.call_count == 2
+
+
+class TestGeminiLocalMode:
+    """Gemini local mode: offline GeminiLocalTokenizer + content-hash LRU."""
+
+    def test_unfitted_calibration_falls_back_to_remote(self, tmp_path, monkeypatch):
+        import json
+
+        import core.dm.budget.local_tokenizer as local_tokenizer
+
+        calibration = tmp_path / "calibration.json"
+        calibration.write_text(json.dumps({"samples": 0, "params": {}}))
+        monkeypatch.delenv("TOKEN_COUNTER_GEMINI_MODE", raising=False)
+        monkeypatch.setenv("GEMINI_SPM_MODEL_PATH", str(tmp_path / "missing.model"))
+        monkeypatch.setattr(local_tokenizer, "CALIBRATION_PATH", calibration)
+
+        tc = TokenCounter(provider="gemini", model="gemini-2.5-flash-lite")
+        assert not isinstance(tc._impl, local_tokenizer.GeminiLocalTokenizer)
+
+        calibration.write_text(json.dumps({"samples": 400, "params": {}}))
+        tc = TokenCounter(provider="gemini", model="gemini-2.5-flash-lite")
+        assert isinstance(tc._impl, local_tokenizer.GeminiLocalTokenizer)
+
+    def test_local_mode_uses_offline_tokenizer(self):
+        from core.dm.budget.local_tokenizer import GeminiLocalTokenizer
+
+        with patch.dict("os.environ", {"TOKEN_COUNTER_GEMINI_MODE": "local"}):
+            tc = TokenCounter(provider="gemini", model="gemini-2.5-flash-lite")
+        assert isinstance(tc._impl, GeminiLocalTokenizer)
+        assert tc.count("Hola, ¿qué tal el curso de yoga?") > 0
+
+    def test_static_section_counted_once(self):
+        with patch.dict("os.environ", {"TOKEN_COUNTER_GEMINI_MODE": "local"}):
+            tc = TokenCounter(provider="gemini", model="gemini-2.5-flash-lite")
+        doc_d = "Eres Iris, instructora de baile. " * 50
+
+        with patch.object(tc._impl, "count", wraps=tc._impl.count) as spy:
+            first = tc.count(doc_d)
+            second = tc.count(doc_d)
+
+        assert first == second
+        assert spy.call_count == 1
+
+    def test_shared_counter_per_provider_model(self):
+        from core.dm.budget.tokenizer import get_token_counter
+
+        a = get_token_counter("gemini", "gemini-2.5-flash-lite")
+        b = get_token_counter("gemini", "gemini-2.5-flash-lite")
+        c = get_token_counter("gemini", "other-model")
+        assert a is b
+        assert a is not c
+
+    def test_approximation_tracks_length(self):
+        from core.dm.budget.local_tokenizer import GeminiLocalTokenizer
+
+        tok = GeminiLocalTokenizer(calibration=None)
+        short = tok.approximate("hola guapa")
+        long = tok.approximate("hola guapa " * 20)
+        assert short == 2
+        assert 35 <= long <= 45
+
+    def test_digits_counted_individually(self):
+        from core.dm.budget.local_tokenizer import GeminiLocalTokenizer, DEFAULT_CALIBRATION
+
+        tok = GeminiLocalTokenizer(calibration=dict(DEFAULT_CALIBRATION))
+        assert tok.approximate("297") == 3
@@ -4,6 +4,8 @@ All fixtures are documented and can be imported from this file.
 """
 import pytest
 import os
+import shutil
+import tempfile
 from datetime import datetime, timedelta
 from unittest.mock import MagicMock
 
@@ -14,12 +16,36 @@ os.environ["OPENAI_API_KEY"] = "test-key"
 os.environ["INSTAGRAM_ACCESS_TOKEN"] = "test-token"
 os.environ["META_APP_SECRET"] = "test-secret"
 
+# api.main builds a MemoryStore at import time, so the default follower store
+# has to be redirected before the app is imported or the tests write
+# data/followers/followers.sqlite3 in the repo.
+import core.follower_store as _follower_store
+
+_FOLLOWER_STORE_DIR = tempfile.mkdtemp(prefix="clonnect-followers-")
+_DEFAULT_FOLLOWER_PATH = os.path.abspath("data/followers")
+_real_get_follower_store = _follower_store.get_follower_store
+
+
+def _test_get_follower_store(storage_path: str = "data/followers"):
+    if os.path.abspath(storage_path) == _DEFAULT_FOLLOWER_PATH:
+        storage_path = _FOLLOWER_STORE_DIR
+    return _real_get_follower_store(storage_path)
+
+
+_follower_store.get_follower_store = _test_get_follower_store
+
 from fastapi.testclient import TestClient
 from api.main import app
 from api.database import get_db
 from api.auth import require_creator_access
 
 
+def pytest_unconfigure(config):
+    """Close the redirected follower store and drop its temp directory."""
+    _follower_store._close_all()
+    shutil.rmtree(_FOLLOWER_STORE_DIR, ignore_errors=True)
+
+
 # =============================================================================
 # DEPENDENCY OVERRIDES FOR TESTING
 # =============================================================================
@@ -0,0 +1,128 @@
+"""Tests for core.dm.loader_graph — DAG executor for context-phase loaders."""
+
+import asyncio
+import time
+
+import pytest
+
+from core.dm.loader_graph import Loader, LoaderGraphError, run_loader_graph
+
+
+def _sleeper(value, delay=0.05):
+    async def _fn(_deps):
+        await asyncio.sleep(delay)
+        return value
+    return _fn
+
+
+@pytest.mark.asyncio
+async def test_independent_loaders_run_concurrently():
+    spans = {}
+    start = time.monotonic()
+    results = await run_loader_graph(
+        [Loader(name, _sleeper(name, 0.1)) for name in ("a", "b", "c", "d")],
+        spans=spans,
+    )
+    elapsed = time.monotonic() - start
+
+    assert results == {"a": "a", "b": "b", "c": "c", "d": "d"}
+    # Max of the loaders, not their sum (0.4s)
+    assert elapsed < 0.3
+    assert {s["status"] for s in spans.values()} == {"ok"}
+
+
+@pytest.mark.asyncio
+async def test_dependencies_receive_upstream_results():
+    async def _double(deps):
+        return deps["base"] * 2
+
+    results = await run_loader_graph([
+        Loader("doubled", _double, deps=("base",)),
+        Loader("base", _sleeper(21)),
+    ])
+    assert results["doubled"] == 42
+
+
+@pytest.mark.asyncio
+async def test_optional_loader_timeout_yields_default():
+    spans = {}
+    results = await run_loader_graph(
+        [
+            Loader("fast", _sleeper("ok", 0.01)),
+            Loader("slow", _sleeper("late", 1.0), timeout_s=0.05, default=""),
+        ],
+        spans=spans,
+    )
+    assert results == {"fast": "ok", "slow": ""}
+    assert spans["slow"]["status"] == "timeout"
+
+
+@pytest.mark.asyncio
+async def test_optional_loader_error_yields_default():
+    async def _boom(_deps):
+        raise RuntimeError("db down")
+
+    spans = {}
+    results = await run_loader_graph([Loader("mem", _boom, default="")], spans=spans)
+    assert results["mem"] == ""
+    assert spans["mem"]["status"] == "error"
+
+
+@pytest.mark.asyncio
+async def test_required_loader_error_propagates():
+    async def _boom(_deps):
+        raise RuntimeError("no follower")
+
+    with pytest.raises(RuntimeError, match="no follower"):
+        await run_loader_graph([
+            Loader("follower", _boom, optional=False),
+            Loader("other", _sleeper("x", 0.01)),
+        ])
+
+
+@pytest.mark.asyncio
+async def test_graph_deadline_drops_optional_but_waits_for_required():
+    spans = {}
+    start = time.monotonic()
+    results = await run_loader_graph(
+        [
+            Loader("required", _sleeper("r", 0.15), optional=False, timeout_s=None),
+            Loader("optional", _sleeper("o", 1.0), timeout_s=None, default=None),
+        ],
+        deadline_s=0.05,
+        spans=spans,
+    )
+    elapsed = time.monotonic() - start
+
+    assert results == {"required": "r", "optional": None}
+    assert spans["optional"]["status"] == "deadline"
+    assert spans["required"]["status"] == "ok"
+    assert elapsed < 0.5
+
+
+@pytest.mark.asyncio
+async def test_optional_dep_failure_passes_default_downstream():
+    async def _boom(_deps):
+        raise RuntimeError("dna down")
+
+    async def _render(deps):
+        return f"dna={deps['raw_dna']!r}"
+
+    results = await run_loader_graph([
+        Loader("raw_dna", _boom, default=None),
+        Loader("dna_context", _render, deps=("raw_dna",)),
+    ])
+    assert results["dna_context"] == "dna=None"
+
+
+@pytest.mark.asyncio
+async def test_invalid_graphs_are_rejected():
+    with pytest.raises(LoaderGraphError, match="unknown"):
+        await run_loader_graph([Loader("a", _sleeper(1), deps=("missing",))])
+    with pytest.raises(LoaderGraphError, match="cycle"):
+        await run_loader_graph([
+            Loader("a", _sleeper(1), deps=("b",)),
+            Loader("b", _sleeper(2), deps=("a",)),
+        ])
+    with pytest.raises(LoaderGraphError, match="duplicate"):
+        await run_loader_graph([Loader("a", _sleeper(1)), Loader("a", _sleeper(2))])
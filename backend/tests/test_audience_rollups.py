@@ -0,0 +1,166 @@
+"""
+Unit tests: audience rollups (core/audience_rollups.py) and the tabs served from them.
+Single pass vs stored facts, freshness, ORM invalidation hook. No DB required.
+"""
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from core import audience_rollups as ar
+from core.audience_aggregator import AudienceAggregator
+
+NOW = datetime.now(timezone.utc)
+
+
+def _row(n, **overrides):
+    fields = dict(
+        id=uuid.UUID(int=n),
+        username=f"user{n}",
+        last_contact=(NOW - timedelta(days=1)).isoformat(),
+        total_messages=6,
+        interests=["yoga"],
+        products_discussed=["curso"],
+        objections_raised=["precio alto"],
+        is_customer=False,
+        last_messages=[
+            {"role": "user", "content": "me encanta el yoga, ¿cuándo empieza el curso?"},
+            {"role": "assistant", "content": "el lunes!"},
+            {"role": "user", "content": "el precio alto me frena, @otrocoach es más barato pero malo"},
+            {"role": "user", "content": "iris eres una experta, gracias por el contenido del curso"},
+        ],
+    )
+    fields.update(overrides)
+    return fields
+
+
+def _db_streaming(rows):
+    db = MagicMock()
+    db.execute.return_value.mappings.return_value = rows
+    return db
+
+
+@pytest.fixture(autouse=True)
+def names():
+    with patch.object(ar, "creator_names", return_value=["iris"]):
+        yield
+
+
+class TestSinglePass:
+
+    def test_not_capped_at_500_followers(self):
+        rows = [_row(n) for n in range(650)]
+        payload = ar.compute_audience_rollup(_db_streaming(rows), "iris")
+
+        assert payload["followers"] == 650
+        assert payload["topics"]["total"] == 650
+        assert payload["topics"]["items"]["yoga"]["count"] == 650
+        assert len(payload["topics"]["items"]["yoga"]["users"]) == 10
+        assert payload["purchase_objections"]["total"] == 650
+        assert payload["competition"]["items"]["otrocoach"]["score"] == -650
+
+    def test_stored_facts_merge_to_the_same_rollup(self):
+        rows = [
+            _row(1),
+            _row(2, is_customer=True, interests=["meditación"], objections_raised=[]),
+            _row(3, last_contact=(NOW - timedelta(days=10)).isoformat(), interests=None),
+        ]
+        direct = ar.AudienceRollup(NOW)
+        stored = ar.AudienceRollup(NOW)
+        for row in rows:
+            facts = ar.follower_facts(row, "iris", ["iris"])
+            direct.add(facts, row["last_contact"])
+            stored.add(json.loads(json.dumps(facts)), row["last_contact"])
+
+        assert stored.payload() == direct.payload()
+        payload = direct.payload()
+        assert payload["frustrations"]["items"]["precio alto"] == {
+            "count": 2, "quotes": [_row(1)["last_messages"][2]["content"][:150]] * 2, "resolved": 0, "pending": 2,
+        }
+        assert payload["trends"]["items"]["curso"]["this_week"] == 2
+        assert payload["trends"]["items"]["curso"]["last_week"] == 1
+        assert payload["perception"]["total"] == 3
+
+    def test_own_handle_is_not_competition(self):
+        row = _row(1, last_messages=[{"role": "user", "content": "vi a @Iris en directo"}])
+        assert ar.follower_facts(row, "iris", ["iris"])["competition"]["items"] == {}
+
+
+class TestServedTabs:
+
+    @pytest.fixture
+    def aggregator(self):
+        payload = ar.compute_audience_rollup(_db_streaming([_row(1), _row(2, interests=["yoga", "pilates"])]), "iris")
+        with patch("core.audience_aggregator.get_audience_rollup", return_value=payload) as get:
+            agg = AudienceAggregator("iris", MagicMock())
+            yield agg
+            get.assert_called_once()  # every tab reads the same rollup
+
+    def test_tabs_are_shaped_from_one_rollup(self, aggregator):
+        topics = aggregator.get_topics(limit=1)
+        assert [(t.topic, t.count, t.percentage) for t in topics.topics] == [("yoga", 2, 100.0)]
+        assert topics.computed_at is not None
+
+        competition = aggregator.get_competition()
+        assert competition.competitors[0].competitor == "@otrocoach"
+        assert competition.competitors[0].sentiment == "negativo"
+
+        trends = aggregator.get_trends()
+        assert {t.term for t in trends.trends} == {"yoga", "curso", "pilates"}
+        assert all(t.growth_percentage == 100.0 for t in trends.trends)
+
+        purchase = aggregator.get_purchase_objections()
+        assert purchase.objections[0].suggestion == "Ofrece plan de pagos o destaca el ROI"
+
+        contenido = next(p for p in aggregator.get_perception().perceptions if p.aspect == "contenido")
+        assert contenido.positive_count == 2
+
+
+class TestStoredRollup:
+
+    def _db_with_rollup(self, **overrides):
+        row = dict(version=ar.ROLLUP_VERSION, generation=3, built_generation=3,
+                   payload={"followers": 1}, computed_at=NOW)
+        row.update(overrides)
+        db = MagicMock()
+        db.execute.return_value.mappings.return_value.first.return_value = row
+        return db
+
+    def test_current_rollup_is_served(self):
+        assert ar.load_audience_rollup(self._db_with_rollup(), "iris") == {"followers": 1}
+
+    @pytest.mark.parametrize("overrides", [
+        {"built_generation": 2},
+        {"version": 0},
+        {"computed_at": NOW - timedelta(seconds=ar.AUDIENCE_ROLLUP_TTL_S + 1)},
+        {"payload": None},
+    ])
+    def test_outdated_rollup_is_rebuilt(self, overrides):
+        assert ar.load_audience_rollup(self._db_with_rollup(**overrides), "iris") is None
+
+
+class TestInvalidationHook:
+
+    @pytest.fixture
+    def flush_session(self):
+        session = MagicMock()
+        session.new, session.deleted, session.dirty = [], [], []
+        with patch.object(ar, "rollup_tables_present", return_value=True):
+            yield session
+
+    def test_new_follower_bumps_creator_generation(self, flush_session):
+        from api.models import FollowerMemoryDB
+
+        flush_session.new = [FollowerMemoryDB(creator_id="iris", follower_id="f1")]
+        ar._invalidate_audience_rollups(flush_session, None)
+
+        statement, params = flush_session.connection.return_value.execute.call_args.args
+        assert "generation = audience_rollups.generation + 1" in str(statement)
+        assert params == [{"creator_id": "iris"}]
+
+    def test_no_follower_changes_no_sql(self, flush_session):
+        flush_session.new = [object()]
+        ar._invalidate_audience_rollups(flush_session, None)
+        flush_session.connection.assert_not_called()
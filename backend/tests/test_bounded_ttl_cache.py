@@ -0,0 +1,187 @@
+"""Tests for core.cache.BoundedTTLCache — O(1) LRU+TTL with single-flight loading."""
+
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from core.cache import BoundedTTLCache
+
+
+class TestLRUAndTTL:
+
+    def test_evicts_least_recently_used_one_at_a_time(self):
+        cache = BoundedTTLCache(max_size=3, ttl_seconds=60)
+        for key in ("a", "b", "c"):
+            cache.set(key, key)
+        cache.get("a")  # a is now most recent; b is LRU
+        cache.set("d", "d")
+
+        assert "b" not in cache
+        assert all(k in cache for k in ("a", "c", "d"))
+        assert cache.stats()["evictions"] == 1
+
+    def test_overwrite_does_not_evict(self):
+        cache = BoundedTTLCache(max_size=2, ttl_seconds=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.set("a", 3)
+        assert cache.get("a") == 3 and cache.get("b") == 2
+        assert cache.stats()["evictions"] == 0
+
+    def test_ttl_expiry_and_sliding_refresh(self):
+        cache = BoundedTTLCache(max_size=10, ttl_seconds=10)
+        with patch("core.cache.time.monotonic", return_value=100.0):
+            cache.set("k", "v")
+        with patch("core.cache.time.monotonic", return_value=108.0):
+            assert cache.get("k") == "v"  # refreshes access time
+        with patch("core.cache.time.monotonic", return_value=115.0):
+            assert cache.get("k") == "v"
+        with patch("core.cache.time.monotonic", return_value=126.0):
+            assert cache.get("k") is None
+            assert len(cache) == 0
+
+    def test_pop_prefix_drops_only_matching_keys(self):
+        cache = BoundedTTLCache(max_size=10, ttl_seconds=60)
+        for key in ("iris:a", "iris:b", "maria:a"):
+            cache.set(key, key)
+        assert cache.pop_prefix("iris:") == 2
+        assert "iris:a" not in cache and "iris:b" not in cache
+        assert cache.get("maria:a") == "maria:a"
+
+    def test_stats_count_hits_and_misses(self):
+        cache = BoundedTTLCache(max_size=10, ttl_seconds=60)
+        cache.set("k", 1)
+        cache.get("k")
+        cache.get("missing")
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+
+    def test_named_cache_emits_metrics(self):
+        cache = BoundedTTLCache(max_size=1, ttl_seconds=60, name="unit")
+        with patch("core.observability.metrics.emit_metric") as emit:
+            cache.get("nope")
+            cache.set("a", 1)
+            cache.get("a")
+            cache.set("b", 2)
+
+        calls = [(c.args[0], c.args[1], c.kwargs["cache_name"]) for c in emit.call_args_list]
+        assert calls == [
+            ("cache_miss_total", 1, "unit"),
+            ("cache_hit_total", 1, "unit"),
+            ("cache_eviction_total", 1, "unit"),
+        ]
+
+    def test_concurrent_writers_keep_size_bounded(self):
+        cache = BoundedTTLCache(max_size=50, ttl_seconds=60)
+
+        def writer(offset):
+            for i in range(500):
+                cache.set(f"{offset}-{i}", i)
+                cache.get(f"{offset}-{i // 2}")
+
+        threads = [threading.Thread(target=writer, args=(n,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(cache) == 50
+
+
+class TestSingleFlight:
+
+    def test_sync_concurrent_misses_run_loader_once(self):
+        cache = BoundedTTLCache(max_size=10, ttl_seconds=60)
+        calls = []
+
+        def loader():
+            calls.append(1)
+            time.sleep(0.05)
+            return {"creator": "iris"}
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.get_or_load("iris", loader)))
+            for _ in range(10)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(calls) == 1
+        assert results == [{"creator": "iris"}] * 10
+        assert cache.get("iris") == {"creator": "iris"}
+
+    def test_sync_loader_error_propagates_and_is_not_cached(self):
+        cache = BoundedTTLCache(max_size=10, ttl_seconds=60)
+
+        def boom():
+            raise RuntimeError("db down")
+
+        with pytest.raises(RuntimeError):
+            cache.get_or_load("k", boom)
+        assert cache.get_or_load("k", lambda: "ok") == "ok"
+
+    def test_none_result_is_not_cached(self):
+        cache = BoundedTTLCache(max_size=10, ttl_seconds=60)
+        assert cache.get_or_load("k", lambda: None) is None
+        assert "k" not in cache
+
+    @pytest.mark.asyncio
+    async def test_async_concurrent_misses_await_loader_once(self):
+        cache = BoundedTTLCache(max_size=10, ttl_seconds=60)
+        calls = []
+
+        async def loader():
+            calls.append(1)
+            await asyncio.sleep(0.02)
+            return "profile"
+
+        results = await asyncio.gather(*(cache.aget_or_load("iris", loader) for _ in range(10)))
+
+        assert len(calls) == 1
+        assert results == ["profile"] * 10
+
+    @pytest.mark.asyncio
+    async def test_async_loader_error_reaches_every_waiter(self):
+        cache = BoundedTTLCache(max_size=10, ttl_seconds=60)
+
+        async def boom():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("api down")
+
+        results = await asyncio.gather(
+            *(cache.aget_or_load("k", boom) for _ in range(3)), return_exceptions=True
+        )
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert await cache.aget_or_load("k", _value("ok")) == "ok"
+
+    @pytest.mark.asyncio
+    async def test_async_cancelled_leader_does_not_fail_followers(self):
+        cache = BoundedTTLCache(max_size=10, ttl_seconds=60)
+        calls = []
+
+        async def loader():
+            calls.append(1)
+            await asyncio.sleep(0.03)
+            return "profile"
+
+        leader = asyncio.create_task(cache.aget_or_load("iris", loader))
+        await asyncio.sleep(0.01)
+        follower = asyncio.create_task(cache.aget_or_load("iris", loader))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        assert await follower == "profile"
+        assert leader.cancelled()
+        assert len(calls) == 1
+        assert cache.get("iris") == "profile"
+
+
+def _value(v):
+    async def _load():
+        return v
+    return _load
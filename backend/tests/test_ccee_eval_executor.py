@@ -0,0 +1,131 @@
+"""Tests for the CCEE evaluation executor, judge cache and stub judge (offline)."""
+
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+import core.evaluation.judge_cache as judge_cache
+import core.evaluation.m_prometheus_judge as judge
+import core.evaluation.multi_turn_scorer as scorer
+from core.evaluation.eval_executor import EvalStats, JudgeBudget, metric_scope, run_eval_tasks
+
+
+@pytest.fixture
+def stub_judge(tmp_path):
+    """Stub backend + a fresh on-disk cache under tmp_path."""
+    cache = judge_cache.JudgeCache(str(tmp_path / "judge"))
+    with patch.object(judge, "JUDGE_BACKEND", "stub"), \
+            patch.object(judge, "MODEL_NAME", judge._STUB_MODEL), \
+            patch.object(judge_cache, "JUDGE_CACHE_ENABLED", True), \
+            patch.object(judge_cache, "_cache", cache):
+        yield cache
+
+
+def _conversation(tag):
+    history = []
+    for n in range(4):
+        history.append({"role": "user", "content": f"{tag} pregunta {n} sobre el curso de yoga"})
+        history.append({"role": "assistant", "content": f"{tag} claro! el curso de yoga empieza el lunes {n}"})
+    return {"n_turns": 4, "history": history, "belief_shift_turn": None}
+
+
+class TestJudgeCache:
+
+    def test_stub_judge_is_deterministic_and_parseable(self, stub_judge):
+        direct = judge._call_judge("rate this response")
+        assert direct == judge._call_judge("rate this response")
+        assert judge._parse_result_score(direct) in range(1, 6)
+
+        pairwise = judge._build_pairwise_prompt("which is human?", "hola!", "Hello, how can I help?")
+        assert judge._parse_pairwise_result(judge._call_judge(pairwise)) in ("A", "B")
+
+    def test_repeat_prompt_replays_from_disk(self, stub_judge):
+        stats = EvalStats()
+        with metric_scope("J3_prompt_to_line", stats):
+            first = judge._call_judge("same prompt")
+            second = judge._call_judge("same prompt")
+
+        assert first == second
+        assert stub_judge.stats()["writes"] == 1
+        m = stats.report()["per_metric"]["J3_prompt_to_line"]
+        assert m["judge_calls"] == 2 and m["cache_hits"] == 1
+
+        # A new cache object over the same directory (a later run) still hits
+        rerun = judge_cache.JudgeCache(stub_judge.root)
+        key = judge_cache.judge_cache_key(judge._STUB_MODEL, judge._SYSTEM_PROMPT, "same prompt", 1500)
+        assert rerun.get(key)["text"] == first
+
+    def test_key_depends_on_model_and_max_tokens(self):
+        base = judge_cache.judge_cache_key("m1", "sys", "p", 1500)
+        assert base != judge_cache.judge_cache_key("m2", "sys", "p", 1500)
+        assert base != judge_cache.judge_cache_key("m1", "sys", "p", 800)
+
+    def test_unformatted_completions_are_not_cached(self, stub_judge):
+        with patch.object(judge, "_stub_completion", return_value=("no verdict here", 0.0)):
+            judge._call_judge("prompt")
+        assert stub_judge.stats()["writes"] == 0
+
+    def test_unparseable_verdicts_are_not_cached(self, stub_judge):
+        with patch.object(judge, "_stub_completion", return_value=("Feedback: ok [RESULT] 9", 0.0)):
+            judge._call_judge("score prompt")
+        with patch.object(judge, "_stub_completion", return_value=("Feedback: ok [RESULT] 4", 0.0)):
+            judge._call_judge("pairwise prompt", verdict="pairwise")
+            judge._call_judge("generate a reply", verdict=None)
+        assert stub_judge.stats()["writes"] == 0
+
+
+class TestExecutor:
+
+    def test_budget_caps_requests_in_flight(self):
+        budget = JudgeBudget(max_concurrency=2)
+        in_flight, peak, lock = [0], [0], threading.Lock()
+
+        def call():
+            with budget.slot():
+                with lock:
+                    in_flight[0] += 1
+                    peak[0] = max(peak[0], in_flight[0])
+                time.sleep(0.02)
+                with lock:
+                    in_flight[0] -= 1
+
+        tasks = [(i, "m", call) for i in range(6)]
+        run_eval_tasks(tasks, EvalStats(), max_workers=6)
+        assert peak[0] == 2
+
+    def test_task_errors_propagate(self):
+        def boom():
+            raise ValueError("metric failed")
+
+        with pytest.raises(ValueError):
+            run_eval_tasks([(0, "m", lambda: 1), (1, "m", boom)], EvalStats(), max_workers=2)
+
+    def test_batch_runs_metrics_concurrently_and_keeps_order(self, stub_judge):
+        barrier = threading.Barrier(2, timeout=5)
+
+        def slow_j3(conv, creator_id):
+            barrier.wait()  # only passes if two J3 runs overlap
+            return {"score": 60.0 if conv["history"][0]["content"].startswith("a") else 80.0}
+
+        convs = [_conversation("a"), _conversation("b")]
+        with patch.object(scorer, "score_j3_prompt_to_line", slow_j3), \
+                patch("core.evaluation.eval_executor.EVAL_WORKERS", 4):
+            result = scorer.score_multi_turn_batch(convs, "iris")
+
+        assert [c["J3"] for c in result["per_conversation"]] == [60.0, 80.0]
+        per_metric = result["eval_stats"]["per_metric"]
+        assert per_metric["J3_prompt_to_line"]["runs"] == 2
+        assert per_metric["J4_line_to_line"]["judge_calls"] > 0
+        assert result["eval_stats"]["totals"]["cost_usd"] == 0.0
+
+    def test_rerun_is_served_from_cache(self, stub_judge):
+        convs = [_conversation("a")]
+        first = scorer.score_multi_turn_batch(convs, "iris")
+        second = scorer.score_multi_turn_batch(convs, "iris")
+
+        assert first["per_conversation"] == second["per_conversation"]
+        totals = second["eval_stats"]["totals"]
+        assert totals["judge_calls"] > 0
+        assert totals["cache_hits"] == totals["judge_calls"]
@@ -646,7 +646,7 @@ class TestDebounce:
         with (
             patch("core.copilot_service.asyncio.sleep", new_callable=AsyncMock),
             patch("api.database.SessionLocal", return_value=mock_session),
-            patch("core.dm_agent_v2.get_dm_agent", return_value=mock_agent),
+            patch("core.dm_agent_v2.aget_dm_agent", return_value=mock_agent),
         ):
             await service._debounced_regeneration(lead_key)
 
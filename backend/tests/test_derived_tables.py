@@ -0,0 +1,34 @@
+"""
+Unit tests: shared helpers for derived-state tables (core/derived_tables.py).
+No DB required.
+"""
+from core import derived_tables
+
+
+def test_table_probe_caches_presence_and_rechecks_absence(monkeypatch):
+    answers = iter([False, True])
+    checks = []
+
+    class FakeInspector:
+        def has_table(self, name):
+            checks.append(name)
+            return next(answers)
+
+    monkeypatch.setattr("sqlalchemy.inspect", lambda connection: FakeInspector())
+    clock = iter([0.0, 10.0, 400.0, 500.0])
+    monkeypatch.setattr(derived_tables.time, "monotonic", lambda: next(clock))
+    probe = derived_tables.TableProbe("audience_rollups")
+
+    assert probe(None) is False
+    assert probe(None) is False  # within the recheck window: not asked again
+    assert probe(None) is True
+    assert probe(None) is True
+    assert checks == ["audience_rollups", "audience_rollups"]
+
+
+def test_rules_version_is_stable_and_positive():
+    version = derived_tables.rules_version(1, ("precio", "caro"), {"users": 10})
+
+    assert version == derived_tables.rules_version(1, ("precio", "caro"), {"users": 10})
+    assert version != derived_tables.rules_version(2, ("precio", "caro"), {"users": 10})
+    assert 0 <= version <= 0x7FFFFFFF
@@ -0,0 +1,167 @@
+"""Tests for DeterministicScraper.scrape_website — concurrent, polite crawling."""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from ingestion import deterministic_scraper as ds
+from ingestion.deterministic_scraper import (
+    NOT_MODIFIED,
+    DeterministicScraper,
+    RobotsTxtChecker,
+    ScrapedPage,
+    _HostThrottle,
+)
+
+SITE = {
+    "https://example.com": ["https://example.com/a", "https://example.com/b", "https://example.com/c"],
+    "https://example.com/a": ["https://example.com/a1", "https://example.com/b"],
+    "https://example.com/b": ["https://example.com/admin/x"],
+    "https://example.com/c": [],
+    "https://example.com/a1": [],
+    "https://example.com/admin/x": [],
+}
+
+
+def _page(url):
+    return ScrapedPage(url=url, title=url, main_content="x" * 200, links=SITE.get(url, []))
+
+
+class FakeSite:
+    """scrape_page stand-in that records concurrency."""
+
+    def __init__(self, delay=0.02):
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.fetched = []
+
+    async def scrape_page(self, url, creator_id="unknown", client=None):
+        assert client is not None  # crawls share one client
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            self.fetched.append(url)
+            return _page(url)
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture
+def crawl_env():
+    """No host delay, robots.txt disallowing /admin/, pooled client mocked out."""
+    checker = RobotsTxtChecker()
+    robots = MagicMock()
+    robots.can_fetch.side_effect = lambda agent, path: not path.startswith("/admin/")
+    robots.crawl_delay.return_value = None
+    checker._cache["https://example.com"] = (robots, time.time())
+
+    client = AsyncMock()
+    client.__aenter__ = AsyncMock(return_value=client)
+    client.__aexit__ = AsyncMock(return_value=None)
+
+    with patch.object(ds, "SCRAPER_HOST_DELAY_S", 0.0), \
+            patch.object(ds, "RESPECT_ROBOTS_TXT", True), \
+            patch.object(ds, "get_robots_checker", return_value=checker), \
+            patch.object(ds.httpx, "AsyncClient", return_value=client) as client_cls:
+        yield client_cls
+
+
+class TestScrapeWebsite:
+
+    @pytest.mark.asyncio
+    async def test_crawls_in_discovery_order_with_one_client(self, crawl_env):
+        site = FakeSite()
+        scraper = DeterministicScraper(max_pages=10, concurrency=4)
+        with patch.object(scraper, "scrape_page", site.scrape_page):
+            pages = await scraper.scrape_website("https://example.com")
+
+        assert [p.url for p in pages] == [
+            "https://example.com",
+            "https://example.com/a",
+            "https://example.com/b",
+            "https://example.com/c",
+            "https://example.com/a1",
+        ]
+        assert sorted(site.fetched) == sorted(p.url for p in pages)  # each URL fetched once
+        assert "https://example.com/admin/x" not in scraper._visited  # robots.txt
+        crawl_env.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_per_host_concurrency_is_bounded(self, crawl_env):
+        site = FakeSite()
+        scraper = DeterministicScraper(max_pages=10, concurrency=8)
+        with patch.object(ds, "SCRAPER_PER_HOST_CONCURRENCY", 2), \
+                patch.object(scraper, "scrape_page", site.scrape_page):
+            await scraper.scrape_website("https://example.com")
+
+        assert site.max_in_flight == 2
+
+    @pytest.mark.asyncio
+    async def test_max_pages_caps_results(self, crawl_env):
+        site = FakeSite()
+        scraper = DeterministicScraper(max_pages=2, concurrency=4)
+        with patch.object(scraper, "scrape_page", site.scrape_page):
+            pages = await scraper.scrape_website("https://example.com")
+
+        assert [p.url for p in pages] == ["https://example.com", "https://example.com/a"]
+
+    @pytest.mark.asyncio
+    async def test_host_throttle_spaces_request_starts(self):
+        throttle = _HostThrottle(concurrency=3, delay_s=0.05)
+        starts = []
+
+        async def request():
+            async with throttle.slot():
+                starts.append(time.monotonic())
+
+        await asyncio.gather(*(request() for _ in range(3)))
+        gaps = [b - a for a, b in zip(starts, starts[1:])]
+        assert all(gap >= 0.045 for gap in gaps)
+
+
+class TestConditionalGet:
+
+    @staticmethod
+    def _client(response):
+        client = AsyncMock()
+        client.get.return_value = response
+        return client
+
+    @pytest.mark.asyncio
+    async def test_validators_are_recorded_and_sent_back(self):
+        scraper = DeterministicScraper()
+        ok = MagicMock(status_code=200, text="<html></html>", url="https://example.com/p")
+        ok.headers = {"content-type": "text/html", "etag": '"v1"', "last-modified": "Mon, 01 Jan 2026 00:00:00 GMT"}
+
+        html, _ = await scraper._fetch_page_html("https://example.com/p", self._client(ok))
+        assert html == "<html></html>"
+        assert scraper._validators["https://example.com/p"] == ('"v1"', "Mon, 01 Jan 2026 00:00:00 GMT")
+
+        not_modified = MagicMock(status_code=304, headers={})
+        client = self._client(not_modified)
+        cached = {"etag": '"v1"', "last_modified": None, "page": None}
+        html, _ = await scraper._fetch_page_html("https://example.com/p", client, cached)
+
+        assert html is NOT_MODIFIED
+        client.get.assert_awaited_once_with("https://example.com/p", headers={"If-None-Match": '"v1"'})
+
+    @pytest.mark.asyncio
+    async def test_not_modified_returns_cached_page(self):
+        scraper = DeterministicScraper()
+        cached_page = _page("https://example.com/c")
+        ds._revalidation_cache.set(
+            "https://example.com/c", {"etag": '"v1"', "last_modified": None, "page": cached_page}
+        )
+        checker = MagicMock()
+        checker.is_allowed.return_value = True
+
+        with patch.object(ds, "get_robots_checker", return_value=checker), \
+                patch.object(scraper, "_fetch_page_with_circuit_breaker",
+                             AsyncMock(return_value=(NOT_MODIFIED, "https://example.com/c"))):
+            page = await scraper.scrape_page("https://example.com/c", client=AsyncMock())
+
+        assert page is cached_page
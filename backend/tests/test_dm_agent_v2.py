@@ -11,8 +11,11 @@ NOTE: Groups 1-4 require DATABASE_URL and OPENAI_API_KEY env vars (production).
       Groups 5-7 are pure-logic tests that work without external dependencies.
 """
 
+import asyncio
 import os
 import sys
+import threading
+from unittest.mock import patch
 
 import pytest
 
@@ -50,6 +53,26 @@ class TestFactory:
         agent = get_dm_agent(CREATOR_ID)
         assert agent.creator_id == CREATOR_ID
 
+    @pytest.mark.asyncio
+    async def test_aget_dm_agent_builds_once_off_the_event_loop(self):
+        from core.dm import agent as agent_module
+        from core.dm_agent_v2 import aget_dm_agent, invalidate_dm_agent_cache
+
+        invalidate_dm_agent_cache(CREATOR_ID)
+        built_on = []
+        real_create = agent_module._create_dm_agent
+
+        def create(creator_id):
+            built_on.append(threading.current_thread())
+            return real_create(creator_id)
+
+        with patch.object(agent_module, "_create_dm_agent", create):
+            agents = await asyncio.gather(*(aget_dm_agent(CREATOR_ID) for _ in range(3)))
+
+        assert agents[0] is agents[1] is agents[2]
+        assert built_on and built_on[0] is not threading.main_thread()
+        assert len(built_on) == 1
+
     def test_invalidate_cache_forces_new_instance(self):
         from core.dm_agent_v2 import get_dm_agent, invalidate_dm_agent_cache
 
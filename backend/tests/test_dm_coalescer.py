@@ -0,0 +1,214 @@
+"""
+Unit tests: per-conversation DM burst coalescing (core/dm_coalescer.py).
+Windows are a few tens of milliseconds; no DB or LLM required.
+"""
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from core.dm_coalescer import DMCoalescer, QueuedBurst, coalesce_window_s
+from core.webhook_queue import BatchFailed
+
+WINDOW = 0.05
+
+
+def _recording_generate(calls, delay=0.0):
+    async def generate(batch):
+        calls.append(list(batch))
+        if delay:
+            await asyncio.sleep(delay)
+        return "reply to " + " / ".join(batch)
+    return generate
+
+
+async def _send_burst(coalescer, key, texts, generate, gap=0.01):
+    tasks = []
+    for text in texts:
+        tasks.append(asyncio.create_task(coalescer.submit("whatsapp", key, text, generate, window_s=WINDOW)))
+        await asyncio.sleep(gap)
+    return await asyncio.gather(*tasks)
+
+
+class TestCoalescing:
+
+    @pytest.mark.asyncio
+    async def test_zero_window_runs_each_message(self):
+        calls = []
+        coalescer = DMCoalescer()
+        turn = await coalescer.submit("instagram", "iris:1", "hola", _recording_generate(calls), window_s=0)
+
+        assert calls == [["hola"]]
+        assert turn.result == "reply to hola"
+        assert not turn.absorbed
+
+    @pytest.mark.asyncio
+    async def test_burst_runs_one_pass_answered_by_last_caller(self):
+        calls = []
+        coalescer = DMCoalescer()
+        turns = await _send_burst(coalescer, "iris:1", ["hola", "una pregunta", "cuánto cuesta?"],
+                                  _recording_generate(calls))
+
+        assert calls == [["hola", "una pregunta", "cuánto cuesta?"]]
+        assert [t.absorbed for t in turns] == [True, True, False]
+        assert turns[-1].result == "reply to hola / una pregunta / cuánto cuesta?"
+        assert coalescer.stats()["passes_saved"] == 2
+        assert coalescer.stats()["open_bursts"] == 0
+
+    @pytest.mark.asyncio
+    async def test_message_mid_generation_supersedes_the_run(self):
+        calls = []
+        coalescer = DMCoalescer()
+        generate = _recording_generate(calls, delay=0.1)
+
+        first = asyncio.create_task(coalescer.submit("whatsapp", "iris:1", "hola", generate, window_s=WINDOW))
+        await asyncio.sleep(WINDOW + 0.03)  # window elapsed, generation in flight
+        assert calls == [["hola"]]
+        second = await coalescer.submit("whatsapp", "iris:1", "sigues ahí?", generate, window_s=WINDOW)
+
+        assert (await first).absorbed
+        assert second.result == "reply to hola / sigues ahí?"
+        assert calls == [["hola"], ["hola", "sigues ahí?"]]
+        assert coalescer.stats()["superseded"] == 1
+
+    @pytest.mark.asyncio
+    async def test_max_batch_generates_without_waiting(self):
+        calls = []
+        coalescer = DMCoalescer(max_batch=2)
+        turns = await asyncio.wait_for(asyncio.gather(
+            coalescer.submit("instagram", "iris:1", "a", _recording_generate(calls), window_s=10),
+            coalescer.submit("instagram", "iris:1", "b", _recording_generate(calls), window_s=10),
+        ), timeout=1)
+
+        assert calls == [["a", "b"]]
+        assert turns[1].batch_size == 2
+
+    @pytest.mark.asyncio
+    async def test_max_wait_caps_a_long_burst(self):
+        calls = []
+        coalescer = DMCoalescer(max_wait_s=0.1)
+        await _send_burst(coalescer, "iris:1", [str(i) for i in range(8)],
+                          _recording_generate(calls), gap=0.03)
+
+        assert len(calls) >= 2
+        assert [m for batch in calls for m in batch] == [str(i) for i in range(8)]
+
+    @pytest.mark.asyncio
+    async def test_conversations_are_independent(self):
+        calls = []
+        coalescer = DMCoalescer()
+        generate = _recording_generate(calls)
+        a, b = await asyncio.gather(
+            _send_burst(coalescer, "iris:1", ["a1", "a2"], generate),
+            _send_burst(coalescer, "iris:2", ["b1"], generate),
+        )
+
+        assert sorted(calls) == [["a1", "a2"], ["b1"]]
+        assert a[-1].result == "reply to a1 / a2"
+        assert b[0].result == "reply to b1"
+
+    @pytest.mark.asyncio
+    async def test_generation_error_goes_to_the_last_caller(self):
+        async def failing(batch):
+            raise RuntimeError("gemini 503")
+
+        coalescer = DMCoalescer()
+        first = asyncio.create_task(coalescer.submit("whatsapp", "iris:1", "a", failing, window_s=WINDOW))
+        await asyncio.sleep(0.01)
+        with pytest.raises(RuntimeError, match="gemini 503"):
+            await coalescer.submit("whatsapp", "iris:1", "b", failing, window_s=WINDOW)
+        assert (await first).absorbed
+
+
+class TestQueuedBurst:
+    """A queue consumer's claimed burst: no window, arrival order, one pass."""
+
+    @pytest.mark.asyncio
+    async def test_events_generate_once_in_arrival_order(self):
+        calls, turns = [], {}
+        coalescer = DMCoalescer()
+        generate = _recording_generate(calls)
+
+        async def event(text, work_s):
+            # Earlier events do more work before reaching submit()
+            await asyncio.sleep(work_s)
+            turns[text] = await coalescer.submit("instagram", "iris:1", text, generate, window_s=WINDOW)
+
+        async def echo():
+            await asyncio.sleep(0)  # the creator's own message: persisted, never generated
+
+        await QueuedBurst(coalescer).run(
+            [event("hola", 0.03), event("una pregunta", 0.01), echo(), event("precio?", 0)]
+        )
+
+        assert calls == [["hola", "una pregunta", "precio?"]]
+        assert [turns[t].absorbed for t in ("hola", "una pregunta", "precio?")] == [True, True, False]
+        assert turns["precio?"].result == "reply to hola / una pregunta / precio?"
+        assert coalescer.stats()["passes_saved"] == 2
+
+    @pytest.mark.asyncio
+    async def test_burst_ending_without_a_dm_is_still_answered(self):
+        calls = []
+        coalescer = DMCoalescer()
+
+        async def event(text):
+            return await coalescer.submit("whatsapp", "iris:1", text, _recording_generate(calls), window_s=WINDOW)
+
+        async def echo():
+            return None
+
+        await QueuedBurst(coalescer).run([event("a"), event("b"), echo()])
+        assert calls == [["a", "b"]]
+
+    @pytest.mark.asyncio
+    async def test_generation_error_fails_the_run(self):
+        async def failing(batch):
+            raise RuntimeError("gemini 503")
+
+        coalescer = DMCoalescer()
+        events = [coalescer.submit("whatsapp", "iris:1", t, failing, window_s=WINDOW) for t in "ab"]
+        with pytest.raises(BatchFailed, match="gemini 503") as failed:
+            await QueuedBurst(coalescer).run(events)
+        # The burst's earlier message was absorbed; only the one owning the reply is retried
+        first, last = failed.value.errors
+        assert first is None and isinstance(last, RuntimeError)
+
+    @pytest.mark.asyncio
+    async def test_failure_names_only_the_failing_events(self):
+        async def ok():
+            return None
+
+        async def broken():
+            raise RuntimeError("db down")
+
+        with pytest.raises(BatchFailed) as failed:
+            await QueuedBurst(DMCoalescer()).run([ok(), broken(), ok()])
+        assert [e is not None for e in failed.value.errors] == [False, True, False]
+
+
+def test_window_per_platform_overrides_default(monkeypatch):
+    monkeypatch.setenv("DM_COALESCE_WINDOW_MS_WHATSAPP", "3000")
+    monkeypatch.delenv("DM_COALESCE_WINDOW_MS_TELEGRAM", raising=False)
+
+    assert coalesce_window_s("whatsapp") == 3.0
+    assert coalesce_window_s("telegram") == 0.0
+
+
+def test_instagram_burst_merges_into_last_message():
+    from core.instagram import InstagramMessage
+    from core.instagram_modules.webhook import _is_plain_text, _merge_burst
+
+    now = datetime.now()
+    burst = [
+        InstagramMessage(message_id="m1", sender_id="u", recipient_id="p", text="hola", timestamp=now),
+        InstagramMessage(message_id="m2", sender_id="u", recipient_id="p", text="precio?", timestamp=now),
+    ]
+    merged = _merge_burst(burst)
+
+    assert merged.message_id == "m2"
+    assert merged.text == "hola\nprecio?"
+    assert burst[1].text == "precio?"
+    assert not _is_plain_text(InstagramMessage(
+        message_id="m3", sender_id="u", recipient_id="p", text="",
+        timestamp=now, attachments=[{"type": "image"}],
+    ))
@@ -0,0 +1,223 @@
+"""Tests for services/dm_context_repository.py — async DM hot-path reads."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from services import dm_context_repository as repo
+
+
+class _Result:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+    def fetchall(self):
+        return list(self._rows)
+
+
+class FakeAsyncSession:
+    """Async session stand-in; ``responder(sql, params)`` returns result rows."""
+
+    def __init__(self, responder, stats):
+        self._responder = responder
+        self._stats = stats
+
+    async def connection(self):
+        self._stats["connections"] += 1
+
+    async def execute(self, statement, params):
+        self._stats["in_flight"] += 1
+        self._stats["max_in_flight"] = max(self._stats["max_in_flight"], self._stats["in_flight"])
+        try:
+            await asyncio.sleep(0.01)
+            rows = self._responder(str(statement), params)
+            if isinstance(rows, Exception):
+                raise rows
+            return _Result(rows)
+        finally:
+            self._stats["in_flight"] -= 1
+
+    async def rollback(self):
+        self._stats["rollbacks"] += 1
+
+    async def close(self):
+        self._stats["closed"] += 1
+
+    async def invalidate(self):
+        self._stats["invalidated"] += 1
+
+
+def _turn(responder):
+    stats = {
+        "connections": 0, "in_flight": 0, "max_in_flight": 0,
+        "rollbacks": 0, "closed": 0, "invalidated": 0,
+    }
+    factory_calls = []
+
+    def factory():
+        factory_calls.append(1)
+        return FakeAsyncSession(responder, stats)
+
+    return repo.TurnSession(factory), stats, factory_calls
+
+
+class TestTurnSession:
+
+    @pytest.mark.asyncio
+    async def test_concurrent_loaders_get_their_own_sessions(self):
+        turn, stats, factory_calls = _turn(lambda sql, params: [(1,)])
+
+        async def load():
+            async with turn.loader() as db:
+                return await db.fetchone("SELECT 1")
+
+        assert await asyncio.gather(*(load() for _ in range(5))) == [(1,)] * 5
+
+        assert len(factory_calls) == 5
+        assert stats["max_in_flight"] == 5
+        assert stats["closed"] == 5
+
+    @pytest.mark.asyncio
+    async def test_timed_out_loader_invalidates_only_its_connection(self):
+        def responder(sql, params):
+            return [(1,)]
+
+        turn, stats, _ = _turn(responder)
+
+        async def slow():
+            async with turn.loader() as db:
+                await db.fetchone("SELECT 1")
+                await db.fetchone("SELECT pg_sleep(1)")
+
+        async def fast():
+            async with turn.loader() as db:
+                return await db.fetchone("SELECT 1")
+
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(slow(), timeout=0.015)
+        assert await fast() == (1,)
+        await turn.close()
+
+        assert stats["invalidated"] == 1
+        assert stats["closed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_statement_rolls_back_and_session_stays_usable(self):
+        calls = []
+
+        def responder(sql, params):
+            calls.append(sql)
+            return RuntimeError("boom") if len(calls) == 1 else [(1,)]
+
+        turn, stats, _ = _turn(responder)
+        async with turn.loader() as db:
+            with pytest.raises(RuntimeError):
+                await db.fetchone("SELECT broken")
+            assert await db.fetchone("SELECT 1") == (1,)
+        assert stats["rollbacks"] == 1
+        assert stats["closed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_open_turn_session_yields_none_without_async_engine(self):
+        with patch("api.database.AsyncSessionLocal", None):
+            async with repo.open_turn_session() as turn:
+                assert turn is None
+
+
+class TestArc2Memories:
+
+    @staticmethod
+    def _responder(semantic_rows, all_rows):
+        def responder(sql, params):
+            if "FROM creators" in sql:
+                return [("creator-uuid",)]
+            if "FROM leads" in sql:
+                assert params["raw"] == "12345"
+                return [("lead-uuid",)]
+            if "embedding <=>" in sql:
+                return semantic_rows
+            return all_rows
+        return responder
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_all_memories_without_semantic_hits(self):
+        row = SimpleNamespace(memory_type="identity", content="Se llama Ana", confidence=0.9)
+        turn, _, _ = _turn(self._responder([], [row]))
+
+        with patch("core.embeddings.agenerate_embeddings_batch", AsyncMock(return_value=[[0.1] * 4])):
+            memories = await repo.read_arc2_memories(turn, "iris", "ig_12345", "hola")
+
+        assert [m.content for m in memories] == ["Se llama Ana"]
+
+    @pytest.mark.asyncio
+    async def test_unknown_creator_returns_empty(self):
+        turn, _, _ = _turn(lambda sql, params: [])
+        assert await repo.read_arc2_memories(turn, "nobody", "ig_1") == []
+
+    @pytest.mark.asyncio
+    async def test_query_is_embedded_before_a_connection_is_held(self):
+        row = SimpleNamespace(memory_type="identity", content="Se llama Ana", confidence=0.9)
+        turn, stats, _ = _turn(self._responder([row], []))
+        held = []
+
+        async def embed(texts):
+            held.append(stats["connections"] - stats["closed"])
+            return [[0.1] * 4]
+
+        with patch("core.embeddings.agenerate_embeddings_batch", embed):
+            memories = await repo.read_arc2_memories(turn, "iris", "ig_12345", "hola")
+
+        assert held == [0]
+        assert [m.content for m in memories] == ["Se llama Ana"]
+
+
+class TestEpisodicSearch:
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_slug_pair_and_parses_json_metadata(self):
+        searched = []
+
+        def responder(sql, params):
+            if "FROM creators" in sql:
+                return [("creator-uuid",)]
+            if "FROM leads" in sql:
+                return [("lead-uuid",)]
+            searched.append((params["creator_id"], params["follower_id"]))
+            if params["creator_id"] == "creator-uuid":
+                return []
+            return [SimpleNamespace(
+                content="quiero el curso", message_role="user",
+                msg_metadata='{"source": "ig"}', created_at=None, similarity=0.8123,
+            )]
+
+        turn, stats, _ = _turn(responder)
+        with patch("core.semantic_memory_pgvector.ENABLE_SEMANTIC_MEMORY_PGVECTOR", True), \
+                patch("core.embeddings.agenerate_embeddings_batch", AsyncMock(return_value=[[0.1] * 4])):
+            results = await repo.search_episodic(turn, "iris", "12345", "curso", k=5, min_similarity=0.6)
+
+        assert searched == [("creator-uuid", "lead-uuid"), ("iris", "12345")]
+        assert results == [{
+            "content": "quiero el curso", "role": "user", "similarity": 0.812,
+            "created_at": None, "metadata": {"source": "ig"},
+        }]
+        assert stats["connections"] == 1
+
+    @pytest.mark.asyncio
+    async def test_query_is_embedded_before_a_connection_is_held(self):
+        turn, stats, _ = _turn(lambda sql, params: [])
+        held = []
+
+        async def embed(texts):
+            held.append(stats["connections"] - stats["closed"])
+            return [[0.1] * 4]
+
+        with patch("core.semantic_memory_pgvector.ENABLE_SEMANTIC_MEMORY_PGVECTOR", True), \
+                patch("core.embeddings.agenerate_embeddings_batch", embed):
+            assert await repo.search_episodic(turn, "iris", "12345", "curso", k=5, min_similarity=0.6) == []
+
+        assert held == [0]
@@ -170,8 +170,11 @@ def test_scheduler_status():
     print(f"\n✅ Scheduler status: {scheduler}")
 
 
-def test_health_endpoint():
+def test_health_endpoint(tmp_path, monkeypatch):
     """Test that health endpoint works (returns valid response)"""
+    for subdir in ("followers", "products", "creators", "analytics"):
+        (tmp_path / subdir).mkdir()
+    monkeypatch.setenv("DATA_PATH", str(tmp_path))
     resp = client.get("/health")
     assert resp.status_code == 200, f"Health check failed: {resp.text}"
 
@@ -72,19 +72,101 @@ class TestGeminiEmbeddings:
         result = mod.generate_embedding("   ")
         assert result is None
 
+    def _mock_batch_response(self, vectors):
+        mock_resp = MagicMock()
+        mock_resp.json.return_value = {"embeddings": [{"values": v} for v in vectors]}
+        mock_resp.raise_for_status.return_value = None
+        return mock_resp
+
     def test_generate_batch(self):
         import core.embeddings as mod
 
-        side_effects = [[0.1] * 1536, [0.2] * 1536]
+        mock_resp = self._mock_batch_response([[0.1] * 1536, [0.2] * 1536])
 
-        with patch("core.embeddings.generate_embedding", side_effect=side_effects):
-            result = mod.generate_embeddings_batch(["text_a batch", "text_b batch"])
+        with patch("core.embeddings._get_gemini_api_key", return_value="fake-key"):
+            with patch("httpx.post", return_value=mock_resp) as mock_post:
+                result = mod.generate_embeddings_batch(["text_a batch", "text_b batch"])
 
-        assert result[0] is not None
-        assert result[1] is not None
+        assert mock_post.call_count == 1
+        assert mock_post.call_args.args[0] == mod._GEMINI_BATCH_EMBED_URL
+        assert len(mock_post.call_args.kwargs["json"]["requests"]) == 2
         assert result[0][0] == pytest.approx(0.1)
         assert result[1][0] == pytest.approx(0.2)
 
+    def test_batch_dedupes_and_uses_cache(self):
+        import core.embeddings as mod
+
+        mod._embedding_cache.set(mod._embedding_cache_key("cached batch text", "RETRIEVAL_DOCUMENT"), [0.9] * 1536)
+        mock_resp = self._mock_batch_response([[0.3] * 1536])
+
+        with patch("core.embeddings._get_gemini_api_key", return_value="fake-key"):
+            with patch("httpx.post", return_value=mock_resp) as mock_post:
+                result = mod.generate_embeddings_batch(
+                    ["dup batch text", "cached batch text", "Dup Batch Text", ""]
+                )
+
+        sent = mock_post.call_args.kwargs["json"]["requests"]
+        assert len(sent) == 1
+        assert result[0] == result[2] == [0.3] * 1536
+        assert result[1] == [0.9] * 1536
+        assert result[3] is None
+
+    def test_batch_chunks_to_api_limit(self):
+        import core.embeddings as mod
+
+        texts = [f"chunk limit text {i}" for i in range(mod.EMBEDDING_BATCH_SIZE + 5)]
+
+        def fake_post(url, params=None, json=None, timeout=None):
+            return self._mock_batch_response([[0.1] * 4] * len(json["requests"]))
+
+        with patch("core.embeddings._get_gemini_api_key", return_value="fake-key"):
+            with patch("httpx.post", side_effect=fake_post) as mock_post:
+                result = mod.generate_embeddings_batch(texts)
+
+        assert mock_post.call_count == 2
+        assert all(r is not None for r in result)
+
+    def test_batch_retries_only_failed_items(self):
+        import core.embeddings as mod
+
+        first = self._mock_batch_response([[0.1] * 4, []])
+        second = self._mock_batch_response([[0.2] * 4])
+
+        with patch("core.embeddings._get_gemini_api_key", return_value="fake-key"), \
+             patch("core.embeddings.time.sleep"):
+            with patch("httpx.post", side_effect=[first, second]) as mock_post:
+                result = mod.generate_embeddings_batch(["retry ok text", "retry missing text"])
+
+        assert mock_post.call_count == 2
+        assert len(mock_post.call_args.kwargs["json"]["requests"]) == 1
+        assert result == [[0.1] * 4, [0.2] * 4]
+
+    @pytest.mark.asyncio
+    async def test_async_batch_bounded_concurrency(self):
+        import asyncio
+
+        import core.embeddings as mod
+
+        in_flight = {"now": 0, "max": 0}
+
+        class FakeClient:
+            async def post(self, url, params=None, json=None, timeout=None):
+                in_flight["now"] += 1
+                in_flight["max"] = max(in_flight["max"], in_flight["now"])
+                await asyncio.sleep(0.01)
+                in_flight["now"] -= 1
+                resp = MagicMock()
+                resp.json.return_value = {"embeddings": [{"values": [0.5] * 4}] * len(json["requests"])}
+                return resp
+
+        texts = [f"async concurrency text {i}" for i in range(mod.EMBEDDING_BATCH_SIZE * 3)]
+        with patch("core.embeddings._get_gemini_api_key", return_value="fake-key"), \
+             patch("core.providers.http_clients.get_http_client", return_value=FakeClient()):
+            result = await mod.agenerate_embeddings_batch(texts, concurrency=2)
+
+        assert all(r == [0.5] * 4 for r in result)
+        assert in_flight["max"] == 2
+
     def test_api_error_returns_none(self):
         import core.embeddings as mod
 
@@ -146,7 +228,124 @@ class TestGeminiEmbeddings:
 
 
 # ---------------------------------------------------------------------------
-# Test 3: Cosine Similarity
+# Test 3: Durable embedding cache tier
+# ---------------------------------------------------------------------------
+
+
+class FakeEmbeddingStore:
+    """In-memory stand-in for DurableEmbeddingStore."""
+
+    def __init__(self):
+        self.rows = {}
+        self.get_calls = 0
+
+    def bulk_get(self, keys):
+        self.get_calls += 1
+        return {k: self.rows[k] for k in keys if k in self.rows}
+
+    def bulk_put(self, items, task_type, model, dimensions):
+        self.rows.update(items)
+        return len(items)
+
+
+class TestDurableEmbeddingCache:
+    """Memory miss → durable store → API, shared by single and batch paths."""
+
+    def test_key_is_content_hash_scoped_by_model_task_and_dims(self):
+        from core.embedding_cache import embedding_cache_key
+
+        key = embedding_cache_key("  Hola Iris ", "RETRIEVAL_QUERY", "models/m", 1536)
+        assert key == embedding_cache_key("Hola Iris", "RETRIEVAL_QUERY", "models/m", 1536)
+        assert key != embedding_cache_key("hola iris", "RETRIEVAL_QUERY", "models/m", 1536)  # model is case-sensitive
+        assert key.startswith("v2:models/m:RETRIEVAL_QUERY:1536:")
+        assert "Hola" not in key
+        assert key != embedding_cache_key("hola iris", "RETRIEVAL_QUERY", "models/m", 768)
+        assert key != embedding_cache_key("hola iris", "RETRIEVAL_DOCUMENT", "models/m", 1536)
+
+    def test_vector_bytes_roundtrip(self):
+        from core.embedding_cache import _decode, _encode
+
+        vec = [0.25, -1.5, 3.0]
+        assert _decode(_encode(vec)) == vec
+
+    def test_single_embedding_served_from_durable_store(self):
+        import core.embeddings as mod
+
+        store = FakeEmbeddingStore()
+        key = mod._embedding_cache_key("durable single text", "RETRIEVAL_QUERY")
+        store.rows[key] = [0.7] * 4
+        mod._embedding_cache.pop(key)
+
+        with patch("core.embeddings.get_embedding_store", return_value=store), \
+             patch("core.embeddings._get_gemini_api_key", return_value="fake-key"), \
+             patch("httpx.post") as mock_post:
+            result = mod.generate_embedding("durable single text", task_type="RETRIEVAL_QUERY")
+
+        mock_post.assert_not_called()
+        assert result == [0.7] * 4
+        # Promoted to the in-process tier
+        assert mod._embedding_cache.get(key) == [0.7] * 4
+
+    def test_generated_embedding_written_to_durable_store(self):
+        import core.embeddings as mod
+
+        store = FakeEmbeddingStore()
+        mock_resp = MagicMock()
+        mock_resp.json.return_value = {"embedding": {"values": [0.3] * 4}}
+
+        with patch("core.embeddings.get_embedding_store", return_value=store), \
+             patch("core.embeddings._get_gemini_api_key", return_value="fake-key"), \
+             patch("httpx.post", return_value=mock_resp):
+            mod.generate_embedding("durable write text")
+
+        assert store.rows[mod._embedding_cache_key("durable write text", "RETRIEVAL_DOCUMENT")] == [0.3] * 4
+
+    def test_batch_resolves_durable_hits_in_one_lookup(self):
+        import core.embeddings as mod
+
+        store = FakeEmbeddingStore()
+        key = mod._embedding_cache_key("durable batch hit", "RETRIEVAL_DOCUMENT")
+        store.rows[key] = [0.9] * 4
+        mod._embedding_cache.pop(key)
+        mock_resp = MagicMock()
+        mock_resp.json.return_value = {"embeddings": [{"values": [0.1] * 4}]}
+
+        with patch("core.embeddings.get_embedding_store", return_value=store), \
+             patch("core.embeddings._get_gemini_api_key", return_value="fake-key"), \
+             patch("httpx.post", return_value=mock_resp) as mock_post:
+            result = mod.generate_embeddings_batch(["durable batch hit", "durable batch miss"])
+
+        assert store.get_calls == 1
+        assert len(mock_post.call_args.kwargs["json"]["requests"]) == 1
+        assert result == [[0.9] * 4, [0.1] * 4]
+        assert mod._embedding_cache_key("durable batch miss", "RETRIEVAL_DOCUMENT") in store.rows
+
+    def test_store_failure_falls_back_to_api(self):
+        import core.embeddings as mod
+
+        store = MagicMock()
+        store.bulk_get.side_effect = RuntimeError("db down")
+        store.bulk_put.side_effect = RuntimeError("db down")
+        mock_resp = MagicMock()
+        mock_resp.json.return_value = {"embedding": {"values": [0.2] * 4}}
+
+        with patch("core.embeddings.get_embedding_store", return_value=store), \
+             patch("core.embeddings._get_gemini_api_key", return_value="fake-key"), \
+             patch("httpx.post", return_value=mock_resp):
+            assert mod.generate_embedding("durable failure text") == [0.2] * 4
+
+    def test_store_without_database_is_a_noop(self):
+        from core.embedding_cache import DurableEmbeddingStore
+
+        store = DurableEmbeddingStore()
+        with patch("api.database.SessionLocal", None):
+            assert store.bulk_get(["k"]) == {}
+            assert store.bulk_put({"k": [1.0]}, "RETRIEVAL_DOCUMENT", "m", 1) == 0
+        assert store.stats()["errors"] == 0
+
+
+# ---------------------------------------------------------------------------
+# Test 4: Cosine Similarity
 # ---------------------------------------------------------------------------
 
 
@@ -71,12 +71,10 @@ def test_03_similarity_threshold_consistency():
 
     test("Default similarity is 0.70", DEFAULT_MIN_SIMILARITY == 0.70)
 
-    # Read _episodic_search threshold
-    import inspect
-    from core.dm.phases.context import _episodic_search
-    source = inspect.getsource(_episodic_search)
+    # Episodic threshold is shared by the sync and async (ENABLE_ASYNC_DB) paths
+    from core.dm.phases.context import _EPISODIC_MIN_SIM
 
-    test("Episodic search uses _MIN_SIM = 0.60", "_MIN_SIM = 0.60" in source,
+    test("Episodic search uses _EPISODIC_MIN_SIM = 0.60", _EPISODIC_MIN_SIM == 0.60,
          "Should use 0.60 per BUG-EP-02 fix")
 
 
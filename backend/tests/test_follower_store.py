@@ -0,0 +1,175 @@
+"""Tests for core.follower_store — SQLite follower records behind MemoryStore."""
+
+import json
+import os
+import sqlite3
+
+import pytest
+
+from core.follower_store import DB_FILENAME, FollowerStore, get_follower_store
+
+
+def _record(follower_id, creator_id="iris", **fields):
+    return {"creator_id": creator_id, "follower_id": follower_id, **fields}
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = FollowerStore(str(tmp_path), flush_interval_s=60, max_pending=1000)
+    yield s
+    s.close()
+
+
+def _db_count(path):
+    conn = sqlite3.connect(os.path.join(path, DB_FILENAME))
+    try:
+        return conn.execute("SELECT COUNT(*) FROM follower_memory").fetchone()[0]
+    finally:
+        conn.close()
+
+
+class TestWriteBehind:
+
+    def test_reads_see_buffered_writes_before_flush(self, store):
+        store.put(_record("f1", total_messages=3))
+        assert _db_count(store.storage_path) == 0
+        assert store.get("iris", "f1")["total_messages"] == 3
+
+        store.flush()
+        assert _db_count(store.storage_path) == 1
+
+    def test_repeated_saves_coalesce_into_one_row(self, store):
+        for n in range(5):
+            store.put(_record("f1", total_messages=n))
+        store.flush()
+        assert store.stats["writes"] == 1
+        assert store.get("iris", "f1")["total_messages"] == 4
+
+    def test_max_pending_flushes_early(self, tmp_path):
+        s = FollowerStore(str(tmp_path), flush_interval_s=60, max_pending=3)
+        try:
+            for i in range(3):
+                s.put(_record(f"f{i}"))
+            # The batch was handed to the executor; a read is ordered after it
+            assert s.get("iris", "f0") is not None
+            assert _db_count(s.storage_path) == 3
+        finally:
+            s.close()
+
+    def test_close_flushes_pending_writes(self, tmp_path):
+        s = FollowerStore(str(tmp_path), flush_interval_s=60)
+        s.put(_record("f1"))
+        s.close()
+        assert _db_count(str(tmp_path)) == 1
+
+
+class TestCreatorQueries:
+
+    def test_high_intent_and_leads_use_indexed_columns(self, store):
+        store.put(_record("cold", purchase_intent_score=0.1, last_contact="2026-01-01"))
+        store.put(_record("warm", purchase_intent_score=0.6, is_lead=True, last_contact="2026-01-03"))
+        store.put(_record("hot", purchase_intent_score=0.9, is_lead=True, last_contact="2026-01-02"))
+        store.put(_record("other", creator_id="stefano", purchase_intent_score=0.9, is_lead=True))
+
+        assert [r["follower_id"] for r in store.list_for_creator("iris", min_intent=0.5)] == ["hot", "warm"]
+        assert [r["follower_id"] for r in store.list_for_creator("iris", leads_only=True)] == ["warm", "hot"]
+        assert len(store.list_for_creator("iris")) == 3
+
+    def test_delete_creator_drops_rows_and_pending(self, store):
+        store.put(_record("f1"))
+        store.flush()
+        store.put(_record("f2"))
+        store.put(_record("keep", creator_id="stefano"))
+
+        store.delete("iris")
+        assert store.list_for_creator("iris") == []
+        assert store.get("stefano", "keep") is not None
+
+
+class TestLegacyJsonImport:
+
+    @staticmethod
+    def _write_legacy(root, creator, follower, data):
+        creator_dir = root / creator
+        creator_dir.mkdir(parents=True, exist_ok=True)
+        (creator_dir / f"{follower}.json").write_text(json.dumps(data), encoding="utf-8")
+
+    def test_single_follower_is_imported_on_miss(self, tmp_path, store):
+        self._write_legacy(tmp_path, "iris", "f1", _record("f1", username="ana"))
+        assert store.get("iris", "f1")["username"] == "ana"
+        assert store.stats["legacy_imported"] == 1
+        assert _db_count(str(tmp_path)) == 1
+
+    def test_creator_directory_is_imported_once(self, tmp_path, store):
+        self._write_legacy(tmp_path, "iris", "f1", _record("f1", purchase_intent_score=0.8))
+        self._write_legacy(tmp_path, "iris", "f2", _record("f2", purchase_intent_score=0.2))
+        # A newer record written through the store wins over its legacy file
+        store.put(_record("f2", purchase_intent_score=0.7))
+
+        assert [r["follower_id"] for r in store.list_for_creator("iris", min_intent=0.5)] == ["f1", "f2"]
+        store.list_for_creator("iris")
+        assert store.stats["legacy_imported"] == 2
+
+    def test_deleted_follower_is_not_reimported(self, tmp_path, store):
+        self._write_legacy(tmp_path, "iris", "f1", _record("f1", username="ana"))
+        assert store.get("iris", "f1") is not None
+
+        assert store.delete("iris", "f1") == 1
+        assert store.get("iris", "f1") is None
+        assert not (tmp_path / "iris" / "f1.json").exists()
+
+    def test_delete_creator_removes_unimported_legacy_files(self, tmp_path, store):
+        self._write_legacy(tmp_path, "iris", "f1", _record("f1"))
+        self._write_legacy(tmp_path, "iris", "f2", _record("f2"))
+
+        assert store.delete("iris") == 2
+        assert store.get("iris", "f1") is None
+        assert store.list_for_creator("iris") == []
+
+
+class TestMemoryStoreFacade:
+
+    @pytest.mark.asyncio
+    async def test_instances_on_one_path_share_store_and_cache(self, tmp_path):
+        from services.memory_service import FollowerMemory, MemoryStore
+
+        writer = MemoryStore(storage_path=str(tmp_path))
+        reader = MemoryStore(storage_path=str(tmp_path))
+        assert writer._store is reader._store is get_follower_store(str(tmp_path))
+
+        memory = FollowerMemory(follower_id="f1", creator_id="iris", total_messages=2)
+        await writer.save(memory)
+        assert await reader.get("iris", "f1") is memory
+
+        reader.clear_cache()
+        loaded = await reader.get("iris", "f1")
+        assert loaded is not memory and loaded.total_messages == 2
+
+    @pytest.mark.asyncio
+    async def test_core_memory_store_creator_queries(self, tmp_path):
+        with pytest.warns(DeprecationWarning):
+            import importlib
+
+            import core.memory
+            importlib.reload(core.memory)
+        from core.memory import FollowerMemory, MemoryStore
+
+        store = MemoryStore(storage_path=str(tmp_path))
+        await store.save(FollowerMemory(follower_id="a", creator_id="iris", purchase_intent_score=0.9, is_lead=True))
+        await store.save(FollowerMemory(follower_id="b", creator_id="iris", purchase_intent_score=0.1))
+
+        assert [m.follower_id for m in await store.get_high_intent("iris")] == ["a"]
+        assert [m.follower_id for m in await store.get_leads("iris")] == ["a"]
+        assert len(await store.get_all_for_creator("iris")) == 2
+
+        other = FollowerMemory(follower_id="c", creator_id="maria")
+        await store.save(other)
+
+        store.clear_creator_cache("iris")
+        assert len(await store.get_all_for_creator("iris")) == 2
+        assert await store.get("maria", "c") is other
+
+        assert store.delete_creator_followers("iris") == 2
+        assert await store.get_all_for_creator("iris") == []
+        assert await store.get("iris", "a") is None
+        assert await store.get("maria", "c") is other
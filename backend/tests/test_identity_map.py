@@ -0,0 +1,179 @@
+"""
+Unit tests: process-wide identity map (core/identity_map.py).
+Warm-path query counts, bulk resolution, negative caching, invalidation. No DB required.
+"""
+import uuid
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from core import identity_map as im
+
+IRIS = str(uuid.UUID(int=1))
+STEFANO = str(uuid.UUID(int=2))
+LEAD_A = str(uuid.UUID(int=101))
+LEAD_B = str(uuid.UUID(int=102))
+
+
+class FakeLoader:
+    """In-memory creators/leads tables; counts round trips."""
+
+    def __init__(self):
+        self.queries = 0
+        self.creators = [
+            (IRIS, "iris_bertran", "page-1", "igu-1", ["extra-1"]),
+            (STEFANO, "stefano", "page-2", "extra-1", []),
+        ]
+        self.leads_table = {IRIS: [(LEAD_A, "ig_555"), (LEAD_B, "777")]}
+
+    def creators_by_slug(self, slugs):
+        self.queries += 1
+        return [r for r in self.creators if r[1] in slugs]
+
+    def creators_by_uuid(self, uuids):
+        self.queries += 1
+        return [r for r in self.creators if r[0] in uuids]
+
+    def creators_by_platform_id(self, ids):
+        self.queries += 1
+        return [r for r in self.creators if {r[2], r[3], *r[4]} & set(ids)]
+
+    def leads(self, creator_uuid, platform_user_ids):
+        self.queries += 1
+        raws = {im.raw_platform_id(p) for p in platform_user_ids}
+        return [r for r in self.leads_table.get(creator_uuid, []) if im.raw_platform_id(r[1]) in raws]
+
+
+@pytest.fixture
+def loader():
+    return FakeLoader()
+
+
+@pytest.fixture
+def idmap(loader):
+    return im.IdentityMap(loader=loader, ttl_s=3600, negative_ttl_s=60)
+
+
+class TestWarmPath:
+
+    def test_dm_turn_translates_ids_without_queries_once_warm(self, idmap, loader):
+        def turn():
+            creator = idmap.resolve_creator_by_platform_id("page-1")
+            assert idmap.resolve_creator_uuid("iris_bertran") == creator == IRIS
+            assert idmap.resolve_lead_uuid(creator, "555") == LEAD_A
+
+        turn()
+        cold = loader.queries
+        for _ in range(5):
+            turn()
+
+        assert loader.queries == cold
+        assert idmap.stats()["lookups"][im.LEAD]["hit_rate"] > 0.8
+
+    def test_one_creator_row_fills_every_mapping(self, idmap, loader):
+        idmap.resolve_creator_uuid("iris_bertran")
+        assert idmap.resolve_creator_slug(IRIS) == "iris_bertran"
+        assert idmap.resolve_creator_by_platform_id("igu-1") == IRIS
+        assert loader.queries == 1
+
+    @pytest.mark.asyncio
+    async def test_async_hits_stay_on_the_event_loop(self, idmap):
+        assert await idmap.aresolve_lead_uuid(IRIS, "ig_777") == LEAD_B
+        with patch.object(im.asyncio, "to_thread", side_effect=AssertionError("queried")):
+            assert await idmap.aresolve_lead_uuid(IRIS, "777") == LEAD_B
+            assert await idmap.aresolve_creator_uuid(IRIS) == IRIS
+
+
+class TestResolution:
+
+    def test_prefix_variants_share_one_lead(self, idmap, loader):
+        assert idmap.resolve_lead_uuid(IRIS, "555") == LEAD_A
+        assert idmap.resolve_lead_uuid(IRIS, "ig_555") == LEAD_A
+        assert idmap.resolve_lead_uuid(IRIS, "wa_555") == LEAD_A
+        assert loader.queries == 1
+
+    def test_resolve_many_is_one_query(self, idmap, loader):
+        leads = idmap.resolve_many(["ig_555", "777", "999", LEAD_B], creator_uuid=IRIS)
+        creators = idmap.resolve_many(["iris_bertran", "stefano", "ghost"])
+
+        assert leads == {"ig_555": LEAD_A, "777": LEAD_B, "999": None, LEAD_B: LEAD_B}
+        assert creators == {"iris_bertran": IRIS, "stefano": STEFANO, "ghost": None}
+        assert loader.queries == 2
+
+    def test_unknown_ids_are_cached_negatively(self, idmap, loader):
+        for _ in range(3):
+            assert idmap.resolve_creator_by_platform_id("spam-page") is None
+            assert idmap.resolve_lead_uuid(IRIS, "123") is None
+        assert loader.queries == 2
+        assert idmap.stats()["lookups"][im.CREATOR_BY_PLATFORM_ID]["negative_hits"] == 2
+
+    def test_negative_entries_expire(self, loader):
+        idmap = im.IdentityMap(loader=loader, negative_ttl_s=0)
+        idmap.resolve_lead_uuid(IRIS, "123")
+        loader.leads_table[IRIS].append((str(uuid.UUID(int=103)), "123"))
+        assert idmap.resolve_lead_uuid(IRIS, "123") == str(uuid.UUID(int=103))
+
+    def test_page_id_wins_over_additional_ids(self, idmap):
+        # extra-1 is Iris's additional id but Stefano's ig_user_id
+        assert idmap.resolve_creator_by_platform_id("extra-1") == STEFANO
+
+    def test_failures_are_not_cached(self, idmap, loader):
+        with patch.object(loader, "creators_by_slug", side_effect=RuntimeError("db down")):
+            with pytest.raises(RuntimeError):
+                idmap.resolve_creator_uuid("iris_bertran")
+        assert idmap.resolve_creator_uuid("iris_bertran") == IRIS
+
+
+class TestInvalidation:
+
+    def test_new_lead_drops_its_negative_entry(self, idmap, loader):
+        assert idmap.resolve_lead_uuid(IRIS, "ig_123") is None
+        loader.leads_table[IRIS].append((str(uuid.UUID(int=103)), "123"))
+
+        idmap.invalidate(f"lead:{IRIS}:123")
+
+        assert idmap.resolve_lead_uuid(IRIS, "ig_123") == str(uuid.UUID(int=103))
+        assert idmap.resolve_lead_uuid(IRIS, "555") == LEAD_A
+
+    def test_creator_change_drops_creator_mappings(self, idmap, loader):
+        idmap.resolve_creator_by_platform_id("page-9")
+        loader.creators[0] = (IRIS, "iris_bertran", "page-9", "igu-1", [])
+
+        idmap.invalidate("creators")
+
+        assert idmap.resolve_creator_by_platform_id("page-9") == IRIS
+
+    @pytest.fixture
+    def flush_session(self):
+        session = MagicMock()
+        session.new, session.deleted, session.dirty = [], [], []
+        session.info = {}
+        return session
+
+    def test_hook_collects_new_leads_and_publishes_after_commit(self, flush_session):
+        from api.models import Lead
+
+        flush_session.new = [Lead(creator_id=uuid.UUID(IRIS), platform="instagram", platform_user_id="ig_123")]
+        im._collect_identity_changes(flush_session, None)
+
+        with patch("core.invalidation_bus.publish_invalidation") as publish:
+            im._publish_identity_changes(flush_session)
+        publish.assert_called_once()
+        assert publish.call_args.args[1] == f"lead:{IRIS}:123"
+
+    def test_hook_ignores_non_identity_updates(self, flush_session):
+        from sqlalchemy.orm.attributes import set_committed_value
+
+        from api.models import Creator
+
+        creator = Creator()
+        for field, value in (("name", "iris_bertran"), ("bot_active", False), ("instagram_page_id", "page-1")):
+            set_committed_value(creator, field, value)
+        creator.bot_active = True
+        flush_session.dirty = [creator]
+        im._collect_identity_changes(flush_session, None)
+        assert "_invalidate_identities" not in flush_session.info
+
+        creator.instagram_page_id = "page-9"
+        im._collect_identity_changes(flush_session, None)
+        assert flush_session.info["_invalidate_identities"] == {"creators"}
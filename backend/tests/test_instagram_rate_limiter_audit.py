@@ -275,3 +275,31 @@ class TestStatsReporting:
         r2 = get_instagram_rate_limiter()
         assert r1 is r2
         mod._instagram_rate_limiter = None  # Cleanup
+
+
+class TestBackgroundBudget:
+    """Test 6: Background (reconciliation) budget accounting."""
+
+    def test_remaining_budget_is_min_of_hour_and_day(self):
+        """remaining_budget reports the tighter of the hourly/daily windows."""
+        limiter = InstagramRateLimiter()
+        assert limiter.remaining_budget("c1") == limiter.CALLS_PER_HOUR
+        limiter.record_call("c1", "/conversations", 200)
+        assert limiter.remaining_budget("c1") == limiter.CALLS_PER_HOUR - 1
+
+    def test_remaining_budget_zero_during_backoff(self):
+        """A token in backoff has no background budget."""
+        limiter = InstagramRateLimiter()
+        limiter.record_call("c1", "/conversations", 429)
+        assert limiter.remaining_budget("c1") == 0
+
+    def test_consume_budget_skips_minute_window(self):
+        """consume_budget charges hour/day but leaves the burst window free."""
+        limiter = InstagramRateLimiter()
+        limiter.consume_budget("c1", "reconciliation", 30)
+        stats = limiter.get_stats("c1")
+        assert stats["calls_last_minute"] == 0
+        assert stats["calls_last_hour"] == 30
+        assert stats["calls_last_day"] == 30
+        allowed, _, _ = limiter.can_make_request("c1")
+        assert allowed
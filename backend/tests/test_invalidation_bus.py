@@ -0,0 +1,139 @@
+"""Tests for core.invalidation_bus — cross-worker cache invalidation."""
+
+import json
+import time
+
+from core.invalidation_bus import (
+    InMemoryBackend,
+    InMemoryHub,
+    InvalidationBus,
+    InvalidationTopic,
+    encode_batch,
+)
+
+
+class RecordingBackend(InMemoryBackend):
+    def __init__(self, hub):
+        super().__init__(hub)
+        self.sent = []
+
+    def send(self, payload):
+        self.sent.append(json.loads(payload))
+        super().send(payload)
+
+
+def _cluster(n=2, **bus_kwargs):
+    """n buses ("workers") sharing one in-memory hub, each recording dropped keys."""
+    hub = InMemoryHub()
+    workers = []
+    for _ in range(n):
+        bus = InvalidationBus(RecordingBackend(hub), **bus_kwargs)
+        dropped = []
+        bus.subscribe(InvalidationTopic.DM_AGENT, dropped.append)
+        bus.start()
+        workers.append((bus, dropped))
+    return workers
+
+
+class TestInvalidationBus:
+
+    def test_publish_applies_locally_then_reaches_other_workers(self):
+        (a, dropped_a), (b, dropped_b) = _cluster(batch_window_s=60)
+
+        a.publish(InvalidationTopic.DM_AGENT, "iris")
+        assert dropped_a == ["iris"]
+        assert dropped_b == []  # still batched
+
+        a.flush()
+        assert dropped_b == ["iris"]
+        assert dropped_a == ["iris"]  # own broadcast is ignored
+
+    def test_burst_is_deduplicated_into_one_message(self):
+        (a, _), (b, dropped_b) = _cluster(batch_window_s=60)
+
+        for _ in range(3):
+            for creator in ("iris", "stefano"):
+                a.publish(InvalidationTopic.DM_AGENT, creator)
+        a.flush()
+
+        assert len(a.backend.sent) == 1
+        assert sorted(dropped_b) == ["iris", "stefano"]
+
+    def test_topic_wide_invalidation_absorbs_keys(self):
+        (a, _), (b, dropped_b) = _cluster(batch_window_s=60)
+
+        a.publish(InvalidationTopic.DM_AGENT, "iris")
+        a.publish(InvalidationTopic.DM_AGENT, None)
+        a.publish(InvalidationTopic.DM_AGENT, "stefano")
+        a.flush()
+
+        assert dropped_b == [None]
+
+    def test_batch_window_flushes_in_background(self):
+        (a, _), (b, dropped_b) = _cluster(batch_window_s=0.02)
+        a.publish(InvalidationTopic.DM_AGENT, "iris")
+        deadline = time.monotonic() + 1.0
+        while not dropped_b and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert dropped_b == ["iris"]
+
+    def test_max_batch_flushes_immediately(self):
+        (a, _), (b, dropped_b) = _cluster(batch_window_s=60, max_batch=2)
+        a.publish(InvalidationTopic.DM_AGENT, "one")
+        assert dropped_b == []
+        a.publish(InvalidationTopic.DM_AGENT, "two")
+        assert sorted(dropped_b) == ["one", "two"]
+
+    def test_failing_handler_does_not_block_others(self):
+        [(a, dropped_a)] = _cluster(n=1)
+
+        def boom(_key):
+            raise RuntimeError("bad handler")
+
+        a.subscribe(InvalidationTopic.DM_AGENT, boom)
+        a.subscribe(InvalidationTopic.DM_AGENT, dropped_a.append)
+        a.publish(InvalidationTopic.DM_AGENT, "iris")
+        assert dropped_a == ["iris", "iris"]
+
+    def test_unknown_topic_and_malformed_payloads_are_ignored(self):
+        [(a, dropped_a)] = _cluster(n=1)
+        a.receive("not json")
+        a.receive(json.dumps({"o": "other", "i": [["future_topic", "x"], ["dm_agent", "iris"]]}))
+        assert dropped_a == ["iris"]
+
+    def test_resync_drops_every_subscribed_topic(self):
+        [(a, dropped_a)] = _cluster(n=1)
+        a.resync()
+        assert dropped_a == [None]
+
+
+class TestEncoding:
+
+    def test_large_batches_are_chunked_under_notify_limit(self):
+        items = [("api_cache", f"conversations:creator_{i:05d}") for i in range(2000)]
+        payloads = encode_batch("origin", items)
+
+        assert len(payloads) > 1
+        assert all(len(p.encode("utf-8")) < 8000 for p in payloads)
+        decoded = [tuple(i) for p in payloads for i in json.loads(p)["i"]]
+        assert decoded == items
+
+
+class TestApiCacheIntegration:
+
+    def test_simple_cache_invalidation_is_published(self):
+        from unittest.mock import patch
+
+        from api.cache import SimpleCache
+
+        cache = SimpleCache(invalidation_topic=InvalidationTopic.API_CACHE)
+        cache.set("conversations:iris:50", [1])
+        cache.set("leads:iris", [2])
+
+        with patch("core.invalidation_bus.publish_invalidation") as publish:
+            cache.invalidate("conversations:iris")
+        publish.assert_called_once_with(InvalidationTopic.API_CACHE, "conversations:iris")
+
+        cache._invalidate_local("conversations:iris")
+        assert cache.get("conversations:iris:50") is None
+        assert cache.get("leads:iris") == [2]
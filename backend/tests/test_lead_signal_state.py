@@ -0,0 +1,183 @@
+"""
+Unit tests: incremental lead-signal state (services/lead_scoring.py).
+Stored counters vs from-scratch scan, ORM hook parameters, bulk scoring.
+No DB required.
+"""
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from services import lead_scoring as ls
+from services.lead_scoring import (
+    SIGNAL_COUNTERS,
+    SIGNAL_WINDOW,
+    check_signal_state,
+    extract_signals,
+    message_signal_deltas,
+    signals_from_state,
+)
+
+CONVERSATION = [
+    ("user", "hola! cuánto cuesta el programa?", None, None),
+    ("assistant", "jaja hola crack, te paso info", None, None),
+    ("user", "quiero reservar una sesión", "purchase", None),
+    ("user", "🔥", None, "story_reply"),
+    ("assistant", "un abrazo!", None, None),
+    ("user", "me interesa colaborar en un proyecto", "interest_soft", None),
+]
+
+
+def _lead(**overrides):
+    now = datetime.now(timezone.utc)
+    fields = dict(id="lead-1", status="nuevo", last_contact_at=now - timedelta(days=2),
+                  first_contact_at=now - timedelta(days=10), username="ana", platform_user_id="1")
+    fields.update(overrides)
+    return SimpleNamespace(**fields)
+
+
+def _session_with(messages):
+    """Session whose execute() returns scan rows the way Postgres would (window aggregates + LIMIT)."""
+    rows = [
+        {"role": r, "content": c, "intent": i, "meta_type": m, "created_at": None,
+         "message_count": len(messages), "last_message_at": None}
+        for r, c, i, m in messages
+    ][:SIGNAL_WINDOW]
+    session = MagicMock()
+    session.execute.return_value.mappings.return_value.fetchall.return_value = rows
+    return session
+
+
+def _accumulate(messages):
+    """What the after_flush UPDATE does, message by message."""
+    state = dict.fromkeys(SIGNAL_COUNTERS, 0)
+    state["message_count"] = 0
+    for role, content, intent, meta_type in messages:
+        deltas = message_signal_deltas(role, content, intent, meta_type)
+        if state["message_count"] < SIGNAL_WINDOW:
+            for key, value in deltas.items():
+                state[key] += value
+        state["message_count"] += 1
+    return state
+
+
+class TestSignalsFromState:
+
+    def test_scan_produces_expected_signals(self):
+        signals = extract_signals(_session_with(CONVERSATION), _lead())
+
+        assert signals["total_messages"] == 6
+        assert signals["follower_messages"] == 4
+        assert signals["creator_messages"] == 2
+        assert signals["follower_purchase_hits"] == 1
+        assert signals["follower_scheduling_hits"] == 1
+        assert signals["follower_interest_hits"] == 1
+        assert signals["creator_social_hits"] == 2
+        assert signals["social_hits"] == 2
+        assert signals["collaboration_hits"] == 1
+        assert signals["story_replies"] == 1
+        assert signals["short_reactions"] == 1
+        assert signals["strong_intents"] == 1 and signals["soft_intents"] == 1
+        assert signals["bidirectional_ratio"] == 0.5
+        assert signals["days_since_last"] == 2
+
+    def test_incremental_state_matches_full_scan(self):
+        messages = CONVERSATION * 30  # crosses the 100-message window
+        scanned = ls.scan_signal_state(_session_with(messages), "lead-1")
+        incremental = _accumulate(messages)
+
+        for key in ("message_count",) + SIGNAL_COUNTERS:
+            assert incremental[key] == scanned[key], key
+        lead = _lead()
+        assert signals_from_state({**incremental, "last_message_at": None}, lead) == signals_from_state(scanned, lead)
+        assert signals_from_state(scanned, lead)["total_messages"] == SIGNAL_WINDOW
+
+    def test_existing_customer_flag_comes_from_lead(self):
+        state = _accumulate(CONVERSATION)
+        assert signals_from_state(state, _lead(status="cliente"))["is_existing_customer"] is True
+
+
+class TestSignalStateHook:
+
+    @pytest.fixture
+    def flush_session(self):
+        session = MagicMock()
+        session.new, session.deleted, session.dirty = [], [], []
+        with patch.object(ls, "_signal_table_present", return_value=True):
+            yield session
+
+    def test_new_messages_become_one_increment_each(self, flush_session):
+        from api.models import Message
+
+        flush_session.new = [
+            Message(lead_id="lead-1", role="user", content="cuánto cuesta?"),
+            Message(lead_id="lead-1", role="assistant", content=""),  # not counted by the scan either
+            SimpleNamespace(),  # unrelated object
+        ]
+        ls._advance_signal_states(flush_session, None)
+
+        statement, params = flush_session.connection.return_value.execute.call_args.args
+        assert "UPDATE lead_signal_state" in str(statement)
+        assert len(params) == 1
+        assert params[0]["lead_id"] == "lead-1"
+        assert params[0]["follower_purchase_hits"] == 1
+        assert params[0]["version"] == ls.SIGNALS_VERSION
+
+    def test_deleted_messages_mark_state_stale(self, flush_session):
+        from api.models import Message
+
+        flush_session.deleted = [Message(lead_id="lead-2", role="user", content="hola")]
+        ls._advance_signal_states(flush_session, None)
+
+        statement, params = flush_session.connection.return_value.execute.call_args.args
+        assert "stale = TRUE" in str(statement)
+        assert params == [{"lead_id": "lead-2"}]
+
+    def test_no_message_changes_no_sql(self, flush_session):
+        ls._advance_signal_states(flush_session, None)
+        flush_session.connection.assert_not_called()
+
+    def test_raw_sql_importers_mark_leads_stale(self):
+        cursor = MagicMock(rowcount=1)
+        cursor.fetchone.return_value = {"present": True}  # RealDictCursor row
+
+        assert ls.mark_signal_states_stale(cursor, ["lead-3", None]) == 1
+        statement, params = cursor.execute.call_args.args
+        assert "stale = TRUE" in statement
+        assert params == (["lead-3"],)
+
+        cursor.reset_mock()
+        cursor.fetchone.return_value = (False,)  # before migration 053
+        assert ls.mark_signal_states_stale(cursor, ["lead-3"]) == 0
+        assert cursor.execute.call_count == 1
+
+
+class TestBulkScoringAndChecker:
+
+    def test_stored_states_skip_message_scans(self):
+        leads = [_lead(id="a"), _lead(id="b")]
+        stored = {"a": _accumulate(CONVERSATION)}
+        with patch.object(ls, "load_signal_states", return_value=stored), \
+                patch.object(ls, "rebuild_signal_state", return_value=_accumulate([])) as rebuild:
+            by_status, rebuilt = ls._score_leads(MagicMock(), leads)
+
+        rebuild.assert_called_once()
+        assert rebuilt == 1
+        assert sum(by_status.values()) == 2
+        assert leads[0].score > 0
+
+    def test_checker_reports_and_repairs_drift(self):
+        fresh = {**_accumulate(CONVERSATION), "last_message_at": None}
+        drifted = {**fresh, "follower_purchase_hits": 0}
+        with patch.object(ls, "load_signal_states", return_value={"a": drifted, "b": fresh}), \
+                patch.object(ls, "scan_signal_state", return_value=fresh), \
+                patch.object(ls, "save_signal_state") as save:
+            report = check_signal_state(MagicMock(), ["a", "b", "c"], repair=True)
+
+        assert report["checked"] == 3
+        assert report["consistent"] == 1
+        assert report["missing"] == 1
+        assert report["mismatched"] == [{"lead_id": "a", "fields": {"follower_purchase_hits": [0, 1]}}]
+        assert report["repaired"] == 2
+        assert {c.args[1] for c in save.call_args_list} == {"a", "c"}
@@ -0,0 +1,227 @@
+"""
+Unit tests: content-addressed media store (services/media_store.py).
+Filesystem backend under tmp_path; no DB or Cloudinary required.
+"""
+import base64
+import hashlib
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from services.media_store import (
+    CloudinaryMediaBackend,
+    FilesystemMediaBackend,
+    InlineMediaBackend,
+    MediaStore,
+    MediaStoreUnavailable,
+    backfill_message_media,
+    parse_data_url,
+)
+
+JPEG = b"\xff\xd8\xff\xe0" + b"story-thumbnail" * 400
+SHA = hashlib.sha256(JPEG).hexdigest()
+DATA_URL = "data:image/jpeg;base64," + base64.b64encode(JPEG).decode()
+
+
+@pytest.fixture
+def store(tmp_path):
+    return MediaStore(FilesystemMediaBackend(str(tmp_path), base_url="https://api.test"), inline_max_bytes=64)
+
+
+class TestStore:
+
+    def test_put_is_content_addressed_and_deduplicated(self, store, tmp_path):
+        first = store.put(JPEG, "image/jpeg")
+        second = MediaStore(store.backend).put(JPEG, "image/jpeg")
+
+        assert first.sha256 == second.sha256 == SHA
+        assert first.url == f"https://api.test/media/{SHA}"
+        assert (tmp_path / SHA[:2] / SHA[2:4] / SHA).read_bytes() == JPEG
+        assert store.get(SHA) == (JPEG, "image/jpeg")
+
+    def test_get_rejects_non_hash_keys(self, store):
+        assert store.get("../../etc/passwd") is None
+        assert store.get("0" * 64) is None
+
+    def test_parse_data_url(self):
+        assert parse_data_url(DATA_URL) == (JPEG, "image/jpeg")
+        assert parse_data_url("https://cdn.instagram.com/x.jpg") is None
+
+    def test_cloudinary_backend_uses_hash_as_public_id(self):
+        calls = []
+
+        class FakeService:
+            def upload_from_url(self, url, **kwargs):
+                calls.append((url, kwargs))
+                return SimpleNamespace(success=True, url=f"https://res.cloudinary.com/x/{kwargs['public_id']}", error=None)
+
+        stored = MediaStore(CloudinaryMediaBackend(FakeService(), folder="media")).put(JPEG, "image/jpeg")
+
+        assert stored.url.endswith(SHA)
+        assert calls[0][0] == DATA_URL
+        assert calls[0][1]["public_id"] == SHA
+
+
+class TestExternalize:
+
+    def test_data_urls_become_references_at_any_depth(self, store):
+        meta = {
+            "type": "story_mention",
+            "permanent_url": DATA_URL,
+            "carousel_items": [{"url": DATA_URL}, {"url": "https://cdn/x.jpg"}],
+            "emoji": "data:,tiny",
+        }
+        out, changed = store.externalize(meta)
+
+        url = f"https://api.test/media/{SHA}"
+        assert changed
+        assert out["permanent_url"] == url
+        assert out["carousel_items"] == [{"url": url}, {"url": "https://cdn/x.jpg"}]
+        assert out["emoji"] == "data:,tiny"
+        assert out["media_refs"] == [SHA]
+        assert meta["permanent_url"] == DATA_URL  # input left untouched
+
+    def test_legacy_thumbnail_base64_moves_to_thumbnail_url(self, store):
+        raw = base64.b64encode(JPEG).decode()
+        out, changed = store.externalize({"type": "shared_post", "thumbnail_base64": raw})
+
+        assert changed
+        assert "thumbnail_base64" not in out
+        assert out["thumbnail_url"] == f"https://api.test/media/{SHA}"
+
+        out, _ = store.externalize({"thumbnail_base64": raw, "thumbnail_url": "https://res.cloudinary.com/a.jpg"})
+        assert out["thumbnail_url"] == "https://res.cloudinary.com/a.jpg"
+
+    def test_metadata_without_blobs_is_unchanged(self, store):
+        meta = {"type": "image", "url": "https://cdn/x.jpg"}
+        assert store.externalize(meta) == (meta, False)
+
+
+class TestBackendSelection:
+
+    @pytest.fixture
+    def cloudinary(self, monkeypatch):
+        import services.cloudinary_service as cloudinary_service
+
+        service = SimpleNamespace(is_configured=False)
+        monkeypatch.setattr(cloudinary_service, "get_cloudinary_service", lambda: service)
+        return service
+
+    def _backend(self, monkeypatch, name):
+        import services.media_store as media_store
+
+        monkeypatch.setattr(media_store, "MEDIA_STORE_BACKEND", name)
+        return media_store.media_backend_from_env()
+
+    def test_auto_without_cloudinary_keeps_media_inline(self, cloudinary, monkeypatch):
+        assert isinstance(self._backend(monkeypatch, "auto"), InlineMediaBackend)
+        assert isinstance(self._backend(monkeypatch, "cloudinary"), InlineMediaBackend)
+
+    def test_auto_uses_cloudinary_when_configured(self, cloudinary, monkeypatch):
+        cloudinary.is_configured = True
+        assert isinstance(self._backend(monkeypatch, "auto"), CloudinaryMediaBackend)
+
+    def test_filesystem_only_when_asked_for(self, cloudinary, monkeypatch):
+        assert isinstance(self._backend(monkeypatch, "filesystem"), FilesystemMediaBackend)
+        assert isinstance(self._backend(monkeypatch, "disk"), InlineMediaBackend)
+
+    def test_inline_store_never_externalizes(self):
+        store = MediaStore(InlineMediaBackend(), inline_max_bytes=64)
+        meta = {"permanent_url": DATA_URL, "thumbnail_base64": base64.b64encode(JPEG).decode()}
+
+        assert not store.durable
+        assert store.externalize(meta) == (meta, False)
+        with pytest.raises(MediaStoreUnavailable):
+            store.put(JPEG, "image/jpeg")
+        with pytest.raises(MediaStoreUnavailable):
+            backfill_message_media(engine=None, store=store)
+
+    async def test_story_thumbnail_stays_inline_without_a_durable_store(self, monkeypatch):
+        import services.media_store as media_store
+        from core.story_thumbnail import _store_content, ensure_story_thumbnail
+
+        monkeypatch.setattr(media_store, "_store", MediaStore(InlineMediaBackend(), inline_max_bytes=64))
+
+        assert await _store_content(JPEG, "image/jpeg") == DATA_URL
+        assert await ensure_story_thumbnail("https://cdn/x.jpg", existing_thumbnail=DATA_URL) == DATA_URL
+
+
+def test_backfill_streams_batches_and_rewrites_only_changed_rows(store):
+    rows = [(f"00000000-0000-0000-0000-00000000000{i}", meta) for i, meta in enumerate([
+        {"permanent_url": DATA_URL},
+        {"url": "https://cdn/x.jpg;base64,nothing"},
+        {"thumbnail_base64": base64.b64encode(JPEG).decode()},
+    ], start=1)]
+
+    class FakeEngine:
+        def __init__(self):
+            self.selects, self.updates, self.transactions = [], [], []
+            self._open = None
+
+        @contextmanager
+        def connect(self):
+            yield self
+
+        @contextmanager
+        def begin(self):
+            self._open = []
+            yield self
+            self.transactions.append(self._open)
+
+        def execute(self, statement, params):
+            if "UPDATE" in str(statement):
+                self.updates.append(params["id"])
+                self._open.append(params["id"])
+                return SimpleNamespace(rowcount=1)
+            self.selects.append(params["after"])
+            batch = [r for r in rows if r[0] > params["after"]][:params["batch_size"]]
+            return SimpleNamespace(fetchall=lambda: batch)
+
+    engine = FakeEngine()
+    counts = backfill_message_media(engine, store=store, batch_size=2)
+
+    assert counts == {"scanned": 3, "updated": 2, "failed": 0}
+    assert engine.updates == [rows[0][0], rows[2][0]]
+    assert engine.selects[1:] == [rows[1][0], rows[2][0]]
+    # Each batch's updates commit in their own transaction
+    assert engine.transactions == [[rows[0][0]], [rows[2][0]]]
+
+
+def test_flush_hook_skips_network_backends(monkeypatch):
+    import services.media_store as media_store
+
+    uploads = []
+    backend = SimpleNamespace(name="cloudinary", put=lambda *a: uploads.append(a) or "https://cdn/x")
+    monkeypatch.setattr(media_store, "_store", MediaStore(backend, inline_max_bytes=64))
+    from api.models import Message
+
+    message = Message(role="user", content="story", msg_metadata={"permanent_url": DATA_URL})
+
+    media_store._externalize_pending_messages(SimpleNamespace(new=[message], dirty=[]), None, None)
+
+    assert uploads == []
+    assert message.msg_metadata == {"permanent_url": DATA_URL}
+
+
+def test_media_endpoint_serves_with_immutable_cache_headers(store, monkeypatch):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    import services.media_store as media_store
+    from api.routers import media
+
+    store.put(JPEG, "image/jpeg")
+    monkeypatch.setattr(media_store, "_store", store)
+    app = FastAPI()
+    app.include_router(media.router)
+    client = TestClient(app)
+
+    response = client.get(f"/media/{SHA}")
+    assert response.status_code == 200
+    assert response.content == JPEG
+    assert response.headers["content-type"] == "image/jpeg"
+    assert "immutable" in response.headers["cache-control"]
+
+    assert client.get(f"/media/{SHA}", headers={"If-None-Match": response.headers["etag"]}).status_code == 304
+    assert client.get("/media/not-a-hash").status_code == 404
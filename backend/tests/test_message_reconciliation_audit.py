@@ -131,6 +131,41 @@ class TestDuplicateDetection:
             result = await get_db_message_ids("test_creator")
             assert isinstance(result, set)
 
+    @pytest.mark.asyncio
+    async def test_get_db_message_ids_probes_only_candidates(self):
+        """With candidate_ids, only those IDs are probed, in bounded chunks."""
+        import core.message_reconciliation.fetcher as fetcher_mod
+
+        mock_session = MagicMock()
+        chain = MagicMock()
+        chain.join.return_value = chain
+        chain.filter.return_value = chain
+        chain.all.side_effect = [[("m1",)], [("m3",)]]
+        mock_session.query.return_value = chain
+
+        with patch("api.database.SessionLocal", return_value=mock_session), \
+                patch.object(fetcher_mod, "_ID_PROBE_CHUNK", 2):
+            result = await fetcher_mod.get_db_message_ids(
+                "test_creator", candidate_ids=["m1", "m2", "m3", None, "m1"]
+            )
+
+        assert result == {"m1", "m3"}
+        # One join query, two IN (...) probes for three distinct candidates
+        assert mock_session.query.call_count == 1
+        assert chain.all.call_count == 2
+        mock_session.close.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_get_db_message_ids_empty_candidates_skips_db(self):
+        """No candidate IDs means no DB round-trip."""
+        from core.message_reconciliation import get_db_message_ids
+
+        with patch("api.database.SessionLocal") as mock_session_local:
+            result = await get_db_message_ids("test_creator", candidate_ids=[None, ""])
+
+        assert result == set()
+        mock_session_local.assert_not_called()
+
     def test_extract_sticker_attachment(self):
         """Sticker attachment correctly identified."""
         attachments = [{"type": "sticker", "payload": {"url": "https://example.com/sticker.webp"}}]
@@ -289,3 +324,129 @@ class TestTimestampUpdate:
         result = _extract_media_from_attachments(attachments)
         assert result["type"] == "shared_reel"
         assert result["content_text"] == "Shared a reel"
+
+
+class TestConcurrentCycle:
+    """Test 6: Concurrent multi-creator cycle with per-creator rate budgets."""
+
+    @staticmethod
+    def _mock_creators(names):
+        creators = []
+        for name in names:
+            c = MagicMock()
+            c.name = name
+            c.instagram_token = f"tok_{name}"
+            c.instagram_user_id = f"ig_{name}"
+            c.instagram_page_id = None
+            creators.append(c)
+        session = MagicMock()
+        session.query.return_value.filter.return_value.all.return_value = creators
+        return session
+
+    @staticmethod
+    def _result(creator_id, missing=0, inserted=0):
+        return {
+            "creator_id": creator_id,
+            "conversations_checked": 3,
+            "messages_found": 5,
+            "messages_missing": missing,
+            "messages_inserted": inserted,
+            "errors": [],
+        }
+
+    @pytest.mark.asyncio
+    async def test_cycle_fans_out_with_bounded_concurrency(self):
+        """Creators run in parallel up to RECONCILIATION_CONCURRENCY."""
+        import asyncio
+
+        import core.message_reconciliation.core as core_mod
+        from core.instagram_rate_limiter import InstagramRateLimiter
+
+        in_flight = 0
+        peak = 0
+
+        async def fake_reconcile(creator_id, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return self._result(creator_id, missing=1, inserted=1)
+
+        session = self._mock_creators(["a", "b", "c", "d"])
+        with patch("api.database.SessionLocal", return_value=session), \
+                patch.object(core_mod, "RECONCILIATION_CONCURRENCY", 2), \
+                patch.object(core_mod, "get_instagram_rate_limiter",
+                             return_value=InstagramRateLimiter()), \
+                patch.object(core_mod, "reconcile_messages_for_creator",
+                             side_effect=fake_reconcile):
+            result = await core_mod.run_reconciliation_cycle(lookback_hours=1)
+
+        assert peak == 2
+        assert result["creators_processed"] == 4
+        assert result["total_inserted"] == 4
+        assert result["creators_skipped_budget"] == 0
+        assert [r["creator_id"] for r in result["by_creator"]] == ["a", "b", "c", "d"]
+        assert all("latency_ms" in r for r in result["by_creator"])
+        assert result["cycle_ms"] > 0
+
+    @pytest.mark.asyncio
+    async def test_creator_in_backoff_is_skipped(self):
+        """A creator whose token is in backoff is skipped, others still run."""
+        import core.message_reconciliation.core as core_mod
+        from core.instagram_rate_limiter import InstagramRateLimiter
+
+        limiter = InstagramRateLimiter()
+        limiter.record_call("throttled", "/conversations", 429)
+        reconcile = AsyncMock(side_effect=lambda creator_id, **kw: self._result(creator_id))
+
+        session = self._mock_creators(["ok", "throttled"])
+        with patch("api.database.SessionLocal", return_value=session), \
+                patch.object(core_mod, "get_instagram_rate_limiter", return_value=limiter), \
+                patch.object(core_mod, "reconcile_messages_for_creator", reconcile):
+            result = await core_mod.run_reconciliation_cycle(lookback_hours=1)
+
+        called = [c.kwargs["creator_id"] for c in reconcile.call_args_list]
+        assert called == ["ok"]
+        assert result["creators_skipped_budget"] == 1
+        assert result["by_creator"][1] == {"creator_id": "throttled", "skipped": "backoff"}
+        # The completed creator's calls are charged to its hourly budget
+        assert limiter.get_stats("ok")["calls_last_hour"] == 2 + 3
+
+    @pytest.mark.asyncio
+    async def test_creator_error_does_not_abort_cycle(self):
+        """An exception for one creator is recorded; the rest are processed."""
+        import core.message_reconciliation.core as core_mod
+        from core.instagram_rate_limiter import InstagramRateLimiter
+
+        async def fake_reconcile(creator_id, **kwargs):
+            if creator_id == "bad":
+                raise RuntimeError("token expired")
+            return self._result(creator_id, missing=2, inserted=2)
+
+        session = self._mock_creators(["bad", "good"])
+        with patch("api.database.SessionLocal", return_value=session), \
+                patch.object(core_mod, "get_instagram_rate_limiter",
+                             return_value=InstagramRateLimiter()), \
+                patch.object(core_mod, "reconcile_messages_for_creator",
+                             side_effect=fake_reconcile):
+            result = await core_mod.run_reconciliation_cycle(lookback_hours=1)
+
+        assert result["creators_processed"] == 1
+        assert result["total_inserted"] == 2
+        assert result["by_creator"][0]["error"] == "token expired"
+
+    def test_budget_scales_conversation_limit(self):
+        """Conversation limit shrinks with the creator's remaining budget."""
+        from core.instagram_rate_limiter import InstagramRateLimiter
+        from core.message_reconciliation.core import _budget_max_conversations
+
+        limiter = InstagramRateLimiter()
+        assert _budget_max_conversations(limiter, "fresh") == MAX_CONVERSATIONS_PER_CYCLE
+
+        # 190 - 150 = 40 remaining → 25% share = 10 calls → 2 folders x (4 + 1)
+        limiter.consume_budget("busy", "reconciliation", 150)
+        assert _budget_max_conversations(limiter, "busy") == 4
+
+        limiter.consume_budget("spent", "reconciliation", limiter.CALLS_PER_HOUR)
+        assert _budget_max_conversations(limiter, "spent") == 0
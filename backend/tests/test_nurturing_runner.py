@@ -5,6 +5,8 @@ import os
 import json
 import time
 from datetime import datetime, timedelta, timezone
+
+import pytest
 from fastapi.testclient import TestClient
 from api.main import app
 from core.nurturing import get_nurturing_manager
@@ -12,13 +14,19 @@ from core.nurturing import get_nurturing_manager
 client = TestClient(app)
 
 
+@pytest.fixture(autouse=True)
+def nurturing_storage(tmp_path, monkeypatch):
+    """Keep followup files out of the repo's data/nurturing."""
+    monkeypatch.setattr(get_nurturing_manager(), "storage_path", str(tmp_path))
+
+
 def _get_creator_id():
     """Generate unique creator ID per test run"""
     return f"runner_{int(time.time() * 1000)}"
 
 
 def _get_followups_path(creator_id: str) -> str:
-    return f"data/nurturing/{creator_id}_followups.json"
+    return os.path.join(get_nurturing_manager().storage_path, f"{creator_id}_followups.json")
 
 
 def _cleanup(creator_id: str):
@@ -34,8 +42,6 @@ def _cleanup(creator_id: str):
 
 def _create_test_followups(creator_id: str, count: int = 3, due: bool = True):
     """Create test followups directly in JSON file"""
-    os.makedirs("data/nurturing", exist_ok=True)
-
     now = datetime.now(timezone.utc)
     followups = []
 
@@ -236,7 +242,6 @@ def test_by_sequence_breakdown():
     _cleanup(creator_id)
 
     # Create followups of different types
-    os.makedirs("data/nurturing", exist_ok=True)
     now = datetime.now(timezone.utc)
     past = now - timedelta(hours=1)
 
@@ -20,6 +20,20 @@ os.environ["TESTING"] = "true"
 from fastapi.testclient import TestClient
 from api.main import app
 from core.payments import PaymentManager, PaymentPlatform
+from core.sales_tracker import SalesTracker
+from core.analytics.analytics_manager import AnalyticsManager
+
+
+@pytest.fixture(autouse=True)
+def tracking_storage(tmp_path, monkeypatch):
+    """Keep sales and analytics files out of the repo's data/ directory"""
+    monkeypatch.setattr(
+        "core.sales_tracker._sales_tracker", SalesTracker(storage_path=str(tmp_path / "sales"))
+    )
+    monkeypatch.setattr(
+        "core.analytics.analytics_manager._analytics_manager",
+        AnalyticsManager(storage_path=str(tmp_path / "analytics")),
+    )
 
 
 @pytest.fixture
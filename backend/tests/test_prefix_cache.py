@@ -0,0 +1,218 @@
+"""Tests for prompt prefix caching (core/providers/prefix_cache.py).
+
+Verifies:
+1. Same creator, different leads → the static prefix is served from cache (fake provider)
+2. A prompt change that moves the prefix shows up as lost cached tokens
+3. Prefix binding refuses prompts whose leading bytes no longer match the hash
+4. Gemini context caches: registered once, reused, refreshed on hash change
+5. Cached tokens are read from Gemini usage fields
+"""
+
+import os
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from core.dm.cache_boundary import compute_prefix_hash
+from core.providers import gemini_provider as gp
+from core.providers import prefix_cache as pc
+from services.prompt_service import PromptBuilder
+
+STYLE = "Eres Iris Bertran. Respondes DMs con tono cercano, frases cortas, emojis con moderación. " * 30
+
+
+def _system_prompt(style: str, recalling: str):
+    """Same layout as context.py: static style section first, per-lead sections after."""
+    combined = "\n\n".join([style, recalling])
+    builder = PromptBuilder({"name": "Iris Bertran", "knowledge_about": {"bio": "Yoga teacher"}})
+    return builder.build_system_prompt(products=[{"name": "Clase yoga", "price": 25}],
+                                       custom_instructions=combined), len(style)
+
+
+def _dm(style: str, lead: str, message: str):
+    system_prompt, prefix_chars = _system_prompt(style, f"Nombre: {lead}. Último contacto: hace 2 días.")
+    return [{"role": "system", "content": system_prompt}, {"role": "user", "content": message}], prefix_chars
+
+
+@pytest.fixture(autouse=True)
+def fresh_state():
+    manager = pc.PrefixCacheManager(min_chars=100)
+    with patch.object(pc, "_stats", {}), patch.object(pc, "prefix_cache_manager", manager), \
+            patch.object(gp, "prefix_cache_manager", manager):
+        yield
+
+
+class TestFakeProviderPrefixHits:
+
+    @pytest.mark.asyncio
+    async def test_second_lead_reuses_creator_prefix(self):
+        fake = pc.FakePrefixCacheProvider()
+        first, prefix_chars = _dm(STYLE, "Laura", "hola! cuánto cuesta?")
+        second, _ = _dm(STYLE, "Marc", "tienes clases los martes?")
+
+        cold = await fake(first)
+        warm = await fake(second)
+
+        assert cold["cached_tokens"] == 0
+        assert warm["cached_tokens"] >= prefix_chars // 4 - fake.block_chars // 4
+        assert warm["cost_usd"] < cold["cost_usd"]
+        assert warm["latency_ms"] < cold["latency_ms"]
+
+    @pytest.mark.asyncio
+    async def test_volatile_prefix_is_caught(self):
+        """Anything per-request ahead of the style section (here a timestamp) kills the hit."""
+        fake = pc.FakePrefixCacheProvider()
+        await fake(_dm(f"[12:01] {STYLE}", "Laura", "hola")[0])
+        broken = await fake(_dm(f"[12:02] {STYLE}", "Marc", "hola")[0])
+        assert broken["cached_tokens"] == 0
+
+    @pytest.mark.asyncio
+    async def test_hits_are_recorded_per_creator(self):
+        fake = pc.FakePrefixCacheProvider(provider="deepinfra")
+        for lead in ("Laura", "Marc", "Núria"):
+            messages, prefix_chars = _dm(STYLE, lead, "hola")
+            with pc.bound_prompt_prefix("iris", messages[0]["content"],
+                                        {"cache_prefix_chars": prefix_chars}):
+                await fake(messages)
+
+        stats = pc.get_prefix_cache_stats()["creators"]["iris"]["providers"]["deepinfra"]
+        assert stats["calls"] == 3
+        assert stats["hit_rate"] > 0.5
+
+
+class TestPrefixBinding:
+
+    def test_mismatched_prefix_is_not_bound(self):
+        system_prompt, prefix_chars = _system_prompt(STYLE, "Nombre: Laura.")
+        expected = compute_prefix_hash(system_prompt[:prefix_chars])
+
+        assert pc.bind_prompt_prefix("iris", "[nota] " + system_prompt, prefix_chars, expected) is None
+        assert pc.current_prompt_prefix() is None
+        assert pc.get_prefix_cache_stats()["creators"]["iris"]["prefix_mismatches"] == 1
+
+        token = pc.bind_prompt_prefix("iris", system_prompt, prefix_chars, expected)
+        assert pc.current_prompt_prefix().text == STYLE
+        pc.reset_prompt_prefix(token)
+        assert pc.current_prompt_prefix() is None
+
+
+class FakeResp:
+    def __init__(self, payload, status_code=200):
+        self.payload = payload
+        self.status_code = status_code
+
+    def json(self):
+        return self.payload
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            request = httpx.Request("POST", "https://gemini.test")
+            raise httpx.HTTPStatusError(
+                "refused", request=request, response=httpx.Response(self.status_code, request=request),
+            )
+
+
+class FakeGeminiClient:
+    """Records cachedContents registrations/deletes and generateContent payloads."""
+
+    def __init__(self):
+        self.created = []
+        self.deleted = []
+        self.generated = []
+        self.refuse_cache = False
+
+    async def post(self, url, json=None, timeout=None):
+        if "/cachedContents" in url:
+            self.created.append(json)
+            return FakeResp({"name": f"cachedContents/c{len(self.created)}"})
+        self.generated.append(json)
+        if self.refuse_cache and "cachedContent" in json:
+            return FakeResp({}, status_code=404)
+        return FakeResp({
+            "candidates": [{"content": {"parts": [{"text": "hola!"}]}, "finishReason": "STOP"}],
+            "usageMetadata": {"promptTokenCount": 900, "candidatesTokenCount": 3,
+                              "cachedContentTokenCount": 700 if "cachedContent" in json else 0},
+        })
+
+    async def delete(self, url, timeout=None):
+        self.deleted.append(url)
+        return FakeResp({})
+
+
+class TestGeminiContextCache:
+
+    @pytest.fixture
+    def client(self):
+        client = FakeGeminiClient()
+        with patch.object(pc, "GEMINI_PREFIX_CACHE_ENABLED", True), \
+                patch.object(pc, "get_http_client", lambda provider: client), \
+                patch.object(gp, "get_http_client", lambda provider: client), \
+                patch.dict(os.environ, {"GOOGLE_API_KEY": "k"}):
+            yield client
+
+    async def _generate(self, style, lead, history=True):
+        messages, prefix_chars = _dm(style, lead, "hola")
+        if history:
+            messages.insert(1, {"role": "assistant", "content": "ey!"})  # history starting with the creator
+        with pc.bound_prompt_prefix("iris", messages[0]["content"], {"cache_prefix_chars": prefix_chars}):
+            return await gp.generate_response_gemini(messages)
+
+    @pytest.mark.asyncio
+    async def test_prefix_registered_once_and_referenced(self, client):
+        first = await self._generate(STYLE, "Laura")
+        await self._generate(STYLE, "Marc")
+
+        assert len(client.created) == 1
+        assert client.created[0]["systemInstruction"]["parts"][0]["text"] == STYLE
+        payload = client.generated[1]
+        assert payload["cachedContent"] == "cachedContents/c1"
+        assert "systemInstruction" not in payload
+        # The dynamic rest of the system prompt leads, roles still alternate
+        assert [c["role"] for c in payload["contents"]] == ["user", "model", "user"]
+        assert "Nombre: Marc" in payload["contents"][0]["parts"][0]["text"]
+        assert first["cached_tokens"] == 700
+
+    @pytest.mark.asyncio
+    async def test_dynamic_system_text_is_not_merged_into_the_lead_turn(self, client):
+        await self._generate(STYLE, "Laura", history=False)
+
+        contents = client.generated[0]["contents"]
+        assert len(contents) == 2
+        assert "Nombre: Laura" in contents[0]["parts"][0]["text"]
+        assert contents[1]["parts"] == [{"text": "hola"}]
+
+    @pytest.mark.asyncio
+    async def test_refused_cache_retries_once_uncached(self, client):
+        client.refuse_cache = True
+        messages, prefix_chars = _dm(STYLE, "Laura", "hola")
+        with pc.bound_prompt_prefix("iris", messages[0]["content"], {"cache_prefix_chars": prefix_chars}):
+            result = await gp.generate_response_gemini(messages)
+
+        assert result["content"] == "hola!"
+        assert len(client.generated) == 2
+        retry = client.generated[1]
+        assert "cachedContent" not in retry
+        assert retry["systemInstruction"]["parts"][0]["text"] == messages[0]["content"]
+        assert retry["contents"] == [{"role": "user", "parts": [{"text": "hola"}]}]
+        assert pc.prefix_cache_manager.to_dict() == {}
+
+    @pytest.mark.asyncio
+    async def test_changed_prefix_refreshes_cache(self, client):
+        await self._generate(STYLE, "Laura")
+        await self._generate(STYLE + " Nuevo: habla también en catalán.", "Marc")
+        await pc.asyncio.sleep(0)  # let the old cache's delete run
+
+        assert len(client.created) == 2
+        assert client.generated[1]["cachedContent"] == "cachedContents/c2"
+        assert client.deleted and client.deleted[0].split("?")[0].endswith("cachedContents/c1")
+        assert pc.get_prefix_cache_stats()["creators"]["iris"]["prefix_changes"] == 1
+
+    @pytest.mark.asyncio
+    async def test_unbound_calls_send_the_full_prompt(self, client):
+        messages, _ = _dm(STYLE, "Laura", "hola")
+        result = await gp.generate_response_gemini(messages)
+
+        assert client.created == []
+        assert client.generated[0]["systemInstruction"]["parts"][0]["text"] == messages[0]["content"]
+        assert result["cached_tokens"] == 0
@@ -123,6 +123,65 @@ class TestBM25Retriever:
         assert stats["k1"] == 1.5
         assert stats["b"] == 0.75
 
+    def test_postings_track_add_and_remove(self):
+        """Inverted index only holds postings for live documents"""
+        from core.rag.bm25 import BM25Retriever
+
+        bm25 = BM25Retriever()
+        bm25.add_document("doc1", "curso python curso")
+        bm25.add_document("doc2", "curso yoga")
+
+        assert bm25.postings["curso"] == {"doc1": 2, "doc2": 1}
+        assert bm25.postings["python"] == {"doc1": 1}
+
+        bm25.remove_document("doc1")
+
+        assert "python" not in bm25.postings
+        assert bm25.postings["curso"] == {"doc2": 1}
+        assert bm25.avg_doc_length == 2
+
+    def test_readd_document_replaces_previous(self):
+        """Re-adding a doc_id must not double count corpus statistics"""
+        from core.rag.bm25 import BM25Retriever
+
+        bm25 = BM25Retriever()
+        bm25.add_document("doc1", "curso python")
+        bm25.add_document("doc1", "mentoría marketing digital")
+
+        assert bm25.corpus_size == 1
+        assert bm25.avg_doc_length == 3
+        assert "curso" not in bm25.term_doc_freq
+        assert bm25.term_doc_freq["marketing"] == 1
+        assert bm25.search("curso") == []
+
+    def test_search_matches_exhaustive_scoring(self):
+        """Posting-list scores equal scoring every document explicitly"""
+        from core.rag.bm25 import BM25Retriever
+
+        bm25 = BM25Retriever()
+        texts = [
+            "curso de python para principiantes",
+            "mentoría de marketing y python avanzado",
+            "clase de yoga online",
+            "python python python automatización",
+        ]
+        for i, text in enumerate(texts):
+            bm25.add_document(f"doc{i}", text)
+
+        query_terms = bm25._tokenize("python automatización")
+        expected = sorted(
+            ((doc_id, bm25._score_document(doc_id, query_terms)) for doc_id in bm25.documents),
+            key=lambda x: x[1],
+            reverse=True,
+        )
+        expected = [(d, s) for d, s in expected if s > 0][:2]
+
+        results = bm25.search("python automatización", top_k=2)
+
+        assert [r.doc_id for r in results] == [d for d, _ in expected]
+        for r, (_, score) in zip(results, expected):
+            assert abs(r.score - score) < 1e-9
+
 
 class TestHybridRAG:
     """Tests for HybridRAG"""
@@ -0,0 +1,149 @@
+"""Tests for the in-process per-creator vector index (core/rag/vector_index.py)."""
+
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from core.rag.vector_index import CreatorVectorIndex, VectorIndexRegistry
+
+
+def _rows(n, dim=32, seed=0):
+    rng = np.random.default_rng(seed)
+    vecs = rng.normal(size=(n, dim))
+    return [
+        {
+            "chunk_id": f"c{i}",
+            "embedding": vecs[i].tolist(),
+            "content": f"chunk {i}",
+            "source_url": None,
+            "title": None,
+            "source_type": "faq",
+        }
+        for i in range(n)
+    ]
+
+
+def _reference_topk(rows, query, top_k, min_sim):
+    """Brute-force cosine — what pgvector's 1 - (a <=> b) computes."""
+    q = np.asarray(query) / np.linalg.norm(query)
+    scored = []
+    for r in rows:
+        v = np.asarray(r["embedding"])
+        sim = float(v @ q / np.linalg.norm(v))
+        if sim >= min_sim:
+            scored.append((r["chunk_id"], sim))
+    scored.sort(key=lambda x: -x[1])
+    return scored[:top_k]
+
+
+class TestCreatorVectorIndex:
+
+    def test_matches_brute_force_cosine(self):
+        rows = _rows(300)
+        index = VectorIndexRegistry().build("iris", rows)
+        query = np.random.default_rng(1).normal(size=32).tolist()
+
+        got = index.search(query, top_k=5, min_similarity=-1.0)
+        expected = _reference_topk(rows, query, 5, -1.0)
+
+        assert [r["chunk_id"] for r in got] == [cid for cid, _ in expected]
+        for r, (_, sim) in zip(got, expected):
+            assert r["similarity"] == pytest.approx(sim, abs=1e-5)
+        assert set(got[0]) == {"chunk_id", "content", "source_url", "title", "source_type", "similarity"}
+
+    def test_float16_stays_within_tolerance(self):
+        rows = _rows(200)
+        index = CreatorVectorIndex(dim=32, dtype=np.float16)
+        for r in rows:
+            index.upsert(r["chunk_id"], r["embedding"], {"content": r["content"]})
+        query = np.random.default_rng(2).normal(size=32).tolist()
+
+        got = index.search(query, top_k=3, min_similarity=-1.0)
+        expected = _reference_topk(rows, query, 3, -1.0)
+        for r, (_, sim) in zip(got, expected):
+            assert r["similarity"] == pytest.approx(sim, abs=5e-3)
+
+    def test_min_similarity_filters_results(self):
+        index = CreatorVectorIndex(dim=2)
+        index.upsert("same", [1.0, 0.0], {})
+        index.upsert("orthogonal", [0.0, 1.0], {})
+        got = index.search([1.0, 0.0], top_k=5, min_similarity=0.35)
+        assert [r["chunk_id"] for r in got] == ["same"]
+
+    def test_upsert_replace_and_remove_keep_rows_consistent(self):
+        index = CreatorVectorIndex(dim=2)
+        for i in range(100):  # forces capacity growth past the initial 64 rows
+            index.upsert(f"c{i}", [1.0, i / 100], {"content": str(i)})
+        index.upsert("c5", [0.0, 1.0], {"content": "replaced"})
+        assert len(index) == 100
+
+        assert index.remove("c0")
+        assert not index.remove("c0")
+        assert len(index) == 99 and "c0" not in index
+
+        top = index.search([0.0, 1.0], top_k=1, min_similarity=0.0)
+        assert top[0]["chunk_id"] == "c5"
+        assert top[0]["content"] == "replaced"
+        # The row moved into c0's slot is still reachable under its own id
+        assert index.search([1.0, 0.99], top_k=1, min_similarity=0.0)[0]["chunk_id"] == "c99"
+
+    def test_rejects_bad_embeddings(self):
+        index = CreatorVectorIndex(dim=3)
+        assert not index.upsert("zero", [0.0, 0.0, 0.0], {})
+        assert not index.upsert("short", [1.0, 2.0], {})
+        assert len(index) == 0
+
+
+class TestVectorIndexRegistry:
+
+    def test_unindexed_creator_returns_none_for_pgvector_fallback(self):
+        registry = VectorIndexRegistry()
+        assert registry.search("nobody", [1.0, 0.0], 5, 0.0) is None
+
+    def test_creator_over_cap_stays_on_pgvector(self):
+        registry = VectorIndexRegistry(max_chunks=10)
+        assert registry.build("big", _rows(11)) is None
+        assert registry.search("big", [0.0] * 31 + [1.0], 5, 0.0) is None
+        assert registry.stats()["creators_on_pgvector"] == 1
+
+    def test_incremental_upsert_and_remove(self):
+        registry = VectorIndexRegistry()
+        registry.build("iris", [{"chunk_id": "a", "embedding": [1.0, 0.0]}])
+        registry.upsert("iris", "b", [0.0, 1.0], {"content": "new"})
+        assert registry.search("iris", [0.0, 1.0], 1, 0.5)[0]["chunk_id"] == "b"
+        registry.remove("b")
+        assert registry.search("iris", [0.0, 1.0], 1, 0.5) == []
+
+    def test_hydrate_failure_leaves_creator_on_pgvector(self):
+        registry = VectorIndexRegistry()
+        with patch("core.rag.vector_index._fetch_creator_embeddings", side_effect=RuntimeError("db")):
+            assert registry.hydrate("iris") == 0
+        assert registry.get("iris") is None
+
+
+class TestSemanticRAGIntegration:
+
+    def test_semantic_search_uses_index_instead_of_pgvector(self):
+        import core.rag.semantic as semantic
+        from core.rag.vector_index import get_vector_index_registry
+
+        registry = get_vector_index_registry()
+        registry.build("iris", [{
+            "chunk_id": "c1", "embedding": [1.0, 0.0],
+            "content": "Barre 5€", "source_type": "faq",
+        }])
+        rag = semantic.SemanticRAG()
+        rag._embeddings_available = True
+        try:
+            with patch.object(semantic, "ENABLE_VECTOR_INDEX", True), \
+                    patch("core.embeddings.generate_embedding", return_value=[1.0, 0.0]), \
+                    patch("core.embeddings.search_similar") as pg_search:
+                results = rag._semantic_search("precio barre", 5, "iris")
+        finally:
+            registry.clear()
+
+        pg_search.assert_not_called()
+        assert results[0]["doc_id"] == "c1"
+        assert results[0]["metadata"]["type"] == "faq"
+        assert results[0]["score"] == pytest.approx(1.0)
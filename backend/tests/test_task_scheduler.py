@@ -0,0 +1,166 @@
+"""
+Unit tests: TaskScheduler cluster jobs over leases (core/task_scheduler.py, core/job_leases.py).
+Nodes are simulated by schedulers sharing one InMemoryLeaseStore with a fake clock. No DB required.
+"""
+import asyncio
+
+import pytest
+
+from core.job_leases import InMemoryLeaseBackend, InMemoryLeaseStore
+from core.task_scheduler import PROCESS, TaskScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.t = 1_000_000.0
+
+    def __call__(self):
+        return self.t
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def store(clock):
+    return InMemoryLeaseStore(clock=clock)
+
+
+def _node(store, name, role="all"):
+    return TaskScheduler(lease_backend=InMemoryLeaseBackend(store), role=role, owner=name)
+
+
+def _job(runs, node, gate=None):
+    async def job():
+        runs.append(node)
+        if gate is not None:
+            await gate.wait()
+    return job
+
+
+class TestLeasedRuns:
+
+    @pytest.mark.asyncio
+    async def test_each_interval_runs_on_one_node(self, store, clock):
+        runs = []
+        nodes = [_node(store, n) for n in ("a", "b", "c")]
+        for node in nodes:
+            node.register("score_decay", _job(runs, node.owner), interval_seconds=3600)
+
+        delays = [await node._run_leased(node._tasks["score_decay"]) for node in nodes]
+        assert runs == ["a"]
+        assert all(d > 3500 for d in delays)
+
+        clock.t += 3600
+        for node in reversed(nodes):
+            await node._run_leased(node._tasks["score_decay"])
+        assert runs == ["a", "c"]
+
+    @pytest.mark.asyncio
+    async def test_running_job_never_overlaps(self, store):
+        runs, gate = [], asyncio.Event()
+        a, b = _node(store, "a"), _node(store, "b")
+        a.register("reconciliation", _job(runs, "a", gate), interval_seconds=60)
+        b.register("reconciliation", _job(runs, "b"), interval_seconds=60)
+
+        first = asyncio.create_task(a._run_leased(a._tasks["reconciliation"]))
+        await asyncio.sleep(0.01)
+        retry_in = await b._run_leased(b._tasks["reconciliation"])
+        gate.set()
+        await first
+
+        assert runs == ["a"]
+        assert b._tasks["reconciliation"].skipped_not_leader == 1
+        assert retry_in >= 1
+
+    @pytest.mark.asyncio
+    async def test_dead_owner_lease_expires(self, store, clock):
+        backend = InMemoryLeaseBackend(store)
+        assert backend.try_acquire("clone_score_daily", "crashed", 86400, 120).acquired
+
+        runs = []
+        b = _node(store, "b")
+        b.register("clone_score_daily", _job(runs, "b"), interval_seconds=86400)
+        await b._run_leased(b._tasks["clone_score_daily"])
+        assert runs == []
+
+        clock.t += 86400  # lease long expired and the job is due again
+        await b._run_leased(b._tasks["clone_score_daily"])
+        assert runs == ["b"]
+
+    @pytest.mark.asyncio
+    async def test_missed_runs_collapse_into_one_catch_up(self, store, clock):
+        runs = []
+        a = _node(store, "a")
+        a.register("style_recalc", _job(runs, "a"), interval_seconds=3600)
+        await a._run_leased(a._tasks["style_recalc"])
+
+        clock.t += 5 * 3600  # cluster down for five intervals
+        restarted = _node(store, "a2")
+        restarted.register("style_recalc", _job(runs, "a2"), interval_seconds=3600)
+        await restarted._run_leased(restarted._tasks["style_recalc"])
+        await restarted._run_leased(restarted._tasks["style_recalc"])
+
+        assert runs == ["a", "a2"]
+
+    @pytest.mark.asyncio
+    async def test_redeploy_does_not_rerun_a_fresh_job(self, store, clock):
+        runs = []
+        old = _node(store, "old")
+        old.register("nightly_extract_deep", _job(runs, "old"), interval_seconds=86400)
+        await old._run_leased(old._tasks["nightly_extract_deep"])
+
+        clock.t += 600
+        new = _node(store, "new")
+        new.register("nightly_extract_deep", _job(runs, "new"), interval_seconds=86400)
+        delay = await new._run_leased(new._tasks["nightly_extract_deep"])
+
+        assert runs == ["old"]
+        assert delay == pytest.approx(86400 - 600)
+
+    @pytest.mark.asyncio
+    async def test_errors_are_recorded_on_the_lease(self, store):
+        async def failing():
+            raise RuntimeError("neon timeout")
+
+        a = _node(store, "a")
+        a.register("lead_enrichment", failing, interval_seconds=60)
+        await a._run_leased(a._tasks["lead_enrichment"])
+
+        report = a.health_report()["lead_enrichment"]
+        assert report["error_count"] == 1
+        assert report["last_duration_ms"] is not None
+        assert store.rows["lead_enrichment"]["last_error"] == "neon timeout"
+
+
+class TestRoles:
+
+    @pytest.mark.asyncio
+    async def test_web_role_runs_only_process_jobs(self, store):
+        runs = []
+        web = _node(store, "web", role="web")
+        web.register("score_decay", _job(runs, "cluster"), interval_seconds=3600)
+        web.register("memory_cleanup", _job(runs, "process"), interval_seconds=3600, scope=PROCESS)
+
+        await web.start_all()
+        await asyncio.sleep(0.01)
+        await web.shutdown(timeout=1)
+
+        assert runs == ["process"]
+        report = web.health_report()
+        assert report["score_decay"]["runs_here"] is False
+        assert "score_decay" not in store.rows
+
+    @pytest.mark.asyncio
+    async def test_health_report_shows_lease_owner(self, store):
+        a, b = _node(store, "a"), _node(store, "b")
+        for node in (a, b):
+            node.register("token_refresh", _job([], node.owner), interval_seconds=21600)
+            await node._run_leased(node._tasks["token_refresh"])
+
+        lease = b.health_report()["token_refresh"]["lease"]
+        assert lease["owner"] == "a"
+        assert lease["held_by_this_node"] is False
+        assert lease["last_duration_ms"] is not None
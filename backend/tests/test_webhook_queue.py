@@ -0,0 +1,415 @@
+"""
+Unit tests: durable webhook queue (core/webhook_queue.py) and the webhook routes' queue keys.
+Uses the SQLite backend (":memory:" or a tmp file) with a fake clock. No DB required.
+"""
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from core.webhook_queue import (
+    BatchFailed,
+    SQLiteWebhookQueue,
+    WebhookQueueConsumer,
+    handling_event,
+    mark_queued_message_done,
+    queued_message_done,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.t = 1_000_000.0
+
+    def __call__(self):
+        return self.t
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def backend(clock):
+    return SQLiteWebhookQueue(":memory:", clock=clock)
+
+
+def _consumer(backend, **kwargs):
+    kwargs.setdefault("owner", "node-a")
+    return WebhookQueueConsumer(backend, **kwargs)
+
+
+class TestBackend:
+
+    def test_idempotency_key_deduplicates(self, backend):
+        assert backend.enqueue("evolution", "iris:upsert:ABC", "evo:iris:1", {"n": 1}) is not None
+        assert backend.enqueue("evolution", "iris:upsert:ABC", "evo:iris:1", {"n": 2}) is None
+        assert backend.enqueue("instagram", "iris:upsert:ABC", "ig:1:2", {"n": 3}) is not None
+        assert backend.stats()["pending"] == 2
+
+    def test_only_conversation_head_is_claimable(self, backend):
+        backend.enqueue("instagram", "k1", "ig:1:2", {"n": 1})
+        backend.enqueue("instagram", "k2", "ig:1:2", {"n": 2})
+        backend.enqueue("instagram", "k3", "ig:1:3", {"n": 3})
+
+        first = backend.claim("a", 10, 300)
+        assert [e.payload["n"] for e in first] == [1, 3]
+        assert backend.claim("b", 10, 300) == []
+
+        backend.complete(first[0].id, "a")
+        assert [e.payload["n"] for e in backend.claim("b", 10, 300)] == [2]
+
+    def test_failed_event_blocks_its_conversation_until_retry(self, backend, clock):
+        backend.enqueue("instagram", "k1", "ig:1:2", {"n": 1})
+        backend.enqueue("instagram", "k2", "ig:1:2", {"n": 2})
+        (event,) = backend.claim("a", 10, 300)
+        backend.fail(event.id, "a", "neon timeout", retry_in_s=5, dead=False)
+
+        assert backend.claim("a", 10, 300) == []
+        clock.t += 5
+        (retried,) = backend.claim("a", 10, 300)
+        assert retried.payload["n"] == 1
+        assert retried.attempts == 2
+
+    def test_dead_letter_unblocks_conversation(self, backend):
+        backend.enqueue("instagram", "k1", "ig:1:2", {"n": 1})
+        backend.enqueue("instagram", "k2", "ig:1:2", {"n": 2})
+        (event,) = backend.claim("a", 10, 300)
+        backend.fail(event.id, "a", "bad payload", retry_in_s=5, dead=True)
+
+        assert [e.payload["n"] for e in backend.claim("a", 10, 300)] == [2]
+        assert backend.stats()["dead"] == 1
+
+    def test_expired_lock_is_reclaimed(self, backend, clock):
+        backend.enqueue("evolution", "k1", "evo:iris:1", {"n": 1})
+        (event,) = backend.claim("crashed", 10, 300)
+
+        clock.t += 301
+        (again,) = backend.claim("b", 10, 300)
+        assert again.id == event.id
+        backend.complete(event.id, "crashed")  # stale owner can no longer finish it
+        assert backend.stats()["processing"] == 1
+
+    def test_restart_requeues_in_flight_events(self, tmp_path, clock):
+        path = str(tmp_path / "webhook_queue.sqlite3")
+        before = SQLiteWebhookQueue(path, clock=clock)
+        before.enqueue("evolution", "k1", "evo:iris:1", {"n": 1})
+        assert before.claim("old-process", 10, 300)
+
+        after = SQLiteWebhookQueue(path, clock=clock)
+        (event,) = after.claim("new-process", 10, 300)
+        assert event.payload == {"n": 1}
+
+    def test_purge_keeps_recent_and_unfinished_events(self, backend, clock):
+        backend.enqueue("instagram", "k1", "ig:1:2", {})
+        backend.enqueue("instagram", "k2", "ig:1:3", {})
+        done, _ = backend.claim("a", 10, 300)
+        backend.complete(done.id, "a")
+
+        assert backend.purge(3600) == 0
+        clock.t += 3601
+        assert backend.purge(3600) == 1
+        assert backend.enqueue("instagram", "k1", "ig:1:2", {}) is not None
+
+    def test_claim_successors_stops_at_event_in_backoff(self, backend, clock):
+        for key in ("k1", "k2", "k3", "k4"):
+            backend.enqueue("evolution", key, "evo:iris:1", {"k": key})
+        [head] = backend.claim("node-a", 10, 60)
+        # k3 is waiting out a retry backoff: the batch must not skip over it
+        backend._conn.execute("UPDATE webhook_events SET available_at = ? WHERE idempotency_key = 'k3'",
+                              (clock.t + 30,))
+
+        more = backend.claim_successors("node-a", "evo:iris:1", head.id, 10, 60)
+        assert [e.idempotency_key for e in more] == ["k2"]
+        assert backend.claim_successors("node-a", "evo:iris:2", 0, 10, 60) == []
+
+
+class TestConsumer:
+
+    @pytest.mark.asyncio
+    async def test_conversation_order_and_bounded_concurrency(self, backend):
+        active, peak, seen = 0, 0, []
+
+        async def handler(event):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            seen.append((event.conversation_key, event.payload["n"]))
+            active -= 1
+
+        consumer = _consumer(backend, concurrency=2)
+        consumer.register_handler("evolution", handler)
+        for n in range(3):
+            for chat in ("a", "b", "c"):
+                await consumer.enqueue("evolution", f"{chat}{n}", f"evo:iris:{chat}", {"n": n})
+        await consumer.drain()
+
+        assert peak == 2
+        for chat in ("a", "b", "c"):
+            assert [n for key, n in seen if key == f"evo:iris:{chat}"] == [0, 1, 2]
+        assert consumer.counters["done"] == 9
+        assert backend.stats()["pending"] == 0
+
+    @pytest.mark.asyncio
+    async def test_handler_error_retries_then_dead_letters(self, backend, clock):
+        calls = []
+
+        async def failing(event):
+            calls.append(event.attempts)
+            raise RuntimeError("gemini 503")
+
+        consumer = _consumer(backend, max_attempts=2)
+        consumer.register_handler("instagram", failing)
+        await consumer.enqueue("instagram", "k1", "ig:1:2", {})
+
+        await consumer.drain()
+        clock.t += 60
+        await consumer.drain()
+
+        assert calls == [1, 2]
+        assert consumer.counters["retry"] == 1
+        assert consumer.counters["dead"] == 1
+        assert backend.stats()["dead"] == 1
+
+    @pytest.mark.asyncio
+    async def test_batch_handler_gets_the_conversation_burst(self, backend):
+        batches = []
+
+        async def handler(events):
+            batches.append([e.payload["n"] for e in events])
+
+        consumer = _consumer(backend)
+        consumer.register_batch_handler("evolution", handler, window_s=lambda: 0.05,
+                                        max_wait_s=1.0, max_size=8)
+        await consumer.enqueue("evolution", "a1", "evo:iris:a", {"n": 1})
+
+        async def follow_up():
+            await asyncio.sleep(0.02)
+            await consumer.enqueue("evolution", "a2", "evo:iris:a", {"n": 2})
+            await consumer.enqueue("evolution", "b1", "evo:iris:b", {"n": 10})
+
+        await asyncio.gather(consumer.drain(), follow_up())
+        if backend.stats()["pending"]:
+            await consumer.drain()
+
+        assert [1, 2] in batches and [10] in batches
+        assert consumer.counters["done"] == 3
+        assert consumer.counters["batched"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_is_retried_together(self, backend, clock):
+        batches = []
+
+        async def failing(events):
+            batches.append([e.idempotency_key for e in events])
+            if len(batches) == 1:
+                raise RuntimeError("gemini 503")
+
+        consumer = _consumer(backend)
+        consumer.register_batch_handler("instagram", failing, window_s=lambda: 0.01,
+                                        max_wait_s=1.0, max_size=8)
+        await consumer.enqueue("instagram", "k1", "ig:1:2", {})
+        await consumer.enqueue("instagram", "k2", "ig:1:2", {})
+
+        await consumer.drain()
+        assert consumer.counters["retry"] == 2
+        clock.t += 60
+        await consumer.drain()
+
+        assert batches == [["k1", "k2"], ["k1", "k2"]]
+        assert consumer.counters["done"] == 2
+
+    @pytest.mark.asyncio
+    async def test_batch_failed_retries_only_the_failed_events(self, backend, clock):
+        batches = []
+
+        async def partly_failing(events):
+            batches.append([e.idempotency_key for e in events])
+            if len(batches) == 1:
+                raise BatchFailed([None, RuntimeError("gemini 503"), None])
+
+        consumer = _consumer(backend)
+        consumer.register_batch_handler("instagram", partly_failing, window_s=lambda: 0.01,
+                                        max_wait_s=1.0, max_size=8)
+        for key in ("k1", "k2", "k3"):
+            await consumer.enqueue("instagram", key, "ig:1:2", {})
+
+        await consumer.drain()
+        assert consumer.counters["retry"] == 1
+        assert consumer.counters["done"] == 2
+        clock.t += 60
+        await consumer.drain()
+
+        assert batches == [["k1", "k2", "k3"], ["k2"]]
+        assert consumer.counters["done"] == 3
+
+    @pytest.mark.asyncio
+    async def test_finished_messages_are_kept_across_a_retry(self, backend, clock):
+        seen = []
+
+        async def handler(event):
+            with handling_event(event):
+                seen.append([queued_message_done(m) for m in ("m1", "m2")])
+                mark_queued_message_done("m1")
+                if event.attempts == 1:
+                    raise RuntimeError("m2 failed after m1 was sent")
+
+        consumer = _consumer(backend)
+        consumer.register_handler("instagram", handler)
+        await consumer.enqueue("instagram", "k1", "ig:1:2", {}, {"signature": "sig"})
+
+        await consumer.drain()
+        clock.t += 60
+        await consumer.drain()
+
+        assert seen == [[False, False], [True, False]]
+        assert consumer.counters["done"] == 1
+        assert not queued_message_done("m1")  # outside the consumer
+
+    @pytest.mark.asyncio
+    async def test_duplicate_webhook_is_acknowledged_once(self, backend):
+        consumer = _consumer(backend)
+        assert await consumer.enqueue("instagram", "same-body", "ig:1:2", {}) is True
+        assert await consumer.enqueue("instagram", "same-body", "ig:1:2", {}) is False
+        assert consumer.counters == {"enqueued": 1, "duplicate": 1}
+
+    @pytest.mark.asyncio
+    async def test_started_consumer_wakes_on_enqueue(self, backend):
+        done = asyncio.Event()
+
+        async def handler(event):
+            done.set()
+
+        consumer = _consumer(backend, poll_interval_s=30)
+        consumer.register_handler("evolution", handler)
+        consumer.start()
+        try:
+            await consumer.enqueue("evolution", "k1", "evo:iris:1", {})
+            await asyncio.wait_for(done.wait(), timeout=2)
+        finally:
+            await consumer.stop(timeout=2)
+        assert consumer.stats()["consumer_running"] is False
+
+
+class TestRouteKeys:
+
+    def test_evolution_duplicate_upserts_share_idempotency_key(self):
+        from api.routers.messaging_webhooks.evolution_webhook import evolution_queue_keys
+
+        upsert = {
+            "event": "messages.upsert", "instance": "iris-bertran",
+            "data": {"key": {"id": "3EB0A1", "remoteJid": "34600111222@s.whatsapp.net"},
+                     "message": {"conversation": "hola"}},
+        }
+        redelivered = {**upsert, "date_time": "2026-10-16T10:00:01Z"}
+        delete = {"event": "messages.delete", "instance": "iris-bertran",
+                  "data": [{"key": {"id": "3EB0A1", "remoteJid": "34600111222@s.whatsapp.net"}}]}
+
+        key, conversation = evolution_queue_keys(upsert)
+        assert evolution_queue_keys(redelivered) == (key, conversation)
+        delete_key, delete_conversation = evolution_queue_keys(delete)
+        assert delete_key != key
+        assert delete_conversation == conversation
+
+    def test_instagram_echo_shares_conversation_with_incoming_dm(self):
+        from api.routers.messaging_webhooks.instagram_webhook import instagram_queue_keys
+
+        incoming = {"object": "instagram", "entry": [{"id": "PAGE", "messaging": [
+            {"sender": {"id": "USER"}, "recipient": {"id": "PAGE"}, "message": {"mid": "m1"}}]}]}
+        echo = {"object": "instagram", "entry": [{"id": "PAGE", "messaging": [
+            {"sender": {"id": "PAGE"}, "recipient": {"id": "USER"},
+             "message": {"mid": "m2", "is_echo": True}}]}]}
+
+        key_in, conv_in = instagram_queue_keys(incoming, b'{"a": 1}')
+        key_echo, conv_echo = instagram_queue_keys(echo, b'{"a": 2}')
+        assert conv_in == conv_echo
+        assert key_in != key_echo
+
+    @pytest.mark.asyncio
+    async def test_evolution_route_only_enqueues_when_enabled(self, backend):
+        from api.routers.messaging_webhooks import evolution_webhook as evo
+
+        class FakeRequest:
+            async def json(self):
+                return {"event": "messages.upsert", "instance": "iris-bertran",
+                        "data": {"key": {"id": "X1", "remoteJid": "346@s.whatsapp.net"},
+                                 "message": {"conversation": "hola"}}}
+
+        consumer = _consumer(backend)
+        with patch("core.webhook_queue.WEBHOOK_QUEUE_ENABLED", True), \
+                patch("core.webhook_queue.get_webhook_queue", return_value=consumer), \
+                patch.object(evo, "process_evolution_event") as inline:
+            first = await evo.evolution_webhook(FakeRequest())
+            second = await evo.evolution_webhook(FakeRequest())
+
+        inline.assert_not_called()
+        assert first["processing"] == "queued"
+        assert second["processing"] == "duplicate"
+
+
+class TestRealHandlers:
+    """Failures inside the platform pipelines reach the queue instead of being logged as done."""
+
+    @pytest.mark.asyncio
+    async def test_instagram_dm_failure_is_retried_then_dead_lettered(self, backend, clock):
+        from api.routers.messaging_webhooks.instagram_webhook import process_queued_instagram_event
+
+        calls = []
+
+        class FailingHandler:
+            async def handle_webhook(self, payload, signature, raw_body=None):
+                calls.append(payload)
+                return {"results": [{"message_id": "m1", "status": "failed", "error": "gemini 503"}]}
+
+        payload = {"object": "instagram", "entry": [{"id": "PAGE", "messaging": [
+            {"sender": {"id": "USER"}, "recipient": {"id": "PAGE"}, "message": {"mid": "m1"}}]}]}
+        consumer = _consumer(backend, max_attempts=2)
+        consumer.register_handler("instagram", process_queued_instagram_event)
+        await consumer.enqueue("instagram", "k1", "ig:PAGE:USER", payload)
+
+        with patch("core.webhook_routing.extract_all_instagram_ids", return_value=["PAGE"]), \
+                patch("core.webhook_routing.find_creator_for_webhook",
+                      return_value=({"creator_id": "iris", "bot_active": True}, "PAGE")), \
+                patch("core.webhook_routing.update_creator_webhook_stats"), \
+                patch("api.routers.instagram.get_handler_for_creator", return_value=FailingHandler()):
+            await consumer.drain()
+            clock.t += 60
+            await consumer.drain()
+
+        assert len(calls) == 2
+        assert consumer.counters["retry"] == 1
+        assert consumer.counters["dead"] == 1
+        assert consumer.counters["done"] == 0
+
+    @pytest.mark.asyncio
+    async def test_evolution_dm_failure_is_retried(self, backend, clock):
+        from api.routers.messaging_webhooks import evolution_webhook as evo
+
+        payload = {"event": "messages.upsert", "instance": "iris-bertran",
+                   "data": {"key": {"id": "RETRY1", "remoteJid": "34600999888@s.whatsapp.net"},
+                            "message": {"conversation": "hola, precio?"}}}
+        consumer = _consumer(backend)
+        consumer.register_handler("evolution", evo.process_queued_evolution_event)
+        await consumer.enqueue("evolution", "iris:upsert:RETRY1", "evo:iris:346", payload)
+
+        with patch.dict(evo.EVOLUTION_INSTANCE_MAP, {"iris-bertran": "iris"}), \
+                patch("core.dm_agent_v2.aget_dm_agent", side_effect=RuntimeError("db down")) as agent:
+            await consumer.drain()
+            assert consumer.counters["retry"] == 1
+            # The dedup marks were released, so the retry runs the pipeline again
+            clock.t += 60
+            await consumer.drain()
+
+        assert agent.call_count == 2
+        assert consumer.counters["retry"] == 2
+        assert consumer.counters["done"] == 0
+
+
+def test_evolution_dedup_purge_stops_at_first_live_entry():
+    from api.routers.messaging_webhooks.evolution_webhook import _purge_expired
+
+    seen = {"old1": 100.0, "old2": 130.0, "live": 150.0}
+    _purge_expired(seen, now=200.0, ttl=60)
+    assert list(seen) == ["live"]
@@ -50,7 +50,7 @@ async def test_debounce_regen_skips_if_creator_replied_during_sleep():
         patch("api.database.SessionLocal", return_value=mock_session),
     ):
         # Sentinel: if process_dm is accidentally called the test should fail.
-        with patch("core.dm_agent_v2.get_dm_agent") as mock_agent_getter:
+        with patch("core.dm_agent_v2.aget_dm_agent") as mock_agent_getter:
             mock_agent_getter.return_value.process_dm = AsyncMock(
                 return_value=MagicMock(content="SHOULD_NOT_OVERWRITE")
             )
@@ -116,7 +116,7 @@ async def test_debounce_regen_proceeds_when_no_manual_reply():
         patch("core.copilot.messaging.asyncio.sleep", new_callable=AsyncMock),
         patch("api.database.SessionLocal", return_value=mock_session),
     ):
-        with patch("core.dm_agent_v2.get_dm_agent") as mock_agent_getter:
+        with patch("core.dm_agent_v2.aget_dm_agent") as mock_agent_getter:
             mock_agent_getter.return_value.process_dm = AsyncMock(return_value=dm_response)
             await _debounced_regeneration_impl(service, lead_key)
 
@@ -177,7 +177,7 @@ async def test_debounce_regen_skips_if_creator_replies_during_llm_call():
         patch("core.copilot.messaging.asyncio.sleep", new_callable=AsyncMock),
         patch("api.database.SessionLocal", return_value=mock_session),
     ):
-        with patch("core.dm_agent_v2.get_dm_agent") as mock_agent_getter:
+        with patch("core.dm_agent_v2.aget_dm_agent") as mock_agent_getter:
             mock_agent_getter.return_value.process_dm = AsyncMock(return_value=dm_response)
             await _debounced_regeneration_impl(service, lead_key)
 
@@ -0,0 +1,171 @@
+"""Tests for streaming DM generation (core/dm/streaming.py, provider SSE streams)."""
+
+import asyncio
+import json
+import os
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from core.dm import streaming as ds
+from core.providers import gemini_provider as gp
+from core.providers import hedging as hd
+
+
+def _streamer(deltas, consumed, closed, fail_after=None):
+    async def stream(messages, max_tokens, temperature, meta):
+        meta.update(model="m", provider="fake", tokens_in=100, tokens_out=7)
+        try:
+            for i, delta in enumerate(deltas):
+                if fail_after is not None and i == fail_after:
+                    raise RuntimeError("connection reset")
+                consumed.append(delta)
+                yield delta
+        finally:
+            closed.append(True)
+    return stream
+
+
+async def _run(deltas, fail_after=None, **kwargs):
+    consumed, closed = [], []
+    streamer = _streamer(deltas, consumed, closed, fail_after)
+    with patch.object(ds, "_primary_streamer", return_value=("gemini", streamer)), \
+            patch.object(gp, "_async_log_usage", AsyncMock()):
+        result = await ds.stream_dm_response([{"role": "user", "content": "hola"}], **kwargs)
+    return result, consumed, closed
+
+
+class TestStreamMonitor:
+
+    @pytest.mark.asyncio
+    async def test_deltas_are_joined_into_the_reply(self):
+        result, _, closed = await _run(["Hola gua", "pa! Qué tal", " estás?\n", "Te cuento ", "mañana"])
+
+        assert result["content"] == "Hola guapa! Qué tal estás?\nTe cuento mañana"
+        assert result["streamed"] is True and result["stream_abort"] is None
+        assert closed == [True]
+
+    @pytest.mark.asyncio
+    async def test_runaway_loop_is_aborted_mid_stream(self):
+        deltas = ["Vale vale, lo miro y te digo. "] + ["jajaja te digo lo miro y te digo " for _ in range(200)]
+        result, consumed, closed = await _run(deltas)
+
+        assert result["stream_abort"] == "loop"
+        assert result["finish_reason"] == "aborted"  # truncation recovery must not retry it
+        assert len(consumed) < 10  # stopped long before the provider finished
+        assert closed == [True]
+        assert len(result["content"]) < 60
+
+    @pytest.mark.asyncio
+    async def test_short_natural_repetition_is_kept(self):
+        text = "Buaaaaa tiaaaa Buaaaaa tiaaaa que guay!! 😍"
+        result, _, _ = await _run([text])
+        assert result["content"] == text and result["stream_abort"] is None
+
+    @pytest.mark.asyncio
+    async def test_failure_before_first_token_falls_back(self):
+        result, _, _ = await _run(["hola"], fail_after=0)
+        assert result is None
+
+    @pytest.mark.asyncio
+    async def test_break_after_text_keeps_partial_reply(self):
+        result, _, _ = await _run(["Hola! ", "Mira, el curso"], fail_after=1)
+        assert result["content"] == "Hola!"
+        assert result["stream_abort"] == "stream_error"
+
+    @pytest.mark.asyncio
+    async def test_usage_is_logged_like_blocking_calls(self):
+        log_usage = AsyncMock()
+        with patch.object(ds, "_primary_streamer", return_value=("gemini", _streamer(["Hola!"], [], []))), \
+                patch.object(gp, "_async_log_usage", log_usage):
+            result = await ds.stream_dm_response([{"role": "user", "content": "hola"}])
+            await asyncio.sleep(0)
+
+        log_usage.assert_awaited_once_with(result, "dm_response")
+        assert result["tokens_in"] == 100
+
+    @pytest.mark.asyncio
+    async def test_slow_first_token_is_hedged_with_flash_lite(self):
+        closed = []
+
+        async def slow_stream(messages, max_tokens, temperature, meta):
+            try:
+                await asyncio.sleep(5)
+                yield "tarde"
+            finally:
+                closed.append(True)
+
+        backup = hd.HedgeBackup("gemini", AsyncMock(return_value={"content": "hola!", "provider": "gemini"}))
+        with patch.object(hd, "HEDGE_ENABLED", True), \
+                patch.object(hd, "HEDGE_DEFAULT_DELAY_MS", 20), \
+                patch.object(hd, "HEDGE_MIN_DELAY_MS", 10), \
+                patch.object(hd, "_budget", hd.HedgeBudget(ratio=1.0, burst=5)), \
+                patch.object(hd, "_stats", {}), \
+                patch.object(ds, "_primary_streamer", return_value=("deepinfra", slow_stream)), \
+                patch.object(gp, "_gemini_hedge_backup", return_value=backup):
+            result = await asyncio.wait_for(ds.stream_dm_response([{"role": "user", "content": "hola"}]), 1)
+            stats = hd.get_hedge_stats()["providers"]["deepinfra:first_token"]
+
+        assert result == {"content": "hola!", "provider": "gemini"}
+        assert closed == [True]
+        assert stats["backup_wins"] == 1
+
+    @pytest.mark.asyncio
+    async def test_config_driven_models_do_not_stream(self):
+        with patch("core.config.llm_models.get_active_model_config", return_value={"provider": {"name": "deepinfra"}}):
+            assert await ds.stream_dm_response([{"role": "user", "content": "hola"}]) is None
+
+
+class _SSEResponse:
+    def __init__(self, lines):
+        self.lines = lines
+
+    def raise_for_status(self):
+        return None
+
+    async def aiter_lines(self):
+        for line in self.lines:
+            yield line
+
+
+class _SSEClient:
+    def __init__(self, lines):
+        self.lines = lines
+        self.urls = []
+
+    def stream(self, method, url, json=None, timeout=None, headers=None):
+        self.urls.append(url)
+        client = self
+
+        class _Ctx:
+            async def __aenter__(self):
+                return _SSEResponse(client.lines)
+
+            async def __aexit__(self, *a):
+                return None
+        return _Ctx()
+
+
+class TestGeminiStream:
+
+    def setup_method(self):
+        gp._gemini_consecutive_failures = 0
+        gp._gemini_circuit_open_until = 0.0
+
+    @pytest.mark.asyncio
+    async def test_sse_chunks_become_deltas_and_usage(self):
+        chunks = [
+            {"candidates": [{"content": {"parts": [{"text": "Hola "}]}}]},
+            {"candidates": [{"content": {"parts": [{"text": "guapa!"}]}, "finishReason": "STOP"}],
+             "usageMetadata": {"promptTokenCount": 900, "candidatesTokenCount": 4, "cachedContentTokenCount": 600}},
+        ]
+        client = _SSEClient([f"data: {json.dumps(c)}" for c in chunks])
+        meta = {}
+        with patch.dict(os.environ, {"GOOGLE_API_KEY": "k"}), \
+                patch.object(gp, "get_http_client", lambda provider: client):
+            deltas = [d async for d in gp.stream_gemini([{"role": "user", "content": "hola"}], 60, 0.7, meta)]
+
+        assert deltas == ["Hola ", "guapa!"]
+        assert ":streamGenerateContent?alt=sse" in client.urls[0]
+        assert meta["finish_reason"] == "stop"
+        assert (meta["tokens_in"], meta["tokens_out"], meta["cached_tokens"]) == (900, 4, 600)
@@ -5,6 +5,7 @@ import os
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
+from core.providers.http_clients import get_http_client
 from core.providers.fireworks_provider import (
     call_fireworks,
     _record_failure,
@@ -68,6 +69,7 @@ class TestCallFireworks:
                 MockClient.assert_called_once_with(
                     api_key="test-key",
                     base_url=FIREWORKS_BASE_URL,
+                    http_client=get_http_client("fireworks"),
                 )
 
     @pytest.mark.asyncio
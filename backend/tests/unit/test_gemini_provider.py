@@ -113,11 +113,11 @@ class TestCallGeminiConfigDriven:
             def __init__(self, *a, **kw): pass
             async def __aenter__(self): return self
             async def __aexit__(self, *a): return None
-            async def post(self, url, json=None):
+            async def post(self, url, json=None, timeout=None):
                 return await fake_post(url, json=json)
 
         with patch.dict(os.environ, {"GEMINI_PRESENCE_PENALTY": "0.5", "GEMINI_FREQUENCY_PENALTY": "0.3"}):
-            with patch("httpx.AsyncClient", FakeClient):
+            with patch.object(gp, "get_http_client", lambda provider: FakeClient()):
                 result = await gp._call_gemini(
                     "gemini-2.5-flash-lite", "test-key", "sys", "hi",
                     max_tokens=20, temperature=0.7, max_retries=1,
@@ -172,13 +172,13 @@ class TestCallGeminiConfigDriven:
             def __init__(self, *a, **kw): pass
             async def __aenter__(self): return self
             async def __aexit__(self, *a): return None
-            async def post(self, url, json=None):
+            async def post(self, url, json=None, timeout=None):
                 captured["payload"] = json
                 return FakeResp()
 
         # Make sure env vars set differently are NOT used
         with patch.dict(os.environ, {"GEMINI_PRESENCE_PENALTY": "0.0", "GEMINI_FREQUENCY_PENALTY": "0.0"}):
-            with patch("httpx.AsyncClient", FakeClient):
+            with patch.object(gp, "get_http_client", lambda provider: FakeClient()):
                 result = await gp._call_gemini(
                     "gemini-2.5-flash-lite", "test-key", "sys", "hi",
                     max_tokens=20, temperature=0.7, max_retries=1,
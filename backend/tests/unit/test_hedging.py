@@ -0,0 +1,155 @@
+"""Tests for hedged DM generation (core/providers/hedging.py + generate_dm_response)."""
+
+import asyncio
+import os
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from core.providers import gemini_provider as gp
+from core.providers import hedging as hd
+
+
+def _reply(provider):
+    return {"content": f"hola desde {provider}", "model": "m", "provider": provider, "latency_ms": 1}
+
+
+def _slow(provider, delay, result="ok", calls=None):
+    async def call():
+        if calls is not None:
+            calls.append(provider)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            if calls is not None:
+                calls.append(f"{provider}:cancelled")
+            raise
+        return _reply(provider) if result == "ok" else None
+    return call
+
+
+@pytest.fixture(autouse=True)
+def hedging_on():
+    """Hedging enabled, 50ms hedge delay, budget with credit to spend, fresh stats."""
+    with patch.object(hd, "HEDGE_ENABLED", True), \
+            patch.object(hd, "HEDGE_DEFAULT_DELAY_MS", 50), \
+            patch.object(hd, "HEDGE_MIN_DELAY_MS", 10), \
+            patch.object(hd, "_budget", hd.HedgeBudget(ratio=1.0, burst=5)), \
+            patch.object(hd, "_stats", {}):
+        yield
+
+
+class TestHedgedCall:
+
+    @pytest.mark.asyncio
+    async def test_fast_primary_never_hedges(self):
+        calls = []
+        result, tried = await hd.hedged_call(
+            "deepinfra", _slow("deepinfra", 0.0, calls=calls),
+            hd.HedgeBackup("gemini", _slow("gemini", 0.0, calls=calls)),
+        )
+        assert result["provider"] == "deepinfra" and tried is False
+        assert calls == ["deepinfra"]
+        assert hd.get_hedge_stats()["providers"]["deepinfra"]["hedged"] == 0
+
+    @pytest.mark.asyncio
+    async def test_slow_primary_loses_to_backup_and_is_cancelled(self):
+        calls = []
+        result, tried = await hd.hedged_call(
+            "deepinfra", _slow("deepinfra", 5.0, calls=calls),
+            hd.HedgeBackup("gemini", _slow("gemini", 0.01, calls=calls)),
+        )
+        await asyncio.sleep(0)
+
+        assert result["provider"] == "gemini" and tried is True
+        assert "deepinfra:cancelled" in calls
+        stats = hd.get_hedge_stats()["providers"]
+        assert stats["deepinfra"]["hedge_rate"] == 1.0
+        assert stats["deepinfra"]["backup_win_rate"] == 1.0
+        assert stats["gemini"]["latency_p50_ms"] is not None
+
+    @pytest.mark.asyncio
+    async def test_failed_backup_waits_for_primary(self):
+        result, tried = await hd.hedged_call(
+            "deepinfra", _slow("deepinfra", 0.1),
+            hd.HedgeBackup("gemini", _slow("gemini", 0.0, result=None)),
+        )
+        assert result["provider"] == "deepinfra" and tried is True
+        assert hd.get_hedge_stats()["providers"]["deepinfra"]["backup_wins"] == 0
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_or_empty_budget_skips_hedge(self):
+        calls = []
+        backup = hd.HedgeBackup("gemini", _slow("gemini", 0.0, calls=calls), available=lambda: False)
+        result, tried = await hd.hedged_call("deepinfra", _slow("deepinfra", 0.1), backup)
+        assert result["provider"] == "deepinfra" and tried is False
+
+        with patch.object(hd, "_budget", hd.HedgeBudget(ratio=0.1, burst=5)):
+            backup = hd.HedgeBackup("gemini", _slow("gemini", 0.0, calls=calls))
+            result, tried = await hd.hedged_call("deepinfra", _slow("deepinfra", 0.1), backup)
+        assert tried is False
+        assert calls == []
+        stats = hd.get_hedge_stats()["providers"]["deepinfra"]
+        assert stats["skipped_circuit"] == 1 and stats["skipped_budget"] == 1
+
+    def test_hedge_delay_is_learned_percentile(self):
+        stats = hd.ProviderHedgeStats("deepinfra")
+        assert stats.hedge_delay_ms() == 50  # default until enough samples
+        stats.latencies_ms.extend(range(100, 2100, 20))  # 100 samples, 100..2080ms
+        with patch.object(hd, "HEDGE_PERCENTILE", 95):
+            assert stats.hedge_delay_ms() == stats.percentile(95) == 1980
+
+    def test_budget_caps_extra_requests(self):
+        budget = hd.HedgeBudget(ratio=0.1, burst=2)
+        spent = 0
+        for _ in range(100):
+            budget.earn()
+            spent += budget.try_spend()
+        assert spent == 10
+
+
+class TestGenerateDmResponseHedging:
+
+    def setup_method(self):
+        gp._gemini_consecutive_failures = 0
+        gp._gemini_circuit_open_until = 0.0
+
+    @pytest.mark.asyncio
+    async def test_slow_deepinfra_is_raced_by_gemini(self):
+        os.environ.pop("LLM_MODEL_NAME", None)
+        with patch.object(gp, "LLM_PRIMARY_PROVIDER", "deepinfra"), \
+                patch("core.config.llm_models.get_active_model_config", return_value=None), \
+                patch.object(gp, "_try_deepinfra", new=lambda *a, **k: _slow("deepinfra", 5.0)()), \
+                patch.object(gp, "generate_response_gemini", new_callable=AsyncMock) as gem:
+            gem.return_value = _reply("gemini")
+            result = await gp.generate_dm_response([{"role": "user", "content": "hola"}])
+
+        assert result["provider"] == "gemini"
+        gem.assert_called_once()  # raced once, not retried as fallback
+        assert gp._gemini_consecutive_failures == 0
+
+    @pytest.mark.asyncio
+    async def test_active_model_config_provider_is_raced_by_gemini(self):
+        active = {"provider": {"name": "openrouter"}}
+        with patch.dict(os.environ, {"LLM_MODEL_NAME": "some-model"}), \
+                patch("core.config.llm_models.get_active_model_config", return_value=active), \
+                patch.object(gp, "_try_openrouter", new=lambda *a, **k: _slow("openrouter", 5.0)()), \
+                patch.object(gp, "generate_response_gemini", new_callable=AsyncMock) as gem:
+            gem.return_value = _reply("gemini")
+            result = await gp.generate_dm_response([{"role": "user", "content": "hola"}])
+
+        assert result["provider"] == "gemini"
+        gem.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_no_fallback_mode_never_hedges(self):
+        os.environ.pop("LLM_MODEL_NAME", None)
+        with patch.dict(os.environ, {"CCEE_NO_FALLBACK": "1"}), \
+                patch.object(gp, "LLM_PRIMARY_PROVIDER", "deepinfra"), \
+                patch("core.config.llm_models.get_active_model_config", return_value=None), \
+                patch.object(gp, "_try_deepinfra", new=lambda *a, **k: _slow("deepinfra", 0.1)()), \
+                patch.object(gp, "generate_response_gemini", new_callable=AsyncMock) as gem:
+            result = await gp.generate_dm_response([{"role": "user", "content": "hola"}])
+
+        assert result["provider"] == "deepinfra"
+        gem.assert_not_called()
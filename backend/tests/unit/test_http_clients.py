@@ -0,0 +1,89 @@
+"""Tests for the pooled LLM provider HTTP client registry."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from core.providers import http_clients as hc
+
+
+class TestHTTPClientRegistry:
+    """Registry lifecycle: one client per provider per event loop."""
+
+    @pytest.mark.asyncio
+    async def test_same_client_reused_within_loop(self):
+        registry = hc.HTTPClientRegistry()
+        a = registry.get("gemini")
+        b = registry.get("gemini")
+        c = registry.get("deepinfra")
+        assert a is b
+        assert a is not c
+        await registry.aclose()
+
+    @pytest.mark.asyncio
+    async def test_aclose_closes_and_forgets_clients(self):
+        registry = hc.HTTPClientRegistry()
+        client = registry.get("gemini")
+        await registry.aclose()
+        assert client.is_closed
+        assert registry.get("gemini") is not client
+        await registry.aclose()
+
+    def test_client_from_finished_loop_is_replaced_and_closed(self):
+        registry = hc.HTTPClientRegistry()
+
+        async def fetch():
+            return registry.get("gemini")
+
+        first = asyncio.run(fetch())
+        second = asyncio.run(fetch())
+        assert second is not first
+        assert not first.is_closed
+
+        asyncio.run(registry.aclose())
+        assert first.is_closed
+        assert second.is_closed
+
+    def test_open_creates_default_providers(self):
+        registry = hc.HTTPClientRegistry()
+        registry.open()
+        assert set(registry._clients) == set(hc.DEFAULT_PROVIDERS)
+
+
+class TestInstrumentedTransport:
+    """Per-provider metrics are recorded for success and failure."""
+
+    @pytest.mark.asyncio
+    async def test_records_requests_errors_and_latency(self):
+        def handler(request):
+            if request.url.path == "/fail":
+                return httpx.Response(503)
+            return httpx.Response(200, json={"ok": True})
+
+        stats = hc.ProviderPoolStats("fake")
+        transport = hc._InstrumentedTransport("fake", httpx.MockTransport(handler), stats)
+        async with httpx.AsyncClient(transport=transport, base_url="http://llm") as client:
+            await client.get("/ok")
+            await client.get("/ok")
+            await client.get("/fail")
+
+        data = stats.to_dict()
+        assert data["requests"] == 3
+        assert data["errors"] == 1
+        assert data["in_flight"] == 0
+        assert data["latency_p50_ms"] is not None
+
+    @pytest.mark.asyncio
+    async def test_transport_exception_counts_as_error(self):
+        def handler(request):
+            raise httpx.ConnectError("boom", request=request)
+
+        stats = hc.ProviderPoolStats("fake")
+        transport = hc._InstrumentedTransport("fake", httpx.MockTransport(handler), stats)
+        async with httpx.AsyncClient(transport=transport) as client:
+            with pytest.raises(httpx.ConnectError):
+                await client.get("http://llm/x")
+
+        assert stats.errors == 1
+        assert stats.in_flight == 0
@@ -4,6 +4,7 @@ import os
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
+from core.providers.http_clients import get_http_client
 from core.providers.openrouter_provider import (
     call_openrouter,
     _record_failure,
@@ -62,6 +63,7 @@ class TestCallOpenRouterLegacy:
                 MockClient.assert_called_once_with(
                     api_key="test-key",
                     base_url=OPENROUTER_BASE_URL,
+                    http_client=get_http_client("openrouter"),
                 )
                 kwargs = mock_create.call_args.kwargs
                 assert kwargs["model"] == "google/gemma-4-31b-it"
@@ -5,6 +5,7 @@ import os
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
+from core.providers.http_clients import get_http_client
 from core.providers.together_provider import (
     call_together,
     _record_failure,
@@ -71,6 +72,7 @@ class TestCallTogether:
                 MockClient.assert_called_once_with(
                     api_key="test-key",
                     base_url=TOGETHER_BASE_URL,
+                    http_client=get_http_client("together"),
                 )
 
     @pytest.mark.asyncio